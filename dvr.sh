@@ -25,7 +25,7 @@ echo "Message file: $message_file"
 echo "Changes file: $changes_file"
 echo "Output will be written to: $output_file"
 
-$python_cmd "src/dvr.py" "$topology_file" "$message_file" "$changes_file" "$output_file"
+$python_cmd "src/dvr.py" "$topology_file" "$message_file" "$changes_file" "$output_file" "${@:5}"
 
 
 
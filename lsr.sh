@@ -26,4 +26,4 @@ echo "Changes file: $changes_file"
 echo "Output will be written to: $output_file"
 
 
-$python_cmd "src/lsr.py" "$topology_file" "$message_file" "$changes_file" "$output_file"
+$python_cmd "src/lsr.py" "$topology_file" "$message_file" "$changes_file" "$output_file" "${@:5}"
@@ -27,7 +27,7 @@ if [ $? -ne 0 ]; then
 fi
 
 # Define source files
-source_files=("dvr" "lsr")
+source_files=("dvr" "lsr" "dual")
 
 # Create binary executables
 echo "Creating binary executables..."
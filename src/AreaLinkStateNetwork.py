@@ -0,0 +1,131 @@
+from LinkStateNetwork import LinkStateNetwork
+from AreaLinkStateRouter import AreaLinkStateRouter
+from input_parser import parse_integer_file
+from shortest_paths import shortest_path_tree
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the AreaLinkStateNetwork Class.
+# This module defines the AreaLinkStateNetwork class, which extends the LinkStateNetwork class to split the
+# network into OSPF-style areas. Routers are assigned to areas by an areas file, and every router only keeps
+# the links of its own area plus the distances summarized by the area border routers. After every change,
+# the network floods the area LSPs, then the backbone LSPs of the area border routers, then their summary
+# LSPs, before routing tables are recomputed. The network can report how much smaller the link state
+# databases and the SPF computations are than with flat link state routing, and how much the routes differ.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup LSR
+## @{
+class AreaLinkStateNetwork(LinkStateNetwork):
+    """
+    Represents a network using Link State routing split into areas.
+
+    Inherits from the LinkStateNetwork class.
+
+    Attributes:
+        areas (dict): The area ID of each router listed in the areas file. Other routers belong to area 0.
+    """
+
+    def __init__(self, topology_file, output_file, areas_file, output_routers=None, lazy=False, trace=None):
+        """
+        Initializes an AreaLinkStateNetwork object.
+
+        Args:
+            topology_file (str): The file path of the topology file.
+            output_file (str): The file path to write the output, an open writable object, or None to discard the output.
+            areas_file (str): The file path of the areas file, where every line is "router area".
+            output_routers (iterable): The IDs of the routers whose routing tables are written, or None for all routers.
+            lazy (bool): If True, routing tables are only computed when they are read.
+            trace (TraceRecorder): The recorder of every routing table update, or None.
+        """
+        values = parse_integer_file(areas_file, 2)
+        self.areas = dict(zip(values[0::2], values[1::2]))
+        super().__init__(topology_file, output_file, output_routers, lazy, trace=trace)
+
+    def _add_router(self, router_id):
+        """
+        Adds a router to the network, in the area given by the areas file.
+
+        Args:
+            router_id (int): The ID of the router to add.
+        """
+        router = AreaLinkStateRouter(router_id, self.routers, self.areas.get(router_id, 0), self.lsdb)
+        self.routers[router.id] = router
+
+    def distribute_all_lsp(self, routers=None):
+        """
+        Floods the area LSPs of all routers, then lets the area border routers exchange backbone LSPs
+        and flood the resulting summary LSPs into their areas.
+
+        Args:
+            routers (list): The routers generating an area LSP, or None for all routers.
+        """
+        super().distribute_all_lsp(routers)
+        for router in self.routers.values():
+            router.generate_backbone_lsp()
+        for router in self.routers.values():
+            router.generate_summary_lsp()
+
+    def routers_affected_by(self, link_changes):
+        """
+        Finds the routers whose routes link changes may alter. Area border routers remember the backbone
+        LSPs of routers they can no longer reach, so every router is updated after a change.
+
+        Args:
+            link_changes (list): The (router1, router2, cost) link changes.
+
+        Returns:
+            list: All the routers, in the order of the network.
+        """
+        return list(self.routers.values())
+
+    def area_report(self):
+        """
+        Compares the network with flat link state routing over the same topology: the size of the link
+        state database and the SPF work of each router, and the routes that differ.
+
+        Returns:
+            str: The report.
+        """
+        router_count = len(self.routers) or 1
+        flat_lsdb_size = sum(len(router.neighbors) for router in self.routers.values())
+        flat_spf_work = 0
+        area_lsdb_size = 0
+        area_spf_work = 0
+        routes = longer_routes = unreachable_routes = other_next_hops = 0
+        max_stretch = 1.0
+        for router_id, router in self.routers.items():
+            distances, next_hops = shortest_path_tree(lambda other_id: self.routers[other_id].neighbors, router_id)
+            flat_spf_work += sum(len(self.routers[other_id].neighbors) for other_id in distances)
+            routing_table = router.routing_table
+            area_lsdb_size += router.lsdb_size()
+            area_spf_work += router.spf_work
+            for destination_id, distance in distances.items():
+                if destination_id == router_id:
+                    continue
+                routes += 1
+                next_hop, cost = routing_table.get(destination_id, (None, INFINITY))
+                if cost == INFINITY:
+                    unreachable_routes += 1
+                elif cost > distance:
+                    longer_routes += 1
+                    max_stretch = max(max_stretch, cost / distance)
+                elif next_hop != next_hops[destination_id]:
+                    other_next_hops += 1
+
+        def saving(flat, area):
+            return f"{100 * (flat - area) / flat:.1f}%" if flat else "0.0%"
+
+        return (f"areas: {len(set(router.area for router in self.routers.values()))}\n"
+                f"area border routers: {sum(router.is_area_border_router() for router in self.routers.values())}\n"
+                f"average LSDB entries per router: flat {flat_lsdb_size:.1f}, areas {area_lsdb_size / router_count:.1f}, "
+                f"saving {saving(flat_lsdb_size, area_lsdb_size / router_count)}\n"
+                f"average SPF work per router: flat {flat_spf_work / router_count:.1f}, areas {area_spf_work / router_count:.1f}, "
+                f"saving {saving(flat_spf_work, area_spf_work)}\n"
+                f"routes compared with flat routing: {routes}\n"
+                f"longer routes: {longer_routes} (max stretch {max_stretch:.2f})\n"
+                f"unreachable routes: {unreachable_routes}\n"
+                f"same cost, different next hop: {other_next_hops}\n")
+
+## @}
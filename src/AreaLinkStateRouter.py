@@ -0,0 +1,305 @@
+from LinkStateRouter import LinkStateRouter
+from LinkStateDatabase import make_lsp
+from shortest_paths import choose_tree_kernel, shortest_path_tree
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the AreaLinkStateRouter Class.
+# This file defines the AreaLinkStateRouter class, a LinkStateRouter that belongs to an OSPF-style area.
+# Link State Packets (LSPs) are only flooded inside the area, so the network topology of a router only
+# holds the links of its own area. Area border routers (ABRs), the routers with a link to another area,
+# also exchange backbone LSPs with each other, describing their links to other areas and their distances
+# to the other ABRs and to every router of their area. From the backbone, each ABR computes its distance to
+# every router outside its area and floods it into its area as a summary LSP. Routers then run Dijkstra's
+# algorithm over their area only, and reach routers of other areas through the ABR that offers the lowest
+# total distance.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup LSR
+## @{
+class AreaLinkStateRouter(LinkStateRouter):
+    """
+    This class represents a Link State Router that belongs to an area.
+
+    Inherits from the LinkStateRouter class.
+
+    Attributes:
+        area (int): The ID of the area of the router.
+        area_border_routers (set): The IDs of the routers of the area whose LSP advertises a link to another area.
+        summary_topology (dict): For each ABR of the area, the distances it advertised to routers of other areas.
+        backbone_topology (dict): For each ABR of the network, its last backbone LSP. Only kept by ABRs.
+        inter_area_routes (dict): The next hop and distance to each router of another area. Only computed by ABRs.
+        summary_sequence_number (int): The sequence number of the summary and backbone LSPs generated by the router.
+        summary_sequence_tracker (dict): The sequence numbers of received summary LSPs.
+        backbone_sequence_tracker (dict): The sequence numbers of received backbone LSPs.
+        spf_work (int): The number of LSDB entries read by the last routing table computation.
+        backbone_spf_work (int): The number of backbone LSP entries read by the last backbone computation of an ABR.
+    """
+
+    def __init__(self, id, network_routers, area, lsdb=None):
+        """
+        Initializes an AreaLinkStateRouter object.
+
+        Args:
+            id (int): The ID of the router.
+            network_routers (dict): A dictionary representing the network routers, where the keys are the router IDs and the values are the router objects.
+            area (int): The ID of the area of the router.
+            lsdb (LinkStateDatabase): The empty link state database shared by the routers of the network. A new one is created if None.
+        """
+        super().__init__(id, network_routers, lsdb)
+        self.area = area
+        self.summary_topology = {}
+        self.backbone_topology = {}
+        self.inter_area_routes = {}
+        self.summary_sequence_number = 0
+        self.summary_sequence_tracker = {}
+        self.backbone_sequence_tracker = {}
+        self.spf_work = 0
+        self.backbone_spf_work = 0
+
+    def area_neighbors(self):
+        """
+        Retrieves the neighbors of the router that belong to its area.
+
+        Returns:
+            dict: A dictionary mapping the IDs of the neighbors in the area to the cost to reach them.
+        """
+        return {neighbor_id: cost for neighbor_id, cost in self.neighbors.items()
+                if self.network_routers[neighbor_id].area == self.area}
+
+    @property
+    def area_border_routers(self):
+        """
+        The IDs of the routers of the area whose LSP advertises a link to another area.
+        """
+        return {router_id for router_id, lsp in self.lsdb.lsps.items() if lsp['border']}
+
+    def is_area_border_router(self):
+        """
+        Checks whether the router has a link to another area.
+
+        Returns:
+            bool: True if the router is an area border router.
+        """
+        return any(self.network_routers[neighbor_id].area != self.area for neighbor_id in self.neighbors)
+
+    def lsdb_size(self):
+        """
+        Counts the entries of the link state database of the router: links of its area, summary
+        distances and, for ABRs, the backbone LSPs.
+
+        Returns:
+            int: The number of entries.
+        """
+        size = sum(len(neighbors) for neighbors in self.network_topology.values())
+        size += sum(len(summaries) for summaries in self.summary_topology.values())
+        size += sum(len(lsp['links']) + len(lsp['area_distances']) for lsp in self.backbone_topology.values())
+        return size
+
+    def generate_lsp(self):
+        """
+        Generates a Link State Packet (LSP) with the links of the router inside its area and floods it in the area.
+        """
+        self.lsp_sequence_number += 1
+        lsp = make_lsp(self.id, self.lsp_sequence_number, self.area_neighbors(),
+                       area=self.area, border=self.is_area_border_router())
+        self._process_lsp(lsp)
+        self._distribute_lsp(lsp)
+
+    def _process_lsp(self, lsp):
+        """
+        Processes a received Link State Packet (LSP) of the area and updates the network topology if necessary.
+
+        Args:
+            lsp (dict): The received LSP.
+
+        Returns:
+            bool: True if the LSP was new and must be forwarded.
+        """
+        return lsp['area'] == self.area and super()._process_lsp(lsp)
+
+    def _flooding_neighbors(self):
+        """
+        Retrieves the neighbors an LSP is forwarded to. LSPs are only flooded inside the area.
+
+        Returns:
+            dict: The neighbors of the router that belong to its area.
+        """
+        return self.area_neighbors()
+
+    def _area_shortest_paths(self):
+        """
+        Runs Dijkstra's algorithm over the links of the area, with the kernel suited to their costs.
+
+        Returns:
+            tuple: The distances and next hops to the routers of the area the router can reach.
+        """
+        return choose_tree_kernel(self.lsdb.weights)(lambda router_id: self.network_topology.get(router_id, {}), self.id)
+
+    def generate_backbone_lsp(self):
+        """
+        Generates a backbone LSP and floods it to the other area border routers. It holds the links of the
+        router to other areas, its distance to the other reachable ABRs of its area and its distance to every
+        reachable router of its area. A router that is no longer an ABR sends an empty backbone LSP, so the
+        other ABRs forget it.
+        """
+        is_border = self.is_area_border_router()
+        if not is_border and self.id not in self.backbone_topology:
+            return
+        links = {}
+        area_distances = {}
+        if is_border:
+            distances, next_hops = self._area_shortest_paths()
+            links = {router_id: distances[router_id] for router_id in self.area_border_routers
+                     if router_id != self.id and router_id in distances}
+            links.update((neighbor_id, cost) for neighbor_id, cost in self.neighbors.items()
+                         if self.network_routers[neighbor_id].area != self.area)
+            area_distances = distances
+        self.summary_sequence_number += 1
+        lsp = {'id': self.id, 'sequence': self.summary_sequence_number, 'area': self.area,
+               'links': links, 'area_distances': area_distances}
+        self._process_backbone_lsp(lsp)
+
+    def _process_backbone_lsp(self, lsp):
+        """
+        Processes a backbone LSP and forwards it to the neighbors in other areas and the other ABRs of the area.
+        Routers that are not ABRs ignore it.
+
+        Args:
+            lsp (dict): The received backbone LSP.
+        """
+        if lsp['id'] != self.id and not self.is_area_border_router():
+            return
+        if lsp['id'] in self.backbone_sequence_tracker and lsp['sequence'] <= self.backbone_sequence_tracker[lsp['id']]:
+            return
+        self.backbone_sequence_tracker[lsp['id']] = lsp['sequence']
+        if lsp['links'] or lsp['area_distances']:
+            self.backbone_topology[lsp['id']] = lsp
+        else:
+            self.backbone_topology.pop(lsp['id'], None)
+
+        other_areas = {neighbor_id for neighbor_id in self.neighbors if self.network_routers[neighbor_id].area != self.area}
+        for router_id in (self.area_border_routers | other_areas) - {self.id}:
+            self.network_routers[router_id]._process_backbone_lsp(lsp)
+
+    def _backbone_links(self, router_id):
+        """
+        Retrieves the backbone links of an ABR that are advertised by both of their ends.
+
+        Args:
+            router_id (int): The ID of the ABR.
+
+        Returns:
+            dict: A dictionary mapping the IDs of the linked ABRs to the cost of the links.
+        """
+        links = self.backbone_topology[router_id]['links'] if router_id in self.backbone_topology else {}
+        return {other_id: cost for other_id, cost in links.items()
+                if router_id in self.backbone_topology.get(other_id, {'links': {}})['links']}
+
+    def generate_summary_lsp(self):
+        """
+        Computes the routes of an ABR to the routers it cannot reach inside its area, and floods their
+        distances into its area as a summary LSP. A router that is no longer an ABR floods an empty summary LSP.
+
+        An ABR that can reach a destination inside its own area forwards packets along the intra-area route,
+        so the backbone routes to a destination stop at the first such ABR instead of crossing its area.
+        Destinations are grouped by the ABRs that reach them inside their area, with one backbone Dijkstra per group.
+        """
+        self.inter_area_routes = {}
+        self.backbone_spf_work = 0
+        if self.is_area_border_router():
+            area_distances, area_next_hops = self._area_shortest_paths()
+            entry_borders = {}
+            for border_id, lsp in self.backbone_topology.items():
+                for destination_id in lsp['area_distances']:
+                    if destination_id not in area_distances:
+                        entry_borders.setdefault(destination_id, set()).add(border_id)
+            groups = {}
+            for destination_id, border_ids in entry_borders.items():
+                groups.setdefault(frozenset(border_ids), []).append(destination_id)
+
+            for border_ids, destination_ids in groups.items():
+                def get_links(router_id):
+                    return {} if router_id in border_ids else self._backbone_links(router_id)
+                backbone_distances, backbone_next_hops = shortest_path_tree(get_links, self.id)
+                self.backbone_spf_work += sum(len(get_links(router_id)) for router_id in backbone_distances)
+                entries = []
+                for border_id in border_ids & backbone_distances.keys():
+                    first_hop = backbone_next_hops[border_id]
+                    if first_hop in self.neighbors and self.network_routers[first_hop].area != self.area:
+                        entries.append((border_id, backbone_distances[border_id], first_hop))
+                    else:
+                        entries.append((border_id, backbone_distances[border_id], area_next_hops[first_hop]))
+                for destination_id in destination_ids:
+                    route = min((border_distance + self.backbone_topology[border_id]['area_distances'][destination_id], next_hop)
+                                for border_id, border_distance, next_hop in entries) if entries else None
+                    if route is not None:
+                        self.inter_area_routes[destination_id] = (route[1], route[0])
+                    self.backbone_spf_work += len(entries)
+        elif self.id not in self.summary_topology:
+            return
+
+        self.summary_sequence_number += 1
+        summaries = {destination_id: distance for destination_id, (next_hop, distance) in self.inter_area_routes.items()}
+        lsp = {'id': self.id, 'sequence': self.summary_sequence_number, 'area': self.area, 'summaries': summaries}
+        self._process_summary_lsp(lsp)
+        self._distribute_lsp(lsp, '_process_summary_lsp')
+
+    def _process_summary_lsp(self, lsp):
+        """
+        Processes a summary LSP of an ABR of the area.
+
+        Args:
+            lsp (dict): The received summary LSP.
+
+        Returns:
+            bool: True if the summary LSP was new and must be forwarded.
+        """
+        if lsp['area'] != self.area:
+            return False
+        if lsp['id'] in self.summary_sequence_tracker and lsp['sequence'] <= self.summary_sequence_tracker[lsp['id']]:
+            return False
+        self.summary_sequence_tracker[lsp['id']] = lsp['sequence']
+        if lsp['summaries']:
+            self.summary_topology[lsp['id']] = lsp['summaries']
+        else:
+            self.summary_topology.pop(lsp['id'], None)
+        return True
+
+    def update_routing_table_dijkstra(self):
+        """
+        Updates the routing table from the area topology and the summaries of the area border routers.
+
+        Routers of the area are reached along the shortest paths inside the area. Routers of other areas are
+        reached through the ABR offering the lowest total distance, or along the backbone routes for ABRs.
+        """
+        self._routing_table_stale = False
+        self.spf_runs += 1
+        distances, next_hops = self._area_shortest_paths()
+        self.spf_work = sum(len(self.network_topology.get(router_id, {})) for router_id in distances)
+        routes = {destination_id: (next_hops.get(destination_id, self.id), distance)
+                  for destination_id, distance in distances.items()}
+
+        if self.is_area_border_router():
+            self.spf_work += self.backbone_spf_work
+            for destination_id, route in self.inter_area_routes.items():
+                routes.setdefault(destination_id, route)
+        else:
+            candidates = {}
+            for border_id, summaries in self.summary_topology.items():
+                if border_id not in distances:
+                    continue
+                self.spf_work += len(summaries)
+                for destination_id, distance in summaries.items():
+                    candidate = (distances[border_id] + distance, next_hops.get(border_id, self.id))
+                    if destination_id not in distances and (destination_id not in candidates or candidate < candidates[destination_id]):
+                        candidates[destination_id] = candidate
+            routes.update((destination_id, (next_hop, distance)) for destination_id, (distance, next_hop) in candidates.items())
+
+        self.routing_table = {}
+        for destination_id, (next_hop_id, cost) in routes.items():
+            next_hop_router = self.network_routers[next_hop_id] if cost != INFINITY else None
+            self.update_routing_table(self.network_routers[destination_id], next_hop_router, cost)
+
+## @}
@@ -0,0 +1,205 @@
+from collections import deque
+
+## @file
+## @brief Implementation of the ConnectivityIndex Class.
+# This file defines the ConnectivityIndex class, which keeps the connected components of the network up to
+# date as links are added and removed, so that whether two routers can reach each other is answered by
+# comparing two labels instead of waiting for the routing protocol to converge. Adding a link merges two
+# components by relabeling the smaller one, as a union-find would, so every router is relabeled at most
+# log(n) times while links are only added. Removing a link searches from both of its ends at the same time,
+# one router at a time on each side: if the searches meet, the component is still connected, otherwise the
+# side whose search ended first is split off. The work of a removal is therefore bounded by the size of
+# the smaller side, and a link removed inside a large component costs little when a short detour exists.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+
+class ConnectivityIndex:
+    """
+    The connected components of a network, maintained incrementally.
+
+    Routers that were never linked are not stored, and each of them is a component of its own.
+
+    Attributes:
+        labels (dict): The component label of each linked router ID.
+        members (dict): The set of router IDs of each component label.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty ConnectivityIndex object.
+        """
+        self.labels = {}
+        self.members = {}
+        self._next_label = 0
+
+    @classmethod
+    def from_topology(cls, get_neighbors, router_ids):
+        """
+        Creates the index of a topology, labeling the components with a breadth first search.
+
+        Args:
+            get_neighbors (callable): Returns the {neighbor ID: cost} dictionary of a router ID.
+            router_ids (iterable): The IDs of the routers.
+
+        Returns:
+            ConnectivityIndex: The index.
+        """
+        index = cls()
+        for router_id in router_ids:
+            if router_id in index.labels or not get_neighbors(router_id):
+                continue
+            label = index._new_label()
+            component = {router_id}
+            pending = deque([router_id])
+            while pending:
+                for neighbor_id in get_neighbors(pending.popleft()):
+                    if neighbor_id not in component:
+                        component.add(neighbor_id)
+                        pending.append(neighbor_id)
+            index._relabel(component, label)
+        return index
+
+    def connected(self, router_id1, router_id2):
+        """
+        Checks whether two routers are in the same component.
+
+        Args:
+            router_id1 (int): The ID of the first router.
+            router_id2 (int): The ID of the second router.
+
+        Returns:
+            bool: True if a path links the routers.
+        """
+        if router_id1 == router_id2:
+            return True
+        label = self.labels.get(router_id1)
+        return label is not None and label == self.labels.get(router_id2)
+
+    def component(self, router_id):
+        """
+        Retrieves the component of a router.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            set: The IDs of the routers of the component. Shared with the index, must not be modified.
+        """
+        label = self.labels.get(router_id)
+        return {router_id} if label is None else self.members[label]
+
+    def components_of(self, router_ids):
+        """
+        Retrieves the distinct components of several routers.
+
+        Args:
+            router_ids (iterable): The IDs of the routers.
+
+        Returns:
+            list: The sets of router IDs of the components, each listed once. Shared with the index, must not be modified.
+        """
+        components = {}
+        for router_id in router_ids:
+            # Routers that were never linked have no label, they are told apart by their ID
+            key = self.labels.get(router_id, (router_id,))
+            if key not in components:
+                components[key] = self.component(router_id)
+        return list(components.values())
+
+    def add_link(self, router_id1, router_id2):
+        """
+        Records a new link, merging the components of its ends.
+
+        Args:
+            router_id1 (int): The ID of the first router.
+            router_id2 (int): The ID of the second router.
+        """
+        label1 = self._register(router_id1)
+        label2 = self._register(router_id2)
+        if label1 == label2:
+            return
+        if len(self.members[label1]) < len(self.members[label2]):
+            label1, label2 = label2, label1
+        component = self.members.pop(label2)
+        self._relabel(component, label1)
+
+    def remove_link(self, router_id1, router_id2, get_neighbors):
+        """
+        Records the removal of a link, once it was removed from the topology, and splits its component if
+        no other path links its ends.
+
+        Args:
+            router_id1 (int): The ID of the first router.
+            router_id2 (int): The ID of the second router.
+            get_neighbors (callable): Returns the {neighbor ID: cost} dictionary of a router ID, without the removed link.
+        """
+        if router_id1 == router_id2 or not self.connected(router_id1, router_id2) or router_id2 in get_neighbors(router_id1):
+            return
+        searches = [({router_id1}, deque([router_id1])), ({router_id2}, deque([router_id2]))]
+        while True:
+            for side, (visited, pending) in enumerate(searches):
+                if not pending:
+                    self._split(visited)
+                    return
+                other_visited = searches[1 - side][0]
+                for neighbor_id in get_neighbors(pending.popleft()):
+                    if neighbor_id in other_visited:
+                        return
+                    if neighbor_id not in visited:
+                        visited.add(neighbor_id)
+                        pending.append(neighbor_id)
+
+    def _split(self, component):
+        """
+        Moves part of a component to a new component.
+
+        Args:
+            component (set): The IDs of the routers to move.
+        """
+        router_id = next(iter(component))
+        self.members[self.labels[router_id]] -= component
+        self._relabel(component, self._new_label())
+
+    def _register(self, router_id):
+        """
+        Stores a router that was never linked as a component of its own.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            int: The label of the component of the router.
+        """
+        label = self.labels.get(router_id)
+        if label is None:
+            label = self._new_label()
+            self._relabel({router_id}, label)
+        return label
+
+    def _relabel(self, component, label):
+        """
+        Assigns routers to a component.
+
+        Args:
+            component (set): The IDs of the routers.
+            label (int): The label of the component.
+        """
+        for router_id in component:
+            self.labels[router_id] = label
+        self.members.setdefault(label, set()).update(component)
+
+    def _new_label(self):
+        """
+        Creates a new component label.
+
+        Returns:
+            int: The label.
+        """
+        self._next_label += 1
+        return self._next_label
+
+## @}
@@ -0,0 +1,379 @@
+import heapq
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the ContractionHierarchy Class, an index answering route queries on a stable topology.
+# Routers are contracted one after the other, least important first: a contracted router is removed from
+# the topology, and a shortcut link is added between two of its neighbors whenever the path through it is
+# the only shortest one left between them. Every router keeps its links to the routers contracted after it,
+# shortcuts included. The distance between two routers is then found by two small Dijkstra searches only
+# following these upward links, one from each router, meeting at the most important router of a shortest
+# path. Routes follow the tie-break rule of LinkStateRouter: they are rebuilt from the destination by always
+# stepping back to the smallest-ID neighbor on a shortest path from the source, rather than by unpacking the
+# shortcuts of whichever shortest route the searches met on.
+#
+# The index does not follow the changes of the topology: a network invalidates it after every change, and it
+# is rebuilt when it is next queried, keeping the contraction order of the previous build, so only the
+# shortcuts are searched again.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+WITNESS_SETTLE_LIMIT = 64
+SEARCH_CACHE_SIZE = 4096
+
+
+class ContractionHierarchy:
+    """
+    A contraction hierarchy of the routers of a network.
+
+    Attributes:
+        neighbors (dict): The neighbors dictionary of each router ID, as of the last build.
+        rank (dict): The position of each router ID in the contraction order.
+        upward (dict): The links of each router ID to the routers contracted after it, shortcuts included.
+        middles (dict): The contracted router ID each shortcut goes through, keyed by (lower ID, higher ID) router pairs.
+        searches (dict): The upward searches of the last queried routers, until the next build.
+        shortcuts (int): The number of shortcut links added by the last build.
+        builds (int): The number of times the index was built.
+        stale (bool): True if the topology changed since the last build.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty ContractionHierarchy object, built on its first query.
+        """
+        self.neighbors = {}
+        self.rank = {}
+        self.upward = {}
+        self.middles = {}
+        self.searches = {}
+        self.shortcuts = 0
+        self.builds = 0
+        self.stale = True
+
+    def invalidate(self):
+        """
+        Marks the index as out of date, after a change of the topology.
+        """
+        self.stale = True
+
+    def build(self, neighbors):
+        """
+        Builds the index. The first build chooses the contraction order; later builds keep it, routers that
+        appeared since being contracted last.
+
+        Args:
+            neighbors (dict): The neighbors dictionary ({router ID: cost}) of each router ID.
+        """
+        self.neighbors = {router_id: dict(router_neighbors) for router_id, router_neighbors in neighbors.items()}
+        graph = {router_id: dict(router_neighbors) for router_id, router_neighbors in self.neighbors.items()}
+        self.upward = {}
+        self.middles = {}
+        self.searches = {}
+        self.shortcuts = 0
+        if self.rank:
+            order = sorted((router_id for router_id in graph if router_id in self.rank), key=self.rank.get)
+            order += [router_id for router_id in graph if router_id not in self.rank]
+            for router_id in order:
+                self._contract(graph, router_id)
+        else:
+            order = self._contract_by_priority(graph)
+        self.rank = {router_id: position for position, router_id in enumerate(order)}
+        self.builds += 1
+        self.stale = False
+
+    def _contract_by_priority(self, graph):
+        """
+        Contracts every router, always choosing the router whose contraction adds the fewest shortcuts
+        compared to the links it removes, routers next to many contracted routers going later.
+
+        Args:
+            graph (dict): The neighbors dictionary of each router not contracted yet, updated in place.
+
+        Returns:
+            list: The router IDs in the order they were contracted.
+        """
+        contracted_neighbors = {router_id: 0 for router_id in graph}
+        levels = {router_id: 0 for router_id in graph}
+
+        def priority(router_id):
+            shortcuts = self._shortcuts(graph, router_id)
+            return 2 * (len(shortcuts) - len(graph[router_id])) + contracted_neighbors[router_id] + levels[router_id], shortcuts
+
+        heap = [(priority(router_id)[0], router_id) for router_id in graph]
+        heapq.heapify(heap)
+        order = []
+        while heap:
+            _, router_id = heapq.heappop(heap)
+            if router_id not in graph:
+                continue
+            current, shortcuts = priority(router_id)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, router_id))
+                continue
+            for neighbor_id in graph[router_id]:
+                contracted_neighbors[neighbor_id] += 1
+                levels[neighbor_id] = max(levels[neighbor_id], levels[router_id] + 1)
+            self._contract(graph, router_id, shortcuts)
+            order.append(router_id)
+        return order
+
+    def _contract(self, graph, router_id, shortcuts=None):
+        """
+        Removes a router from the graph, adding the shortcuts its removal needs, and keeps its upward links.
+
+        Args:
+            graph (dict): The neighbors dictionary of each router not contracted yet, updated in place.
+            router_id (int): The ID of the router to contract.
+            shortcuts (list): The shortcuts its removal needs, if they were already found.
+        """
+        if shortcuts is None:
+            shortcuts = self._shortcuts(graph, router_id)
+        for router_id1, router_id2, cost in shortcuts:
+            if cost < graph[router_id1].get(router_id2, INFINITY):
+                graph[router_id1][router_id2] = cost
+                graph[router_id2][router_id1] = cost
+                self.middles[(router_id1, router_id2)] = router_id
+                self.shortcuts += 1
+        neighbors = graph.pop(router_id)
+        for neighbor_id in neighbors:
+            del graph[neighbor_id][router_id]
+        self.upward[router_id] = neighbors
+
+    def _shortcuts(self, graph, router_id):
+        """
+        Finds the shortcuts contracting a router needs: for every pair of its neighbors, the path through it,
+        unless a search avoiding it finds a path at most as long. Searches are limited, so a shortcut may be
+        added when it is not needed, which only makes queries slower.
+
+        Args:
+            graph (dict): The neighbors dictionary of each router not contracted yet.
+            router_id (int): The ID of the router to contract.
+
+        Returns:
+            list: The (router ID, router ID, cost) shortcuts.
+        """
+        neighbors = graph[router_id]
+        shortcuts = []
+        for source_id, source_cost in neighbors.items():
+            targets = {target_id: source_cost + target_cost for target_id, target_cost in neighbors.items() if target_id > source_id}
+            if not targets:
+                continue
+            limit = max(targets.values())
+            distances = {source_id: 0}
+            heap = [(0, source_id)]
+            settled = 0
+            while heap and settled < WITNESS_SETTLE_LIMIT:
+                distance, current_id = heapq.heappop(heap)
+                if distance > distances[current_id]:
+                    continue
+                if distance > limit:
+                    break
+                settled += 1
+                for neighbor_id, cost in graph[current_id].items():
+                    new_distance = distance + cost
+                    if neighbor_id != router_id and new_distance < distances.get(neighbor_id, INFINITY):
+                        distances[neighbor_id] = new_distance
+                        heapq.heappush(heap, (new_distance, neighbor_id))
+            shortcuts.extend((source_id, target_id, cost) for target_id, cost in targets.items()
+                             if distances.get(target_id, INFINITY) > cost)
+        return shortcuts
+
+    def _upward_search(self, router_id, limit=INFINITY):
+        """
+        Finds the distances from a router to the routers reached through upward links only.
+
+        Args:
+            router_id (int): The ID of the router.
+            limit (int): The distance beyond which routers are not searched.
+
+        Returns:
+            tuple: The distance of every router reached, and the router each one was reached from.
+        """
+        upward = self.upward
+        distances = {router_id: 0}
+        parents = {router_id: None}
+        heap = [(0, router_id)]
+        while heap:
+            distance, current_id = heapq.heappop(heap)
+            if distance > distances[current_id]:
+                continue
+            for neighbor_id, cost in upward[current_id].items():
+                new_distance = distance + cost
+                if new_distance <= limit and new_distance < distances.get(neighbor_id, INFINITY):
+                    distances[neighbor_id] = new_distance
+                    parents[neighbor_id] = current_id
+                    heapq.heappush(heap, (new_distance, neighbor_id))
+        return distances, parents
+
+    def _cached_search(self, router_id):
+        """
+        Finds the upward search of a router, reusing it if the router was queried recently.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            tuple: The distance of every router reached, and the router each one was reached from.
+        """
+        search = self.searches.pop(router_id, None)
+        if search is None:
+            search = self._upward_search(router_id)
+            if len(self.searches) >= SEARCH_CACHE_SIZE:
+                del self.searches[next(iter(self.searches))]
+        self.searches[router_id] = search
+        return search
+
+    def _meet(self, source_distances, destination_distances):
+        """
+        Finds the router where the upward searches of two routers meet on a shortest path between them.
+
+        Args:
+            source_distances (dict): The upward search of the source router.
+            destination_distances (dict): The upward search of the destination router.
+
+        Returns:
+            tuple: The distance between the two routers and the meeting router ID, (INFINITY, None) if they do not meet.
+        """
+        if len(destination_distances) < len(source_distances):
+            source_distances, destination_distances = destination_distances, source_distances
+        return min(((distance + destination_distances[router_id], router_id) for router_id, distance in source_distances.items()
+                    if router_id in destination_distances), default=(INFINITY, None))
+
+    def _unpack(self, router_id1, router_id2, path):
+        """
+        Appends the links of the topology an upward link stands for to a path.
+
+        Args:
+            router_id1 (int): The ID of the router the upward link starts from, already on the path.
+            router_id2 (int): The ID of the router the upward link ends at.
+            path (list): The path, updated in place.
+        """
+        middle_id = self.middles.get((min(router_id1, router_id2), max(router_id1, router_id2)))
+        if middle_id is None:
+            path.append(router_id2)
+        else:
+            self._unpack(router_id1, middle_id, path)
+            self._unpack(middle_id, router_id2, path)
+
+    def cost(self, source_id, destination_id):
+        """
+        Finds the cost of the shortest route between two routers.
+
+        Args:
+            source_id (int): The ID of the source router.
+            destination_id (int): The ID of the destination router.
+
+        Returns:
+            int: The cost, or INFINITY if the destination cannot be reached.
+        """
+        if source_id not in self.upward or destination_id not in self.upward:
+            return INFINITY
+        return self._meet(self._cached_search(source_id)[0], self._cached_search(destination_id)[0])[0]
+
+    def route(self, source_id, destination_id):
+        """
+        Finds the route between two routers, with the tie-break rule of LinkStateRouter.
+
+        The shortcuts of a shortest route are unpacked first, and the distances from the source of its routers
+        and their neighbors found. The route is then rebuilt from the destination, stepping back to the
+        smallest-ID neighbor on a shortest path from the source; the rare neighbors away from the unpacked
+        route are searched one at a time, each search stopping at the distance the neighbor needs.
+
+        Args:
+            source_id (int): The ID of the source router.
+            destination_id (int): The ID of the destination router.
+
+        Returns:
+            tuple: The list of router IDs on the path, from source to destination, and the total cost.
+                   (None, INFINITY) if the destination cannot be reached.
+        """
+        if source_id not in self.upward or destination_id not in self.upward:
+            return None, INFINITY
+        source_distances, source_parents = self._cached_search(source_id)
+        destination_distances, destination_parents = self._cached_search(destination_id)
+        total_cost, meeting_id = self._meet(source_distances, destination_distances)
+        if meeting_id is None:
+            return None, INFINITY
+
+        upward_path = [meeting_id]
+        while source_parents[upward_path[-1]] is not None:
+            upward_path.append(source_parents[upward_path[-1]])
+        upward_path.reverse()
+        while destination_parents[upward_path[-1]] is not None:
+            upward_path.append(destination_parents[upward_path[-1]])
+        unpacked = [source_id]
+        for router_id1, router_id2 in zip(upward_path, upward_path[1:]):
+            self._unpack(router_id1, router_id2, unpacked)
+
+        routers = set(unpacked)
+        for router_id in unpacked:
+            routers.update(self.neighbors[router_id])
+        distances = self._distances_to(source_distances, routers)
+
+        path = [destination_id]
+        current_id = destination_id
+        while current_id != source_id:
+            for neighbor_id in sorted(self.neighbors[current_id]):
+                needed = distances[current_id] - self.neighbors[current_id][neighbor_id]
+                if neighbor_id in distances:
+                    if distances[neighbor_id] == needed:
+                        break
+                elif self._reaches(source_distances, neighbor_id, needed):
+                    distances[neighbor_id] = needed
+                    break
+            current_id = neighbor_id
+            path.append(current_id)
+        path.reverse()
+        return path, total_cost
+
+    def _distances_to(self, source_distances, routers):
+        """
+        Finds the distances from the source to a set of routers, by a sweep down the hierarchy limited to the
+        routers the set can reach through upward links: in decreasing contraction order, the distance of a
+        router is the smallest of its upward search distance and the distances through its upward links.
+
+        Args:
+            source_distances (dict): The upward search of the source router.
+            routers (set): The IDs of the routers.
+
+        Returns:
+            dict: The distance from the source of every router swept, those of the set included.
+        """
+        swept = set(routers)
+        pending = list(routers)
+        while pending:
+            for neighbor_id in self.upward[pending.pop()]:
+                if neighbor_id not in swept:
+                    swept.add(neighbor_id)
+                    pending.append(neighbor_id)
+        distances = {}
+        for router_id in sorted(swept, key=self.rank.get, reverse=True):
+            distance = source_distances.get(router_id, INFINITY)
+            for neighbor_id, cost in self.upward[router_id].items():
+                if distances[neighbor_id] + cost < distance:
+                    distance = distances[neighbor_id] + cost
+            distances[router_id] = distance
+        return distances
+
+    def _reaches(self, source_distances, router_id, distance):
+        """
+        Checks whether a router is at a given distance from the source, knowing it is not any closer.
+
+        Args:
+            source_distances (dict): The upward search of the source router.
+            router_id (int): The ID of the router.
+            distance (int): The distance to check.
+
+        Returns:
+            bool: True if the router is at that distance from the source.
+        """
+        if distance < 0:
+            return False
+        router_distances = self._upward_search(router_id, distance)[0]
+        return any(reached_id in source_distances and source_distances[reached_id] + reached_distance <= distance
+                   for reached_id, reached_distance in router_distances.items())
+
+## @}
@@ -0,0 +1,155 @@
+from wire_format import encode_delta_lsp, encode_distance_vector, encode_dual_message, encode_lsp
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the ControlPlaneCounter Class, which measures the control plane bandwidth of a network.
+# A ControlPlaneCounter given to a network encodes every message its routers exchange with the wire formats
+# of wire_format.py, and counts the messages and their bytes for each change. With the full encoding, every
+# LSP holds all the adjacencies of its router and every distance vector all the routes advertised to the
+# neighbor. With the delta encoding, an LSP only holds the adjacencies changed since the previous LSP of its
+# router, and a distance vector only the routes changed since the previous vector sent to the same neighbor,
+# vectors without any change not being sent at all. DUAL messages are already incremental, and are the same
+# in both encodings.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+FULL = "full"
+DELTA = "delta"
+ENCODINGS = (FULL, DELTA)
+
+
+class ControlPlaneCounter:
+    """
+    Counts the messages of the routing protocol and their bytes, for each change.
+
+    Attributes:
+        encoding (str): FULL or DELTA.
+        change_index (int): The index of the change being applied, 0 while the initial topology converges.
+        counts (dict): For each change index, the [messages, bytes] counts of each kind of message.
+    """
+
+    def __init__(self, encoding=FULL):
+        """
+        Initializes a ControlPlaneCounter object.
+
+        Args:
+            encoding (str): FULL or DELTA.
+
+        Raises:
+            ValueError: If the encoding is unknown.
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"unknown encoding {encoding!r}, expected one of {', '.join(ENCODINGS)}")
+        self.encoding = encoding
+        self.change_index = 0
+        self.counts = {}
+        self._sent_vectors = {}
+
+    def count(self, kind, packet, copies=1):
+        """
+        Counts a packet sent one or more times.
+
+        Args:
+            kind (str): The kind of message.
+            packet (bytes): The encoded packet.
+            copies (int): The number of times the packet was sent.
+        """
+        counts = self.counts.setdefault(self.change_index, {}).setdefault(kind, [0, 0])
+        counts[0] += copies
+        counts[1] += copies * len(packet)
+
+    def count_lsp(self, lsp, previous_lsp, copies):
+        """
+        Counts an LSP flooded through the network.
+
+        Args:
+            lsp (dict): The LSP.
+            previous_lsp (dict): The previous LSP of the same router, or None if it is its first one.
+            copies (int): The number of links the LSP was sent over.
+        """
+        if self.encoding == DELTA and previous_lsp is not None:
+            self.count("lsp", encode_delta_lsp(lsp, previous_lsp), copies)
+        else:
+            self.count("lsp", encode_lsp(lsp), copies)
+
+    def count_distance_vector(self, sender_id, neighbor_id, entries):
+        """
+        Counts a distance vector sent to a neighbor. With the delta encoding, only the routes changed since
+        the previous vector sent to the neighbor are sent, routes no longer advertised being withdrawn.
+
+        Args:
+            sender_id (int): The ID of the advertising router.
+            neighbor_id (int): The ID of the neighbor.
+            entries (list): The (destination ID, cost) pairs of every route advertised to the neighbor.
+        """
+        if self.encoding == DELTA:
+            vector = dict(entries)
+            previous_vector = self._sent_vectors.get((sender_id, neighbor_id), {})
+            self._sent_vectors[sender_id, neighbor_id] = vector
+            entries = [(destination_id, cost) for destination_id, cost in vector.items() if previous_vector.get(destination_id) != cost]
+            entries.extend((destination_id, INFINITY) for destination_id, cost in previous_vector.items()
+                           if destination_id not in vector and cost != INFINITY)
+            if not entries:
+                return
+        self.count("distance vector", encode_distance_vector(sender_id, entries))
+
+    def count_triggered_update(self, sender_id, neighbor_id, destination_id, cost):
+        """
+        Counts a triggered update of a single route sent to a neighbor after a change.
+
+        Args:
+            sender_id (int): The ID of the advertising router.
+            neighbor_id (int): The ID of the neighbor.
+            destination_id (int): The ID of the destination.
+            cost (int): The cost of the route.
+        """
+        if self.encoding == DELTA:
+            self._sent_vectors.setdefault((sender_id, neighbor_id), {})[destination_id] = cost
+        self.count("distance vector", encode_distance_vector(sender_id, [(destination_id, cost)]))
+
+    def count_dual_message(self, kind, sender_id, destination_id, distance):
+        """
+        Counts a DUAL message.
+
+        Args:
+            kind (str): "update", "query" or "reply".
+            sender_id (int): The ID of the sending router.
+            destination_id (int): The ID of the destination.
+            distance (int): The distance carried by the message.
+        """
+        self.count("dual", encode_dual_message(kind, sender_id, destination_id, distance))
+
+    def totals(self):
+        """
+        Sums the counts of every change.
+
+        Returns:
+            dict: The [messages, bytes] counts of each kind of message.
+        """
+        totals = {}
+        for counts in self.counts.values():
+            for kind, (messages, size) in counts.items():
+                total = totals.setdefault(kind, [0, 0])
+                total[0] += messages
+                total[1] += size
+        return totals
+
+    def report(self):
+        """
+        Formats the counts of every change, then the totals of each kind of message.
+
+        Returns:
+            str: The report, one "change N: M messages B bytes" line per change.
+        """
+        report = f"control plane ({self.encoding} encoding):\n"
+        for change_index in sorted(self.counts):
+            counts = self.counts[change_index].values()
+            report += f"change {change_index}: {sum(count[0] for count in counts)} messages {sum(count[1] for count in counts)} bytes\n"
+        for kind, (messages, size) in sorted(self.totals().items()):
+            report += f"{kind}: {messages} messages {size} bytes\n"
+        return report
+
+## @}
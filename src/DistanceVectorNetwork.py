@@ -1,5 +1,9 @@
 from Network import Network
 from DistanceVectorRouter import DistanceVectorRouter 
+from DistanceVectorShards import DistanceVectorShards
+from input_parser import parse_changes_file
+from utilities import INFINITY
+from TopologyVersion import DISTANCE_VECTOR
 
 ## @file DistanceVectorNetwork.py
 ## @brief Implementation of the Distance Vector Network class for routing simulation.
@@ -25,10 +29,33 @@ class DistanceVectorNetwork(Network):
 
     Inherits from the Network class.
 
+    Attributes:
+        shards (DistanceVectorShards): The worker processes running the Distance Vector algorithm, or None to run it in this process.
     """
 
-    def __init__(self, topology_file, output_file):
-        super().__init__(topology_file, output_file)
+    tie_break = DISTANCE_VECTOR
+
+    def __init__(self, topology_file, output_file, output_routers=None, ecmp=False, trace=None, control_plane=None, shards=None):
+        """
+        Initializes a DistanceVectorNetwork object.
+
+        Args:
+            topology_file (str): The file path of the topology file.
+            output_file (str): The file path to write the output, an open writable object, or None to discard the output.
+            output_routers (iterable): The IDs of the routers whose routing tables are written, or None for all routers.
+            ecmp (bool): If True, routers keep every equal-cost next hop and messages are spread over them by flow.
+            trace (TraceRecorder): The recorder of every routing table update, or None.
+            control_plane (ControlPlaneCounter): The counter of the messages of the routers and their bytes, or None.
+            shards (int): The number of worker processes the routers are partitioned across, or None to run the
+                          Distance Vector algorithm in this process.
+
+        Raises:
+            ValueError: If there is not at least one shard, or the messages are counted with shards.
+        """
+        if shards is not None and control_plane is not None:
+            raise ValueError("the control plane cannot be counted with shards")
+        self.shards = None if shards is None else DistanceVectorShards(shards)
+        super().__init__(topology_file, output_file, output_routers, ecmp, trace, control_plane)
         self._dv_algorithm()
 
 
@@ -40,6 +67,8 @@ class DistanceVectorNetwork(Network):
             router_id (int): The ID of the router to add.
         """
         router = DistanceVectorRouter(router_id)
+        if self.ecmp:
+            router.enable_ecmp(self.next_hop_sets)
         self.routers[router.id] = router
 
 
@@ -56,43 +85,68 @@ class DistanceVectorNetwork(Network):
         """
         self.topology_output()
         self.send_messages(message_file)
-        with open(changes_file, 'r') as changes_file:
-            
-            for line in changes_file:
-                router_id1, router_id2, cost = line.split()
-                self.process_change(int(router_id1), int(router_id2), int(cost))
+        self.traffic_output()
+        for change in parse_changes_file(changes_file):
+            self.apply_topology_change(change)
+            self.topology_output()
+            self.send_messages(message_file)
+            self.traffic_output()
 
-                router_1 = self.get_router(int(router_id1))
-                router_2 = self.get_router(int(router_id2))
+    def apply_link_changes(self, link_changes):
+        """
+        Applies link changes to the network, then runs the Distance Vector Algorithm once until it converges again.
+        Only the routers of the components of the changed links take part; the others keep their routes.
+
+        Args:
+            link_changes (list): The (router1, router2, cost) link changes, cost -999 removing the link.
+        """
+        for router_id1, router_id2, cost in link_changes:
+            self.process_change(router_id1, router_id2, cost)
+
+        for router_id1, router_id2, cost in link_changes:
+            router_1 = self.get_router(router_id1)
+            router_2 = self.get_router(router_id2)
 
-                self._notify_neighbors(router_1, router_2)
-                self._notify_neighbors(router_2, router_1)
+            self._notify_neighbors(router_1, router_2)
+            self._notify_neighbors(router_2, router_1)
 
-                self._invalidate_expired_routes()
+        routers = self.routers_affected_by(link_changes)
+        self._invalidate_expired_routes(routers)
 
-                self._dv_algorithm()
-                self.topology_output()
-                self.send_messages(message_file)
+        self._dv_algorithm(routers)
 
-    def _dv_algorithm(self):
+    def _dv_algorithm(self, routers=None):
         """
         Distance Vector Algorithm implementation.
 
+        Args:
+            routers (list): The routers exchanging distance vectors, closed under neighbors, or None for all routers.
+
         Returns:
             None
         """
+        if routers is None:
+            routers = list(self.routers.values())
+
+        if self.shards is not None:
+            self._sharded_dv_algorithm(routers)
+            return
+
         # Initialize a flag to keep track of changes
         changes_made = True
+        control_plane = self.control_plane
         
         while changes_made:
             changes_made = False
 
             # Iterate over each router in the network
-            for router in self.routers.values():
+            for router in routers:
                 # Iterate over each neighbor of the router
                 for neighbor in router.neighbors.keys():
                     # Get the neighbor router object
                     neighbor_router = self.routers[neighbor]
+                    # The routes advertised to the neighbor, only kept to count the control plane bytes
+                    vector = [] if control_plane is not None else None
                     
                     # Iterate over each destination in the routing table of the router
                     for destination in router.routing_table.keys():
@@ -100,11 +154,88 @@ class DistanceVectorNetwork(Network):
                         destination_router = self.routers[destination]
                         if router.should_transmit_message(neighbor_router, destination_router):
                             next_hop_id, cost = router.routing_table[destination_router.id]
+                            if vector is not None:
+                                vector.append((destination, cost))
                             if  neighbor_router.should_accept_message( router, destination_router, cost):
                                 # Update the routing table of the neighbor
                                 neighbor_router.update_routing_table(destination_router, router, cost + router.neighbors[neighbor])
                                 changes_made = True
 
+                    if vector is not None:
+                        control_plane.count_distance_vector(router.id, neighbor, vector)
+
+        if self.ecmp:
+            self._update_equal_cost_next_hops(routers)
+
+    def _sharded_dv_algorithm(self, routers):
+        """
+        Distance Vector Algorithm run by the worker processes of the shards. The routing tables converge
+        to the same routes as in this process, and only the entries that changed are written back.
+
+        Args:
+            routers (list): The routers exchanging distance vectors, closed under neighbors.
+
+        Returns:
+            None
+        """
+        updates = self.shards.run(routers)
+        for router in routers:
+            entries = updates.get(router.id)
+            if entries is None:
+                continue
+            router.routing_table.update(entries)
+            if router.trace is not None:
+                for destination_id, (next_hop_id, cost) in entries.items():
+                    router.trace.record(router.id, destination_id, next_hop_id, cost)
+
+        if self.ecmp:
+            self._update_equal_cost_next_hops(routers)
+
+    def shard_report(self):
+        """
+        Formats the work of the shards.
+
+        Returns:
+            str: The report of the shards, or an empty string if the Distance Vector algorithm runs in this process.
+        """
+        if self.shards is None:
+            return ""
+        return self.shards.report()
+
+    def close(self):
+        """
+        Closes the output file and the trace file, and stops the worker processes of the shards.
+        """
+        super().close()
+        if getattr(self, 'shards', None) is not None:
+            self.shards.close()
+
+    def _update_equal_cost_next_hops(self, routers):
+        """
+        Finds every equal-cost next hop of each router once the distance vectors converged, for ECMP mode.
+        A neighbor is an equal-cost next hop if the distance it advertises to the router, plus the cost
+        of the link, equals the distance of the router. Its distance is then lower, so no loop can form.
+
+        Args:
+            routers (list): The routers whose distance vectors converged again.
+
+        Returns:
+            None
+        """
+        for router in routers:
+            router.equal_cost_next_hops = {}
+            for destination_id, (next_hop_id, cost) in router.routing_table.items():
+                if destination_id == router.id or cost == INFINITY:
+                    continue
+                destination_router = self.routers[destination_id]
+                next_hop_ids = {next_hop_id}
+                for neighbor, link_cost in router.neighbors.items():
+                    neighbor_router = self.routers[neighbor]
+                    if (neighbor_router.should_transmit_message(router, destination_router)
+                            and link_cost + neighbor_router.get_next_hop_cost(destination_id)[1] == cost):
+                        next_hop_ids.add(neighbor)
+                router.set_equal_cost_next_hops(destination_id, next_hop_ids)
+
     def _notify_neighbors(self, router, destination_router):
         """
         Notify the neighbors of a router about a change in the routing table.
@@ -121,23 +252,30 @@ class DistanceVectorNetwork(Network):
             neighbor_router = self.routers[neighbor]
             if router.should_transmit_message(neighbor_router, destination_router):
                 next_hop_id, cost = router.get_next_hop_cost(destination_router.id)
+                if self.control_plane is not None:
+                    self.control_plane.count_triggered_update(router.id, neighbor, destination_router.id, cost)
                 if  neighbor_router.should_accept_message( router, destination_router, cost):
                     # Update the routing table of the neighbor
                     neighbor_router.update_routing_table(destination_router, router, cost + router.neighbors[neighbor])
                     self._notify_neighbors(neighbor_router, destination_router)
 
-    def _invalidate_expired_routes(self):
+    def _invalidate_expired_routes(self, routers):
         """
-        Invalidate routes in the routing tables of all routers in the network.
+        Invalidate routes in the routing tables of the given routers.
         Except for the neighbors of the routers. 
         Way to simulate the timeout.
 
+        Args:
+            routers (list): The routers whose routes expire.
+
         Returns:
             None
         """
-        for router in self.routers.values():
+        for router in routers:
             for destination_id in router.routing_table.keys():
                 if destination_id not in router.neighbors.keys() and router.id != destination_id:
                     router.routing_table[destination_id] = (None, float('inf'))
+                    if router.trace is not None:
+                        router.trace.record(router.id, destination_id, None, INFINITY)
 
 ## @}
\ No newline at end of file
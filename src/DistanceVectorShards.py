@@ -0,0 +1,399 @@
+import multiprocessing
+import time
+import heapq
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the DistanceVectorShards Class, which runs the Distance Vector algorithm across worker processes.
+# The routers are partitioned into shards, grown breadth first and then refined so that as few links as
+# possible join two shards. Each shard is run by a worker process, which relaxes the routing tables of its
+# routers with the rules of DistanceVectorRouter until they stop changing, after applying the distance vectors
+# received from the routers of other shards. The shards then exchange the distance vectors their boundary
+# routers advertise over the links between shards, only sending the vectors that changed, and relax again,
+# until a round where no vector changed.
+#
+# The shards relax in a different order than the single process algorithm, so they cannot start from routes
+# that may have expired: a stale route advertised around a loop could count to infinity. Every routing table
+# is first reset to its own route and its links, other destinations being unreachable. From there, costs only
+# decrease, so a received route that is not accepted never will be, and the shards end at the fixed point the
+# single process algorithm converges to: the shortest routes, ties going to the lowest next hop. Only the
+# routing table entries that changed are sent back to the network.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup DVR
+## @{
+
+REFINEMENT_PASSES = 4
+IMBALANCE = 1.05
+
+
+def partition_routers(neighbors, shards):
+    """
+    Partitions routers into shards of about the same size, cutting few links.
+    Shards are first grown one after the other, from the unassigned router with the fewest neighbors, always
+    adding the router with the most links into the shard. Routers on the boundary of a shard are then moved
+    to the shard holding most of their neighbors, as long as it is not more than 5% above the average size.
+
+    Args:
+        neighbors (dict): The neighbors dictionary of each router ID, in the order of the network.
+        shards (int): The number of shards.
+
+    Returns:
+        dict: The shard index of each router ID.
+    """
+    router_ids = list(neighbors)
+    target = -(-len(router_ids) // shards)
+    assignment = {}
+    sizes = [0] * shards
+    seeds = iter(sorted(router_ids, key=lambda router_id: len(neighbors[router_id])))
+    for shard in range(shards):
+        links = {}
+        frontier = []
+        while sizes[shard] < target or shard == shards - 1:
+            while frontier and (frontier[0][2] in assignment or -frontier[0][0] != links[frontier[0][2]]):
+                heapq.heappop(frontier)
+            if frontier:
+                router_id = heapq.heappop(frontier)[2]
+            else:
+                router_id = next((seed_id for seed_id in seeds if seed_id not in assignment), None)
+                if router_id is None:
+                    break
+            assignment[router_id] = shard
+            sizes[shard] += 1
+            for neighbor_id in neighbors[router_id]:
+                if neighbor_id not in assignment:
+                    links[neighbor_id] = links.get(neighbor_id, 0) + 1
+                    heapq.heappush(frontier, (-links[neighbor_id], len(assignment), neighbor_id))
+
+    max_size = max(target, int(target * IMBALANCE))
+    for _ in range(REFINEMENT_PASSES):
+        moved = False
+        for router_id in router_ids:
+            shard = assignment[router_id]
+            links = [0] * shards
+            for neighbor_id in neighbors[router_id]:
+                links[assignment[neighbor_id]] += 1
+            best = max(range(shards), key=lambda candidate: (links[candidate], candidate == shard))
+            if links[best] > links[shard] and sizes[best] < max_size and sizes[shard] > 1:
+                assignment[router_id] = best
+                sizes[shard] -= 1
+                sizes[best] += 1
+                moved = True
+        if not moved:
+            break
+    return assignment
+
+
+class _ShardWorker:
+    """
+    The routing tables of the routers of one shard, relaxed in a worker process.
+
+    Attributes:
+        order (list): The IDs of the routers of the shard, in the order of the network.
+        neighbors (dict): The neighbors dictionary of each router of the shard.
+        tables (dict): The routing table of each router of the shard.
+        boundary (list): The (router ID, neighbor ID) links leaving the shard.
+        sent (dict): The last distance vector sent over each link leaving the shard.
+        updated (set): The (router ID, destination ID) routing table entries changed since the routers were loaded.
+    """
+
+    def __init__(self, routers):
+        """
+        Loads the routers of the shard, resetting their routing tables to their own route and their links.
+
+        Args:
+            routers (list): The (router ID, neighbors dictionary, routing table) of each router of the shard.
+        """
+        self.order = [router_id for router_id, neighbors, table in routers]
+        self.neighbors = {router_id: neighbors for router_id, neighbors, table in routers}
+        self.tables = {router_id: table for router_id, neighbors, table in routers}
+        self.boundary = [(router_id, neighbor_id) for router_id in self.order
+                         for neighbor_id in self.neighbors[router_id] if neighbor_id not in self.tables]
+        self.sent = {}
+        self.updated = set()
+        for router_id, table in self.tables.items():
+            neighbors = self.neighbors[router_id]
+            for destination_id, entry in table.items():
+                if destination_id == router_id:
+                    continue
+                reset_entry = (destination_id, neighbors[destination_id]) if destination_id in neighbors else (None, INFINITY)
+                if entry != reset_entry:
+                    table[destination_id] = reset_entry
+                    self.updated.add((router_id, destination_id))
+
+    def _accept(self, receiver_id, sender_id, destination_id, cost, link_cost):
+        """
+        Applies DistanceVectorRouter.should_accept_message and Router.update_routing_table to an advertised route.
+
+        Args:
+            receiver_id (int): The ID of the router receiving the route.
+            sender_id (int): The ID of the advertising router.
+            destination_id (int): The ID of the destination.
+            cost (int): The cost advertised by the sender.
+            link_cost (int): The cost of the link between the routers.
+
+        Returns:
+            bool: True if the route was accepted.
+        """
+        table = self.tables[receiver_id]
+        entry = table.get(destination_id)
+        new_cost = cost + link_cost
+        if (entry is None or new_cost < entry[1] or (new_cost == entry[1] and entry[0] and sender_id < entry[0])
+                or (entry[0] == sender_id and entry[1] < new_cost)):
+            table[destination_id] = (None, INFINITY) if cost == INFINITY else (sender_id, new_cost)
+            self.updated.add((receiver_id, destination_id))
+            return True
+        return False
+
+    def relax(self, received):
+        """
+        Relaxes the routing tables of the shard until they stop changing, then finds the distance vectors to send.
+
+        Args:
+            received (dict): The distance vectors received over links entering the shard since the previous round.
+
+        Returns:
+            tuple: The distance vectors that changed on the links leaving the shard, and the processor time spent relaxing in seconds.
+        """
+        start = time.process_time()
+        # Costs only decrease, so a route that is not accepted when it is received never will be
+        for (sender_id, receiver_id), vector in received.items():
+            link_cost = self.neighbors[receiver_id][sender_id]
+            for destination_id, cost in vector.items():
+                self._accept(receiver_id, sender_id, destination_id, cost, link_cost)
+        tables = self.tables
+        changes_made = True
+        while changes_made:
+            changes_made = False
+            for router_id in self.order:
+                table = tables[router_id]
+                for neighbor_id, link_cost in self.neighbors[router_id].items():
+                    if neighbor_id not in tables:
+                        continue
+                    for destination_id, (next_hop_id, cost) in table.items():
+                        if neighbor_id != destination_id and neighbor_id != next_hop_id:
+                            if self._accept(neighbor_id, router_id, destination_id, cost, link_cost):
+                                changes_made = True
+
+        vectors = {}
+        for router_id, neighbor_id in self.boundary:
+            vector = {destination_id: cost for destination_id, (next_hop_id, cost) in tables[router_id].items()
+                      if neighbor_id != destination_id and neighbor_id != next_hop_id}
+            if self.sent.get((router_id, neighbor_id)) != vector:
+                self.sent[router_id, neighbor_id] = vector
+                vectors[router_id, neighbor_id] = vector
+        return vectors, time.process_time() - start
+
+    def updates(self):
+        """
+        Collects the routing table entries changed since the routers were loaded.
+
+        Returns:
+            dict: The changed (next hop ID, cost) entries of each router ID.
+        """
+        updates = {}
+        for router_id, destination_id in self.updated:
+            updates.setdefault(router_id, {})[destination_id] = self.tables[router_id][destination_id]
+        return updates
+
+
+def _serve_shard(connection):
+    """
+    Runs the requests of the network in a worker process: "load" a shard, "relax" it, get its "updates" or "stop".
+
+    Args:
+        connection (Connection): The end of the pipe to the network.
+    """
+    worker = None
+    while True:
+        request, argument = connection.recv()
+        if request == "load":
+            worker = _ShardWorker(argument)
+        elif request == "relax":
+            connection.send(worker.relax(argument))
+        elif request == "updates":
+            connection.send(worker.updates())
+            worker = None
+        else:
+            connection.close()
+            return
+
+
+class DistanceVectorShards:
+    """
+    Runs the Distance Vector algorithm of a network across worker processes, one per shard of routers.
+
+    Attributes:
+        shards (int): The number of shards and worker processes.
+        assignment (dict): The shard index of each router ID.
+        cut_links (int): The number of links between two shards, the last time the algorithm was run.
+        links (int): The number of links, the last time the algorithm was run.
+        runs (int): The number of times the algorithm was run.
+        rounds (int): The number of rounds of distance vector exchanges between shards.
+        vectors (int): The number of distance vectors sent between shards.
+        busy_time (list): The processor time each worker process spent relaxing routing tables, in seconds.
+        wall_time (float): The time the network spent running the algorithm, in seconds.
+    """
+
+    def __init__(self, shards):
+        """
+        Initializes a DistanceVectorShards object. The worker processes are started when the algorithm is first run.
+
+        Args:
+            shards (int): The number of shards.
+
+        Raises:
+            ValueError: If there is not at least one shard.
+        """
+        if shards < 1:
+            raise ValueError(f"invalid number of shards {shards}: at least one is needed")
+        self.shards = shards
+        self.assignment = None
+        self.cut_links = 0
+        self.links = 0
+        self.runs = 0
+        self.rounds = 0
+        self.vectors = 0
+        self.busy_time = [0.0] * shards
+        self.wall_time = 0.0
+        self._processes = []
+        self._connections = []
+
+    def _start(self):
+        """
+        Starts one worker process per shard.
+        """
+        for _ in range(self.shards):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_serve_shard, args=(worker_connection,), daemon=True)
+            process.start()
+            worker_connection.close()
+            self._processes.append(process)
+            self._connections.append(connection)
+
+    def _assign(self, routers):
+        """
+        Partitions the routers the first time, then puts each new router in the shard of most of its neighbors.
+
+        Args:
+            routers (list): The routers exchanging distance vectors.
+        """
+        if self.assignment is None:
+            self.assignment = partition_routers({router.id: router.neighbors for router in routers}, self.shards)
+            return
+        sizes = [0] * self.shards
+        for shard in self.assignment.values():
+            sizes[shard] += 1
+        for router in routers:
+            if router.id not in self.assignment:
+                links = [0] * self.shards
+                for neighbor_id in router.neighbors:
+                    if neighbor_id in self.assignment:
+                        links[self.assignment[neighbor_id]] += 1
+                shard = max(range(self.shards), key=lambda candidate: (links[candidate], -sizes[candidate]))
+                self.assignment[router.id] = shard
+                sizes[shard] += 1
+
+    def run(self, routers):
+        """
+        Runs the Distance Vector algorithm until the routing tables of the routers converge.
+
+        Args:
+            routers (list): The routers exchanging distance vectors, closed under neighbors.
+
+        Returns:
+            dict: The changed (next hop ID, cost) entries of the routing table of each router ID.
+        """
+        start = time.perf_counter()
+        if not self._processes:
+            self._start()
+        self._assign(routers)
+        assignment = self.assignment
+        shard_routers = [[] for _ in range(self.shards)]
+        self.links = self.cut_links = 0
+        for router in routers:
+            shard_routers[assignment[router.id]].append((router.id, router.neighbors, router.routing_table))
+            for neighbor_id in router.neighbors:
+                if router.id < neighbor_id:
+                    self.links += 1
+                    self.cut_links += assignment[router.id] != assignment[neighbor_id]
+        for connection, shard in zip(self._connections, shard_routers):
+            connection.send(("load", shard))
+
+        received = [{} for _ in range(self.shards)]
+        while True:
+            for connection, vectors in zip(self._connections, received):
+                connection.send(("relax", vectors))
+            received = [{} for _ in range(self.shards)]
+            self.rounds += 1
+            sent = 0
+            for shard, connection in enumerate(self._connections):
+                vectors, busy_time = connection.recv()
+                self.busy_time[shard] += busy_time
+                for (router_id, neighbor_id), vector in vectors.items():
+                    received[assignment[neighbor_id]][router_id, neighbor_id] = vector
+                sent += len(vectors)
+            self.vectors += sent
+            if not sent:
+                break
+
+        updates = {}
+        for connection in self._connections:
+            connection.send(("updates", None))
+        for connection in self._connections:
+            updates.update(connection.recv())
+        self.runs += 1
+        self.wall_time += time.perf_counter() - start
+        return updates
+
+    def report(self):
+        """
+        Summarizes the work of the shards. The parallel efficiency is the share of the wall time the worker
+        processes spent relaxing routing tables, the rest being spent exchanging state and waiting for each other.
+
+        Returns:
+            str: The number of shards, cut links, rounds and distance vectors exchanged, the time of each
+                 worker process, the wall time and the parallel efficiency.
+        """
+        efficiency = sum(self.busy_time) / (self.shards * self.wall_time) if self.wall_time else 0.0
+        report = (f"shards: {self.shards}\n"
+                  f"links between shards: {self.cut_links} of {self.links}\n"
+                  f"rounds: {self.rounds} in {self.runs} runs\n"
+                  f"distance vectors exchanged between shards: {self.vectors}\n")
+        for shard, busy_time in enumerate(self.busy_time):
+            routers = sum(assigned == shard for assigned in (self.assignment or {}).values())
+            report += f"shard {shard}: {routers} routers {busy_time:.3f} s relaxing\n"
+        report += (f"wall time: {self.wall_time:.3f} s\n"
+                   f"parallel efficiency: {efficiency:.1%}\n")
+        return report
+
+    def close(self):
+        """
+        Stops the worker processes. They are started again if the algorithm is run again.
+        """
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send(("stop", None))
+                connection.close()
+            except OSError:
+                pass
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+
+    def __getstate__(self):
+        """
+        Saves the shards without their worker processes, which are started again when the algorithm is next run.
+
+        Returns:
+            dict: The attributes of the shards.
+        """
+        state = self.__dict__.copy()
+        state['_processes'] = []
+        state['_connections'] = []
+        return state
+
+## @}
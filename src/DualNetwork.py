@@ -0,0 +1,159 @@
+from collections import deque
+from Network import Network
+from DualRouter import DualRouter
+from input_parser import parse_changes_file
+from TopologyVersion import DISTANCE_VECTOR
+
+## @file
+## @brief Implementation of the DualNetwork Class.
+# This module defines the DualNetwork class, which extends the Network base class to simulate a network of
+# DualRouter objects running the Diffusing Update Algorithm (DUAL) used by EIGRP. Routers exchange updates,
+# queries and replies through a shared message queue, which the network delivers in order until no message
+# is left. Topology changes are only signalled to the two routers of the changed link: when they have a
+# feasible successor the change is handled locally, otherwise diffusing computations spread only as far as
+# the routes that depended on the link. The network counts how many changes were handled each way.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup DUAL
+## @{
+class DualNetwork(Network):
+    """
+    Represents a network using the Diffusing Update Algorithm.
+
+    Inherits from the Network class.
+
+    Attributes:
+        message_queue (deque): The messages in transit between routers.
+        messages_delivered (int): The total number of messages delivered.
+        local_changes (int): The number of changes handled without any diffusing computation.
+        diffused_changes (int): The number of changes that needed at least one diffusing computation.
+    """
+
+    tie_break = DISTANCE_VECTOR
+
+    def __init__(self, topology_file, output_file, output_routers=None, trace=None, control_plane=None):
+        """
+        Initializes a DualNetwork object and lets the routers converge.
+
+        Args:
+            topology_file (str): The file path of the topology file.
+            output_file (str): The file path to write the output, an open writable object, or None to discard the output.
+            output_routers (iterable): The IDs of the routers whose routing tables are written, or None for all routers.
+            trace (TraceRecorder): The recorder of every routing table update, or None.
+            control_plane (ControlPlaneCounter): The counter of the messages of the routers and their bytes, or None.
+        """
+        self.message_queue = deque()
+        self.messages_delivered = 0
+        self.local_changes = 0
+        self.diffused_changes = 0
+        super().__init__(topology_file, output_file, output_routers, trace=trace, control_plane=control_plane)
+        for router in self.routers.values():
+            for neighbor_id in router.neighbors:
+                router.advertise_all(neighbor_id)
+        self._deliver_messages()
+
+    def _add_router(self, router_id):
+        """
+        Adds a router to the network.
+
+        Args:
+            router_id (int): The ID of the router to add.
+        """
+        router = DualRouter(router_id, self.routers, self.message_queue)
+        self.routers[router.id] = router
+
+    def _deliver_messages(self):
+        """
+        Delivers the messages in transit, in order, until the network is quiet.
+        """
+        while self.message_queue:
+            kind, sender_id, receiver_id, destination_id, distance = self.message_queue.popleft()
+            self.messages_delivered += 1
+            self.routers[receiver_id].receive(kind, sender_id, destination_id, distance)
+
+    def add_link(self, router_id1, router_id2, cost):
+        """
+        Adds a link, or changes its cost, and signals it to the routers at both ends.
+
+        Args:
+            router_id1 (int): The ID of the first router.
+            router_id2 (int): The ID of the second router.
+            cost (int): The cost of the link.
+        """
+        new_link = router_id1 not in self.routers or router_id2 not in self.routers[router_id1].neighbors
+        super().add_link(router_id1, router_id2, cost)
+        self.routers[router_id1].link_up(router_id2, new_link)
+        self.routers[router_id2].link_up(router_id1, new_link)
+
+    def remove_link(self, router1, router2):
+        """
+        Removes a link and signals it to the routers at both ends.
+
+        Args:
+            router1 (Router): The first router.
+            router2 (Router): The second router.
+        """
+        if router2.id in router1.neighbors:
+            router1.link_down(router2.id)
+            router2.link_down(router1.id)
+
+    def diffusing_computations(self):
+        """
+        Counts the diffusing computations started in the network.
+
+        Returns:
+            int: The total number of diffusing computations of all routers.
+        """
+        return sum(router.diffusing_computations for router in self.routers.values())
+
+    def apply_changes_and_output(self, changes_file, message_file):
+        """
+        Applies changes to the network and outputs the topology and messages after each of them.
+
+        Args:
+            changes_file (str): The file path of the changes file.
+            message_file (str): The file path of the messages file.
+        """
+        self.topology_output()
+        self.send_messages(message_file)
+        self.traffic_output()
+
+        for change in parse_changes_file(changes_file):
+            self.apply_topology_change(change)
+
+            self.topology_output()
+            self.send_messages(message_file)
+            self.traffic_output()
+
+    def apply_link_changes(self, link_changes):
+        """
+        Applies link changes to the network one at a time, delivering the DUAL messages until every router
+        is passive again after each of them, so that diffusing computations never overlap.
+
+        Args:
+            link_changes (list): The (router1, router2, cost) link changes, cost -999 removing the link.
+        """
+        for router_id1, router_id2, cost in link_changes:
+            diffusing_computations = self.diffusing_computations()
+            self.process_change(router_id1, router_id2, cost)
+            self._deliver_messages()
+
+            if self.diffusing_computations() == diffusing_computations:
+                self.local_changes += 1
+            else:
+                self.diffused_changes += 1
+
+    def convergence_report(self):
+        """
+        Summarizes how the changes were handled.
+
+        Returns:
+            str: The number of changes handled locally and by diffusing computations, and the messages delivered.
+        """
+        return (f"changes handled locally: {self.local_changes}\n"
+                f"changes diffused: {self.diffused_changes}\n"
+                f"diffusing computations: {self.diffusing_computations()}\n"
+                f"messages delivered: {self.messages_delivered}\n")
+
+## @}
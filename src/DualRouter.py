@@ -0,0 +1,301 @@
+from Router import Router
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the DualRouter Class.
+# This file defines the DualRouter class, which extends the Router base class with the Diffusing Update
+# Algorithm (DUAL) used by EIGRP. For every destination the router keeps the distance reported by each
+# neighbor and a feasible distance, the lowest distance it had since the destination last became passive.
+# A neighbor whose reported distance is below the feasible distance is a feasible successor: its path
+# cannot loop back through the router, so the router can switch to it locally. When the best neighbor is
+# not feasible, the router goes active for the destination and runs a diffusing computation, querying its
+# neighbors and waiting for all their replies before choosing a new successor.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup DUAL
+## @{
+
+UPDATE = "update"
+QUERY = "query"
+REPLY = "reply"
+
+
+class DualRouter(Router):
+    """
+    This class represents a router running the Diffusing Update Algorithm.
+
+    Inherits from the Router class. Routing table entries hold the successor and the distance to each destination.
+
+    Attributes:
+        topology_table (dict): For each destination ID, a dictionary of the distances reported by each neighbor.
+        feasible_distance (dict): The feasible distance of each destination ID.
+        active (dict): For each destination the router is active for, the set of neighbors that did not reply yet.
+        query_origin (dict): For each active destination, the ID of the successor whose query started the computation.
+        network_routers (dict): A dictionary representing the network routers, used to reach other router objects.
+        message_queue (deque): The queue of messages in transit, shared by all routers of the network.
+        local_computations (int): The number of times the router changed route without a diffusing computation.
+        diffusing_computations (int): The number of diffusing computations started by the router.
+    """
+
+    def __init__(self, id, network_routers, message_queue):
+        """
+        Initializes a DualRouter object.
+
+        Args:
+            id (int): The ID of the router.
+            network_routers (dict): A dictionary representing the network routers, where the keys are the router IDs and the values are the router objects.
+            message_queue (deque): The queue of messages in transit, shared by all routers of the network.
+        """
+        super().__init__(id)
+        self.topology_table = {}
+        self.feasible_distance = {id: 0}
+        self.active = {}
+        self.query_origin = {}
+        self.network_routers = network_routers
+        self.message_queue = message_queue
+        self.local_computations = 0
+        self.diffusing_computations = 0
+
+    def add_neighbor(self, neighbor, cost):
+        """
+        Adds a neighbor to the router. Routes through the neighbor are only learned from its updates.
+
+        Parameters:
+        - neighbor (Router): The neighbor router object.
+        - cost (int): The cost to reach the neighbor.
+        """
+        self.neighbors[neighbor.id] = cost
+
+    def add_neighbors(self, neighbors):
+        """
+        Adds several neighbors to the router at once.
+
+        Parameters:
+        - neighbors (dict): A dictionary mapping neighbor router IDs to the cost to reach them.
+        """
+        self.neighbors.update(neighbors)
+
+    def get_distance(self, destination_id):
+        """
+        Retrieves the current distance to a destination.
+
+        Args:
+            destination_id (int): The destination router ID.
+
+        Returns:
+            int: The distance, or INFINITY if the destination is unreachable.
+        """
+        return self.get_next_hop_cost(destination_id)[1]
+
+    def _best_route(self, destination_id):
+        """
+        Finds the neighbor offering the lowest distance to a destination, breaking ties by lowest ID.
+
+        Args:
+            destination_id (int): The destination router ID.
+
+        Returns:
+            tuple: The distance and the neighbor ID, or (INFINITY, None) if no neighbor reaches the destination.
+        """
+        reported_distances = self.topology_table.get(destination_id, {})
+        best = (INFINITY, None)
+        for neighbor_id, cost in self.neighbors.items():
+            distance = cost + reported_distances.get(neighbor_id, INFINITY)
+            if distance < best[0] or (distance == best[0] and distance != INFINITY and neighbor_id < best[1]):
+                best = (distance, neighbor_id)
+        return best
+
+    def _set_route(self, destination_id, successor_id, distance):
+        """
+        Sets the successor and distance of a destination in the routing table.
+
+        Args:
+            destination_id (int): The destination router ID.
+            successor_id (int): The successor router ID, ignored if the distance is INFINITY.
+            distance (int): The distance to the destination.
+        """
+        destination = self.network_routers[destination_id]
+        successor = self.network_routers[successor_id] if distance != INFINITY else None
+        self.update_routing_table(destination, successor, distance)
+
+    def _send(self, kind, neighbor_id, destination_id):
+        """
+        Sends a message carrying the current distance to a destination to a neighbor.
+
+        Args:
+            kind (str): UPDATE, QUERY or REPLY.
+            neighbor_id (int): The ID of the receiving neighbor.
+            destination_id (int): The destination router ID.
+        """
+        distance = self.get_distance(destination_id)
+        self.message_queue.append((kind, self.id, neighbor_id, destination_id, distance))
+        if self.control_plane is not None:
+            self.control_plane.count_dual_message(kind, self.id, destination_id, distance)
+
+    def _send_to_neighbors(self, kind, destination_id, excluded_id=None):
+        """
+        Sends a message carrying the current distance to a destination to all neighbors.
+
+        Args:
+            kind (str): UPDATE or QUERY.
+            destination_id (int): The destination router ID.
+            excluded_id (int): The ID of a neighbor that should not receive the message.
+        """
+        for neighbor_id in self.neighbors:
+            if neighbor_id != excluded_id:
+                self._send(kind, neighbor_id, destination_id)
+
+    def advertise_all(self, neighbor_id):
+        """
+        Sends the distance to every known destination to a neighbor, used when a link comes up.
+
+        Args:
+            neighbor_id (int): The ID of the new neighbor.
+        """
+        for destination_id, (next_hop, distance) in self.routing_table.items():
+            if distance != INFINITY:
+                self._send(UPDATE, neighbor_id, destination_id)
+
+    def local_computation(self, destination_id):
+        """
+        Reacts to a change of the distances to a destination while passive.
+
+        If the best neighbor satisfies the feasibility condition (its reported distance is lower than the
+        feasible distance), it becomes the successor right away. Otherwise a diffusing computation starts.
+
+        Args:
+            destination_id (int): The destination router ID.
+        """
+        if destination_id == self.id or destination_id in self.active:
+            return
+        best_distance, best_id = self._best_route(destination_id)
+        successor_id, distance = self.get_next_hop_cost(destination_id)
+        if (best_distance, best_id) == (distance, successor_id) or best_distance == distance == INFINITY:
+            return
+
+        feasible_distance = self.feasible_distance.get(destination_id, INFINITY)
+        if best_id is not None and self.topology_table[destination_id][best_id] < feasible_distance:
+            self._set_route(destination_id, best_id, best_distance)
+            self.feasible_distance[destination_id] = min(feasible_distance, best_distance)
+            self.local_computations += 1
+            if best_distance != distance:
+                self._send_to_neighbors(UPDATE, destination_id)
+        else:
+            self._go_active(destination_id)
+
+    def _go_active(self, destination_id):
+        """
+        Starts a diffusing computation for a destination by querying all neighbors.
+        Until every neighbor replied, the router advertises the destination as unreachable, so no
+        neighbor can keep a route through it that is based on its old distance.
+
+        Args:
+            destination_id (int): The destination router ID.
+        """
+        self._set_route(destination_id, None, INFINITY)
+        self.diffusing_computations += 1
+        self.active[destination_id] = set(self.neighbors)
+        if not self.neighbors:
+            self._finish_active(destination_id)
+            return
+        self._send_to_neighbors(QUERY, destination_id)
+
+    def _finish_active(self, destination_id):
+        """
+        Ends a diffusing computation once all replies arrived: chooses the best neighbor,
+        resets the feasible distance, replies to the query origin and updates the other neighbors.
+
+        Args:
+            destination_id (int): The destination router ID.
+        """
+        del self.active[destination_id]
+        active_distance = self.get_distance(destination_id)
+        best_distance, best_id = self._best_route(destination_id)
+        self._set_route(destination_id, best_id, best_distance)
+        self.feasible_distance[destination_id] = best_distance
+
+        origin_id = self.query_origin.pop(destination_id, None)
+        if origin_id in self.neighbors:
+            self._send(REPLY, origin_id, destination_id)
+        if best_distance != active_distance:
+            self._send_to_neighbors(UPDATE, destination_id, origin_id)
+
+    def receive(self, kind, sender_id, destination_id, distance):
+        """
+        Processes a message from a neighbor.
+
+        Args:
+            kind (str): UPDATE, QUERY or REPLY.
+            sender_id (int): The ID of the neighbor that sent the message.
+            destination_id (int): The destination router ID.
+            distance (int): The distance from the sender to the destination.
+        """
+        if sender_id not in self.neighbors:
+            return
+        if destination_id == self.id:
+            if kind == QUERY:
+                self._send(REPLY, sender_id, destination_id)
+            return
+
+        self.topology_table.setdefault(destination_id, {})[sender_id] = distance
+
+        if destination_id in self.active:
+            if kind == REPLY:
+                self._reply_received(destination_id, sender_id)
+            elif kind == QUERY:
+                self._send(REPLY, sender_id, destination_id)
+            return
+
+        successor_id = self.get_next_hop_cost(destination_id)[0]
+        self.local_computation(destination_id)
+        if kind == QUERY:
+            if destination_id in self.active and sender_id == successor_id:
+                self.query_origin[destination_id] = sender_id
+            else:
+                self._send(REPLY, sender_id, destination_id)
+
+    def _reply_received(self, destination_id, neighbor_id):
+        """
+        Records a reply, or the loss of a neighbor, for an active destination.
+
+        Args:
+            destination_id (int): The destination router ID.
+            neighbor_id (int): The ID of the neighbor.
+        """
+        pending = self.active[destination_id]
+        pending.discard(neighbor_id)
+        if not pending:
+            self._finish_active(destination_id)
+
+    def link_up(self, neighbor_id, new_link):
+        """
+        Handles a new link or a cost change to a neighbor.
+
+        Args:
+            neighbor_id (int): The ID of the neighbor.
+            new_link (bool): True if the link did not exist before.
+        """
+        if new_link:
+            self.advertise_all(neighbor_id)
+        for destination_id in list(self.topology_table):
+            self.local_computation(destination_id)
+
+    def link_down(self, neighbor_id):
+        """
+        Handles the removal of the link to a neighbor.
+
+        Args:
+            neighbor_id (int): The ID of the former neighbor.
+        """
+        self.neighbors.pop(neighbor_id, None)
+        for destination_id, reported_distances in self.topology_table.items():
+            reported_distances.pop(neighbor_id, None)
+            if self.query_origin.get(destination_id) == neighbor_id:
+                del self.query_origin[destination_id]
+        for destination_id in list(self.active):
+            self._reply_received(destination_id, neighbor_id)
+        for destination_id in list(self.topology_table):
+            self.local_computation(destination_id)
+
+## @}
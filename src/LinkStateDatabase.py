@@ -0,0 +1,174 @@
+import weakref
+from types import MappingProxyType
+
+## @file
+## @brief Implementation of the LinkStateDatabase Class.
+# This file defines the LinkStateDatabase class, a link state database shared by the routers of a network.
+# Routers that received the same Link State Packets (LSPs) point to the same database object instead of each
+# keeping a copy of the whole network topology. When a router accepts a new LSP, it updates the database in
+# place if no other router uses it, and otherwise moves to a copy that includes the LSP. The copy is remembered,
+# so the other routers that accept the same LSP while it is being flooded move to the same copy. Databases
+# therefore only diverge while an LSP has not reached every router yet, or between parts of the network that
+# are disconnected from each other, and databases that become identical again are merged. LSPs are
+# immutable snapshots, created with make_lsp.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup LSR
+## @{
+
+
+def make_lsp(id, sequence, neighbors, **fields):
+    """
+    Creates an immutable Link State Packet (LSP).
+
+    Args:
+        id (int): The ID of the router originating the LSP.
+        sequence (int): The sequence number of the LSP.
+        neighbors (dict): The neighbors of the router, mapping their IDs to the cost to reach them. The LSP keeps a copy.
+        **fields: Additional fields of the LSP.
+
+    Returns:
+        MappingProxyType: A read-only LSP with the 'id', 'sequence' and 'neighbors' keys and the additional fields.
+    """
+    return MappingProxyType({'id': id, 'sequence': sequence, 'neighbors': MappingProxyType(dict(neighbors)), **fields})
+
+
+class LinkStateDatabase:
+    """
+    A versioned link state database that can be shared by several routers.
+
+    Attributes:
+        lsps (dict): The last LSP accepted from each router ID.
+        topology (dict): The neighbors advertised by each router ID, as in its last LSP.
+        weights (dict): The number of advertised links with each cost, so the shortest path kernel is chosen without reading the topology.
+        version (int): Incremented every time the database is updated in place.
+        holders (int): The number of routers (or networks) currently pointing to the database.
+        fingerprint (int): A hash of the IDs and sequence numbers of the LSPs, used to find identical databases.
+    """
+
+    def __init__(self, registry=None):
+        """
+        Initializes an empty LinkStateDatabase object.
+
+        Args:
+            registry (WeakValueDictionary): The databases of the network indexed by fingerprint. A new one is created if None.
+        """
+        self.lsps = {}
+        self.topology = {}
+        self.weights = {}
+        self.version = 0
+        self.holders = 0
+        self.fingerprint = 0
+        self._successor = None
+        self._registry = weakref.WeakValueDictionary() if registry is None else registry
+
+    def acquire(self):
+        """
+        Registers a new holder of the database.
+
+        Returns:
+            LinkStateDatabase: The database itself.
+        """
+        self.holders += 1
+        return self
+
+    def sequence_number(self, router_id):
+        """
+        Retrieves the sequence number of the last LSP accepted from a router.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            int: The sequence number, or None if no LSP from the router was accepted.
+        """
+        lsp = self.lsps.get(router_id)
+        return None if lsp is None else lsp['sequence']
+
+    def is_newer(self, lsp):
+        """
+        Checks whether an LSP is newer than the one the database holds for its router.
+
+        Args:
+            lsp (MappingProxyType): The LSP.
+
+        Returns:
+            bool: True if the LSP should be accepted.
+        """
+        sequence_number = self.sequence_number(lsp['id'])
+        return sequence_number is None or lsp['sequence'] > sequence_number
+
+    def _record(self, lsp):
+        """
+        Stores an LSP, replacing the previous LSP of its router, and updates the fingerprint and the link costs.
+
+        Args:
+            lsp (MappingProxyType): The LSP.
+        """
+        previous = self.lsps.get(lsp['id'])
+        if previous is not None:
+            self.fingerprint ^= hash((previous['id'], previous['sequence']))
+            for cost in previous['neighbors'].values():
+                self.weights[cost] -= 1
+                if not self.weights[cost]:
+                    del self.weights[cost]
+        for cost in lsp['neighbors'].values():
+            self.weights[cost] = self.weights.get(cost, 0) + 1
+        self.fingerprint ^= hash((lsp['id'], lsp['sequence']))
+        self.lsps[lsp['id']] = lsp
+        self.topology[lsp['id']] = lsp['neighbors']
+
+    def _canonical(self):
+        """
+        Finds a database holding exactly the same LSPs, so that databases that diverged while an LSP was
+        being flooded, or while the network was split, are merged again once they are identical.
+
+        Returns:
+            LinkStateDatabase: The identical database, or the database itself if there is none.
+        """
+        other = self._registry.get(self.fingerprint)
+        if other is None or other is self:
+            self._registry[self.fingerprint] = self
+            return self
+        if other.lsps.keys() == self.lsps.keys() and all(other.lsps[router_id] is lsp for router_id, lsp in self.lsps.items()):
+            return other
+        return self
+
+    def accept(self, lsp):
+        """
+        Records an LSP for one of the holders of the database.
+
+        Holders accepting the same LSP all move to the same copy of the database including it. The first
+        of them creates the copy, unless it is the only holder, in which case the database is updated in place.
+
+        Args:
+            lsp (MappingProxyType): The LSP.
+
+        Returns:
+            LinkStateDatabase: The database the caller should now point to.
+        """
+        successor = self._successor
+        if successor is not None and successor[0] is lsp and successor[1].version == successor[2]:
+            self.holders -= 1
+            return successor[1].acquire()
+
+        if self.holders == 1:
+            if self._registry.get(self.fingerprint) is self:
+                del self._registry[self.fingerprint]
+            self._record(lsp)
+            self.version += 1
+            database = self._canonical()
+        else:
+            database = LinkStateDatabase(self._registry)
+            database.lsps = self.lsps.copy()
+            database.topology = self.topology.copy()
+            database.weights = self.weights.copy()
+            database.fingerprint = self.fingerprint
+            database._record(lsp)
+            database = database._canonical()
+            self._successor = (lsp, database, database.version)
+        self.holders -= 1
+        return database.acquire()
+
+## @}
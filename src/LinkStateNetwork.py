@@ -1,5 +1,12 @@
 from Network import Network
 from LinkStateRouter import LinkStateRouter 
+from LinkStateDatabase import LinkStateDatabase
+from ShortestPathTreeIndex import ShortestPathTreeIndex
+from SpfThrottle import SpfThrottle
+from utilities import INFINITY
+from input_parser import parse_changes_file
+from itertools import chain
+import heapq
 ## @file
 ## @brief Implementation of the LinkStateNetwork Class.
 # This module defines the LinkStateNetwork class, which extends the Network base class to simulate 
@@ -21,21 +28,44 @@ class LinkStateNetwork(Network):
     Represents a network using the Link State routing algorithm.
 
     Inherits from the Network class.
+
+    Attributes:
+        lazy (bool): If True, routing tables are only computed when they are read.
+        lsdb (LinkStateDatabase): The empty link state database every new router starts from.
+        spt_index (ShortestPathTreeIndex): The links used by the shortest path tree of each router.
+        skipped_recomputations (int): The number of routing tables left as they were after a change, because it could not alter them.
+        spf_throttle (tuple): The (initial delay, hold time, maximum hold time) of the SPF throttle of every router, or None.
+        change_interval (int): The time between two changes in a timed simulation, or None if every change waits for the
+                               SPF runs of the previous one.
+        clock (int): The simulated time, in milliseconds.
     """
 
-    def __init__(self, topology_file, output_file):
+    def __init__(self, topology_file, output_file, output_routers=None, lazy=False, ecmp=False, trace=None, control_plane=None):
         """
         Initializes a LinkStateNetwork object.
 
         Args:
             topology_file (str): The file path of the topology file.
-            output_file (str): The file path to write the output.
+            output_file (str): The file path to write the output, an open writable object, or None to discard the output.
+            output_routers (iterable): The IDs of the routers whose routing tables are written, or None for all routers.
+                                       Limiting the output also turns on lazy routing tables.
+            lazy (bool): If True, routing tables are only computed when they are read.
+            ecmp (bool): If True, routers keep every equal-cost next hop and messages are spread over them by flow.
+            trace (TraceRecorder): The recorder of every routing table update, or None.
+            control_plane (ControlPlaneCounter): The counter of the messages of the routers and their bytes, or None.
         """
-        super().__init__(topology_file, output_file)
+        self.lazy = lazy or output_routers is not None
+        self.lsdb = LinkStateDatabase().acquire()
+        self.spt_index = ShortestPathTreeIndex()
+        self.skipped_recomputations = 0
+        self.spf_throttle = None
+        self.change_interval = None
+        self.clock = 0
+        self._next_change_time = 0
+        self._scheduled_spfs = []
+        super().__init__(topology_file, output_file, output_routers, ecmp, trace, control_plane)
         self.distribute_all_lsp()
-
-        for router in self.routers.values():
-            router.update_routing_table_dijkstra()
+        self.update_routing_tables()
 
     def _add_router(self, router_id):
         """
@@ -44,14 +74,137 @@ class LinkStateNetwork(Network):
         Args:
             router_id (int): The ID of the router to add.
         """
-        router = LinkStateRouter(router_id, self.routers)
+        router = LinkStateRouter(router_id, self.routers, self.lsdb, self.spt_index)
+        if self.ecmp:
+            router.enable_ecmp(self.next_hop_sets)
+        if self.spf_throttle is not None:
+            router.spf_throttle = SpfThrottle(*self.spf_throttle)
         self.routers[router.id] = router
 
-    def distribute_all_lsp(self):
+    def enable_spf_throttle(self, initial_delay, hold_time, max_hold, change_interval=None):
         """
-        Distributes the Link State Packets (LSP) from all routers in the network.
+        Throttles the SPF runs of every router after the initial convergence, with exponential backoff.
+        The SPF requests of a router made while one of its SPF runs is pending are coalesced into it.
+        Without a change interval, every change waits for the SPF runs of the previous one, so the routing
+        tables are always up to date when written. With one, changes arrive every change_interval milliseconds,
+        and SPF runs scheduled after the next change are still pending when the routing tables are written.
+
+        Args:
+            initial_delay (int): The delay between the first SPF request after a quiet period and the SPF run, in milliseconds.
+            hold_time (int): The initial minimum time between two SPF runs of a router, in milliseconds.
+            max_hold (int): The maximum time between two SPF runs of a router, reached by doubling the hold time.
+            change_interval (int): The time between two changes, or None.
+
+        Raises:
+            ValueError: In lazy mode, if a time is negative, if the maximum hold time is shorter than the hold time,
+                        or if the change interval is not positive.
         """
+        if self.lazy:
+            raise ValueError("SPF throttling cannot be used with lazy routing tables")
+        if change_interval is not None and change_interval <= 0:
+            raise ValueError(f"invalid change interval {change_interval}: it must be positive")
+        self.spf_throttle = (initial_delay, hold_time, max_hold)
         for router in self.routers.values():
+            router.spf_throttle = SpfThrottle(*self.spf_throttle)
+        self.change_interval = change_interval
+        self._next_change_time = self.clock if change_interval is None else self.clock + change_interval
+
+    def update_routing_tables(self, routers=None):
+        """
+        Recomputes the routing tables of all routers after a change.
+        In lazy mode the routing tables are only invalidated, and each one is recomputed when it is next read.
+        With an SPF throttle, each router requests an SPF run instead, and the runs are made by run_scheduled_spfs.
+
+        Args:
+            routers (list): The routers to update, or None for all routers.
+        """
+        for router in self.routers.values() if routers is None else routers:
+            if self.lazy:
+                router.invalidate_routing_table()
+            elif router.spf_throttle is not None:
+                scheduled = router.spf_throttle.request(self.clock)
+                if scheduled is not None:
+                    heapq.heappush(self._scheduled_spfs, (scheduled, router.id))
+            else:
+                router.update_routing_table_dijkstra()
+
+    def run_scheduled_spfs(self, until=None, inclusive=True):
+        """
+        Runs the pending SPF runs in the order they are scheduled in, advancing the clock to each of them.
+
+        Args:
+            until (int): The time of the last SPF runs to make, or None to make all of them.
+            inclusive (bool): If False, the SPF runs scheduled at exactly until are left pending.
+        """
+        scheduled_spfs = self._scheduled_spfs
+        while scheduled_spfs and (until is None or scheduled_spfs[0][0] < until or (inclusive and scheduled_spfs[0][0] == until)):
+            time, router_id = heapq.heappop(scheduled_spfs)
+            router = self.routers[router_id]
+            self.clock = max(self.clock, router.spf_throttle.run())
+            router.update_routing_table_dijkstra()
+
+    def spf_runs(self):
+        """
+        Counts how many times Dijkstra's algorithm was run in the network.
+
+        Returns:
+            int: The total number of SPF runs of all routers.
+        """
+        return sum(router.spf_runs for router in self.routers.values())
+
+    def spf_report(self):
+        """
+        Summarizes the routing table computations of the run.
+        Every LSP changing the neighbors a router knows for its origin would run Dijkstra's algorithm if it was
+        run as soon as the LSP arrived, so the runs saved are those arrivals minus the runs made or still pending.
+        LSPs flooded again without a change of neighbors do not count, as they leave the topology as it was.
+
+        Returns:
+            str: The number of Dijkstra runs, of routing tables left as they were after a change, of LSP arrivals
+                 and of runs saved by coalescing them, followed by the SPF throttle counts and the simulated time if throttled.
+        """
+        spf_runs = self.spf_runs()
+        lsp_arrivals = sum(router.lsp_arrivals for router in self.routers.values())
+        report = (f"SPF runs: {spf_runs}\n"
+                  f"routing table recomputations skipped: {self.skipped_recomputations}\n"
+                  f"LSP arrivals changing the link state topology: {lsp_arrivals}\n"
+                  f"SPF runs saved by coalescing LSP arrivals: {lsp_arrivals - spf_runs - len(self._scheduled_spfs)}\n")
+        if self.spf_throttle is not None:
+            throttles = [router.spf_throttle for router in self.routers.values()]
+            report += (f"SPF throttle requests: {sum(throttle.requests for throttle in throttles)}\n"
+                       f"SPF requests coalesced into a pending run: {sum(throttle.coalesced for throttle in throttles)}\n"
+                       f"SPF runs pending: {len(self._scheduled_spfs)}\n"
+                       f"simulated time: {self.clock} ms\n")
+        return report
+
+    def link_state_databases(self):
+        """
+        Counts the distinct link state databases held by the routers. Routers that received the same LSPs share one.
+
+        Returns:
+            int: The number of distinct link state databases.
+        """
+        return len({id(router.lsdb) for router in self.routers.values()})
+
+    def invalidate_routes_for_removed_link(self, router1, router2):
+        """
+        Routing tables of link state routers are rebuilt from their network topology after every change,
+        so routes using a removed link do not need to be invalidated one by one.
+
+        Args:
+            router1 (Router): The first router.
+            router2 (Router): The second router.
+        """
+        pass
+
+    def distribute_all_lsp(self, routers=None):
+        """
+        Distributes the Link State Packets (LSP) from all routers in the network.
+
+        Args:
+            routers (list): The routers generating an LSP, or None for all routers.
+        """
+        for router in self.routers.values() if routers is None else routers:
             router.generate_lsp()
 
     def apply_changes_and_output(self, changes_file, message_file):
@@ -65,23 +218,85 @@ class LinkStateNetwork(Network):
 
         self.topology_output()
         self.send_messages(message_file)
+        self.traffic_output()
 
-        with open(changes_file, 'r') as changes_file:
-            for line in changes_file:
-                router_id1, router_id2, cost = line.split()
-               
-                self.process_change(int(router_id1), int(router_id2), int(cost))
+        for change in parse_changes_file(changes_file):
+            self.apply_topology_change(change)
 
-                router_1 = self.get_router(int(router_id1))
-                router_2 = self.get_router(int(router_id2))
-                router_1.generate_lsp()
-                router_2.generate_lsp()
+            self.topology_output()
+            self.send_messages(message_file)
+            self.traffic_output()
+
+    def apply_link_changes(self, link_changes):
+        """
+        Applies link changes to the network, floods the LSPs once, then updates the routing tables once.
+        Only the routers of the components of the changed links flood LSPs, and only those whose routes
+        the changes can alter update their routing tables. With an SPF throttle, the SPF runs scheduled
+        before the change are made first, then those scheduled before the next change.
+
+        Args:
+            link_changes (list): The (router1, router2, cost) link changes, cost -999 removing the link.
+        """
+        if self.spf_throttle is not None:
+            self.run_scheduled_spfs(self._next_change_time)
+            self.clock = max(self.clock, self._next_change_time)
+        previous_costs = [self.routers[router_id1].neighbors.get(router_id2) if router_id1 in self.routers else None
+                          for router_id1, router_id2, cost in link_changes]
+        for router_id1, router_id2, cost in link_changes:
+            super().process_change(router_id1, router_id2, cost)
+        routers = self.routers_affected_by(link_changes)
+        self.distribute_all_lsp(routers)
+
+        for router_id in dict.fromkeys(chain.from_iterable(change[:2] for change in link_changes)):
+            self.get_router(router_id).generate_lsp()
+
+        routers = self.routers_to_recompute(routers, link_changes, previous_costs)
+        self.skipped_recomputations += len(self.routers) - len(routers)
+        self.update_routing_tables(routers)
+
+        if self.spf_throttle is not None:
+            if self.change_interval is None:
+                self.run_scheduled_spfs()
+                self._next_change_time = self.clock
+            else:
+                self._next_change_time = self.clock + self.change_interval
+                self.run_scheduled_spfs(self._next_change_time, inclusive=False)
+
+    def routers_to_recompute(self, routers, link_changes, previous_costs):
+        """
+        Finds the routers whose routing tables link changes can alter, among the routers of their components.
+        A link that got more expensive, or was removed, only alters the routes of the routers whose shortest
+        path tree uses it. A link that got cheaper, or was added, only alters the routes of the routers it
+        gives a path to one of its ends at most as long as their current one, ties included. Routers whose
+        tree is unknown, or whose routing table is already out of date, are always included, and so are the
+        ends of the changed links, whose routes to each other were overwritten when the links changed.
+        Routers with a pending SPF run are included as well, as their routing table is already out of date.
+
+        Args:
+            routers (list): The routers of the components of the changed links.
+            link_changes (list): The (router1, router2, cost) link changes, cost -999 removing the link.
+            previous_costs (list): The cost of each link before the changes, or None if it did not exist.
+
+        Returns:
+            list: The routers to update, in the order of the network.
+        """
+        using_changed_links = set(chain.from_iterable(change[:2] for change in link_changes))
+        shorter_links = []
+        for (router_id1, router_id2, cost), previous_cost in zip(link_changes, previous_costs):
+            if previous_cost is not None and (cost == -999 or cost > previous_cost):
+                using_changed_links.update(self.spt_index.routers_using((min(router_id1, router_id2), max(router_id1, router_id2))))
+            elif cost != -999 and cost != previous_cost:
+                shorter_links.append((router_id1, router_id2, cost))
 
-                for router in self.routers.values():
-                    router.update_routing_table_dijkstra()
+        def shortens_path(router, router_id1, router_id2, cost):
+            cost1 = router.get_cost(router_id1)
+            cost2 = router.get_cost(router_id2)
+            return (cost1 != INFINITY and cost1 + cost <= cost2) or (cost2 != INFINITY and cost2 + cost <= cost1)
 
-                self.topology_output()
-                self.send_messages(message_file)
+        return [router for router in routers
+                if router.id in using_changed_links or router.is_routing_table_stale() or not self.spt_index.knows(router.id)
+                or (router.spf_throttle is not None and router.spf_throttle.scheduled is not None)
+                or any(shortens_path(router, *link) for link in shorter_links)]
 
     def process_change(self, router_id1, router_id2, cost):
         """
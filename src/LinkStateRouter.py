@@ -1,6 +1,8 @@
 from Router import Router
+from LinkStateDatabase import LinkStateDatabase, make_lsp
 from utilities import INFINITY
-import heapq
+from shortest_paths import choose_tree_kernel
+from collections import deque
 
 ## @file
 ## @brief Implementation of the LinkStateRouter Class.
@@ -24,33 +26,117 @@ class LinkStateRouter(Router):
 
     Attributes:
         lsp_sequence_number (int): The sequence number of the Link State Packet (LSP) generated by the router.
-        network_topology (dict): A dictionary representing the network topology, where the keys are the router IDs and the values are the neighbor routers.
-        sequence_number_tracker (dict): A dictionary tracking the sequence numbers of received LSPs from other routers.
+        lsdb (LinkStateDatabase): The link state database of the router, shared with the routers that received the same LSPs.
+        network_topology (dict): A read-only dictionary representing the network topology, where the keys are the router IDs and the values are the neighbor routers.
         network_routers (dict): A dictionary representing the network routers, where the keys are the router IDs and the values are the router objects. 
                                 This is not used for shared global knowledge, but a way to access the object of other routers, in order to trigger actions on them.
+        spf_runs (int): The number of times the router ran Dijkstra's algorithm.
+        spt_index (ShortestPathTreeIndex): The index the router records its shortest path tree in after each run, or None.
+        lsp_arrivals (int): The number of LSPs that changed the neighbors the router knew for their origin, each of which would run Dijkstra's algorithm without coalescing.
+        spf_throttle (SpfThrottle): The scheduling of the SPF runs of the router, or None if they run as soon as the LSPs of a change are flooded.
+        routing_table (dict): The routing table of the router. If it was invalidated, it is recomputed the next time it is read.
     """
 
-    def __init__(self, id, network_routers):
+    def __init__(self, id, network_routers, lsdb=None, spt_index=None):
         """
         Initializes a LinkStateRouter object.
 
         Args:
             id (int): The ID of the router.
             network_routers (dict): A dictionary representing the network routers, where the keys are the router IDs and the values are the router objects.
+            lsdb (LinkStateDatabase): The empty link state database shared by the routers of the network. A new one is created if None.
+            spt_index (ShortestPathTreeIndex): The index to record the shortest path tree of the router in, or None.
         """
+        self._routing_table = {}
+        self._routing_table_stale = False
+        self.spf_runs = 0
+        self.spt_index = spt_index
+        self.lsp_arrivals = 0
+        self.spf_throttle = None
         super().__init__(id)
         self.lsp_sequence_number = 0
-        self.network_topology = {}
-        self.sequence_number_tracker = {}
+        self.lsdb = (LinkStateDatabase() if lsdb is None else lsdb).acquire()
         self.network_routers = network_routers
-    
+
+    @property
+    def network_topology(self):
+        """
+        The neighbors advertised by each router in its last LSP accepted by this router. Shared with other routers, must not be modified.
+        """
+        return self.lsdb.topology
+
+    @property
+    def routing_table(self):
+        """
+        The routing table of the router, recomputed with Dijkstra's algorithm if it was invalidated.
+        """
+        if self._routing_table_stale:
+            self.update_routing_table_dijkstra()
+        return self._routing_table
+
+    @routing_table.setter
+    def routing_table(self, routing_table):
+        self._routing_table = routing_table
+        if self.trace is not None:
+            self.trace.record_clear(self.id)
+            for destination_id, (next_hop_id, cost) in routing_table.items():
+                self.trace.record(self.id, destination_id, next_hop_id, cost)
+
+    def invalidate_routing_table(self):
+        """
+        Marks the routing table as out of date, so it is recomputed only when it is next read.
+        """
+        self._routing_table_stale = True
+
+    def is_routing_table_stale(self):
+        """
+        Checks whether the routing table was invalidated and not recomputed since.
+
+        Returns:
+            bool: True if the routing table is out of date.
+        """
+        return self._routing_table_stale
+
+    def get_cost(self, destination_id):
+        """
+        Retrieves the cost to a destination from the routing table, without recomputing an invalidated routing table.
+
+        Args:
+            destination_id (int): The ID of the destination router.
+
+        Returns:
+            int: The cost, or INFINITY if the destination is unknown or unreachable.
+        """
+        return self._routing_table.get(destination_id, (None, INFINITY))[1]
+
+    def update_routing_table(self, destination, next_hop, cost):
+        """
+        Updates the routing table of the router. Same as Router.update_routing_table, but it never
+        triggers the recomputation of an invalidated routing table.
+
+        Args:
+            destination (Router): The destination router object.
+            next_hop (Router): The next hop router object.
+            cost (int): The cost to reach the destination.
+        """
+        if cost == INFINITY:
+            self._routing_table[destination.id] = (None, INFINITY)
+        else:
+            self._routing_table[destination.id] = (next_hop.id, cost)
+        if self.trace is not None:
+            self.trace.record(self.id, destination.id, None if next_hop is None else next_hop.id, cost)
+
     def generate_lsp(self):
         """
-        Generates a Link State Packet (LSP) and distributes it to all other routers in the network.
+        Generates a Link State Packet (LSP) with a snapshot of the neighbors of the router, records it and distributes it to all other routers in the network.
         """
         self.lsp_sequence_number += 1
-        lsp =  {'id': self.id, 'sequence': self.lsp_sequence_number, 'neighbors': self.neighbors}
-        self._distribute_lsp(lsp)
+        lsp = make_lsp(self.id, self.lsp_sequence_number, self.neighbors)
+        previous_lsp = self.lsdb.lsps.get(self.id)
+        self._process_lsp(lsp)
+        copies = self._distribute_lsp(lsp)
+        if self.control_plane is not None:
+            self.control_plane.count_lsp(lsp, previous_lsp, copies)
     
     def _process_lsp(self, lsp):
         """
@@ -58,98 +144,73 @@ class LinkStateRouter(Router):
 
         Args:
             lsp (dict): The received LSP.
+
+        Returns:
+            bool: True if the LSP was new and must be forwarded.
         """
-        if lsp['id'] not in self.sequence_number_tracker.keys() or lsp['sequence'] > self.sequence_number_tracker[lsp['id']]:
-            self.sequence_number_tracker[lsp['id']] = lsp['sequence']
-            self.network_topology[lsp['id']] = lsp['neighbors']
-            self.network_topology[self.id] = self.neighbors
-            self._distribute_lsp(lsp)
+        if self.lsdb.is_newer(lsp):
+            previous_lsp = self.lsdb.lsps.get(lsp['id'])
+            self.lsdb = self.lsdb.accept(lsp)
+            if previous_lsp is None or previous_lsp['neighbors'] != lsp['neighbors']:
+                self.lsp_arrivals += 1
+            return True
+        return False
 
-    
-    def _distribute_lsp(self, lsp):
+    def _flooding_neighbors(self):
+        """
+        Retrieves the neighbors an LSP is forwarded to.
+
+        Returns:
+            dict: The neighbors dictionary of the router.
+        """
+        return self.neighbors
+
+    def _distribute_lsp(self, lsp, process='_process_lsp'):
         """
         Distributes a Link State Packet (LSP) to all other routers in the network.
+        The LSP is flooded breadth first: every router that accepts it forwards it to its own neighbors.
 
         Args:
             lsp (dict): The LSP to be distributed.
+            process (str): The name of the method of the receiving routers that processes the LSP.
+
+        Returns:
+            int: The number of times the LSP was sent over a link.
         """
-        # send the lsp to all other routers in the network
-        for router_id in self.neighbors.keys():
+        copies = 0
+        pending = deque([self])
+        while pending:
+            sender = pending.popleft()
+            neighbors = sender._flooding_neighbors()
+            copies += len(neighbors)
+            for router_id in neighbors:
                 router = self.network_routers[router_id]
-                router._process_lsp(lsp)
+                if getattr(router, process)(lsp):
+                    pending.append(router)
+        return copies
 
     def _ls_algorithm(self):
         """
         Implements the Link State algorithm to calculate the shortest paths and next hops.
 
+        The shortest path kernel is chosen from the link costs of the link state database: a breadth first
+        search if they are all equal, Dial's buckets if they are small, a binary heap otherwise. Among equal
+        cost paths, each node is reached from its smallest-ID predecessor, so the path to a node is the one whose
+        router IDs, read from the node back to this router, are lexicographically smallest.
+
         Returns:
             tuple: A tuple containing two dictionaries - shortest_paths and next_hops.
                 shortest_distances: A dictionary mapping each node to its shortest path cost from the current router.
                 next_hops: A dictionary mapping each node to its next hop router ID.
         """
-        shortest_distances = {node: INFINITY for node in self.network_topology}
-        paths = {self.id: [self.id]}   
+        topology = self.network_topology
+        distances, next_hop_ids = choose_tree_kernel(self.lsdb.weights)(lambda node: topology.get(node, {}), self.id)
+        shortest_distances = {node: distances.get(node, INFINITY) for node in topology}
         shortest_distances[self.id] = 0
-        pq = [(0, self.id, [self.id])]
-        
-        while pq:
-            current_distance, current_node, current_path = heapq.heappop(pq)
-            
-            if current_distance > shortest_distances[current_node]:
-                continue
-            
-            for neighbor, weight in self.network_topology[current_node].items():
-                distance = current_distance + weight
-                new_path = current_path + [neighbor]
-                    
-                if distance < shortest_distances.get(neighbor, INFINITY):
-                    shortest_distances[neighbor] = distance
-                    paths[neighbor] = new_path
-                    heapq.heappush(pq, (distance, neighbor, new_path))
-                elif distance == shortest_distances[neighbor] and  self.check_new_path_lexicographically_smaller(new_path, paths[neighbor]):
-                    paths[neighbor] = new_path
-                    heapq.heappush(pq, (distance, neighbor, new_path))
-
-        # reconstruct shortest path in order to find the next hop
-        next_hops = {node: None for node in self.network_topology}
-
-        for node in self.network_topology:
-            if node == self.id:
-                next_hops[node] = self.id
-            else:
-                
-                if paths.get(node, False) and len(paths[node]) > 1:
-                    next_hops[node] = paths[node][1]
-                else:
-                    next_hops[node] = INFINITY
-                        
+        next_hops = {node: next_hop_ids.get(node, INFINITY) for node in topology}
+        next_hops[self.id] = self.id
         return shortest_distances, next_hops
-    
-    def check_new_path_lexicographically_smaller(self, new_path, old_path):
-        """
-        Checks if a new path is lexicographically smaller than another path.
 
-        Args:
-            new_path (list): The first path.
-            old_path (list): The second path.
-
-        Returns:
-            bool: True if new_path is lexicographically smaller than old_path, False otherwise.
-        """
-        new_path = new_path[::-1]
-        old_path = old_path[::-1]
-        
-        for i in range(min(len(new_path), len(old_path))):
-            if new_path[i] < old_path[i]:
-                return True
-            elif new_path[i] > old_path[i]:
-                return False
-        
-        if len(new_path) < len(old_path):
-            return True
-        else:
-            return False
-    
     def update_routing_table_dijkstra(self):
         """
         Updates the routing table using Dijkstra's algorithm.
@@ -157,6 +218,8 @@ class LinkStateRouter(Router):
         This method calculates the shortest paths and next hops using the Link State algorithm,
         and updates the routing table accordingly.
         """
+        self._routing_table_stale = False
+        self.spf_runs += 1
         shortest_paths, next_hops = self._ls_algorithm()
         self.routing_table = {}
         
@@ -171,4 +234,54 @@ class LinkStateRouter(Router):
                 
             self.update_routing_table(destination_router, next_hop_router, cost)
 
+        if self.equal_cost_next_hops is not None:
+            self._update_equal_cost_next_hops(shortest_paths)
+        if self.spt_index is not None:
+            self.spt_index.record(self.id, self._shortest_path_links(shortest_paths))
+
+    def _shortest_path_links(self, shortest_distances):
+        """
+        Finds the links of the shortest path tree: every router is reached from its lowest-ID predecessor
+        on a shortest path, as in _ls_algorithm. In ECMP mode, every link lying on a shortest path is
+        included, since all of them give next hops.
+
+        Args:
+            shortest_distances (dict): The shortest path cost from the router to each node, as computed by _ls_algorithm.
+
+        Returns:
+            set: The links, as (lower ID, higher ID) router pairs.
+        """
+        predecessors = {}
+        for node, distance in shortest_distances.items():
+            if distance == INFINITY:
+                continue
+            for neighbor, weight in self.network_topology.get(node, {}).items():
+                if neighbor != self.id and distance + weight == shortest_distances.get(neighbor):
+                    predecessors.setdefault(neighbor, []).append(node)
+        if self.equal_cost_next_hops is None:
+            predecessors = {node: [min(node_predecessors)] for node, node_predecessors in predecessors.items()}
+        return {(min(node, predecessor), max(node, predecessor))
+                for node, node_predecessors in predecessors.items() for predecessor in node_predecessors}
+
+    def _update_equal_cost_next_hops(self, shortest_distances):
+        """
+        Finds every equal-cost next hop to each destination, for ECMP mode.
+
+        Routers are visited in increasing distance order. Every link lying on a shortest path passes
+        the next hops of its first router on to the second one, or the second router itself when the
+        first one is this router.
+
+        Args:
+            shortest_distances (dict): The shortest path cost from the router to each node, as computed by _ls_algorithm.
+        """
+        next_hops = {}
+        for node in sorted((node for node, cost in shortest_distances.items() if cost != INFINITY), key=shortest_distances.get):
+            for neighbor, weight in self.network_topology.get(node, {}).items():
+                if neighbor != self.id and shortest_distances[node] + weight == shortest_distances.get(neighbor):
+                    next_hops.setdefault(neighbor, set()).update((neighbor,) if node == self.id else next_hops[node])
+
+        self.equal_cost_next_hops = {}
+        for destination_id, destination_next_hops in next_hops.items():
+            self.set_equal_cost_next_hops(destination_id, destination_next_hops)
+
 ## @}
\ No newline at end of file
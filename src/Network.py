@@ -1,5 +1,16 @@
 from utilities import INFINITY
 from Router import Router
+from topology_format import open_topology_edges
+from input_parser import parse_integer_file, parse_message_file
+from shortest_paths import bidirectional_route
+from TrafficMatrix import TrafficMatrix
+from output_pipeline import NullOutput, PipelinedOutput
+from TopologyVersion import LINK_STATE, TopologyVersion
+from ConnectivityIndex import ConnectivityIndex
+from ContractionHierarchy import ContractionHierarchy
+from itertools import chain
+import os
+import zlib
 
 ## @file
 ## @brief Implementation of the Network Class, that is the parent of the DistanceVectorNetwork and LinkStateNetwork classes.
@@ -20,34 +31,221 @@ class Network:
 
     Attributes:
         routers (dict): A dictionary of routers in the network.
-        output_file (str): The path to the output file.
-        output_file_iterator (file): The file iterator for writing output.
+        output_file (str): The path to the output file, or the writable object or None given instead.
+        output_file_iterator (file): The file iterator for writing output, or the PipelinedOutput writing it in pipelined mode.
+                                     A NullOutput if the output is discarded, in which case it is not formatted.
+        owns_output (bool): True if the network opened the output file, and closes it with close.
+        output_pipeline (PipelinedOutput): The background writer of the output file in pipelined mode, or None.
+        parsed_messages (dict): The parsed message files, keyed by path, so messages are parsed only once.
+        output_routers (set): The IDs of the routers whose routing tables are written, or None for all routers.
+        ecmp (bool): If True, routers keep every equal-cost next hop and messages are spread over them by flow.
+        next_hop_sets (dict): The equal-cost next hop tuples used by the routers, so that each is stored only once.
+        traffic_matrix (TrafficMatrix): The traffic demands whose load is reported after each change, or None.
+        top_links (int): The number of most loaded links listed in the traffic reports.
+        shared_risk_link_groups (dict): For each shared risk link group ID, the set of its links, as (lower ID, higher ID) router pairs.
+        down_routers (set): The IDs of the routers failed by a node event.
+        down_link_groups (set): The IDs of the shared risk link groups failed by an event.
+        suspended_links (dict): The cost of every link removed by a failure, restored when the failure is over.
+        changes_applied (int): The number of changes applied since the network was created.
+        history (list): The version of the topology after each change, starting with the initial topology, or None if it is not recorded.
+        tie_break (str): The rule between equal-cost next hops used by the topology versions, LINK_STATE by default.
+        connectivity (ConnectivityIndex): The connected components of the network, kept up to date by process_change.
+        route_index (ContractionHierarchy): The index answering route queries, rebuilt after changes when next queried, or None.
+        trace (TraceRecorder): The recorder of every routing table update of the routers, or None.
+        control_plane (ControlPlaneCounter): The counter of the messages exchanged by the routers and their bytes, or None.
     """
 
-    def __init__(self, topology_file, output_file):
+    tie_break = LINK_STATE
+
+    def __init__(self, topology_file, output_file, output_routers=None, ecmp=False, trace=None, control_plane=None):
         """
         Initializes a Network object.
 
         Args:
             topology_file (str): The path to the topology file.
-            output_file (str): The path to the output file.
-        """
+            output_file (str): The path to the output file, an open writable object such as a StringIO, written
+                               but not closed by the network, or None to discard the output without formatting it.
+            output_routers (iterable): The IDs of the routers whose routing tables are written, or None for all routers.
+            ecmp (bool): If True, routers keep every equal-cost next hop and messages are spread over them by flow.
+            trace (TraceRecorder): The recorder of every routing table update, from the initial convergence on, or None.
+            control_plane (ControlPlaneCounter): The counter of the messages of the routers, from the initial convergence on, or None.
+        """
+        self.trace = trace
+        self.control_plane = control_plane
         self.routers = {}
+        self.parsed_messages = {}
+        self.ecmp = ecmp
+        self.next_hop_sets = {}
+        self.traffic_matrix = None
+        self.top_links = 10
+        self.shared_risk_link_groups = {}
+        self.down_routers = set()
+        self.down_link_groups = set()
+        self.suspended_links = {}
+        self.changes_applied = 0
+        self.history = None
+        self.connectivity = ConnectivityIndex()
+        self.route_index = None
+        self.output_routers = None if output_routers is None else set(output_routers)
         self.initialize_topology(topology_file)
+        self.output_pipeline = None
+        self._open_output(output_file)
+
+    def _open_output(self, output_file):
+        """
+        Sets the sink the output is written to.
+
+        Args:
+            output_file (str): The path to the output file, which is then opened, an open writable object, or None to discard the output.
+        """
         self.output_file = output_file
-        self.output_file_iterator = open(output_file, 'w')  # Open output file
+        self.owns_output = isinstance(output_file, (str, os.PathLike))
+        if output_file is None:
+            self.output_file_iterator = NullOutput()
+        elif self.owns_output:
+            self.output_file_iterator = open(output_file, 'w')  # Open output file
+        else:
+            self.output_file_iterator = output_file
+
+    def output_discarded(self):
+        """
+        Checks whether the output is discarded, in which case routing tables and messages are not formatted.
+
+        Returns:
+            bool: True if the network writes to a NullOutput.
+        """
+        return isinstance(self.output_file_iterator, NullOutput)
+
+    def enable_pipeline(self, max_pending=4):
+        """
+        Switches to pipelined mode: the output is formatted and written by a background thread, from
+        snapshots of the routing tables, while the network computes the next change. Discarded output
+        is not pipelined.
+
+        Args:
+            max_pending (int): The number of routing table snapshots and text batches that may wait to be
+                               written before the computation waits for the writer.
+        """
+        if self.output_pipeline is None and not self.output_discarded():
+            self.output_pipeline = PipelinedOutput(self.output_file_iterator, max_pending, self.owns_output)
+            self.output_file_iterator = self.output_pipeline
 
     def initialize_topology(self, topology_file):
         """
         Initializes the network topology based on the given topology file.
+        The file may be plain text, gzip-compressed text or a binary topology file.
 
         Args:
             topology_file (str): The path to the topology file.
         """
-        with open(topology_file, 'r') as file:
-            for line in file:
-                router1, router2, cost = line.split()
-                self.add_link(int(router1), int(router2), int(cost))
+        with open_topology_edges(topology_file) as edges:
+            self.add_links(edges)
+
+    def add_links(self, edges):
+        """
+        Adds links between routers in bulk.
+        Add routers if they don't exist. A link given more than once keeps its last cost.
+
+        Args:
+            edges (array or memoryview): A flat sequence of (router1, router2, cost) triples.
+        """
+        # The columns are copied out in bulk, so no slice of a memory-mapped edge sequence outlives this line
+        first_ids, second_ids, costs = (edges[column::3].tolist() for column in range(3))
+
+        # Routers are created in the same order as the links would add them one by one
+        for router_id in dict.fromkeys(chain.from_iterable(zip(first_ids, second_ids))):
+            if router_id not in self.routers:
+                self._create_router(router_id)
+
+        neighbors = {router_id: {} for router_id in self.routers}
+        for router_id1, router_id2, cost in zip(first_ids, second_ids, costs):
+            neighbors[router_id1][router_id2] = cost
+            neighbors[router_id2][router_id1] = cost
+
+        for router_id, router_neighbors in neighbors.items():
+            if router_neighbors:
+                self.routers[router_id].add_neighbors(router_neighbors)
+
+        self.connectivity = ConnectivityIndex.from_topology(self._get_neighbors, self.routers)
+
+    def _get_neighbors(self, router_id):
+        """
+        Retrieves the neighbors of a router.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            dict: The {neighbor ID: cost} dictionary of the router.
+        """
+        return self.routers[router_id].neighbors
+
+    def record_history(self):
+        """
+        Starts recording a version of the topology after every change, from the current topology.
+        Versions share everything but the neighbors of the routers changed between them.
+        """
+        if self.history is None:
+            self.history = [None] * self.changes_applied
+            self.history.append(TopologyVersion.from_routers(self.routers, self.changes_applied, self.tie_break))
+
+    def enable_route_index(self):
+        """
+        Starts answering route queries from a contraction hierarchy of the topology. The index is built
+        on the first query, and rebuilt on the first query after a change.
+        """
+        if self.route_index is None:
+            self.route_index = ContractionHierarchy()
+
+    def _current_route_index(self):
+        """
+        Retrieves the route index, rebuilding it first if the topology changed since it was built.
+
+        Returns:
+            ContractionHierarchy: The up to date route index.
+        """
+        if self.route_index.stale:
+            self.route_index.build({router_id: router.neighbors for router_id, router in self.routers.items()})
+        return self.route_index
+
+    def current_version(self):
+        """
+        Retrieves the version of the current topology, to query or fork without touching the network.
+
+        Returns:
+            TopologyVersion: The last recorded version, or a new snapshot of the topology if the history is not recorded.
+        """
+        if self.history is not None:
+            return self.history[-1]
+        return TopologyVersion.from_routers(self.routers, self.changes_applied, self.tie_break)
+
+    def version(self, number):
+        """
+        Retrieves the version of the topology as of a change.
+
+        Args:
+            number (int): The number of changes applied before the version, 0 for the initial topology.
+
+        Returns:
+            TopologyVersion: The version.
+
+        Raises:
+            ValueError: If the history does not contain the version.
+        """
+        if self.history is None or not 0 <= number < len(self.history) or self.history[number] is None:
+            raise ValueError(f"version {number} was not recorded")
+        return self.history[number]
+
+    def load_shared_risk_link_groups(self, srlg_file):
+        """
+        Loads the shared risk link groups that srlg events fail and recover.
+
+        Args:
+            srlg_file (str): The path to the file, where every line is "group router1 router2". A link may belong to several groups.
+        """
+        values = parse_integer_file(srlg_file, 3)
+        for group_id, router_id1, router_id2 in zip(values[0::3], values[1::3], values[2::3]):
+            self.shared_risk_link_groups.setdefault(group_id, set()).add(_link_key(router_id1, router_id2))
 
     def _add_router(self, router_id):
         """
@@ -59,6 +257,31 @@ class Network:
         router = Router(router_id)
         self.routers[router.id] = router
 
+    def _create_router(self, router_id):
+        """
+        Creates a router of the protocol of the network and registers it. Every router is created through
+        this method, whether it appears in the topology file, in a new link or in the removal of an unknown link.
+
+        Args:
+            router_id (int): The ID of the router to create.
+        """
+        self._add_router(router_id)
+        self._register_router(router_id)
+
+    def _register_router(self, router_id):
+        """
+        Hands the trace recorder and the control plane counter of the network to a new router. The trace
+        starts with the route of the router to itself.
+
+        Args:
+            router_id (int): The ID of the new router.
+        """
+        router = self.routers[router_id]
+        router.control_plane = self.control_plane
+        if self.trace is not None:
+            router.trace = self.trace
+            self.trace.record(router_id, router_id, router_id, 0)
+
     def get_router(self, router_id):
         """
         Retrieves a router from the network.
@@ -96,9 +319,9 @@ class Network:
             cost (int): The cost of the link.
         """
         if router_id1 not in self.routers.keys():
-            self._add_router(router_id1)
+            self._create_router(router_id1)
         if router_id2 not in self.routers.keys():
-            self._add_router(router_id2)
+            self._create_router(router_id2)
 
         router1 = self.routers[router_id1]
         router2 = self.routers[router_id2]
@@ -155,8 +378,22 @@ class Network:
     def topology_output(self):
         """
         Writes the routing tables to the output file.
-        """
+        If output routers were given, only their routing tables are written.
+        In pipelined mode, a snapshot of the routing tables is handed to the background writer instead.
+        If the output is discarded, the routing tables are only read, so invalidated ones are recomputed as if written.
+        """
+        if self.output_discarded():
+            for router in self.routers.values():
+                if self.output_routers is None or router.id in self.output_routers:
+                    router.routing_table
+            return
+        if self.output_pipeline is not None:
+            self.output_pipeline.write_routing_tables([dict(router.routing_table) for router in sorted(self.routers.values(), key=lambda x: x.id)
+                                                       if self.output_routers is None or router.id in self.output_routers])
+            return
         for router in sorted(self.routers.values(), key=lambda x: x.id):
+            if self.output_routers is not None and router.id not in self.output_routers:
+                continue
             routing_table_str = router.get_routing_table_string()
             self.output_file_iterator.write(routing_table_str)
             self.output_file_iterator.write("\n")
@@ -172,16 +409,58 @@ class Network:
         Returns:
             None
         """
-        with open(message_file, 'r') as message_file_iterator:
-            for line in message_file_iterator:
-                router_id_from, router_id_to, message = line.split(" ", 2)
-                self.send_message(int(router_id_from), int(router_id_to),message)
-            self.output_file_iterator.write("\n\n")
+        for router_id_from, router_id_to, message in self.read_messages(message_file):
+            self.send_message(router_id_from, router_id_to, message)
+        self.output_file_iterator.write("\n\n")
+
+    def load_traffic(self, traffic_file, top_links=10):
+        """
+        Loads traffic demands, whose load is then reported by traffic_output.
+
+        Args:
+            traffic_file (str): The path to the traffic file, where every line is "source destination volume".
+            top_links (int): The number of most loaded links listed in the traffic reports.
+        """
+        self.traffic_matrix = TrafficMatrix(traffic_file)
+        self.top_links = top_links
+
+    def traffic_load(self):
+        """
+        Computes the load of the traffic demands under the current routing tables.
+
+        Returns:
+            tuple: The load of each directed link (router ID, next hop ID), the load of each router ID and the volume delivered.
+        """
+        return self.traffic_matrix.load(self.routers)
+
+    def traffic_output(self):
+        """
+        Writes the delivered volume and the most loaded links to the output file, if traffic demands were loaded.
+        """
+        if self.traffic_matrix is None or self.output_discarded():
+            return
+        self.output_file_iterator.write(self.traffic_matrix.report(self.routers, self.top_links))
+        self.output_file_iterator.write("\n")
+
+    def read_messages(self, message_file):
+        """
+        Reads the messages of a message file. The file is parsed only the first time it is read.
+
+        Args:
+            message_file (str): The path to the file containing the messages.
+
+        Returns:
+            list: A list of (source router ID, destination router ID, message) tuples.
+        """
+        key = str(message_file)
+        if key not in self.parsed_messages:
+            self.parsed_messages[key] = parse_message_file(message_file)
+        return self.parsed_messages[key]
 
     def send_message(self, router_id_from, router_id_to, message):
         """
         Sends a message from one router to another in the network.
-        Writes the message to the output file.
+        Writes the message to the output file. If the output is discarded, the message is still forwarded but not formatted.
 
         Args:
             router_id_from (int): The ID of the source router.
@@ -189,6 +468,12 @@ class Network:
             message (str): The message to send.
         
         """
+        if self.output_discarded():
+            router_from = self.get_router(router_id_from)
+            router_to = self.get_router(router_id_to)
+            if not self.check_impossible_to_reach(router_from, router_to):
+                self.get_hops_and_cost_from_to(router_from, router_to)
+            return
         formatted_message = self._generate_message_string(router_id_from, router_id_to, message)
         self.output_file_iterator.write(formatted_message)
     
@@ -213,32 +498,136 @@ class Network:
         else:
             hops, total_cost = self.get_hops_and_cost_from_to(router_from, router_to)
             hops_str = ' '.join(map(str, hops))
-            formatted_message = f"from {router_id_from} to {router_id_to} cost {total_cost} hops {hops_str} message {message}"
+            if total_cost == INFINITY:
+                # dropped on the way by a routing table not yet updated
+                formatted_message = f"from {router_id_from} to {router_id_to} cost infinite hops {hops_str} dropped message {message}"
+            else:
+                formatted_message = f"from {router_id_from} to {router_id_to} cost {total_cost} hops {hops_str} message {message}"
 
         return formatted_message
 
     def get_hops_and_cost_from_to(self, router_from, router_to):
         """
         Calculates the hops and total cost to reach a destination router.
+        Routing tables waiting for their SPF run can send a message to a router without a route to the
+        destination, or around a loop. The message is then dropped.
 
         Args:
             router_from (Router): The source router.
             router_to (Router): The destination router.
 
         Returns:
-            tuple: A tuple containing the list of hops and the total cost.
+            tuple: A tuple containing the list of hops and the total cost, INFINITY if the message was dropped.
         """
-        next_hop, cost = router_from.routing_table[router_to.id]
+        total_cost = router_from.routing_table[router_to.id][1]
+        next_hop = self._flow_next_hop(router_from, router_from, router_to)
         hops = [str(router_from.id)]
-        total_cost = cost
+        visited = {router_from.id}
 
         while next_hop != router_to.id:
+            if next_hop is None:
+                return hops, INFINITY
             hops.append(str(next_hop))
+            if next_hop in visited:
+                return hops, INFINITY
+            visited.add(next_hop)
             next_router = self.get_router(next_hop)
-            next_hop, cost = next_router.routing_table[router_to.id]
+            next_hop = self._flow_next_hop(next_router, router_from, router_to)
 
         return hops, total_cost
 
+    def _flow_next_hop(self, router, router_from, router_to):
+        """
+        Chooses the next hop of a message at a router.
+        In ECMP mode, the equal-cost next hops are picked by a hash of the flow (source and destination)
+        and of the router, so every message of a flow follows the same path while flows are spread
+        over all the equal-cost paths. Otherwise, the next hop of the routing table is used.
+
+        Args:
+            router (Router): The router forwarding the message.
+            router_from (Router): The source router of the message.
+            router_to (Router): The destination router of the message.
+
+        Returns:
+            int: The ID of the next hop router.
+        """
+        if not self.ecmp:
+            return router.get_next_hop_cost(router_to.id)[0]
+        next_hops = router.get_next_hops(router_to.id)
+        if len(next_hops) == 1:
+            return next_hops[0]
+        flow_hash = zlib.crc32(f"{router_from.id} {router_to.id} {router.id}".encode())
+        return next_hops[flow_hash % len(next_hops)]
+
+    def query_route(self, router_id_from, router_id_to):
+        """
+        Finds the current route between two routers directly from the network topology.
+        No routing table is read or computed; ties are broken like in LinkStateRouter.
+
+        Args:
+            router_id_from (int): The ID of the source router.
+            router_id_to (int): The ID of the destination router.
+
+        Returns:
+            tuple: The list of router IDs on the path, from source to destination, and the total cost.
+                   (None, INFINITY) if the destination cannot be reached.
+        """
+        if not self.reachable(router_id_from, router_id_to):
+            return None, INFINITY
+        if self.route_index is not None:
+            return self._current_route_index().route(router_id_from, router_id_to)
+        return bidirectional_route(self._get_neighbors, router_id_from, router_id_to)
+
+    def query_cost(self, router_id_from, router_id_to):
+        """
+        Finds the cost of the current route between two routers directly from the network topology.
+
+        Args:
+            router_id_from (int): The ID of the source router.
+            router_id_to (int): The ID of the destination router.
+
+        Returns:
+            int: The cost of the route, or INFINITY if the destination cannot be reached.
+        """
+        if not self.reachable(router_id_from, router_id_to):
+            return INFINITY
+        if self.route_index is not None:
+            return self._current_route_index().cost(router_id_from, router_id_to)
+        return bidirectional_route(self._get_neighbors, router_id_from, router_id_to)[1]
+
+    def reachable(self, router_id_from, router_id_to):
+        """
+        Checks whether a path links two routers, from the connected components of the network.
+        The answer does not depend on the routing tables, which are neither read nor computed.
+
+        Args:
+            router_id_from (int): The ID of the source router.
+            router_id_to (int): The ID of the destination router.
+
+        Returns:
+            bool: True if both routers exist and are connected.
+        """
+        if router_id_from not in self.routers or router_id_to not in self.routers:
+            return False
+        return self.connectivity.connected(router_id_from, router_id_to)
+
+    def routers_affected_by(self, link_changes):
+        """
+        Finds the routers whose routes link changes may alter, once they are applied: the routers of the
+        components of the changed links. Routing messages never leave a component, so the routes of the
+        other routers stay the same.
+
+        Args:
+            link_changes (list): The (router1, router2, cost) link changes.
+
+        Returns:
+            list: The affected routers, in the order of the network.
+        """
+        components = self.connectivity.components_of(chain.from_iterable(link_change[:2] for link_change in link_changes))
+        if sum(len(component) for component in components) == len(self.routers):
+            return list(self.routers.values())
+        return [router for router_id, router in self.routers.items() if any(router_id in component for component in components)]
+
     def check_impossible_to_reach(self, router_from, router_to):
         """
         Checks if it is impossible to reach a destination router from a source router.
@@ -252,13 +641,182 @@ class Network:
         """
         if router_from is None or router_to is None:
             return True
+        if not self.connectivity.connected(router_from.id, router_to.id):
+            return True
         if router_to.id not in router_from.routing_table.keys() or router_from.routing_table[router_to.id][1] == INFINITY:
             return True
         return False
 
+    def apply_change(self, router_id1, router_id2, cost):
+        """
+        Applies a link change to the network and updates the routing tables.
+
+        Args:
+            router_id1 (int): The ID of the first router.
+            router_id2 (int): The ID of the second router.
+            cost (int): The new cost of the link, or -999 to remove the link.
+        """
+        self.apply_topology_change((router_id1, router_id2, cost))
+
+    def apply_topology_change(self, change):
+        """
+        Applies one line of a changes file and updates the routing tables once.
+        Node and shared risk link group events remove or restore all their links at once. Links changed
+        while they are failed only take their new cost when the failure is over. If the history is
+        recorded, the new version of the topology is added to it.
+
+        Args:
+            change (tuple): A (router1, router2, cost) link change, or a ("node" or "srlg", ID, "down" or "up") event.
+        """
+        if isinstance(change[0], str):
+            kind, target_id, state = change
+            if kind == "node":
+                link_changes = self._node_event(target_id, state == "up")
+            else:
+                link_changes = self._link_group_event(target_id, state == "up")
+        else:
+            link_changes = self._filter_failed_link_change(*change)
+        if self.trace is not None:
+            self.trace.change_index = self.changes_applied + 1
+        if self.control_plane is not None:
+            self.control_plane.change_index = self.changes_applied + 1
+        self.apply_link_changes(link_changes)
+        self.changes_applied += 1
+
+        if self.history is not None:
+            changed_ids = set(chain.from_iterable(link_change[:2] for link_change in link_changes))
+            version = self.history[-1]
+            if len(version.neighbors) != len(self.routers):
+                changed_ids.update(router_id for router_id in self.routers if router_id not in version.neighbors)
+            self.history.append(version.derive(self.routers, changed_ids, self.changes_applied))
+
+    def apply_link_changes(self, link_changes):
+        """
+        Applies link changes to the network, one at a time with process_change.
+        Routing protocols override it to apply the changes together, then update the routing tables once.
+
+        Args:
+            link_changes (list): The (router1, router2, cost) link changes, cost -999 removing the link.
+        """
+        for router_id1, router_id2, cost in link_changes:
+            self.process_change(router_id1, router_id2, cost)
+
+    def _link_failed(self, link):
+        """
+        Checks if a link is held down by a failed router or a failed shared risk link group.
+
+        Args:
+            link (tuple): The (lower ID, higher ID) router pair of the link.
+
+        Returns:
+            bool: True if the link is failed.
+        """
+        if link[0] in self.down_routers or link[1] in self.down_routers:
+            return True
+        return any(link in self.shared_risk_link_groups[group_id] for group_id in self.down_link_groups)
+
+    def _filter_failed_link_change(self, router_id1, router_id2, cost):
+        """
+        Holds back a link change on a failed link until the failure is over. The routers are still added.
+
+        Args:
+            router_id1 (int): The ID of the first router.
+            router_id2 (int): The ID of the second router.
+            cost (int): The new cost of the link, or -999 to remove the link.
+
+        Returns:
+            list: The link changes to apply now.
+        """
+        link = _link_key(router_id1, router_id2)
+        if link not in self.suspended_links and not self._link_failed(link):
+            return [(router_id1, router_id2, cost)]
+        for router_id in link:
+            if router_id not in self.routers:
+                self._create_router(router_id)
+        if cost == -999:
+            self.suspended_links.pop(link, None)
+        else:
+            self.suspended_links[link] = cost
+        return []
+
+    def _suspend_links(self, links):
+        """
+        Removes the existing links among the given ones and remembers their costs.
+
+        Args:
+            links (iterable): The (lower ID, higher ID) router pairs of the links.
+
+        Returns:
+            list: The link changes removing the links.
+        """
+        link_changes = []
+        for router_id1, router_id2 in sorted(links):
+            router = self.routers.get(router_id1)
+            if (router_id1, router_id2) not in self.suspended_links and router is not None and router_id2 in router.neighbors:
+                self.suspended_links[(router_id1, router_id2)] = router.neighbors[router_id2]
+                link_changes.append((router_id1, router_id2, -999))
+        return link_changes
+
+    def _restore_links(self, links):
+        """
+        Restores the suspended links among the given ones that are no longer failed.
+
+        Args:
+            links (iterable): The (lower ID, higher ID) router pairs of the links.
+
+        Returns:
+            list: The link changes adding the links back with their costs.
+        """
+        link_changes = []
+        for link in sorted(links):
+            if link in self.suspended_links and not self._link_failed(link):
+                link_changes.append((link[0], link[1], self.suspended_links.pop(link)))
+        return link_changes
+
+    def _node_event(self, router_id, up):
+        """
+        Fails or recovers all the links of a router.
+
+        Args:
+            router_id (int): The ID of the router.
+            up (bool): True to recover the router, False to fail it.
+
+        Returns:
+            list: The link changes of the event.
+        """
+        if up:
+            self.down_routers.discard(router_id)
+            return self._restore_links([link for link in self.suspended_links if router_id in link])
+        self.down_routers.add(router_id)
+        router = self.routers.get(router_id)
+        return self._suspend_links([] if router is None else [_link_key(router_id, neighbor_id) for neighbor_id in router.neighbors])
+
+    def _link_group_event(self, group_id, up):
+        """
+        Fails or recovers all the links of a shared risk link group.
+
+        Args:
+            group_id (int): The ID of the shared risk link group.
+            up (bool): True to recover the group, False to fail it.
+
+        Returns:
+            list: The link changes of the event.
+
+        Raises:
+            ValueError: If the group was not loaded.
+        """
+        if group_id not in self.shared_risk_link_groups:
+            raise ValueError(f"unknown shared risk link group {group_id}")
+        if up:
+            self.down_link_groups.discard(group_id)
+            return self._restore_links(self.shared_risk_link_groups[group_id])
+        self.down_link_groups.add(group_id)
+        return self._suspend_links(self.shared_risk_link_groups[group_id])
+
     def process_change(self, router_id1, router_id2, cost):
         """
-        Processes a change in the network topology.
+        Processes a change in the network topology, updates the connected components of the network and
+        marks the route index as out of date.
 
         Args:
             router_id1 (int): The ID of the first router.
@@ -267,21 +825,122 @@ class Network:
         """
         if cost == -999:
             if router_id1 not in self.routers.keys():
-                self._add_router(router_id1)
+                self._create_router(router_id1)
             if router_id2 not in self.routers.keys():
-                self._add_router(router_id2)
+                self._create_router(router_id2)
             router1 = self.get_router(router_id1)
             router2 = self.get_router(router_id2)
 
             self.remove_link(router1, router2)
+            self.connectivity.remove_link(router_id1, router_id2, self._get_neighbors)
 
         else:
             self.add_link(router_id1, router_id2, cost)
+            self.connectivity.add_link(router_id1, router_id2)
+        if self.route_index is not None:
+            self.route_index.invalidate()
     
+    def resume_output(self, output_file, output_text):
+        """
+        Opens the output file of a network restored from a checkpoint, and writes the output of the changes already applied.
+
+        Args:
+            output_file (str): The path to the output file, an open writable object, or None to discard the output.
+            output_text (str): The output written before the checkpoint.
+        """
+        self._open_output(output_file)
+        self.output_file_iterator.write(output_text)
+
+    def continue_changes_and_output(self, changes, message_file):
+        """
+        Applies parsed changes one at a time, writing the routing tables, messages and traffic report after each of them.
+
+        Args:
+            changes (list): The parsed changes, as returned by parse_changes_file.
+            message_file (str): The path to the file containing the messages to be sent.
+        """
+        for change in changes:
+            self.apply_topology_change(change)
+            self.topology_output()
+            self.send_messages(message_file)
+            self.traffic_output()
+
+    def __getstate__(self):
+        """
+        Saves the network without its output file, which is reopened with resume_output.
+
+        Returns:
+            dict: The attributes of the network.
+        """
+        state = self.__dict__.copy()
+        state['output_file_iterator'] = None
+        state['output_pipeline'] = None
+        if not self.owns_output:
+            state['output_file'] = None
+        return state
+
+    def control_plane_report(self):
+        """
+        Formats the messages exchanged by the routers and their bytes, for each change.
+
+        Returns:
+            str: The report of the control plane counter, or an empty string if the messages are not counted.
+        """
+        if self.control_plane is None:
+            return ""
+        return self.control_plane.report()
+
+    def close(self):
+        """
+        Closes the output file and the trace file. In pipelined mode, waits until all the pending output is written.
+        An output object given to the network is only flushed, so it can still be read. Closing twice does nothing.
+
+        Raises:
+            Exception: The error raised by the background writer, in pipelined mode.
+        """
+        if getattr(self, 'output_file_iterator', None) is not None:
+            output_file_iterator, self.output_file_iterator = self.output_file_iterator, None
+            if self.owns_output or output_file_iterator is self.output_pipeline:
+                output_file_iterator.close()
+            else:
+                output_file_iterator.flush()
+        if getattr(self, 'trace', None) is not None:
+            self.trace.close()
+
+    def __enter__(self):
+        """
+        Uses the network as a context manager, closed when the context exits.
+
+        Returns:
+            Network: The network itself.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the network when the context exits, whether or not an exception was raised.
+        """
+        self.close()
+
     def __del__(self):
         """
         Closes the output file when the Network object is deleted.
+        The file may not be open if the network could not be initialized.
         """
-        self.output_file_iterator.close()
+        self.close()
+
+
+def _link_key(router_id1, router_id2):
+    """
+    Identifies an undirected link.
+
+    Args:
+        router_id1 (int): The ID of the first router.
+        router_id2 (int): The ID of the second router.
+
+    Returns:
+        tuple: The lower and the higher router ID.
+    """
+    return (router_id1, router_id2) if router_id1 < router_id2 else (router_id2, router_id1)
 
 ## @}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from utilities import INFINITY
+from utilities import INFINITY, format_routing_table
 
 ## @file
 ## @brief Implementation of the Router Class, that is the parent of the DistanceVectorRouter and LinkStateRouter classes.
@@ -20,6 +20,10 @@ class Router:
     - id (int): The ID of the router.
     - neighbors (dict): A dictionary of neighbor routers and their costs.
     - routing_table (dict): A dictionary representing the routing table of the router.
+    - equal_cost_next_hops (dict): In ECMP mode, the sorted tuple of next hop IDs of every destination reached
+      through more than one equal-cost next hop. None when ECMP is off.
+    - trace (TraceRecorder): The recorder of every update of the routing table, or None.
+    - control_plane (ControlPlaneCounter): The counter of the messages sent by the router, or None.
     """
 
     def __init__(self, id):
@@ -34,8 +38,44 @@ class Router:
         """
         self.id = id
         self.neighbors = {}
+        self.trace = None
+        self.control_plane = None
         self.routing_table = {}
+        self.equal_cost_next_hops = None
+        self._next_hop_sets = None
         self.update_routing_table(self, self, 0)
+
+    def enable_ecmp(self, next_hop_sets):
+        """
+        Turns on equal-cost multipath (ECMP) routing for the router.
+
+        Parameters:
+        - next_hop_sets (dict): The next hop tuples already in use in the network, shared by all its routers
+          so that identical tuples are stored only once.
+
+        Returns:
+        - None
+        """
+        self.equal_cost_next_hops = {}
+        self._next_hop_sets = next_hop_sets
+
+    def set_equal_cost_next_hops(self, destination_id, next_hop_ids):
+        """
+        Records the equal-cost next hops of a destination in ECMP mode.
+        Destinations with a single next hop are not stored, the routing table already holds it.
+
+        Parameters:
+        - destination_id (int): The destination router ID.
+        - next_hop_ids (iterable): The IDs of all the next hops on a shortest path to the destination.
+
+        Returns:
+        - None
+        """
+        next_hop_ids = tuple(sorted(next_hop_ids))
+        if len(next_hop_ids) < 2:
+            self.equal_cost_next_hops.pop(destination_id, None)
+        else:
+            self.equal_cost_next_hops[destination_id] = self._next_hop_sets.setdefault(next_hop_ids, next_hop_ids)
     
     def add_neighbor(self, neighbor, cost):
         """
@@ -50,7 +90,24 @@ class Router:
         """
         self.neighbors[neighbor.id] =  cost
         self.update_routing_table(neighbor, neighbor, cost)
-    
+
+    def add_neighbors(self, neighbors):
+        """
+        Adds several neighbors to the router at once.
+        Equivalent to calling add_neighbor for each of them.
+
+        Parameters:
+        - neighbors (dict): A dictionary mapping neighbor router IDs to the cost to reach them.
+
+        Returns:
+        - None
+        """
+        self.neighbors.update(neighbors)
+        self.routing_table.update((neighbor_id, (neighbor_id, cost)) for neighbor_id, cost in neighbors.items())
+        if self.trace is not None:
+            for neighbor_id, cost in neighbors.items():
+                self.trace.record(self.id, neighbor_id, neighbor_id, cost)
+
     def update_routing_table(self, destination, next_hop, cost):
         """
         Updates the routing table of the router. 
@@ -70,6 +127,8 @@ class Router:
             self.routing_table[destination.id] = (None, INFINITY)
         else:
             self.routing_table[destination.id] = (next_hop.id, cost)   
+        if self.trace is not None:
+            self.trace.record(self.id, destination.id, None if next_hop is None else next_hop.id, cost)
      
     def get_next_hop_cost(self, destination_id):
         """
@@ -87,6 +146,21 @@ class Router:
             return (None, INFINITY)
         return self.routing_table[destination_id]
 
+    def get_next_hops(self, destination_id):
+        """
+        Retrieves all the equal-cost next hops to reach a destination.
+
+        Parameters:
+        - destination_id (int): The destination router id.
+
+        Returns:
+        - tuple: The sorted IDs of the next hops. Without ECMP, only the next hop of the routing table.
+        """
+        next_hop, cost = self.get_next_hop_cost(destination_id)
+        if self.equal_cost_next_hops is None:
+            return (next_hop,)
+        return self.equal_cost_next_hops.get(destination_id, (next_hop,))
+
     def get_routing_table_string(self):
         """
         Creates string representing routing table  of the router.
@@ -97,10 +171,5 @@ class Router:
         Returns:
         - str: The routing table as a string.
         """
-        routing_table_str = ""
-        for destination in sorted(self.routing_table):
-            next_hop, cost = self.routing_table[destination]
-            if cost != INFINITY:
-                routing_table_str += f"{destination} {next_hop} {cost}\n"
-        return routing_table_str
+        return format_routing_table(self.routing_table)
 ## @}
\ No newline at end of file
@@ -0,0 +1,73 @@
+## @file
+## @brief Implementation of the ShortestPathTreeIndex Class.
+# This file defines the ShortestPathTreeIndex class, which records, for every link of a Link State network,
+# the routers whose shortest path tree uses it. Routers record their tree each time they run Dijkstra's
+# algorithm. When the cost of a link goes up, or the link is removed, only the routers whose tree uses it
+# can get other routes: every other router still has all the links of its tree, at the same cost, and no
+# path became shorter. The network therefore recomputes the routing tables of those routers only.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup LSR
+## @{
+
+
+class ShortestPathTreeIndex:
+    """
+    The routers using each link in their shortest path tree.
+
+    Attributes:
+        routers_by_link (dict): The set of router IDs whose tree uses each link, as a (lower ID, higher ID) router pair.
+        links_by_router (dict): The links of the last recorded tree of each router ID.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty ShortestPathTreeIndex object.
+        """
+        self.routers_by_link = {}
+        self.links_by_router = {}
+
+    def record(self, router_id, links):
+        """
+        Records the shortest path tree of a router, replacing its previous one.
+
+        Args:
+            router_id (int): The ID of the router.
+            links (set): The links of the tree, as (lower ID, higher ID) router pairs.
+        """
+        previous_links = self.links_by_router.get(router_id, set())
+        for link in previous_links - links:
+            routers = self.routers_by_link[link]
+            routers.discard(router_id)
+            if not routers:
+                del self.routers_by_link[link]
+        for link in links - previous_links:
+            self.routers_by_link.setdefault(link, set()).add(router_id)
+        self.links_by_router[router_id] = links
+
+    def knows(self, router_id):
+        """
+        Checks whether the tree of a router was recorded.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            bool: True if the router recorded a tree.
+        """
+        return router_id in self.links_by_router
+
+    def routers_using(self, link):
+        """
+        Retrieves the routers whose tree uses a link.
+
+        Args:
+            link (tuple): The (lower ID, higher ID) router pair of the link.
+
+        Returns:
+            set: The router IDs. Shared with the index, must not be modified.
+        """
+        return self.routers_by_link.get(link, set())
+
+## @}
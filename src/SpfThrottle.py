@@ -0,0 +1,85 @@
+## @file
+## @brief Implementation of the SpfThrottle Class, the SPF scheduling of a Link State router.
+# A real router does not run Dijkstra's algorithm as soon as an LSP arrives: the first SPF after a quiet
+# period waits for an initial delay, so the other LSPs of the same event arrive first, and consecutive SPFs
+# are at least a hold time apart. The hold time doubles with every SPF requested shortly after the previous
+# one, up to a maximum, and goes back to its initial value once the router was quiet for the maximum hold
+# time. Requests made while an SPF is already scheduled are coalesced into it.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup LSR
+## @{
+
+
+class SpfThrottle:
+    """
+    The SPF throttle of a router, with exponential backoff. Times are in milliseconds.
+
+    Attributes:
+        initial_delay (int): The delay between the first request after a quiet period and the SPF.
+        hold_time (int): The initial minimum time between two SPFs.
+        max_hold (int): The maximum hold time, reached by doubling it.
+        current_hold (int): The current minimum time between two SPFs.
+        last_spf (int): The time of the last SPF, or None if the router never ran one.
+        scheduled (int): The time of the pending SPF, or None if none is pending.
+        requests (int): The number of SPF requests.
+        coalesced (int): The number of requests coalesced into an SPF that was already pending.
+    """
+
+    def __init__(self, initial_delay, hold_time, max_hold):
+        """
+        Initializes an SpfThrottle object.
+
+        Args:
+            initial_delay (int): The delay between the first request after a quiet period and the SPF.
+            hold_time (int): The initial minimum time between two SPFs.
+            max_hold (int): The maximum hold time.
+
+        Raises:
+            ValueError: If a time is negative, or the maximum hold time is shorter than the hold time.
+        """
+        if min(initial_delay, hold_time, max_hold) < 0 or max_hold < hold_time:
+            raise ValueError(f"invalid SPF throttle {initial_delay},{hold_time},{max_hold}: times must be non-negative and the maximum hold at least the hold time")
+        self.initial_delay = initial_delay
+        self.hold_time = hold_time
+        self.max_hold = max_hold
+        self.current_hold = hold_time
+        self.last_spf = None
+        self.scheduled = None
+        self.requests = 0
+        self.coalesced = 0
+
+    def request(self, now):
+        """
+        Requests an SPF, after the link state database of the router changed.
+
+        Args:
+            now (int): The current time.
+
+        Returns:
+            int: The time the SPF is scheduled at, or None if the request was coalesced into a pending SPF.
+        """
+        self.requests += 1
+        if self.scheduled is not None:
+            self.coalesced += 1
+            return None
+        if self.last_spf is None or now - self.last_spf >= self.max_hold:
+            self.current_hold = self.hold_time
+            self.scheduled = now + self.initial_delay
+        else:
+            self.scheduled = max(now + self.initial_delay, self.last_spf + self.current_hold)
+            self.current_hold = min(2 * self.current_hold, self.max_hold)
+        return self.scheduled
+
+    def run(self):
+        """
+        Marks the pending SPF as run, at the time it was scheduled at.
+
+        Returns:
+            int: The time of the SPF.
+        """
+        self.last_spf, self.scheduled = self.scheduled, None
+        return self.last_spf
+
+## @}
@@ -0,0 +1,233 @@
+import heapq
+from types import MappingProxyType
+from persistent_map import PersistentMap
+from shortest_paths import bidirectional_route, shortest_path_tree
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the TopologyVersion Class.
+# This file defines the TopologyVersion class, an immutable version of the network topology. Versions map
+# each router ID to a read-only snapshot of its neighbors in a PersistentMap, so a version derived from
+# another by a few link changes only stores the neighbors of the routers it changed, and shares the rest.
+# A network recording its history keeps one version per change, so the routes as of any change can be
+# queried, and a version can be forked with hypothetical changes ("what if this link failed?") without
+# touching the network or the other versions. Routing tables and routes are computed from the version
+# only when asked, with the tie-break rule of the protocol of the network, and remembered.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+LINK_STATE = "link_state"
+DISTANCE_VECTOR = "distance_vector"
+_NO_NEIGHBORS = MappingProxyType({})
+
+
+class TopologyVersion:
+    """
+    An immutable version of the network topology.
+
+    Attributes:
+        neighbors (PersistentMap): The read-only neighbors ({neighbor ID: cost}) of each router ID.
+        number (int): The number of changes applied to the network before this version, or None for a fork.
+        tie_break (str): LINK_STATE or DISTANCE_VECTOR, the rule choosing between equal-cost next hops.
+        parent (TopologyVersion): The version this one was derived from, or None.
+    """
+
+    def __init__(self, neighbors, number, tie_break=LINK_STATE, parent=None):
+        """
+        Initializes a TopologyVersion object.
+
+        Args:
+            neighbors (PersistentMap): The read-only neighbors of each router ID.
+            number (int): The number of changes applied to the network before this version, or None for a fork.
+            tie_break (str): LINK_STATE to reach every router from its lowest-ID predecessor on a shortest path,
+                             or DISTANCE_VECTOR to use the lowest-ID neighbor on a shortest path as next hop.
+            parent (TopologyVersion): The version this one was derived from, or None.
+        """
+        self.neighbors = neighbors
+        self.number = number
+        self.tie_break = tie_break
+        self.parent = parent
+        self._distances = {}
+        self._routing_tables = {}
+
+    @classmethod
+    def from_routers(cls, routers, number=0, tie_break=LINK_STATE):
+        """
+        Creates a version from the current neighbors of the routers of a network.
+
+        Args:
+            routers (dict): The routers of the network, keyed by ID.
+            number (int): The number of changes applied to the network.
+            tie_break (str): LINK_STATE or DISTANCE_VECTOR.
+
+        Returns:
+            TopologyVersion: The version.
+        """
+        return cls(PersistentMap({router_id: MappingProxyType(dict(router.neighbors)) for router_id, router in routers.items()}),
+                   number, tie_break)
+
+    def derive(self, routers, router_ids, number):
+        """
+        Creates the next version of a network, copying the neighbors of the routers that changed.
+
+        Args:
+            routers (dict): The routers of the network, keyed by ID.
+            router_ids (iterable): The IDs of the routers whose neighbors changed, or that were added.
+            number (int): The number of changes applied to the network.
+
+        Returns:
+            TopologyVersion: The new version.
+        """
+        changed = {router_id: MappingProxyType(dict(routers[router_id].neighbors)) for router_id in router_ids}
+        return TopologyVersion(self.neighbors.update(changed), number, self.tie_break, self)
+
+    def fork(self, link_changes):
+        """
+        Creates a hypothetical version with link changes applied. The version itself is unchanged.
+
+        Args:
+            link_changes (list): The (router1, router2, cost) link changes, cost -999 removing the link.
+                                 Routers that do not exist are added.
+
+        Returns:
+            TopologyVersion: The forked version.
+        """
+        changed = {}
+        for router_id1, router_id2, cost in link_changes:
+            for router_id, neighbor_id in ((router_id1, router_id2), (router_id2, router_id1)):
+                if router_id not in changed:
+                    changed[router_id] = dict(self.get_neighbors(router_id))
+                if cost == -999:
+                    changed[router_id].pop(neighbor_id, None)
+                else:
+                    changed[router_id][neighbor_id] = cost
+        changed = {router_id: MappingProxyType(neighbors) for router_id, neighbors in changed.items()}
+        return TopologyVersion(self.neighbors.update(changed), None, self.tie_break, self)
+
+    def fork_without_router(self, router_id):
+        """
+        Creates a hypothetical version where a router lost all its links.
+
+        Args:
+            router_id (int): The ID of the failed router.
+
+        Returns:
+            TopologyVersion: The forked version.
+        """
+        return self.fork([(router_id, neighbor_id, -999) for neighbor_id in self.get_neighbors(router_id)])
+
+    def get_neighbors(self, router_id):
+        """
+        Retrieves the neighbors of a router in this version.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            MappingProxyType: The read-only {neighbor ID: cost} dictionary, empty if the router does not exist.
+        """
+        return self.neighbors.get(router_id, _NO_NEIGHBORS)
+
+    def routers(self):
+        """
+        Lists the routers of this version.
+
+        Returns:
+            list: The sorted router IDs.
+        """
+        return sorted(self.neighbors)
+
+    def distances(self, source_id):
+        """
+        Computes the distance from a router to every router it can reach in this version.
+
+        Args:
+            source_id (int): The ID of the source router.
+
+        Returns:
+            dict: The distance of every reachable router ID.
+        """
+        if source_id not in self._distances:
+            distances = {source_id: 0}
+            heap = [(0, source_id)]
+            while heap:
+                distance, router_id = heapq.heappop(heap)
+                if distance > distances[router_id]:
+                    continue
+                for neighbor_id, cost in self.get_neighbors(router_id).items():
+                    if distance + cost < distances.get(neighbor_id, INFINITY):
+                        distances[neighbor_id] = distance + cost
+                        heapq.heappush(heap, (distance + cost, neighbor_id))
+            self._distances[source_id] = distances
+        return self._distances[source_id]
+
+    def routing_table(self, router_id):
+        """
+        Computes the routing table of a router in this version, as the network would have it.
+
+        Args:
+            router_id (int): The ID of the router.
+
+        Returns:
+            dict: The (next hop ID, cost) of every reachable destination ID, including the router itself,
+                  or an empty dictionary if the router does not exist.
+        """
+        if router_id not in self._routing_tables:
+            if router_id not in self.neighbors:
+                return {}
+            if self.tie_break == LINK_STATE:
+                distances, next_hops = shortest_path_tree(self.get_neighbors, router_id)
+            else:
+                distances = self.distances(router_id)
+                next_hops = {destination_id: self._distance_vector_next_hop(router_id, destination_id, distance)
+                             for destination_id, distance in distances.items() if destination_id != router_id}
+            routing_table = {destination_id: (next_hops[destination_id], distance)
+                             for destination_id, distance in distances.items() if destination_id != router_id}
+            routing_table[router_id] = (router_id, 0)
+            self._routing_tables[router_id] = routing_table
+        return self._routing_tables[router_id]
+
+    def _distance_vector_next_hop(self, router_id, destination_id, distance):
+        """
+        Finds the lowest-ID neighbor of a router lying on a shortest path to a destination.
+
+        Args:
+            router_id (int): The ID of the router.
+            destination_id (int): The ID of the destination.
+            distance (int): The distance from the router to the destination.
+
+        Returns:
+            int: The ID of the next hop.
+        """
+        return min(neighbor_id for neighbor_id, cost in self.get_neighbors(router_id).items()
+                   if cost + self.distances(neighbor_id).get(destination_id, INFINITY) == distance)
+
+    def route(self, source_id, destination_id):
+        """
+        Finds the route of a message in this version, following the routing tables hop by hop.
+
+        Args:
+            source_id (int): The ID of the source router.
+            destination_id (int): The ID of the destination router.
+
+        Returns:
+            tuple: The list of router IDs on the path, from source to destination, and the total cost.
+                   (None, INFINITY) if the destination cannot be reached.
+        """
+        if source_id not in self.neighbors or destination_id not in self.neighbors:
+            return None, INFINITY
+        if self.tie_break == LINK_STATE:
+            return bidirectional_route(self.get_neighbors, source_id, destination_id)
+        to_destination = self.distances(destination_id)
+        if source_id not in to_destination:
+            return None, INFINITY
+        path = [source_id]
+        while path[-1] != destination_id:
+            path.append(min(neighbor_id for neighbor_id, cost in self.get_neighbors(path[-1]).items()
+                            if cost + to_destination.get(neighbor_id, INFINITY) == to_destination[path[-1]]))
+        return path, to_destination[source_id]
+
+## @}
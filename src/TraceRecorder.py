@@ -0,0 +1,180 @@
+import struct
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the TraceRecorder Class, a binary log of every routing table update.
+# The output file only shows the routing tables once they converged after each change. A TraceRecorder
+# logs every update of a routing table, including the transient ones made while the protocol converges,
+# as fixed-size binary records: the index of the change being applied (0 while the initial topology
+# converges), the kind of record, the router, the destination, the next hop and the cost. Records are
+# buffered and written in large blocks, or kept in a ring holding only the most recent ones, written when
+# the recorder is closed. The inspect_trace.py script summarizes, dumps and replays trace files.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+MAGIC = b"RTTR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQ")  # magic, format version, record size, number of dropped records
+RECORD = struct.Struct("<IBiiiq")  # change index, kind, router, destination, next hop, cost
+ROUTE = 0  # The route of the router to the destination was set
+CLEAR = 1  # The routing table of the router was emptied before being recomputed
+UNREACHABLE = -1  # The cost of a route to an unreachable destination, whose next hop is then 0
+BUFFERED_RECORDS = 1 << 12
+
+
+class TraceRecorder:
+    """
+    Records the routing table updates of a network in a binary trace file.
+
+    Records are packed into a preallocated buffer. Once it is full, the buffer is written to the trace
+    file, or, in a ring, the next records overwrite the oldest ones.
+
+    Attributes:
+        path (str): The path to the trace file.
+        ring_size (int): The number of most recent records kept, or None to keep all of them.
+        change_index (int): The index of the change being applied, stored in every record.
+    """
+
+    def __init__(self, path, ring_size=None):
+        """
+        Initializes a TraceRecorder object. Without a ring, the trace file is created right away.
+
+        Args:
+            path (str): The path to the trace file.
+            ring_size (int): The number of most recent records kept and written when the recorder is closed, or None to write every record.
+
+        Raises:
+            ValueError: If the ring size is not positive.
+        """
+        if ring_size is not None and ring_size < 1:
+            raise ValueError(f"the trace ring must hold at least one record, got {ring_size}")
+        self.path = path
+        self.ring_size = ring_size
+        self.change_index = 0
+        self._buffer = bytearray((BUFFERED_RECORDS if ring_size is None else ring_size) * RECORD.size)
+        self._offset = 0
+        self._full_buffers = 0
+        self._file = None
+        if ring_size is None:
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, 0))
+        self._closed = False
+
+    @property
+    def records(self):
+        """
+        The number of records made, including those dropped from the ring.
+        """
+        return (self._full_buffers * len(self._buffer) + self._offset) // RECORD.size
+
+    def record(self, router_id, destination_id, next_hop_id, cost, kind=ROUTE):
+        """
+        Records the update of a route. Called for every update, so the record is packed in place.
+
+        Args:
+            router_id (int): The ID of the router whose routing table is updated.
+            destination_id (int): The ID of the destination.
+            next_hop_id (int): The ID of the next hop, ignored if the cost is INFINITY.
+            cost (int): The cost to the destination, or INFINITY if it is unreachable.
+            kind (int): ROUTE, or CLEAR if the routing table of the router was emptied.
+        """
+        if cost == INFINITY:
+            next_hop_id, cost = 0, UNREACHABLE
+        RECORD.pack_into(self._buffer, self._offset, self.change_index, kind, router_id, destination_id, next_hop_id, cost)
+        self._offset += RECORD.size
+        if self._offset == len(self._buffer):
+            self._buffer_full()
+
+    def record_clear(self, router_id):
+        """
+        Records that the routing table of a router was emptied, before it is recomputed from scratch.
+
+        Args:
+            router_id (int): The ID of the router.
+        """
+        self.record(router_id, 0, 0, 0, CLEAR)
+
+    def _buffer_full(self):
+        """
+        Writes the full buffer to the trace file, or starts overwriting the oldest records of the ring.
+        """
+        if self._file is not None:
+            self._file.write(self._buffer)
+        self._full_buffers += 1
+        self._offset = 0
+
+    def close(self):
+        """
+        Writes the remaining records and closes the trace file. Closing twice has no effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._file is not None:
+            self._file.write(memoryview(self._buffer)[:self._offset])
+            self._file.close()
+            return
+        dropped = max(0, self.records - self.ring_size)
+        with open(self.path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size, dropped))
+            # Once the ring is full, the oldest record is the one the next record would overwrite
+            if self._full_buffers:
+                file.write(memoryview(self._buffer)[self._offset:])
+            file.write(memoryview(self._buffer)[:self._offset])
+
+
+def read_trace(path):
+    """
+    Reads a trace file.
+
+    Args:
+        path (str): The path to the trace file.
+
+    Returns:
+        tuple: The number of records dropped from the ring, and the list of (change index, kind, router,
+               destination, next hop, cost) records, oldest first. Unreachable routes have the cost INFINITY
+               and the next hop None.
+
+    Raises:
+        ValueError: If the file is not a trace file.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a trace file")
+    magic, version, record_size, dropped = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size or (len(data) - HEADER.size) % RECORD.size:
+        raise ValueError(f"{path} is not a trace file of format version {FORMAT_VERSION}")
+    records = []
+    for change_index, kind, router_id, destination_id, next_hop_id, cost in RECORD.iter_unpack(memoryview(data)[HEADER.size:]):
+        if kind == ROUTE and cost == UNREACHABLE:
+            next_hop_id, cost = None, INFINITY
+        records.append((change_index, kind, router_id, destination_id, next_hop_id, cost))
+    return dropped, records
+
+
+def replay(records, change_index=None):
+    """
+    Rebuilds the routing tables of the routers from the records of a complete trace.
+
+    Args:
+        records (list): The records of the trace, as returned by read_trace.
+        change_index (int): The change after which the routing tables are rebuilt, or None for the end of the trace.
+
+    Returns:
+        dict: The routing table of each router ID, mapping destination IDs to (next hop, cost) pairs.
+    """
+    routing_tables = {}
+    for record_change, kind, router_id, destination_id, next_hop_id, cost in records:
+        if change_index is not None and record_change > change_index:
+            break
+        if kind == CLEAR:
+            routing_tables[router_id] = {}
+        else:
+            routing_tables.setdefault(router_id, {})[destination_id] = (next_hop_id, cost)
+    return routing_tables
+
+## @}
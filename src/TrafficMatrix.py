@@ -0,0 +1,155 @@
+import heapq
+from collections import Counter, defaultdict
+from input_parser import parse_integer_file
+from utilities import INFINITY
+
+## @file
+## @brief Implementation of the TrafficMatrix Class.
+# This file defines the TrafficMatrix class, which holds (source, destination, volume) demands and computes
+# the load they put on every link and router under the current routing tables. Demands are grouped by
+# destination. For each destination, the next hops toward it form a tree (a directed acyclic graph with
+# equal-cost multipath), which is walked once from the sources down to the destination: every router adds
+# the volume it receives to its own demands and passes the total on to its next hops, split evenly between
+# equal-cost next hops. The cost therefore depends on the number of routers carrying traffic to each
+# destination, not on the number of demands.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+
+def format_volume(volume):
+    """
+    Formats a traffic volume, without decimals when it is a whole number.
+
+    Args:
+        volume (float): The volume.
+
+    Returns:
+        str: The formatted volume.
+    """
+    if volume == int(volume):
+        return str(int(volume))
+    return f"{volume:.2f}"
+
+
+class TrafficMatrix:
+    """
+    A set of traffic demands between routers.
+
+    Attributes:
+        demands (dict): For each destination router ID, a dictionary mapping source router IDs to the total volume sent.
+        total_volume (int): The total volume of all demands.
+    """
+
+    def __init__(self, traffic_file):
+        """
+        Initializes a TrafficMatrix object from a traffic file.
+        Demands with the same source and destination are added up.
+
+        Args:
+            traffic_file (str): The path to the (optionally gzip-compressed) traffic file, where every line is "source destination volume".
+        """
+        values = parse_integer_file(traffic_file, 3)
+        volumes = Counter()
+        for source_id, destination_id, volume in zip(values[0::3], values[1::3], values[2::3]):
+            volumes[(destination_id, source_id)] += volume
+
+        self.demands = {}
+        for (destination_id, source_id), volume in volumes.items():
+            self.demands.setdefault(destination_id, {})[source_id] = volume
+        self.total_volume = sum(volumes.values())
+
+    def load(self, routers):
+        """
+        Computes the load of every link and router under the current routing tables.
+
+        Args:
+            routers (dict): The routers of the network, keyed by ID.
+
+        Returns:
+            tuple: A dictionary mapping each directed link (router ID, next hop ID) to its load, a dictionary
+                   mapping each router ID to the volume it originated, forwarded or received, and the volume delivered.
+                   Volume that cannot reach its destination is not counted in any load.
+        """
+        link_loads = defaultdict(int)
+        router_loads = defaultdict(int)
+        delivered = 0
+        for destination_id, sources in self.demands.items():
+            if destination_id in routers:
+                delivered += self._load_destination(routers, destination_id, sources, link_loads, router_loads)
+        return link_loads, router_loads, delivered
+
+    def _load_destination(self, routers, destination_id, sources, link_loads, router_loads):
+        """
+        Adds the load of the demands toward one destination.
+
+        The routers carrying these demands are found by following the next hops from the sources. They are
+        then visited once each, a router being visited only after every router forwarding to it, so it passes
+        on all the volume it receives at once.
+
+        Args:
+            routers (dict): The routers of the network, keyed by ID.
+            destination_id (int): The destination router ID.
+            sources (dict): The volume sent to the destination by each source router ID.
+            link_loads (defaultdict): The load of each directed link, updated in place.
+            router_loads (defaultdict): The load of each router, updated in place.
+
+        Returns:
+            int: The volume that reached the destination.
+        """
+        volumes = {source_id: volume for source_id, volume in sources.items() if source_id in routers}
+
+        next_hops = {}
+        pending = list(volumes)
+        while pending:
+            router_id = pending.pop()
+            if router_id == destination_id or router_id in next_hops:
+                continue
+            router = routers[router_id]
+            if router.get_next_hop_cost(destination_id)[1] == INFINITY:
+                next_hops[router_id] = ()
+            else:
+                next_hops[router_id] = router.get_next_hops(destination_id)
+                pending.extend(next_hops[router_id])
+
+        in_degree = Counter(next_hop_id for hops in next_hops.values() for next_hop_id in hops)
+        ready = [router_id for router_id in next_hops if in_degree[router_id] == 0]
+        while ready:
+            router_id = ready.pop()
+            hops = next_hops[router_id]
+            if not hops:
+                continue
+            volume = volumes.get(router_id, 0)
+            router_loads[router_id] += volume
+            share = volume / len(hops) if len(hops) > 1 else volume
+            for next_hop_id in hops:
+                link_loads[(router_id, next_hop_id)] += share
+                volumes[next_hop_id] = volumes.get(next_hop_id, 0) + share
+                in_degree[next_hop_id] -= 1
+                if in_degree[next_hop_id] == 0 and next_hop_id != destination_id:
+                    ready.append(next_hop_id)
+
+        delivered = volumes.get(destination_id, 0)
+        router_loads[destination_id] += delivered
+        return delivered
+
+    def report(self, routers, top_links):
+        """
+        Summarizes the load under the current routing tables.
+
+        Args:
+            routers (dict): The routers of the network, keyed by ID.
+            top_links (int): The number of most loaded links to list.
+
+        Returns:
+            str: The delivered and undelivered volumes, followed by the most loaded links, highest load first.
+        """
+        link_loads, router_loads, delivered = self.load(routers)
+        report = f"traffic delivered {format_volume(delivered)} undelivered {format_volume(self.total_volume - delivered)}\n"
+        for (router_id, next_hop_id), load in heapq.nsmallest(top_links, link_loads.items(), key=lambda item: (-item[1], item[0])):
+            report += f"link {router_id} {next_hop_id} load {format_volume(load)}\n"
+        return report
+
+## @}
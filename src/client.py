@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import socket
+import sys
+from server import DEFAULT_SOCKET
+
+## @file
+## @brief Thin client of the simulator server.
+## This script runs a simulation on a running server.py instead of starting the simulator, with the same
+## arguments as dvr.py, lsr.py and dual.py, preceded by the protocol:
+## "python src/client.py lsr topology.txt messages.txt changes.txt output.txt --lazy". Relative paths are
+## resolved from the directory the client is run in. The SimulatorClient class can also be used to send
+## many requests, including session requests, over a single connection.
+##
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+
+class SimulatorClient:
+    """
+    A connection to the simulator server.
+
+    Attributes:
+        connection (socket): The connected Unix socket.
+        responses (file): The file reading the responses from the socket.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        """
+        Initializes a SimulatorClient object and connects to the server.
+
+        Args:
+            socket_path (str): The path of the Unix socket of the server.
+
+        Raises:
+            OSError: If no server is listening on the socket.
+        """
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.connection.connect(socket_path)
+        except OSError:
+            self.connection.close()
+            raise
+        self.responses = self.connection.makefile('rb')
+
+    def request(self, command, **fields):
+        """
+        Sends a request to the server and waits for its response.
+        The current directory is sent with the request, so that relative paths are resolved from it.
+
+        Args:
+            command (str): The command of the request: run, open, change, messages, query, tables, close or shutdown.
+            **fields: The other fields of the request.
+
+        Returns:
+            dict: The response of the server.
+
+        Raises:
+            ConnectionError: If the server closed the connection.
+        """
+        request = dict(fields, command=command, cwd=os.getcwd())
+        self.connection.sendall(json.dumps(request).encode() + b"\n")
+        line = self.responses.readline()
+        if not line:
+            raise ConnectionError("the server closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        """
+        Closes the connection to the server.
+        """
+        self.responses.close()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """
+    Main function to run a simulation on the simulator server.
+
+    Args:
+        [--socket] (str): The path of the Unix socket of the server.
+        protocol (str): The protocol to simulate: dvr, lsr or dual.
+        arguments (list): The command line arguments of the protocol script.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Runs a routing simulation on the simulator server.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"path of the Unix socket of the server (default: {DEFAULT_SOCKET})")
+    parser.add_argument("protocol", choices=("dvr", "lsr", "dual"), help="protocol to simulate")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help="arguments of the protocol script")
+    args = parser.parse_args()
+
+    try:
+        with SimulatorClient(args.socket) as client:
+            response = client.request("run", protocol=args.protocol, arguments=args.arguments)
+    except OSError as error:
+        sys.exit(f"{parser.prog}: cannot reach the simulator server on {args.socket}: {error}")
+    if not response["ok"]:
+        sys.exit(response["error"])
+    print(response["report"], end="")
+
+
+if __name__ == "__main__":
+    main()
+
+## @}
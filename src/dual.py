@@ -0,0 +1,91 @@
+from DualNetwork import DualNetwork
+from utilities import parseArgs, createArgParser
+from result_cache import run_cached
+from TraceRecorder import TraceRecorder
+from ControlPlaneCounter import ControlPlaneCounter
+
+## @file
+## @brief Main file to run the Diffusing Update Algorithm.
+##
+## This script serves as the entry point for simulating a network utilizing the Diffusing Update Algorithm (DUAL).
+## Once every change is applied, it prints how many changes were handled locally and how many were diffused.
+##
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup DUAL
+## @{
+def createParser():
+    """
+    Creates the command line parser of the Diffusing Update Algorithm simulation.
+
+    Returns:
+        ArgumentParser: The command line parser.
+    """
+    return createArgParser("Diffusing Update Algorithm simulation.")
+
+
+def createNetwork(args):
+    """
+    Creates the network of the Diffusing Update Algorithm simulation.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        DualNetwork: The network, with the traffic, shared risk link groups, pipelined output, trace and control plane counter of the arguments.
+    """
+    trace = None if args.trace is None else TraceRecorder(args.trace, args.trace_ring)
+    control_plane = None if args.control_plane is None else ControlPlaneCounter(args.control_plane)
+    network = DualNetwork(args.topology_file, args.output_file, args.routers, trace, control_plane)
+    if args.traffic is not None:
+        network.load_traffic(args.traffic, args.top_links)
+    if args.srlg is not None:
+        network.load_shared_risk_link_groups(args.srlg)
+    if args.pipeline is not None:
+        network.enable_pipeline(args.pipeline)
+    return network
+
+
+def run(args):
+    """
+    Runs the Diffusing Update Algorithm simulation, through the result cache with --cache.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        str: The convergence report of the network, followed by the control plane report with --control-plane.
+    """
+    return run_cached(args, "dual", createNetwork, lambda network: network.convergence_report() + network.control_plane_report())
+
+
+def main():
+    """
+    Main function to run the Diffusing Update Algorithm.
+
+    Args:
+        topology_file (str): The file containing the network topology.
+        message_file (str): The file containing the messages to be sent.
+        changes_file (str): The file containing the changes to be applied to the network.
+        [output_file] (str): The file to output the results to.
+        [--routers] (str): Comma separated IDs of the routers whose routing tables are written.
+        [--traffic] (str): A file of "source destination volume" demands. The most loaded links are written after each change.
+        [--top-links] (int): The number of most loaded links written with --traffic.
+        [--pipeline] (int): Format and write the output on a background thread, with at most this many states waiting.
+        [--srlg] (str): A file of "group router1 router2" lines defining the shared risk link groups failed and recovered by srlg events.
+        [--cache] (str): A directory of stored results, reused for identical runs and resumed for runs extending their changes.
+        [--cache-size] (int): The size cap of the cache directory, in MiB.
+        [--trace] (str): A binary file recording every routing table update, read by inspect_trace.py.
+        [--trace-ring] (int): Only keep the last records of the trace, written at the end of the run.
+        [--control-plane] (str): Count the protocol messages and their bytes in the full or delta wire encoding, and print them per change.
+
+    Returns:
+        None
+    """
+    print(run(parseArgs(createParser())), end="")
+
+if __name__ == "__main__":
+    main()
+
+## @}
@@ -1,5 +1,8 @@
 from DistanceVectorNetwork import DistanceVectorNetwork
-from utilities import parseArgs
+from utilities import parseArgs, createArgParser
+from result_cache import run_cached
+from TraceRecorder import TraceRecorder
+from ControlPlaneCounter import ControlPlaneCounter
 
 ## @file
 ## @brief Main file to run the Distance Vector Routing Algorithm.
@@ -11,6 +14,62 @@ from utilities import parseArgs
 ## @bug No known bugs.
 ## @addtogroup DVR 
 ## @{
+def createParser():
+    """
+    Creates the command line parser of the Distance Vector Routing simulation.
+
+    Returns:
+        ArgumentParser: The command line parser.
+    """
+    parser = createArgParser("Distance Vector Routing simulation.")
+    parser.add_argument("--ecmp", action="store_true", help="keep every equal-cost next hop and spread the messages over them by flow")
+    parser.add_argument("--shards", type=int, metavar="N", help="partition the routers across N worker processes and print how well they scale")
+    return parser
+
+
+def createNetwork(args):
+    """
+    Creates the network of the Distance Vector Routing simulation.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        DistanceVectorNetwork: The network, with the traffic, shared risk link groups, pipelined output, trace, control plane
+                               counter and shards of the arguments.
+
+    Raises:
+        ValueError: If --control-plane is given with --shards.
+    """
+    trace = None if args.trace is None else TraceRecorder(args.trace, args.trace_ring)
+    control_plane = None if args.control_plane is None else ControlPlaneCounter(args.control_plane)
+    network = DistanceVectorNetwork(args.topology_file, args.output_file, args.routers, args.ecmp, trace, control_plane, args.shards)
+    if args.traffic is not None:
+        network.load_traffic(args.traffic, args.top_links)
+    if args.srlg is not None:
+        network.load_shared_risk_link_groups(args.srlg)
+    if args.pipeline is not None:
+        network.enable_pipeline(args.pipeline)
+    return network
+
+
+def run(args):
+    """
+    Runs the Distance Vector Routing simulation, through the result cache with --cache.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        str: The text to print once the simulation is done: the control plane report with --control-plane and the shard
+             report with --shards, otherwise empty.
+
+    Raises:
+        ValueError: If --control-plane is given with --shards.
+    """
+    return run_cached(args, "dvr", createNetwork, lambda network: network.control_plane_report() + network.shard_report())
+
+
 def main():
     """
     Main function to run the Distance Vector Routing Algorithm.
@@ -20,16 +79,24 @@ def main():
         message_file (str): The file containing the messages to be sent.
         changes_file (str): The file containing the changes to be applied to the network.
         [output_file] (str): The file to output the results to.
+        [--routers] (str): Comma separated IDs of the routers whose routing tables are written.
+        [--ecmp]: Keep every equal-cost next hop and spread the messages over them by flow.
+        [--traffic] (str): A file of "source destination volume" demands. The most loaded links are written after each change.
+        [--top-links] (int): The number of most loaded links written with --traffic.
+        [--pipeline] (int): Format and write the output on a background thread, with at most this many states waiting.
+        [--srlg] (str): A file of "group router1 router2" lines defining the shared risk link groups failed and recovered by srlg events.
+        [--cache] (str): A directory of stored results, reused for identical runs and resumed for runs extending their changes.
+        [--cache-size] (int): The size cap of the cache directory, in MiB.
+        [--trace] (str): A binary file recording every routing table update, read by inspect_trace.py.
+        [--trace-ring] (int): Only keep the last records of the trace, written at the end of the run.
+        [--control-plane] (str): Count the protocol messages and their bytes in the full or delta wire encoding, and print them per change.
+        [--shards] (int): Partition the routers across this many worker processes, and print the links between shards,
+                          the rounds of distance vector exchanges and the parallel efficiency. Not available with --control-plane.
 
     Returns:
         None
     """
-    args = parseArgs()
-    topology_file, message_file, changes_file, output_file  = args
-
-    network = DistanceVectorNetwork(topology_file, output_file)
-    network.apply_changes_and_output(changes_file, message_file)
-
+    print(run(parseArgs(createParser())), end="")
 
 if __name__ == "__main__":
     main()
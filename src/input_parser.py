@@ -0,0 +1,334 @@
+import array
+import gzip
+import re
+
+## @file
+## @brief Shared parsers for the topology, message and changes input files.
+# Input files are read in large chunks. Integer files (topologies and changes) are split, checked
+# and converted to flat arrays of 64 bit integers a whole chunk at a time, so no Python code runs per line
+# unless a chunk contains blank or malformed lines. Malformed lines, values out of range included, are reported
+# with their file name and line number through InputFormatError. Changes files may also contain node
+# and shared risk link group events, which are parsed line by line. Message files are scanned a chunk
+# at a time by a single regular expression into (source, destination, message) entries, keeping the message text
+# exactly as written.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+GZIP_MAGIC = b"\x1f\x8b"
+CHUNK_SIZE = 1 << 22
+
+_INTEGER = r"[+-]?\d+"
+_MESSAGE_LINE = re.compile(rf"^({_INTEGER}) ({_INTEGER}) (.*\n?)", re.MULTILINE)
+_BLANK_LINE = re.compile(r"^[^\S\n]*$", re.MULTILINE)
+_LINE_SEPARATOR = ";"
+CHANGE_EVENTS = ("node", "srlg")
+INTEGER_TYPECODE = 'q'
+
+
+class InputFormatError(ValueError):
+    """
+    Raised when an input file contains a malformed line.
+
+    Attributes:
+        path (str): The path to the input file.
+        line_number (int): The number of the malformed line, starting at 1.
+        line (str): The malformed line.
+    """
+
+    def __init__(self, path, line_number, line, expected):
+        """
+        Initializes an InputFormatError.
+
+        Args:
+            path (str): The path to the input file.
+            line_number (int): The number of the malformed line, starting at 1.
+            line (str): The malformed line.
+            expected (str): A description of the expected line format.
+        """
+        super().__init__(f"{path}:{line_number}: expected {expected}, got {line.rstrip()!r}")
+        self.path = path
+        self.line_number = line_number
+        self.line = line
+
+
+def open_text(path):
+    """
+    Opens a text input file, transparently decompressing it if it is gzip-compressed.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        file: A text file object.
+    """
+    with open(path, 'rb') as file:
+        magic = file.read(len(GZIP_MAGIC))
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, 'rt')
+    return open(path, 'r')
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE):
+    """
+    Reads a text file in large chunks that always end on a line boundary.
+
+    Args:
+        file (file): The text file object to read.
+        chunk_size (int): The approximate number of characters per chunk.
+
+    Yields:
+        str: A chunk made of complete lines.
+    """
+    remainder = ""
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            break
+        data = remainder + data
+        cut = data.rfind("\n") + 1
+        if cut == 0:
+            remainder = data
+            continue
+        remainder = data[cut:]
+        yield data[:cut]
+    if remainder:
+        yield remainder
+
+
+def _is_integer(field):
+    """
+    Checks if a field is an integer that fits in the arrays of parsed values.
+
+    Args:
+        field (str): The field.
+
+    Returns:
+        bool: True if the field is a 64 bit integer, False otherwise.
+    """
+    return re.fullmatch(_INTEGER, field) is not None and -(1 << 63) <= int(field) < (1 << 63)
+
+
+def _parse_integer_chunk(chunk, columns):
+    """
+    Parses a chunk of lines with a fixed number of integer columns in bulk.
+
+    Every line break is turned into a separator token, so the whole chunk is split and checked
+    with a handful of C-level operations instead of a Python loop per line.
+
+    Args:
+        chunk (str): The chunk of complete lines.
+        columns (int): The number of integer columns per line.
+
+    Returns:
+        array: The values of the chunk, or None if some line is blank, malformed or out of range.
+    """
+    if not chunk.endswith("\n"):
+        chunk += "\n"
+    tokens = chunk.replace("\n", f" {_LINE_SEPARATOR} ").split()
+    stride = columns + 1
+    line_count = len(tokens) // stride
+    if len(tokens) % stride != 0 or line_count != chunk.count("\n"):
+        return None
+    if tokens[columns::stride].count(_LINE_SEPARATOR) != line_count:
+        return None
+    del tokens[columns::stride]
+    try:
+        return array.array(INTEGER_TYPECODE, map(int, tokens))
+    except (ValueError, OverflowError):
+        return None
+
+
+def _parse_integer_lines(path, chunk, first_line_number, columns):
+    """
+    Parses a chunk of lines one line at a time, skipping blank lines.
+    Used when bulk parsing of the chunk fails, to locate malformed lines.
+
+    Args:
+        path (str): The path to the input file.
+        chunk (str): The chunk of complete lines.
+        first_line_number (int): The line number of the first line in the chunk.
+        columns (int): The number of integer columns per line.
+
+    Returns:
+        array: The values of the chunk.
+
+    Raises:
+        InputFormatError: If a line does not have exactly `columns` 64 bit integers.
+    """
+    values = array.array(INTEGER_TYPECODE)
+    for offset, line in enumerate(chunk.split("\n")):
+        fields = line.split()
+        if not fields:
+            continue
+        try:
+            if len(fields) != columns:
+                raise ValueError
+            values.extend([int(field) for field in fields])
+        except (ValueError, OverflowError):
+            raise InputFormatError(path, first_line_number + offset, line, f"{columns} 64 bit integer fields") from None
+    return values
+
+
+def parse_integer_file(path, columns):
+    """
+    Parses a text file made of lines with a fixed number of integer columns.
+
+    Args:
+        path (str): The path to the (optionally gzip-compressed) file.
+        columns (int): The number of integer columns per line.
+
+    Returns:
+        array: A flat array with the values of every line, in order.
+
+    Raises:
+        InputFormatError: If a line does not have exactly `columns` 64 bit integers.
+    """
+    values = array.array(INTEGER_TYPECODE)
+    line_number = 1
+    with open_text(path) as file:
+        for chunk in read_chunks(file):
+            chunk_values = _parse_integer_chunk(chunk, columns)
+            if chunk_values is None:
+                chunk_values = _parse_integer_lines(path, chunk, line_number, columns)
+            values.extend(chunk_values)
+            line_number += chunk.count("\n")
+    return values
+
+
+def parse_topology_file(topology_file):
+    """
+    Parses a text topology file where every line is "router1 router2 cost".
+
+    Args:
+        topology_file (str): The path to the (optionally gzip-compressed) topology file.
+
+    Returns:
+        array: A flat array of (router1, router2, cost) triples.
+    """
+    return parse_integer_file(topology_file, 3)
+
+
+def parse_changes_file(changes_file):
+    """
+    Parses a changes file where every line is "router1 router2 cost", or an event failing or recovering
+    all the links of a router ("node router down" or "node router up") or of a shared risk link group
+    ("srlg group down" or "srlg group up").
+
+    Args:
+        changes_file (str): The path to the changes file.
+
+    Returns:
+        list: A list of (router1, router2, cost) tuples, and ("node" or "srlg", ID, "down" or "up") tuples for events, in file order.
+
+    Raises:
+        InputFormatError: If a line is neither a link change nor an event.
+    """
+    try:
+        values = parse_integer_file(changes_file, 3)
+    except InputFormatError:
+        return _parse_change_lines(changes_file)
+    return list(zip(values[0::3], values[1::3], values[2::3]))
+
+
+def _parse_change_lines(changes_file):
+    """
+    Parses a changes file containing events one line at a time.
+
+    Args:
+        changes_file (str): The path to the changes file.
+
+    Returns:
+        list: The link changes and events of the file, in file order.
+
+    Raises:
+        InputFormatError: If a line is neither a link change nor an event.
+    """
+    changes = []
+    with open_text(changes_file) as file:
+        for line_number, line in enumerate(file, 1):
+            fields = line.split()
+            if not fields:
+                continue
+            if (len(fields) == 3 and fields[0] in CHANGE_EVENTS and re.fullmatch(_INTEGER, fields[1])
+                    and fields[2] in ("down", "up")):
+                changes.append((fields[0], int(fields[1]), fields[2]))
+            elif len(fields) == 3 and all(re.fullmatch(_INTEGER, field) for field in fields):
+                changes.append(tuple(int(field) for field in fields))
+            else:
+                raise InputFormatError(changes_file, line_number, line,
+                                       "\"router1 router2 cost\", \"node router down|up\" or \"srlg group down|up\"")
+    return changes
+
+
+def _parse_message_chunk(chunk):
+    """
+    Parses a chunk of message lines in bulk.
+
+    A single regular expression scan finds the lines starting with two integer router IDs, and the IDs of the
+    whole chunk are converted to arrays at once. The chunk is only accepted if every line that is not blank matched.
+
+    Args:
+        chunk (str): The chunk of complete lines.
+
+    Returns:
+        list: The (source, destination, message) tuples of the chunk, or None if some line is malformed or out of range.
+    """
+    entries = _MESSAGE_LINE.findall(chunk)
+    text = chunk[:-1] if chunk.endswith("\n") else chunk
+    if len(entries) != text.count("\n") + 1 - len(_BLANK_LINE.findall(text)):
+        return None
+    try:
+        sources = array.array(INTEGER_TYPECODE, map(int, [entry[0] for entry in entries]))
+        destinations = array.array(INTEGER_TYPECODE, map(int, [entry[1] for entry in entries]))
+    except OverflowError:
+        return None
+    return list(zip(sources, destinations, [entry[2] for entry in entries]))
+
+
+def _report_message_line(message_file, chunk, first_line_number):
+    """
+    Finds the first malformed line of a chunk of message lines, after bulk parsing of the chunk failed.
+
+    Args:
+        message_file (str): The path to the message file.
+        chunk (str): The chunk of complete lines.
+        first_line_number (int): The line number of the first line in the chunk.
+
+    Raises:
+        InputFormatError: For the first line that does not start with two integer router IDs.
+    """
+    for offset, line in enumerate(chunk.splitlines(True)):
+        field = line.split(" ", 2)
+        if line.strip() and (len(field) < 3 or not _is_integer(field[0]) or not _is_integer(field[1])):
+            raise InputFormatError(message_file, first_line_number + offset, line, "\"source destination message\"")
+
+
+def parse_message_file(message_file):
+    """
+    Parses a message file where every line is "source destination message".
+    The message keeps everything after the second space, including its line break.
+
+    Args:
+        message_file (str): The path to the message file.
+
+    Returns:
+        list: A list of (source, destination, message) tuples, in file order.
+
+    Raises:
+        InputFormatError: If a line does not start with two integer router IDs.
+    """
+    messages = []
+    line_number = 1
+    with open_text(message_file) as file:
+        for chunk in read_chunks(file):
+            entries = _parse_message_chunk(chunk)
+            if entries is None:
+                _report_message_line(message_file, chunk, line_number)
+            messages.extend(entries)
+            line_number += chunk.count("\n")
+    return messages
+
+## @}
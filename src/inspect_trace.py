@@ -0,0 +1,133 @@
+import argparse
+from collections import Counter
+from TraceRecorder import CLEAR, read_trace, replay
+from utilities import format_routing_table
+
+## @file
+## @brief Main file to inspect the binary traces written with --trace.
+## This script reads a trace of routing table updates and either summarizes it (updates per change, and the
+## routes updated most often, which reveal transient loops and flapping), dumps its records as text, filtered by
+## change, router or destination, or replays it to write the routing tables after a change in the format of
+## the output file. Only complete traces can be replayed, not rings that dropped their oldest records.
+##
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+
+def summarize(dropped, records, top=10):
+    """
+    Summarizes a trace.
+
+    Args:
+        dropped (int): The number of records dropped from the ring.
+        records (list): The records of the trace, as returned by read_trace.
+        top (int): The number of most updated routes listed.
+
+    Returns:
+        str: The number of records, the updates and routers updated during each change, and the most updated routes.
+    """
+    summary = f"records: {len(records)}\ndropped records: {dropped}\n"
+    updates = Counter()
+    routers = {}
+    routes = Counter()
+    for change_index, kind, router_id, destination_id, next_hop_id, cost in records:
+        updates[change_index] += 1
+        routers.setdefault(change_index, set()).add(router_id)
+        if kind != CLEAR:
+            routes[router_id, destination_id] += 1
+    for change_index in sorted(updates):
+        summary += f"change {change_index}: {updates[change_index]} updates of {len(routers[change_index])} routers\n"
+    for (router_id, destination_id), count in routes.most_common(top):
+        summary += f"router {router_id} destination {destination_id}: {count} updates\n"
+    return summary
+
+
+def dump(records, change_index=None, router_id=None, destination_id=None):
+    """
+    Formats the records of a trace as text, one per line.
+
+    Args:
+        records (list): The records of the trace, as returned by read_trace.
+        change_index (int): Only keep the records of this change, or None.
+        router_id (int): Only keep the records of this router, or None.
+        destination_id (int): Only keep the routes to this destination, or None.
+
+    Returns:
+        str: The "change router destination next_hop cost" lines, "change router clear" for emptied routing tables.
+    """
+    lines = []
+    for record_change, kind, record_router, record_destination, next_hop_id, cost in records:
+        if (change_index is not None and record_change != change_index) or (router_id is not None and record_router != router_id):
+            continue
+        if kind == CLEAR:
+            if destination_id is None:
+                lines.append(f"{record_change} {record_router} clear\n")
+        elif destination_id is None or record_destination == destination_id:
+            lines.append(f"{record_change} {record_router} {record_destination} {next_hop_id} {cost}\n")
+    return "".join(lines)
+
+
+def replay_output(dropped, records, change_index=None):
+    """
+    Replays a trace and formats the routing tables as written to the output file.
+
+    Args:
+        dropped (int): The number of records dropped from the ring.
+        records (list): The records of the trace, as returned by read_trace.
+        change_index (int): The change after which the routing tables are written, or None for the end of the trace.
+
+    Returns:
+        str: The routing table of every router, in increasing router order, each followed by an empty line.
+
+    Raises:
+        ValueError: If records were dropped from the trace.
+    """
+    if dropped:
+        raise ValueError(f"cannot replay a trace whose {dropped} oldest records were dropped")
+    routing_tables = replay(records, change_index)
+    return "".join(format_routing_table(routing_tables[router_id]) + "\n" for router_id in sorted(routing_tables))
+
+
+def main():
+    """
+    Main function to inspect a trace.
+
+    Args:
+        trace_file (str): The trace file written with --trace.
+        command (str): summary, dump or replay.
+        [--change] (int): The change whose records are dumped, or after which the routing tables are replayed.
+        [--router] (int): Only dump the records of this router.
+        [--destination] (int): Only dump the routes to this destination.
+        [--top] (int): The number of most updated routes in the summary.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Inspects a trace of routing table updates.")
+    parser.add_argument("trace_file", help="trace file written with --trace")
+    parser.add_argument("command", choices=("summary", "dump", "replay"), help="summarize, dump or replay the trace")
+    parser.add_argument("--change", type=int, default=None, help="change whose records are dumped, or after which the routing tables are replayed")
+    parser.add_argument("--router", type=int, default=None, help="only dump the records of this router")
+    parser.add_argument("--destination", type=int, default=None, help="only dump the routes to this destination")
+    parser.add_argument("--top", type=int, default=10, help="number of most updated routes in the summary (default: 10)")
+    args = parser.parse_args()
+
+    dropped, records = read_trace(args.trace_file)
+    if args.command == "summary":
+        print(summarize(dropped, records, args.top), end="")
+    elif args.command == "dump":
+        print(dump(records, args.change, args.router, args.destination), end="")
+    else:
+        try:
+            print(replay_output(dropped, records, args.change), end="")
+        except ValueError as error:
+            parser.error(str(error))
+
+
+if __name__ == "__main__":
+    main()
+
+## @}
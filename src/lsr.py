@@ -1,5 +1,10 @@
 from LinkStateNetwork import LinkStateNetwork
-from utilities import parseArgs
+from AreaLinkStateNetwork import AreaLinkStateNetwork
+from utilities import parseArgs, createArgParser
+from result_cache import run_cached
+from TraceRecorder import TraceRecorder
+from ControlPlaneCounter import ControlPlaneCounter
+import argparse
 
 ## @file
 ## @brief Main file to run the Link State Routing Algorithm.
@@ -9,6 +14,146 @@ from utilities import parseArgs
 ## @author Leonardo Kamino Barros (LeonardoKamino)
 ## @bug No known bugs.
 ## @addtogroup LSR
+def parseSpfThrottle(value):
+    """
+    Parses the SPF throttle given on the command line.
+
+    Args:
+        value (str): The initial delay, hold time and maximum hold time in milliseconds, for example "50,200,5000".
+
+    Returns:
+        tuple: The three times as integers.
+    """
+    try:
+        times = tuple(int(time) for time in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid SPF throttle: {value!r}")
+    if len(times) != 3:
+        raise argparse.ArgumentTypeError(f"invalid SPF throttle: {value!r}, expected INITIAL,HOLD,MAX")
+    if min(times) < 0 or times[2] < times[1]:
+        raise argparse.ArgumentTypeError(f"invalid SPF throttle: {value!r}, times must be non-negative and MAX at least HOLD")
+    return times
+
+
+def createParser():
+    """
+    Creates the command line parser of the Link State Routing simulation.
+
+    Returns:
+        ArgumentParser: The command line parser.
+    """
+    parser = createArgParser("Link State Routing simulation.")
+    parser.add_argument("--lazy", action="store_true", help="compute each routing table only when it is read")
+    parser.add_argument("--areas", help="file assigning routers to areas, one \"router area\" line per router")
+    parser.add_argument("--ecmp", action="store_true", help="keep every equal-cost next hop and spread the messages over them by flow")
+    parser.add_argument("--spf-report", action="store_true", help="print the number of SPF runs and of routing table recomputations skipped")
+    parser.add_argument("--spf-throttle", type=parseSpfThrottle, metavar="INITIAL,HOLD,MAX",
+                        help="delay the SPF runs of every router and back off exponentially, times in milliseconds")
+    parser.add_argument("--change-interval", type=int, metavar="MS",
+                        help="with --spf-throttle, apply a change every MS milliseconds instead of after the SPF runs of the previous one")
+    return parser
+
+
+def checkArgs(parser, args):
+    """
+    Rejects the options that cannot be used together, before any network or output file is created.
+
+    Args:
+        parser (ArgumentParser): The command line parser, which prints the error and exits.
+        args (Namespace): The parsed command line arguments.
+    """
+    if args.areas is not None:
+        for option, given in (("--ecmp", args.ecmp), ("--control-plane", args.control_plane is not None),
+                              ("--spf-throttle", args.spf_throttle is not None)):
+            if given:
+                parser.error(f"{option} cannot be used with --areas")
+    if args.spf_throttle is not None and args.lazy:
+        parser.error("--spf-throttle cannot be used with --lazy")
+    if args.spf_throttle is not None and args.routers is not None:
+        parser.error("--spf-throttle cannot be used with --routers")
+    if args.change_interval is not None and args.spf_throttle is None:
+        parser.error("--change-interval needs --spf-throttle")
+    if args.change_interval is not None and args.change_interval <= 0:
+        parser.error("--change-interval must be positive")
+
+
+def createNetwork(args):
+    """
+    Creates the network of the Link State Routing simulation.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        LinkStateNetwork: The network, split into areas with --areas, with the traffic, shared risk link groups,
+                          pipelined output, trace and control plane counter of the arguments.
+
+    Raises:
+        ValueError: If --ecmp, --control-plane or --spf-throttle is given with --areas, --spf-throttle with --lazy
+                    or --routers, or --change-interval without --spf-throttle.
+    """
+    if args.ecmp and args.areas is not None:
+        raise ValueError("--ecmp cannot be used with --areas")
+    if args.control_plane is not None and args.areas is not None:
+        raise ValueError("--control-plane cannot be used with --areas")
+    if args.spf_throttle is not None and args.areas is not None:
+        raise ValueError("--spf-throttle cannot be used with --areas")
+    if args.change_interval is not None and args.spf_throttle is None:
+        raise ValueError("--change-interval needs --spf-throttle")
+
+    trace = None if args.trace is None else TraceRecorder(args.trace, args.trace_ring)
+    control_plane = None if args.control_plane is None else ControlPlaneCounter(args.control_plane)
+    if args.areas is None:
+        network = LinkStateNetwork(args.topology_file, args.output_file, args.routers, args.lazy, args.ecmp, trace, control_plane)
+    else:
+        network = AreaLinkStateNetwork(args.topology_file, args.output_file, args.areas, args.routers, args.lazy, trace)
+    if args.traffic is not None:
+        network.load_traffic(args.traffic, args.top_links)
+    if args.srlg is not None:
+        network.load_shared_risk_link_groups(args.srlg)
+    if args.spf_throttle is not None:
+        network.enable_spf_throttle(*args.spf_throttle, args.change_interval)
+    if args.pipeline is not None:
+        network.enable_pipeline(args.pipeline)
+    return network
+
+
+def report(args, network):
+    """
+    Builds the text printed once the Link State Routing simulation is done.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+        network (LinkStateNetwork): The network of the simulation.
+
+    Returns:
+        str: The area report with --areas, the SPF report with --spf-report, followed by the control plane report with --control-plane.
+    """
+    if args.areas is not None:
+        return network.area_report()
+    if args.spf_report:
+        return network.spf_report() + network.control_plane_report()
+    return network.control_plane_report()
+
+
+def run(args):
+    """
+    Runs the Link State Routing simulation, through the result cache with --cache.
+
+    Args:
+        args (Namespace): The parsed command line arguments.
+
+    Returns:
+        str: The text to print once the simulation is done: the area report with --areas, the SPF report with --spf-report,
+             followed by the control plane report with --control-plane.
+
+    Raises:
+        ValueError: If --ecmp, --control-plane or --spf-throttle is given with --areas, --spf-throttle with --lazy
+                    or --routers, or --change-interval without --spf-throttle.
+    """
+    return run_cached(args, "lsr", createNetwork, lambda network: report(args, network))
+
+
 def main():
     """
     Main function to run the Link State Routing Algorithm.
@@ -18,15 +163,36 @@ def main():
         message_file (str): The file containing the messages to be sent.
         changes_file (str): The file containing the changes to be applied to the network.
         [output_file] (str): The file to output the results to.
+        [--routers] (str): Comma separated IDs of the routers whose routing tables are written.
+                           Only these routers, and those on the paths of the messages, run Dijkstra's algorithm.
+        [--lazy]: Compute each routing table only when it is read.
+        [--areas] (str): A file assigning routers to areas, one "router area" line per router.
+                         The network is then split into areas and a comparison with flat routing is printed.
+        [--ecmp]: Keep every equal-cost next hop and spread the messages over them by flow. Not available with --areas.
+        [--spf-report]: Print the number of Dijkstra runs, of routing tables left as they were because a change could not alter them,
+                        and of runs saved by coalescing LSP arrivals.
+        [--spf-throttle] (str): The initial delay, hold time and maximum hold time of the SPF runs of every router, in milliseconds.
+                                Not available with --areas, --lazy or --routers.
+        [--change-interval] (int): With --spf-throttle, apply a change every this many milliseconds, SPF runs scheduled later
+                                   being still pending when the routing tables are written.
+        [--traffic] (str): A file of "source destination volume" demands. The most loaded links are written after each change.
+        [--top-links] (int): The number of most loaded links written with --traffic.
+        [--pipeline] (int): Format and write the output on a background thread, with at most this many states waiting.
+        [--srlg] (str): A file of "group router1 router2" lines defining the shared risk link groups failed and recovered by srlg events.
+        [--cache] (str): A directory of stored results, reused for identical runs and resumed for runs extending their changes.
+        [--cache-size] (int): The size cap of the cache directory, in MiB.
+        [--trace] (str): A binary file recording every routing table update, read by inspect_trace.py.
+        [--trace-ring] (int): Only keep the last records of the trace, written at the end of the run.
+        [--control-plane] (str): Count the protocol messages and their bytes in the full or delta wire encoding, and print them per change.
 
     Returns:
         None
     """
-    args = parseArgs()
-    topology_file, message_file, changes_file, output_file  = args
+    parser = createParser()
+    args = parseArgs(parser)
+    checkArgs(parser, args)
+    print(run(args), end="")
 
-    network = LinkStateNetwork(topology_file, output_file)
-    network.apply_changes_and_output(changes_file, message_file)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,164 @@
+import queue
+import threading
+from utilities import format_routing_table
+
+## @file
+## @brief Background writer and null sink for the output of the simulations.
+# In pipelined mode, a network does not format and write its output itself. After each change, it hands
+# a snapshot of the routing tables to print (shallow copies, whose (next hop, cost) entries are immutable)
+# and the text of its messages to a PipelinedOutput, which formats and writes them on a background
+# thread while the network already computes the next change. The queue between the two threads is
+# bounded, and text is handed over in bounded batches, so a slow disk makes the computation wait instead
+# of letting pending output grow without limit. A network writing to a NullOutput skips formatting its
+# output altogether, so that only the routing itself is computed.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+TEXT_BATCH_SIZE = 1 << 20
+
+
+class NullOutput:
+    """
+    An output sink discarding everything written to it. Networks check for it and do not format their output.
+    """
+
+    def write(self, text):
+        """
+        Discards text.
+
+        Args:
+            text (str): The text to write.
+
+        Returns:
+            int: The length of the text, as for a file.
+        """
+        return len(text)
+
+    def flush(self):
+        """
+        Does nothing, as nothing is buffered.
+        """
+
+    def close(self):
+        """
+        Does nothing, as there is no file to close.
+        """
+
+
+class PipelinedOutput:
+    """
+    An output file written by a background thread.
+
+    Attributes:
+        file (file): The output file, only written by the background thread.
+        close_file (bool): If True, the output file is closed with the PipelinedOutput, otherwise it is only flushed.
+        pending (Queue): The snapshots and text batches waiting to be written, at most max_pending of them.
+        error (Exception): The error raised by the background thread, or None.
+    """
+
+    def __init__(self, file, max_pending=4, close_file=True):
+        """
+        Initializes a PipelinedOutput object and starts its background thread.
+
+        Args:
+            file (file): The open output file.
+            max_pending (int): The number of snapshots and text batches that may wait to be written before
+                               the producer blocks.
+            close_file (bool): If True, the output file is closed with the PipelinedOutput, otherwise it is only flushed.
+        """
+        self.file = file
+        self.close_file = close_file
+        self.pending = queue.Queue(maxsize=max(1, max_pending))
+        self.error = None
+        self._text = []
+        self._text_size = 0
+        self._thread = threading.Thread(target=self._write_pending, daemon=True)
+        self._thread.start()
+
+    def write(self, text):
+        """
+        Appends text to the output. Text is batched and handed to the background thread once the batch is large enough.
+
+        Args:
+            text (str): The text to write.
+        """
+        self._text.append(text)
+        self._text_size += len(text)
+        if self._text_size >= TEXT_BATCH_SIZE:
+            self._flush_text()
+
+    def write_routing_tables(self, routing_tables):
+        """
+        Appends routing tables to the output, each followed by a blank line. They are formatted by the background thread.
+
+        Args:
+            routing_tables (list): Snapshots of the routing tables to write, in order. They must not be modified afterwards.
+        """
+        self._flush_text()
+        self._put(routing_tables)
+
+    def close(self):
+        """
+        Writes everything still pending, stops the background thread and closes or flushes the output file.
+
+        Raises:
+            Exception: The error raised by the background thread while writing, if any.
+        """
+        if self._thread.is_alive():
+            self._flush_text()
+            self.pending.put(None)
+            self._thread.join()
+        if self.close_file:
+            self.file.close()
+        else:
+            self.file.flush()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _flush_text(self):
+        """
+        Hands the batched text to the background thread.
+        """
+        if self._text:
+            self._put("".join(self._text))
+            self._text = []
+            self._text_size = 0
+
+    def _put(self, item):
+        """
+        Queues an item for the background thread, waiting while the queue is full.
+
+        Args:
+            item (object): A text batch or a list of routing tables.
+
+        Raises:
+            Exception: The error raised by the background thread, as soon as it is known.
+        """
+        if self.error is not None:
+            raise self.error
+        self.pending.put(item)
+
+    def _write_pending(self):
+        """
+        Runs on the background thread: formats and writes the queued items until the None sentinel.
+        After an error, the remaining items are discarded so that the producer never blocks.
+        """
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue
+            try:
+                if isinstance(item, str):
+                    self.file.write(item)
+                else:
+                    self.file.write("".join(format_routing_table(routing_table) + "\n" for routing_table in item))
+            except Exception as error:
+                self.error = error
+
+## @}
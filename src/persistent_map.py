@@ -0,0 +1,200 @@
+## @file
+## @brief Immutable map sharing its structure between versions.
+# A PersistentMap is a hash trie: the hash of each key selects, five bits per level, a path of branches
+# ending in a small leaf dictionary. Setting keys never modifies a map. It returns a new map that copies
+# only the branches on the paths of the changed keys and shares every other branch with the old map, so
+# a new version costs memory proportional to the number of changed keys, and any number of versions can
+# be kept or forked.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_LEAF_SIZE = 16
+_HASH_MASK = (1 << 64) - 1
+_MAX_LEVEL = 64 // _BITS
+
+
+def _slot(key_hash, level):
+    """
+    Selects the branch of a key at a level of the trie.
+
+    Args:
+        key_hash (int): The non-negative hash of the key.
+        level (int): The level of the branch.
+
+    Returns:
+        int: The index of the child to follow.
+    """
+    return (key_hash >> (level * _BITS)) & (_WIDTH - 1)
+
+
+def _build(items, level):
+    """
+    Builds a trie node holding the given items.
+
+    Args:
+        items (dict): The items of the node.
+        level (int): The level of the node.
+
+    Returns:
+        dict or tuple: A leaf dictionary if the items are few enough, otherwise a branch tuple of children.
+    """
+    if len(items) <= _LEAF_SIZE or level >= _MAX_LEVEL:
+        return dict(items)
+    buckets = [{} for _ in range(_WIDTH)]
+    for key, value in items.items():
+        buckets[_slot(hash(key) & _HASH_MASK, level)][key] = value
+    return tuple(_build(bucket, level + 1) if bucket else None for bucket in buckets)
+
+
+def _set(node, key_hash, key, value, level):
+    """
+    Copies the path of a key in a trie, with the key set to a new value.
+
+    Args:
+        node (dict or tuple): The node to copy, or None if the path does not exist yet.
+        key_hash (int): The non-negative hash of the key.
+        key (object): The key.
+        value (object): The new value.
+        level (int): The level of the node.
+
+    Returns:
+        tuple: The new node and True if the key was added rather than replaced.
+    """
+    if node is None:
+        return {key: value}, True
+    if type(node) is dict:
+        leaf = dict(node)
+        added = key not in leaf
+        leaf[key] = value
+        if len(leaf) > _LEAF_SIZE and level < _MAX_LEVEL:
+            return _build(leaf, level), added
+        return leaf, added
+    index = _slot(key_hash, level)
+    child, added = _set(node[index], key_hash, key, value, level + 1)
+    return node[:index] + (child,) + node[index + 1:], added
+
+
+def _items(node):
+    """
+    Iterates over the items of a trie node.
+
+    Args:
+        node (dict or tuple): The node, or None.
+
+    Yields:
+        tuple: The (key, value) items of the node.
+    """
+    if node is None:
+        return
+    if type(node) is dict:
+        yield from node.items()
+        return
+    for child in node:
+        yield from _items(child)
+
+
+class PersistentMap:
+    """
+    An immutable mapping whose updated copies share all their unchanged branches.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items=None):
+        """
+        Initializes a PersistentMap object.
+
+        Args:
+            items (dict): The initial items, or None for an empty map.
+        """
+        items = {} if items is None else dict(items)
+        self._root = _build(items, 0)
+        self._size = len(items)
+
+    def get(self, key, default=None):
+        """
+        Retrieves the value of a key.
+
+        Args:
+            key (object): The key.
+            default (object): The value returned if the key is absent.
+
+        Returns:
+            object: The value of the key, or the default.
+        """
+        node = self._root
+        key_hash = hash(key) & _HASH_MASK
+        level = 0
+        while type(node) is tuple:
+            node = node[_slot(key_hash, level)]
+            if node is None:
+                return default
+            level += 1
+        return node.get(key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return (key for key, value in _items(self._root))
+
+    def items(self):
+        """
+        Iterates over the items of the map, in no particular order.
+
+        Returns:
+            iterator: The (key, value) items.
+        """
+        return _items(self._root)
+
+    def set(self, key, value):
+        """
+        Creates a copy of the map with a key set to a value.
+
+        Args:
+            key (object): The key.
+            value (object): The value.
+
+        Returns:
+            PersistentMap: The new map. The map itself is unchanged.
+        """
+        return self.update({key: value})
+
+    def update(self, items):
+        """
+        Creates a copy of the map with several keys set.
+
+        Args:
+            items (dict): The keys to set and their values.
+
+        Returns:
+            PersistentMap: The new map. The map itself is unchanged.
+        """
+        root = self._root
+        size = self._size
+        for key, value in items.items():
+            root, added = _set(root, hash(key) & _HASH_MASK, key, value, 0)
+            size += added
+        new_map = PersistentMap.__new__(PersistentMap)
+        new_map._root = root
+        new_map._size = size
+        return new_map
+
+
+_MISSING = object()
+
+## @}
@@ -0,0 +1,277 @@
+import copyreg
+import hashlib
+import os
+import pickle
+import tempfile
+import weakref
+from pathlib import Path
+from types import MappingProxyType
+from input_parser import parse_changes_file
+
+## @file
+## @brief On-disk cache of the results of whole simulation runs.
+# With --cache, a simulation script first looks for its result in a cache directory. Results are keyed by a
+# hash of the source code of the simulator, the protocol, the options and the contents of the input files,
+# so a run with identical inputs copies the stored output file and report instead of simulating again.
+# Every run also stores a checkpoint: the state of its network after its last change. Keys are computed
+# change by change, so a later run whose changes file extends the changes of a cached run restores the
+# checkpoint, writes the cached output, and only simulates the new changes. The size of the cache
+# directory is capped, and the least recently used entries are removed first.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+DEFAULT_CACHE_SIZE = 256  # MiB
+FILE_OPTIONS = ("areas", "traffic", "srlg")
+UNKEYED_OPTIONS = ("topology_file", "message_file", "changes_file", "output_file", "cache", "cache_size", "pipeline")
+
+_simulator_fingerprint = None
+
+# LSPs and topology snapshots are read-only mappingproxy objects, and link state databases find each other
+# through a weak registry. Pickle supports neither, so they are saved as the dictionaries they wrap. Both
+# are memoized, so objects shared in the network are still shared once the checkpoint is loaded.
+copyreg.pickle(MappingProxyType, lambda mapping: (_mapping_proxy, (dict(mapping),)))
+copyreg.pickle(weakref.WeakValueDictionary,
+               lambda registry: (weakref.WeakValueDictionary, (), None, None, iter(list(registry.items()))))
+
+
+def _mapping_proxy(mapping):
+    """
+    Recreates a read-only mapping when a checkpoint is loaded.
+
+    Args:
+        mapping (dict): The wrapped dictionary.
+
+    Returns:
+        MappingProxyType: The read-only mapping.
+    """
+    return MappingProxyType(mapping)
+
+
+def simulator_fingerprint():
+    """
+    Computes a hash of the source code of the simulator, so that results are not reused once it changes.
+
+    Returns:
+        str: The hexadecimal hash of the Python files of the src directory.
+    """
+    global _simulator_fingerprint
+    if _simulator_fingerprint is None:
+        digest = hashlib.sha256()
+        for path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        _simulator_fingerprint = digest.hexdigest()
+    return _simulator_fingerprint
+
+
+def _file_hash(path):
+    """
+    Computes the hash of the contents of a file.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        str: The hexadecimal hash.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_cached(args, protocol, create_network, report):
+    """
+    Runs a simulation script, through the result cache if args.cache is set. Traced runs always simulate,
+    since their trace is not cached.
+
+    Args:
+        args (Namespace): The parsed command line arguments of the script.
+        protocol (str): The name of the script: dvr, lsr or dual.
+        create_network (callable): Creates the network of the simulation from the arguments, with its options loaded.
+        report (callable): Returns the text printed once the simulation of a network is done.
+
+    Returns:
+        str: The text to print.
+    """
+    if getattr(args, 'cache', None) is None or getattr(args, 'trace', None) is not None:
+        network = create_network(args)
+        network.apply_changes_and_output(args.changes_file, args.message_file)
+        network.close()
+        return report(network)
+    return ResultCache(args.cache, args.cache_size).run(args, protocol, create_network, report)
+
+
+class ResultCache:
+    """
+    A directory of simulation results and checkpoints, with a size cap.
+
+    Every entry is a file named after its key: "<key>.result" holds the report and the output file of a run,
+    and "<key>.state" the pickled network after the last change of the run.
+
+    Attributes:
+        directory (Path): The cache directory.
+        max_bytes (int): The total size of the entries above which the least recently used ones are removed.
+        hits (int): The number of runs answered from a stored result.
+        resumed_changes (int): The number of changes skipped by resuming from checkpoints.
+    """
+
+    def __init__(self, directory, max_megabytes=DEFAULT_CACHE_SIZE):
+        """
+        Initializes a ResultCache object, creating the directory if needed.
+
+        Args:
+            directory (str): The cache directory.
+            max_megabytes (int): The size cap of the cache, in MiB.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_megabytes << 20
+        self.hits = 0
+        self.resumed_changes = 0
+
+    def keys(self, args, protocol, changes):
+        """
+        Computes the keys of a run and of the runs with the same inputs and fewer changes.
+
+        Args:
+            args (Namespace): The parsed command line arguments of the script.
+            protocol (str): The name of the script.
+            changes (list): The parsed changes of the run.
+
+        Returns:
+            list: The key after each number of changes, from 0 to all of them.
+        """
+        digest = hashlib.sha256()
+        digest.update(simulator_fingerprint().encode())
+        digest.update(protocol.encode())
+        for name, value in sorted(vars(args).items()):
+            if name in UNKEYED_OPTIONS:
+                continue
+            if name in FILE_OPTIONS and value is not None:
+                value = _file_hash(value)
+            elif name == "routers" and value is not None:
+                value = sorted(set(value))
+            digest.update(f"{name}={value!r};".encode())
+        digest.update(_file_hash(args.topology_file).encode())
+        digest.update(_file_hash(args.message_file).encode())
+
+        keys = [digest.hexdigest()]
+        for change in changes:
+            keys.append(hashlib.sha256(f"{keys[-1]}{change!r}".encode()).hexdigest())
+        return keys
+
+    def run(self, args, protocol, create_network, report):
+        """
+        Runs a simulation script, copying its stored result or resuming from the longest checkpoint.
+        The result and the final state of the run are then stored.
+
+        Args:
+            args (Namespace): The parsed command line arguments of the script.
+            protocol (str): The name of the script.
+            create_network (callable): Creates the network of the simulation from the arguments, with its options loaded.
+            report (callable): Returns the text printed once the simulation of a network is done.
+
+        Returns:
+            str: The text to print.
+        """
+        changes = parse_changes_file(args.changes_file)
+        keys = self.keys(args, protocol, changes)
+        result = self._load(keys[-1], "result")
+        if result is not None:
+            self.hits += 1
+            report_text, output = result
+            with open(args.output_file, 'w') as file:
+                file.write(output)
+            return report_text
+
+        network = None
+        for applied in range(len(changes) - 1, -1, -1):
+            result = self._load(keys[applied], "result")
+            network = None if result is None else self._load(keys[applied], "state")
+            if network is not None:
+                self.resumed_changes += applied
+                network.resume_output(args.output_file, result[1])
+                if args.pipeline is not None:
+                    network.enable_pipeline(args.pipeline)
+                network.continue_changes_and_output(changes[applied:], args.message_file)
+                break
+        if network is None:
+            network = create_network(args)
+            network.apply_changes_and_output(args.changes_file, args.message_file)
+        network.close()
+
+        report_text = report(network)
+        with open(args.output_file) as file:
+            output = file.read()
+        self._store(keys[-1], "result", (report_text, output))
+        self._store(keys[-1], "state", network)
+        self.evict()
+        return report_text
+
+    def _load(self, key, kind):
+        """
+        Loads an entry and marks it as recently used.
+
+        Args:
+            key (str): The key of the entry.
+            kind (str): "result" or "state".
+
+        Returns:
+            object: The stored object, or None if the entry does not exist or cannot be read.
+        """
+        path = self.directory / f"{key}.{kind}"
+        try:
+            with open(path, 'rb') as file:
+                value = pickle.load(file)
+            os.utime(path)
+            return value
+        except Exception:
+            # A missing, partial or outdated entry is a cache miss
+            return None
+
+    def _store(self, key, kind, value):
+        """
+        Stores an entry. The file is written under a temporary name first, so concurrent runs never read a partial entry.
+
+        Args:
+            key (str): The key of the entry.
+            kind (str): "result" or "state".
+            value (object): The object to store.
+        """
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.directory / f"{key}.{kind}")
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in its size cap.
+        """
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix in (".result", ".state"):
+                try:
+                    status = path.stat()
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            total -= size
+
+## @}
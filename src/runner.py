@@ -0,0 +1,187 @@
+import argparse
+import contextlib
+import io
+import os
+import shlex
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import dual
+import dvr
+import lsr
+from input_parser import open_text
+from topology_format import cache_text_topologies, topology_was_cached
+
+## @file
+## @brief Main file to run many simulation scenarios in parallel.
+## This script runs the scenarios listed in a manifest file across a pool of worker processes. Every
+## line of the manifest is a protocol (dvr, lsr or dual) followed by the arguments of its script, for example
+## "lsr topology.txt messages.txt changes.txt output.txt --lazy". Workers import the simulator once and keep
+## the last parsed text topologies in memory, so scenarios sharing a topology only parse it once per worker.
+## Scenarios are run in isolation: an error, or even a crash of the worker process, only fails its own
+## scenario. The status, running time and printed report of every scenario are written, in manifest order,
+## to a single summary file.
+##
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+PROTOCOLS = {"dvr": dvr, "lsr": lsr, "dual": dual}
+CACHED_TOPOLOGIES = 8
+
+
+def parse_manifest(manifest_file):
+    """
+    Parses a manifest file. Blank lines and lines starting with '#' are skipped.
+
+    Args:
+        manifest_file (str): The path to the manifest file.
+
+    Returns:
+        list: A list of (line number, protocol, arguments) tuples, in file order.
+    """
+    scenarios = []
+    with open_text(manifest_file) as file:
+        for line_number, line in enumerate(file, 1):
+            fields = shlex.split(line, comments=True)
+            if fields:
+                scenarios.append((line_number, fields[0], fields[1:]))
+    return scenarios
+
+
+def _initialize_worker():
+    """
+    Prepares a worker process: parsed text topologies are kept in memory for the following scenarios.
+    """
+    cache_text_topologies(CACHED_TOPOLOGIES)
+
+
+def run_scenario(protocol, arguments):
+    """
+    Runs one scenario and catches any error it raises.
+
+    Args:
+        protocol (str): The protocol of the scenario: dvr, lsr or dual.
+        arguments (list): The command line arguments of the protocol script.
+
+    Returns:
+        tuple: True if the scenario succeeded, its running time in seconds, True if its topology was already
+               parsed by the worker, and the text printed by the scenario or the error message.
+    """
+    start = time.perf_counter()
+    topology_reused = False
+    errors = io.StringIO()
+    try:
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"unknown protocol {protocol!r}")
+        script = PROTOCOLS[protocol]
+        parser = script.createParser()
+        parser.prog = protocol
+        with contextlib.redirect_stderr(errors):
+            args = parser.parse_args(arguments)
+        topology_reused = os.path.exists(args.topology_file) and topology_was_cached(args.topology_file)
+        report = script.run(args)
+        return True, time.perf_counter() - start, topology_reused, report
+    except SystemExit:
+        message = errors.getvalue().strip().splitlines()
+        return False, time.perf_counter() - start, topology_reused, message[-1] if message else "invalid arguments"
+    except Exception as error:
+        return False, time.perf_counter() - start, topology_reused, f"{type(error).__name__}: {error}"
+
+
+def _run_in_pool(scenarios, indices, workers):
+    """
+    Runs scenarios across a pool of worker processes.
+
+    Args:
+        scenarios (list): The (line number, protocol, arguments) tuples of the manifest.
+        indices (list): The indices of the scenarios to run, submitted in this order.
+        workers (int): The number of worker processes.
+
+    Returns:
+        tuple: A dictionary mapping the index of every completed scenario to its result, as returned by
+               run_scenario, and the list of the indices of the scenarios lost because a worker crashed.
+    """
+    results = {}
+    lost = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker) as executor:
+        futures = [(index, executor.submit(run_scenario, scenarios[index][1], scenarios[index][2])) for index in indices]
+        for index, future in futures:
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool:
+                lost.append(index)
+    return results, lost
+
+
+def run_manifest(manifest_file, summary_file, workers=None):
+    """
+    Runs all the scenarios of a manifest and writes the summary file.
+
+    Scenarios are submitted grouped by topology file, so workers are more likely to reuse a topology they
+    already parsed. If a worker process crashes, the scenarios it took down with the pool are run again,
+    each in a pool of its own, so only the scenario that crashed it fails.
+
+    Args:
+        manifest_file (str): The path to the manifest file.
+        summary_file (str): The path to the summary file to write.
+        workers (int): The number of worker processes, or None for one per CPU.
+
+    Returns:
+        tuple: The number of scenarios that succeeded and the number that failed.
+    """
+    start = time.perf_counter()
+    scenarios = parse_manifest(manifest_file)
+    workers = workers or os.cpu_count() or 1
+    indices = sorted(range(len(scenarios)), key=lambda index: (scenarios[index][2][:1], index))
+
+    results, lost = _run_in_pool(scenarios, indices, workers)
+    for index in lost:
+        retried, crashed = _run_in_pool(scenarios, [index], 1)
+        results.update(retried)
+        if crashed:
+            results[index] = (False, 0.0, False, "worker process crashed")
+
+    succeeded = sum(results[index][0] for index in range(len(scenarios)))
+    with open(summary_file, 'w') as summary:
+        for index, (line_number, protocol, arguments) in enumerate(scenarios):
+            ok, seconds, topology_reused, text = results[index]
+            if ok:
+                summary.write(f"scenario {line_number} {protocol} ok {seconds:.3f}s topology {'reused' if topology_reused else 'parsed'}\n")
+            else:
+                summary.write(f"scenario {line_number} {protocol} failed {seconds:.3f}s\n")
+            for line in text.splitlines():
+                summary.write(f"    {line}\n")
+        summary.write(f"scenarios {len(scenarios)} ok {succeeded} failed {len(scenarios) - succeeded} "
+                      f"time {time.perf_counter() - start:.3f}s\n")
+    return succeeded, len(scenarios) - succeeded
+
+
+def main():
+    """
+    Main function to run the scenarios of a manifest in parallel.
+
+    Args:
+        manifest_file (str): The file listing the scenarios, one "protocol arguments..." line per scenario.
+        [summary_file] (str): The file to write the summary to.
+        [--workers] (int): The number of worker processes, one per CPU by default.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Runs many routing simulation scenarios in parallel.")
+    parser.add_argument("manifest_file", help="file listing the scenarios, one \"protocol arguments...\" line per scenario")
+    parser.add_argument("summary_file", nargs="?", default="summary.txt", help="file to write the summary to (default: summary.txt)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    succeeded, failed = run_manifest(args.manifest_file, args.summary_file, args.workers)
+    print(f"{succeeded} scenarios succeeded, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
+
+## @}
@@ -0,0 +1,375 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from AreaLinkStateNetwork import AreaLinkStateNetwork
+from DistanceVectorNetwork import DistanceVectorNetwork
+from DualNetwork import DualNetwork
+from LinkStateNetwork import LinkStateNetwork
+from runner import CACHED_TOPOLOGIES, run_scenario
+from topology_format import cache_text_topologies
+from utilities import INFINITY
+
+## @file
+## @brief Long-running simulator server listening on a local Unix socket.
+## The server imports the simulator once and keeps the last parsed text topologies in memory, so that
+## running a simulation does not pay the interpreter startup and topology parsing again. Clients send one
+## JSON request per line and receive one JSON response per line:
+## - "run" runs a whole simulation with the command line arguments of dvr.py, lsr.py or dual.py, exactly
+##   like the script would, and returns the text it would print. client.py sends these requests.
+## - "open" loads a topology into a session, which then accepts "change", "messages", "query", "tables"
+##   and "close" requests, and streams back the routing output of every request.
+## - "shutdown" stops the server.
+## Requests are handled one at a time, while several clients may stay connected.
+##
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"routing-simulator-{os.getuid()}.sock")
+
+
+class SimulatorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves simulation requests on a Unix socket.
+
+    Attributes:
+        sessions (dict): The open sessions, mapping their ID to their network.
+        next_session_id (int): The ID given to the next session.
+        lock (Lock): Held while a request is handled, so requests run one at a time.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        """
+        Initializes a SimulatorServer object and binds its socket. A socket file left by a server that is no
+        longer running is replaced.
+
+        Args:
+            socket_path (str): The path of the Unix socket.
+
+        Raises:
+            OSError: If another server is already listening on the socket.
+        """
+        if os.path.exists(socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(socket_path) == 0:
+                    raise OSError(f"a server is already listening on {socket_path}")
+            os.remove(socket_path)
+        super().__init__(socket_path, SimulatorRequestHandler)
+        self.sessions = {}
+        self.next_session_id = 1
+        self.lock = threading.Lock()
+        cache_text_topologies(CACHED_TOPOLOGIES)
+
+    def server_close(self):
+        """
+        Closes the socket and removes the socket file.
+        """
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+    def handle_request_object(self, request):
+        """
+        Handles one request. Paths in the request are relative to its "cwd" field, if given.
+
+        Args:
+            request (dict): The decoded request, whose "command" field selects the handler.
+
+        Returns:
+            dict: The response, with "ok" set to False and an "error" message if the request failed.
+        """
+        handlers = {
+            "run": self._run,
+            "open": self._open,
+            "change": self._change,
+            "messages": self._messages,
+            "query": self._query,
+            "tables": self._tables,
+            "close": self._close,
+            "shutdown": self._shutdown,
+        }
+        with self.lock:
+            previous_directory = os.getcwd()
+            try:
+                command = request.get("command")
+                if command not in handlers:
+                    raise ValueError(f"unknown command {command!r}")
+                if request.get("cwd") is not None:
+                    os.chdir(request["cwd"])
+                response = handlers[command](request)
+                response.setdefault("ok", True)
+                return response
+            except Exception as error:
+                return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+            finally:
+                os.chdir(previous_directory)
+
+    def _run(self, request):
+        """
+        Runs a whole simulation with the command line arguments of its script.
+
+        Args:
+            request (dict): The "protocol" (dvr, lsr or dual) and the "arguments" of the script.
+
+        Returns:
+            dict: The "report" printed by the script, or the "error" message and "ok" set to False if it failed,
+                  its running time in "seconds" and whether its topology was already parsed in "topology_reused".
+        """
+        ok, seconds, topology_reused, text = run_scenario(request["protocol"], list(request.get("arguments", [])))
+        response = {"seconds": seconds, "topology_reused": topology_reused}
+        if ok:
+            response["report"] = text
+        else:
+            response.update(ok=False, error=text)
+        return response
+
+    def _open(self, request):
+        """
+        Loads a topology into a new session.
+
+        Args:
+            request (dict): The "protocol" (dvr, lsr or dual) and the "topology" file, with the optional
+                            "routers", "lazy", "ecmp", "areas", "traffic", "top_links" and "srlg" options of the scripts.
+                            With "history" set, a version of the topology is recorded after every change.
+                            With "route_index" set, routes are queried from a contraction hierarchy of the topology.
+
+        Returns:
+            dict: The "session" ID and the routing tables of the topology as "output".
+
+        Raises:
+            ValueError: If the protocol is unknown or the options cannot be combined.
+        """
+        protocol = request.get("protocol")
+        topology_file = request["topology"]
+        routers = request.get("routers")
+        if protocol == "dvr":
+            network = DistanceVectorNetwork(topology_file, None, routers, request.get("ecmp", False))
+        elif protocol == "dual":
+            network = DualNetwork(topology_file, None, routers)
+        elif protocol == "lsr" and request.get("areas") is None:
+            network = LinkStateNetwork(topology_file, None, routers, request.get("lazy", False), request.get("ecmp", False))
+        elif protocol == "lsr":
+            if request.get("ecmp", False):
+                raise ValueError("ecmp cannot be used with areas")
+            network = AreaLinkStateNetwork(topology_file, None, request["areas"], routers, request.get("lazy", False))
+        else:
+            raise ValueError(f"unknown protocol {protocol!r}")
+        if request.get("traffic") is not None:
+            network.load_traffic(request["traffic"], request.get("top_links", 10))
+        if request.get("srlg") is not None:
+            network.load_shared_risk_link_groups(request["srlg"])
+        if request.get("history", False):
+            network.record_history()
+        if request.get("route_index", False):
+            network.enable_route_index()
+
+        session_id = self.next_session_id
+        self.next_session_id += 1
+        self.sessions[session_id] = network
+        with _captured_output(network) as output:
+            network.topology_output()
+            network.traffic_output()
+        return {"session": session_id, "output": output.getvalue()}
+
+    def _session(self, request):
+        """
+        Finds the network of the session of a request.
+
+        Args:
+            request (dict): The request, with its "session" ID.
+
+        Returns:
+            Network: The network of the session.
+
+        Raises:
+            ValueError: If the session does not exist.
+        """
+        if request.get("session") not in self.sessions:
+            raise ValueError(f"unknown session {request.get('session')!r}")
+        return self.sessions[request["session"]]
+
+    def _change(self, request):
+        """
+        Applies changes to the network of a session.
+
+        Args:
+            request (dict): The "session" ID and the "changes", applied in order. Each is a [router1, router2, cost]
+                            link change or a ["node" or "srlg", ID, "down" or "up"] event, as in the changes files.
+
+        Returns:
+            dict: The routing tables, and the traffic report if traffic was loaded, after each change, as "output".
+        """
+        network = self._session(request)
+        with _captured_output(network) as output:
+            for change in request["changes"]:
+                if isinstance(change[0], str):
+                    network.apply_topology_change((change[0], int(change[1]), change[2]))
+                else:
+                    network.apply_topology_change(tuple(int(value) for value in change))
+                network.topology_output()
+                network.traffic_output()
+        return {"output": output.getvalue()}
+
+    def _messages(self, request):
+        """
+        Sends messages across the network of a session.
+
+        Args:
+            request (dict): The "session" ID and the [source, destination, message] "messages".
+
+        Returns:
+            dict: One line per message, in the format of the output files, as "output".
+        """
+        network = self._session(request)
+        with _captured_output(network) as output:
+            for router_id_from, router_id_to, message in request["messages"]:
+                message = message if message.endswith("\n") else message + "\n"
+                network.send_message(int(router_id_from), int(router_id_to), message)
+        return {"output": output.getvalue()}
+
+    def _query(self, request):
+        """
+        Finds the route between two routers of a session, in the current topology, in the topology as of a
+        recorded "version", or in a fork of either with hypothetical [router1, router2, cost] "changes" that
+        leave the session untouched.
+
+        Args:
+            request (dict): The "session" ID, the "source" and "destination" router IDs, and the optional "version" and "changes".
+
+        Returns:
+            dict: The router IDs of the "path" and its "cost", both None if the destination cannot be reached.
+        """
+        network = self._session(request)
+        source_id = int(request["source"])
+        destination_id = int(request["destination"])
+        if request.get("version") is None and not request.get("changes"):
+            path, cost = network.query_route(source_id, destination_id)
+        else:
+            version = network.current_version() if request.get("version") is None else network.version(int(request["version"]))
+            if request.get("changes"):
+                version = version.fork([tuple(int(value) for value in change) for change in request["changes"]])
+            path, cost = version.route(source_id, destination_id)
+        return {"path": path, "cost": None if cost == INFINITY else cost}
+
+    def _tables(self, request):
+        """
+        Writes the current routing tables of a session.
+
+        Args:
+            request (dict): The "session" ID.
+
+        Returns:
+            dict: The routing tables as "output".
+        """
+        network = self._session(request)
+        with _captured_output(network) as output:
+            network.topology_output()
+        return {"output": output.getvalue()}
+
+    def _close(self, request):
+        """
+        Closes a session and its network.
+
+        Args:
+            request (dict): The "session" ID.
+
+        Returns:
+            dict: An empty response.
+        """
+        self._session(request)
+        self.sessions.pop(request["session"]).close()
+        return {}
+
+    def _shutdown(self, request):
+        """
+        Stops the server once the current request is answered.
+
+        Args:
+            request (dict): The request, without other fields.
+
+        Returns:
+            dict: An empty response.
+        """
+        threading.Thread(target=self.shutdown).start()
+        return {}
+
+
+class SimulatorRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Reads the requests of a client connection, one JSON object per line, and answers each with one line.
+    """
+
+    def handle(self):
+        """
+        Handles the requests of the connection until the client closes it.
+        """
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("requests must be JSON objects")
+            except ValueError as error:
+                response = {"ok": False, "error": f"invalid request: {error}"}
+            else:
+                response = self.server.handle_request_object(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+@contextlib.contextmanager
+def _captured_output(network):
+    """
+    Redirects the output of a network to a string while the context is active.
+
+    Args:
+        network (Network): The network whose output is captured.
+
+    Yields:
+        StringIO: The captured output.
+    """
+    output_file_iterator = network.output_file_iterator
+    network.output_file_iterator = io.StringIO()
+    try:
+        yield network.output_file_iterator
+    finally:
+        network.output_file_iterator = output_file_iterator
+
+
+def main():
+    """
+    Main function to run the simulator server until it receives a shutdown request or is interrupted.
+
+    Args:
+        [--socket] (str): The path of the Unix socket to listen on.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Serves routing simulations on a local Unix socket.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"path of the Unix socket (default: {DEFAULT_SOCKET})")
+    args = parser.parse_args()
+
+    with SimulatorServer(args.socket) as server:
+        print(f"listening on {args.socket}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
+
+## @}
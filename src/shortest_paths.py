@@ -0,0 +1,285 @@
+import heapq
+from functools import partial
+from utilities import INFINITY
+
+## @file
+## @brief Shortest path helpers working directly on the network topology.
+# These functions answer routing questions from the neighbor tables of the routers, without
+# materializing any routing table. They follow the same tie-break rule as LinkStateRouter:
+# among equal cost paths, the chosen path is the one whose router IDs, read from the destination
+# back to the source, are lexicographically smallest. Equivalently, every router on the path is
+# reached from the smallest-ID neighbor that lies on a shortest path to it.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+BUCKET_MAX_WEIGHT = 64
+
+
+def _settle_next(heap, distances, settled, other_distances, get_neighbors, best):
+    """
+    Settles the closest unsettled router of one side of a bidirectional search and relaxes its links.
+
+    Args:
+        heap (list): The priority queue of the side.
+        distances (dict): The tentative distances of the side.
+        settled (set): The routers already settled by the side.
+        other_distances (dict): The tentative distances of the other side.
+        get_neighbors (function): Returns the neighbors dictionary of a router ID.
+        best (tuple): The best (cost, meeting router) found so far.
+
+    Returns:
+        tuple: The updated best (cost, meeting router).
+    """
+    distance, router_id = heapq.heappop(heap)
+    if router_id in settled:
+        return best
+    settled.add(router_id)
+    for neighbor_id, cost in get_neighbors(router_id).items():
+        new_distance = distance + cost
+        if new_distance < distances.get(neighbor_id, INFINITY):
+            distances[neighbor_id] = new_distance
+            heapq.heappush(heap, (new_distance, neighbor_id))
+        if neighbor_id in other_distances and new_distance + other_distances[neighbor_id] < best[0]:
+            best = (new_distance + other_distances[neighbor_id], neighbor_id)
+    return best
+
+
+def _queue_top(heap, settled):
+    """
+    Returns the smallest distance of a priority queue, dropping routers that are already settled.
+
+    Args:
+        heap (list): The priority queue.
+        settled (set): The routers already settled.
+
+    Returns:
+        int: The smallest tentative distance, or INFINITY if the queue is empty.
+    """
+    while heap and heap[0][1] in settled:
+        heapq.heappop(heap)
+    return heap[0][0] if heap else INFINITY
+
+
+def bidirectional_route(get_neighbors, source_id, destination_id):
+    """
+    Finds the route between two routers with a bidirectional Dijkstra search.
+
+    The two searches stop once the sum of their frontiers exceeds the best cost found, so every
+    router lying on a shortest path is settled by at least one of them. The exact distance from
+    the source of the routers settled only by the backward search is then confirmed in increasing
+    order, and the path is rebuilt from the destination by always stepping back to the smallest-ID
+    router on a shortest path, which is the tie-break rule of LinkStateRouter.
+
+    Args:
+        get_neighbors (function): Returns the neighbors dictionary ({router ID: cost}) of a router ID.
+        source_id (int): The ID of the source router.
+        destination_id (int): The ID of the destination router.
+
+    Returns:
+        tuple: The list of router IDs on the path, from source to destination, and the total cost.
+               (None, INFINITY) if the destination cannot be reached.
+    """
+    if source_id == destination_id:
+        return [source_id], 0
+
+    forward_distances = {source_id: 0}
+    backward_distances = {destination_id: 0}
+    forward_settled = set()
+    backward_settled = set()
+    forward_heap = [(0, source_id)]
+    backward_heap = [(0, destination_id)]
+    best = (INFINITY, None)
+
+    while True:
+        forward_top = _queue_top(forward_heap, forward_settled)
+        backward_top = _queue_top(backward_heap, backward_settled)
+        if forward_top == INFINITY or backward_top == INFINITY or forward_top + backward_top > best[0]:
+            break
+        if forward_top <= backward_top:
+            best = _settle_next(forward_heap, forward_distances, forward_settled, backward_distances, get_neighbors, best)
+        else:
+            best = _settle_next(backward_heap, backward_distances, backward_settled, forward_distances, get_neighbors, best)
+
+    total_cost = best[0]
+    if total_cost == INFINITY:
+        return None, INFINITY
+
+    # Exact distances from the source of every router that can lie on a shortest path
+    source_distances = {router_id: forward_distances[router_id] for router_id in forward_settled}
+    backward_only = sorted(backward_settled - forward_settled, key=lambda router_id: -backward_distances[router_id])
+    for router_id in backward_only:
+        candidate = total_cost - backward_distances[router_id]
+        for neighbor_id, cost in get_neighbors(router_id).items():
+            if source_distances.get(neighbor_id, INFINITY) + cost == candidate:
+                source_distances[router_id] = candidate
+                break
+    source_distances[destination_id] = total_cost
+
+    path = [destination_id]
+    current_id = destination_id
+    while current_id != source_id:
+        current_distance = source_distances[current_id]
+        current_id = min(neighbor_id for neighbor_id, cost in get_neighbors(current_id).items()
+                         if source_distances.get(neighbor_id, INFINITY) + cost == current_distance)
+        path.append(current_id)
+    path.reverse()
+    return path, total_cost
+
+
+def shortest_path_tree(get_neighbors, source_id):
+    """
+    Computes the distances and next hops from a router to every router it can reach with Dijkstra's algorithm.
+
+    Every router is reached from the smallest-ID router lying just before it on a shortest path, which is
+    the tie-break rule of LinkStateRouter, and inherits the next hop of that router.
+
+    Args:
+        get_neighbors (function): Returns the neighbors dictionary ({router ID: cost}) of a router ID.
+        source_id (int): The ID of the source router.
+
+    Returns:
+        tuple: A dictionary mapping each reachable router ID to its distance, and a dictionary mapping each
+               reachable router ID, other than the source, to its next hop.
+    """
+    distances = {source_id: 0}
+    parents = {}
+    next_hops = {}
+    settled = set()
+    heap = [(0, source_id)]
+    while heap:
+        distance, router_id = heapq.heappop(heap)
+        if router_id in settled:
+            continue
+        settled.add(router_id)
+        if router_id != source_id:
+            parent_id = parents[router_id]
+            next_hops[router_id] = router_id if parent_id == source_id else next_hops[parent_id]
+        for neighbor_id, cost in get_neighbors(router_id).items():
+            new_distance = distance + cost
+            old_distance = distances.get(neighbor_id, INFINITY)
+            if new_distance < old_distance:
+                distances[neighbor_id] = new_distance
+                parents[neighbor_id] = router_id
+                heapq.heappush(heap, (new_distance, neighbor_id))
+            elif new_distance == old_distance and neighbor_id not in settled and router_id < parents.get(neighbor_id, router_id):
+                parents[neighbor_id] = router_id
+    return distances, next_hops
+
+
+
+def breadth_first_tree(get_neighbors, source_id, weight):
+    """
+    Computes the same distances and next hops as shortest_path_tree when every link costs the same,
+    by a breadth first search: the distance of a router is its number of hops times the cost.
+
+    Args:
+        get_neighbors (function): Returns the neighbors dictionary ({router ID: cost}) of a router ID.
+        source_id (int): The ID of the source router.
+        weight (int): The cost of every link.
+
+    Returns:
+        tuple: A dictionary mapping each reachable router ID to its distance, and a dictionary mapping each
+               reachable router ID, other than the source, to its next hop.
+    """
+    distances = {source_id: 0}
+    parents = {}
+    next_hops = {}
+    level = [source_id]
+    distance = 0
+    while level:
+        distance += weight
+        next_level = []
+        for router_id in level:
+            for neighbor_id in get_neighbors(router_id):
+                if neighbor_id not in distances:
+                    distances[neighbor_id] = distance
+                    parents[neighbor_id] = router_id
+                    next_level.append(neighbor_id)
+                elif distances[neighbor_id] == distance and router_id < parents[neighbor_id]:
+                    parents[neighbor_id] = router_id
+        for router_id in next_level:
+            parent_id = parents[router_id]
+            next_hops[router_id] = router_id if parent_id == source_id else next_hops[parent_id]
+        level = next_level
+    return distances, next_hops
+
+
+def bucket_tree(get_neighbors, source_id, max_weight):
+    """
+    Computes the same distances and next hops as shortest_path_tree with Dial's algorithm, for positive
+    integer costs up to a small maximum. Tentative distances always lie within max_weight of the distance
+    being settled, so routers are kept in a circular array of max_weight + 1 buckets, one per distance, and
+    a router whose distance decreases is left behind in its old bucket and skipped there.
+
+    Args:
+        get_neighbors (function): Returns the neighbors dictionary ({router ID: cost}) of a router ID.
+        source_id (int): The ID of the source router.
+        max_weight (int): The highest cost of a link.
+
+    Returns:
+        tuple: A dictionary mapping each reachable router ID to its distance, and a dictionary mapping each
+               reachable router ID, other than the source, to its next hop.
+    """
+    distances = {source_id: 0}
+    parents = {}
+    next_hops = {}
+    size = max_weight + 1
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(source_id)
+    queued = 1
+    distance = 0
+    while queued:
+        bucket = buckets[distance % size]
+        if bucket:
+            buckets[distance % size] = []
+            queued -= len(bucket)
+            for router_id in bucket:
+                if distances[router_id] != distance:
+                    continue
+                if router_id != source_id:
+                    parent_id = parents[router_id]
+                    next_hops[router_id] = router_id if parent_id == source_id else next_hops[parent_id]
+                for neighbor_id, cost in get_neighbors(router_id).items():
+                    new_distance = distance + cost
+                    old_distance = distances.get(neighbor_id, INFINITY)
+                    if new_distance < old_distance:
+                        distances[neighbor_id] = new_distance
+                        parents[neighbor_id] = router_id
+                        buckets[new_distance % size].append(neighbor_id)
+                        queued += 1
+                    elif new_distance == old_distance and router_id < parents[neighbor_id]:
+                        parents[neighbor_id] = router_id
+        distance += 1
+    return distances, next_hops
+
+
+def choose_tree_kernel(weights):
+    """
+    Chooses how to compute shortest path trees from the costs of the links: a breadth first search when
+    they are all the same, Dial's buckets when they are positive integers up to BUCKET_MAX_WEIGHT, and the
+    binary heap of shortest_path_tree otherwise. Beyond that, Dial's algorithm spends its time scanning empty
+    buckets, and a radix heap written in Python is slower than heapq.
+
+    Args:
+        weights (dict): The number of links with each cost. Costs with no link must not be included.
+
+    Returns:
+        function: A function taking get_neighbors and the source router ID, with the signature and results of shortest_path_tree.
+    """
+    if not weights:
+        return shortest_path_tree
+    min_weight = min(weights)
+    max_weight = max(weights)
+    if min_weight <= 0 or not all(isinstance(weight, int) for weight in weights):
+        return shortest_path_tree
+    if min_weight == max_weight:
+        return partial(breadth_first_tree, weight=min_weight)
+    if max_weight <= BUCKET_MAX_WEIGHT:
+        return partial(bucket_tree, max_weight=max_weight)
+    return shortest_path_tree
+
+
+## @}
@@ -0,0 +1,239 @@
+import array
+import mmap
+import os
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from input_parser import parse_topology_file
+
+## @file
+## @brief Readers and writers for the topology file formats understood by the simulator.
+# Topologies can be given as plain text ("router1 router2 cost" per line), as gzip-compressed
+# text, or as a compact binary edge array produced by convert_topology(). The binary format
+# is a 16 byte header (magic followed by the link count as a little-endian unsigned 64 bit
+# integer) and then one little-endian 32 bit (router1, router2, cost) triple per link. Binary
+# files are memory-mapped when loaded, so large topologies are handed to the Network without
+# any per-line parsing. Processes that build many networks from the same text topologies can
+# keep the parsed edges in memory with cache_text_topologies.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+BINARY_MAGIC = b"RTOPO1\x00\x00"
+HEADER_SIZE = 16
+LINK_FIELDS = 3
+
+_text_topology_cache = None
+_text_topology_cache_size = 0
+
+
+def _read_magic(topology_file, size):
+    """
+    Reads the first bytes of a file, used to detect its format.
+
+    Args:
+        topology_file (str): The path to the topology file.
+        size (int): The number of bytes to read.
+
+    Returns:
+        bytes: The first bytes of the file.
+    """
+    with open(topology_file, 'rb') as file:
+        return file.read(size)
+
+
+def is_binary_topology(topology_file):
+    """
+    Checks if a topology file uses the binary edge array format.
+
+    Args:
+        topology_file (str): The path to the topology file.
+
+    Returns:
+        bool: True if the file starts with the binary topology magic, False otherwise.
+    """
+    return _read_magic(topology_file, len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def write_binary_edges(edges, binary_file):
+    """
+    Writes a flat edge array to a file in the binary topology format.
+
+    Args:
+        edges (array): A flat array of (router1, router2, cost) triples.
+        binary_file (str): The path to the binary file to write.
+
+    Raises:
+        ValueError: If a router ID or a cost does not fit in a signed 32 bit integer.
+    """
+    try:
+        edges = array.array('i', edges)
+    except OverflowError:
+        raise ValueError(f"{binary_file}: router IDs and costs of binary topologies must fit in 32 bits") from None
+    if sys.byteorder == 'big':
+        edges.byteswap()
+    link_count = len(edges) // LINK_FIELDS
+    with open(binary_file, 'wb') as file:
+        file.write(BINARY_MAGIC)
+        file.write(link_count.to_bytes(HEADER_SIZE - len(BINARY_MAGIC), 'little'))
+        edges.tofile(file)
+
+
+def convert_topology(topology_file, binary_file):
+    """
+    Converts a text (optionally gzip-compressed) topology file to the binary topology format.
+
+    Args:
+        topology_file (str): The path to the text topology file.
+        binary_file (str): The path to the binary file to write.
+
+    Returns:
+        int: The number of links written.
+
+    Raises:
+        ValueError: If a router ID or a cost does not fit in a signed 32 bit integer.
+    """
+    edges = parse_topology_file(topology_file)
+    write_binary_edges(edges, binary_file)
+    return len(edges) // LINK_FIELDS
+
+
+@contextmanager
+def map_binary_edges(binary_file):
+    """
+    Memory-maps a binary topology file.
+
+    Yields a flat, read-only sequence of (router1, router2, cost) triples backed directly by
+    the mapped file. The sequence must not be used after the context exits.
+
+    Args:
+        binary_file (str): The path to the binary topology file.
+
+    Raises:
+        ValueError: If the file is not a valid binary topology file.
+    """
+    with open(binary_file, 'rb') as file:
+        header = file.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ValueError(f"{binary_file}: not a binary topology file")
+        link_count = int.from_bytes(header[len(BINARY_MAGIC):], 'little')
+        end = HEADER_SIZE + link_count * LINK_FIELDS * 4
+        if link_count == 0:
+            yield array.array('i')
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(mapped) < end:
+                raise ValueError(f"{binary_file}: truncated binary topology file")
+            with memoryview(mapped) as view, view[HEADER_SIZE:end] as payload:
+                if sys.byteorder == 'big':
+                    edges = array.array('i', payload.tobytes())
+                    edges.byteswap()
+                    yield edges
+                else:
+                    with payload.cast('i') as edges:
+                        yield edges
+        except BaseException:
+            # Slices of the edges still held by a failed consumer keep the mapping exported. Closing it would
+            # raise a BufferError hiding the original error, so the mapping is then closed once they are freed.
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+            raise
+        mapped.close()
+
+
+def cache_text_topologies(max_topologies):
+    """
+    Keeps the edges of the last parsed text topologies in memory, so that networks built again from
+    the same file, while it is unchanged, reuse them instead of parsing it again.
+
+    Args:
+        max_topologies (int): The number of topologies kept, least recently used first out. 0 turns the cache off.
+    """
+    global _text_topology_cache, _text_topology_cache_size
+    _text_topology_cache = OrderedDict() if max_topologies > 0 else None
+    _text_topology_cache_size = max_topologies
+
+
+def _parse_text_topology(topology_file):
+    """
+    Parses a text topology file, or reuses its edges if they are cached.
+
+    Args:
+        topology_file (str): The path to the text (optionally gzip-compressed) topology file.
+
+    Returns:
+        array: A flat array of (router1, router2, cost) triples. Cached arrays are shared and must not be modified.
+    """
+    if _text_topology_cache is None:
+        return parse_topology_file(topology_file)
+    status = os.stat(topology_file)
+    key = (os.path.realpath(topology_file), status.st_mtime_ns, status.st_size)
+    edges = _text_topology_cache.get(key)
+    if edges is not None:
+        _text_topology_cache.move_to_end(key)
+        return edges
+    edges = parse_topology_file(topology_file)
+    _text_topology_cache[key] = edges
+    if len(_text_topology_cache) > _text_topology_cache_size:
+        _text_topology_cache.popitem(last=False)
+    return edges
+
+
+def topology_was_cached(topology_file):
+    """
+    Checks if the edges of a text topology file are currently in the cache.
+
+    Args:
+        topology_file (str): The path to the topology file.
+
+    Returns:
+        bool: True if the topology would be reused from the cache.
+    """
+    if _text_topology_cache is None:
+        return False
+    status = os.stat(topology_file)
+    return (os.path.realpath(topology_file), status.st_mtime_ns, status.st_size) in _text_topology_cache
+
+
+@contextmanager
+def open_topology_edges(topology_file):
+    """
+    Opens a topology file in any supported format as a flat edge sequence.
+
+    Args:
+        topology_file (str): The path to a text, gzip-compressed text or binary topology file.
+
+    Yields:
+        sequence: A flat sequence of (router1, router2, cost) triples.
+    """
+    if is_binary_topology(topology_file):
+        with map_binary_edges(topology_file) as edges:
+            yield edges
+    else:
+        yield _parse_text_topology(topology_file)
+
+
+def main():
+    """
+    Converts a text topology file to the binary topology format.
+
+    Args:
+        topology_file (str): The text (optionally gzip-compressed) topology file.
+        binary_file (str): The binary file to write.
+    """
+    if len(sys.argv) != 3:
+        print("Usage: python topology_format.py topology_file binary_file")
+        sys.exit(1)
+    link_count = convert_topology(sys.argv[1], sys.argv[2])
+    print(f"Wrote {link_count} links to {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
+
+## @}
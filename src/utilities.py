@@ -1,20 +1,86 @@
-import sys
+import argparse
 INFINITY = float("inf")
 
-def parseArgs():
+def format_routing_table(routing_table):
     """
-    Parses the command line arguments and returns them as a list.
+    Formats a routing table as written to the output file, one "destination next_hop cost" line per
+    reachable destination, in increasing destination order.
+
+    Args:
+        routing_table (dict): The (next hop ID, cost) of each destination ID.
 
     Returns:
-        list: A list containing the command line arguments.
+        str: The routing table as a string.
+    """
+    routing_table_str = ""
+    for destination in sorted(routing_table):
+        next_hop, cost = routing_table[destination]
+        if cost != INFINITY:
+            routing_table_str += f"{destination} {next_hop} {cost}\n"
+    return routing_table_str
+
+def parseRouterIds(value):
+    """
+    Parses a comma separated list of router IDs given on the command line.
+
+    Args:
+        value (str): The list of router IDs, for example "1,4,7".
+
+    Returns:
+        list: The router IDs as integers.
+    """
+    try:
+        return [int(router_id) for router_id in value.split(",") if router_id.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid router ID list: {value!r}")
+
+def createArgParser(description):
     """
-    if len(sys.argv) < 4 or len(sys.argv) > 5:
-        print("Usage: python your_script.py topology_file message_file changes_file [output_file]")
-        sys.exit(1)
-    
-    args = sys.argv[1:]
+    Creates the command line parser shared by the simulation scripts.
+    Scripts can add their own options to it before parsing.
 
-    if len(sys.argv) == 4:
-        args += ["output.txt"]
+    Args:
+        description (str): The description of the script.
 
-    return args
\ No newline at end of file
+    Returns:
+        ArgumentParser: The command line parser.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("topology_file", help="file containing the network topology")
+    parser.add_argument("message_file", help="file containing the messages to be sent")
+    parser.add_argument("changes_file", help="file containing the changes to be applied to the network")
+    parser.add_argument("output_file", nargs="?", default="output.txt", help="file to output the results to (default: output.txt)")
+    parser.add_argument("--routers", type=parseRouterIds, default=None,
+                        help="comma separated router IDs; only their routing tables are written")
+    parser.add_argument("--traffic", default=None,
+                        help="file of \"source destination volume\" demands; the most loaded links are written after each change")
+    parser.add_argument("--top-links", type=int, default=10, help="number of most loaded links written with --traffic (default: 10)")
+    parser.add_argument("--pipeline", type=int, nargs="?", const=4, default=None, metavar="MAX_PENDING",
+                        help="format and write the output on a background thread, with at most MAX_PENDING states waiting (default: 4)")
+    parser.add_argument("--srlg", default=None,
+                        help="file of \"group router1 router2\" lines defining the shared risk link groups of srlg events")
+    parser.add_argument("--cache", default=None, metavar="DIRECTORY",
+                        help="reuse the results of identical runs stored in DIRECTORY, and resume runs whose changes extend a stored run")
+    parser.add_argument("--cache-size", type=int, default=256, metavar="MIB",
+                        help="size cap of the --cache directory; least recently used entries are removed first (default: 256)")
+    parser.add_argument("--trace", default=None, metavar="FILE",
+                        help="record every routing table update, including transient ones, in the binary trace FILE")
+    parser.add_argument("--trace-ring", type=int, default=None, metavar="RECORDS",
+                        help="only keep the last RECORDS records of --trace, written at the end of the run")
+    parser.add_argument("--control-plane", choices=("full", "delta"), default=None, metavar="ENCODING",
+                        help="count the protocol messages and their bytes in the full or delta wire encoding, and print them per change")
+    return parser
+
+def parseArgs(parser=None):
+    """
+    Parses the command line arguments.
+
+    Args:
+        parser (ArgumentParser): The parser to use, or None for the default parser.
+
+    Returns:
+        Namespace: The parsed command line arguments.
+    """
+    if parser is None:
+        parser = createArgParser("Routing protocol simulation.")
+    return parser.parse_args()
@@ -0,0 +1,175 @@
+import struct
+from LinkStateDatabase import make_lsp
+from utilities import INFINITY
+
+## @file
+## @brief Wire encodings of the routing protocol messages.
+# Inside the simulator, LSPs are immutable dictionaries, distance vectors are direct updates of the routing
+# tables of the neighbors, and DUAL messages are tuples. This module gives each of them the packet a router
+# would put on a link, so the control plane bandwidth of the protocols can be measured. Every packet starts
+# with a 1 byte type. Integers are little-endian, router IDs are signed 32 bit integers and costs are
+# unsigned 32 bit integers, NO_COST standing for an unreachable destination or a removed adjacency.
+# - LSP: origin, sequence number and entry count, then one (neighbor, cost) entry per adjacency.
+# - Delta LSP: same as an LSP, plus the sequence number of the LSP it is based on, and only the adjacencies
+#   added, changed or removed since that LSP.
+# - Distance vector: sender and entry count, then one (destination, cost) entry per advertised route.
+# - DUAL message: the kind of message (update, query or reply), sender, destination and distance.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Super
+## @{
+
+LSP = 1
+DELTA_LSP = 2
+DISTANCE_VECTOR = 3
+DUAL_MESSAGE = 4
+
+LSP_HEADER = struct.Struct("<BiII")  # type, origin, sequence, entries
+DELTA_LSP_HEADER = struct.Struct("<BiIII")  # type, origin, sequence, base sequence, entries
+VECTOR_HEADER = struct.Struct("<BiI")  # type, sender, entries
+ENTRY = struct.Struct("<iI")  # router ID, cost
+DUAL_PACKET = struct.Struct("<BBiiI")  # type, kind, sender, destination, distance
+DUAL_KINDS = ("update", "query", "reply")
+NO_COST = 0xFFFFFFFF
+
+
+def _encode_entries(entries):
+    """
+    Encodes (router ID, cost) entries.
+
+    Args:
+        entries (iterable): The (router ID, cost) pairs, INFINITY or None costs being encoded as NO_COST.
+
+    Returns:
+        bytes: The encoded entries.
+    """
+    return b"".join(ENTRY.pack(router_id, NO_COST if cost is None or cost == INFINITY else cost) for router_id, cost in entries)
+
+
+def _decode_entries(data, offset, count):
+    """
+    Decodes (router ID, cost) entries.
+
+    Args:
+        data (bytes): The packet.
+        offset (int): The offset of the first entry.
+        count (int): The number of entries.
+
+    Returns:
+        dict: The cost of each router ID, INFINITY for NO_COST.
+
+    Raises:
+        ValueError: If the packet is not as long as its entries.
+    """
+    if len(data) != offset + count * ENTRY.size:
+        raise ValueError(f"packet of {len(data)} bytes does not hold {count} entries")
+    return {router_id: INFINITY if cost == NO_COST else cost
+            for router_id, cost in ENTRY.iter_unpack(memoryview(data)[offset:])}
+
+
+def encode_lsp(lsp):
+    """
+    Encodes a full LSP.
+
+    Args:
+        lsp (dict): The LSP, with its 'id', 'sequence' and 'neighbors'.
+
+    Returns:
+        bytes: The packet.
+    """
+    neighbors = lsp['neighbors']
+    return LSP_HEADER.pack(LSP, lsp['id'], lsp['sequence'], len(neighbors)) + _encode_entries(neighbors.items())
+
+
+def encode_delta_lsp(lsp, base_lsp):
+    """
+    Encodes the adjacencies of an LSP added, changed or removed since a previous LSP of the same router.
+
+    Args:
+        lsp (dict): The new LSP.
+        base_lsp (dict): The previous LSP of the router, that the receivers already have.
+
+    Returns:
+        bytes: The packet.
+    """
+    neighbors = lsp['neighbors']
+    base_neighbors = base_lsp['neighbors']
+    entries = [(neighbor_id, cost) for neighbor_id, cost in neighbors.items() if base_neighbors.get(neighbor_id) != cost]
+    entries.extend((neighbor_id, None) for neighbor_id in base_neighbors if neighbor_id not in neighbors)
+    return DELTA_LSP_HEADER.pack(DELTA_LSP, lsp['id'], lsp['sequence'], base_lsp['sequence'], len(entries)) + _encode_entries(entries)
+
+
+def encode_distance_vector(sender_id, entries):
+    """
+    Encodes a distance vector sent to a neighbor.
+
+    Args:
+        sender_id (int): The ID of the advertising router.
+        entries (list): The (destination ID, cost) pairs advertised, INFINITY for withdrawn routes.
+
+    Returns:
+        bytes: The packet.
+    """
+    return VECTOR_HEADER.pack(DISTANCE_VECTOR, sender_id, len(entries)) + _encode_entries(entries)
+
+
+def encode_dual_message(kind, sender_id, destination_id, distance):
+    """
+    Encodes a DUAL message.
+
+    Args:
+        kind (str): "update", "query" or "reply".
+        sender_id (int): The ID of the sending router.
+        destination_id (int): The ID of the destination the distance is about.
+        distance (int): The distance of the sender to the destination, or INFINITY.
+
+    Returns:
+        bytes: The packet.
+    """
+    return DUAL_PACKET.pack(DUAL_MESSAGE, DUAL_KINDS.index(kind), sender_id, destination_id,
+                            NO_COST if distance == INFINITY else distance)
+
+
+def decode_packet(data, base_lsp=None):
+    """
+    Decodes a packet.
+
+    Args:
+        data (bytes): The packet.
+        base_lsp (dict): For a delta LSP, the LSP it is based on.
+
+    Returns:
+        object: An LSP for full and delta LSPs, a (sender ID, {destination ID: cost}) pair for distance vectors,
+                and a (kind, sender ID, destination ID, distance) tuple for DUAL messages.
+
+    Raises:
+        ValueError: If the packet is malformed, or a delta LSP is not based on base_lsp.
+    """
+    if not data:
+        raise ValueError("empty packet")
+    if data[0] == LSP:
+        _, origin_id, sequence, count = LSP_HEADER.unpack_from(data)
+        return make_lsp(origin_id, sequence, _decode_entries(data, LSP_HEADER.size, count))
+    if data[0] == DELTA_LSP:
+        _, origin_id, sequence, base_sequence, count = DELTA_LSP_HEADER.unpack_from(data)
+        if base_lsp is None or base_lsp['id'] != origin_id or base_lsp['sequence'] != base_sequence:
+            raise ValueError(f"delta LSP of router {origin_id} needs its LSP {base_sequence}")
+        neighbors = dict(base_lsp['neighbors'])
+        for neighbor_id, cost in _decode_entries(data, DELTA_LSP_HEADER.size, count).items():
+            if cost == INFINITY:
+                del neighbors[neighbor_id]
+            else:
+                neighbors[neighbor_id] = cost
+        return make_lsp(origin_id, sequence, neighbors)
+    if data[0] == DISTANCE_VECTOR:
+        _, sender_id, count = VECTOR_HEADER.unpack_from(data)
+        return sender_id, _decode_entries(data, VECTOR_HEADER.size, count)
+    if data[0] == DUAL_MESSAGE:
+        if len(data) != DUAL_PACKET.size:
+            raise ValueError(f"DUAL message of {len(data)} bytes")
+        _, kind, sender_id, destination_id, distance = DUAL_PACKET.unpack(data)
+        return DUAL_KINDS[kind], sender_id, destination_id, INFINITY if distance == NO_COST else distance
+    raise ValueError(f"unknown packet type {data[0]}")
+
+## @}
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from pathlib import Path
+## @file
+## @brief Fixtures shared by the test files.
+# Contains the path to the test files, a topology with two components, and a test case giving every test its
+# own temporary directory, for the tests writing output files or building inputs that are not in the test files.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+TESTFILES = Path(__file__).resolve().parent / "testfiles"
+
+# Two components: the square 1 2 3 4 and the path 5 6 7
+TWO_COMPONENTS_TOPOLOGY = "1 2 1\n2 3 1\n3 4 1\n4 1 1\n5 6 1\n6 7 1\n"
+
+
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    """
+    A test case creating a temporary directory before every test, and removing it with its files after the test.
+
+    Attributes:
+        temp (Path): The temporary directory of the test.
+        testfiles (Path): The directory of the test files.
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp = Path(temp_dir.name)
+        self.testfiles = TESTFILES
+
+## @}
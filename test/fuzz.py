@@ -0,0 +1,267 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from DistanceVectorNetwork import DistanceVectorNetwork
+from DualNetwork import DualNetwork
+from LinkStateNetwork import LinkStateNetwork
+from TopologyVersion import DISTANCE_VECTOR, LINK_STATE, TopologyVersion
+from oracle import DVR, LSR, REMOVED, ReferenceNetwork, reference_output
+
+## @file
+## @brief Randomized differential fuzzing of the routing engines against the reference oracle.
+# Every fuzz case is generated from a seed: a random topology (possibly disconnected, with many equal-cost
+# paths), a trace of link additions, cost changes and removals (including new routers and links that do
+# not exist) mixed with node and shared risk link group failures and recoveries, and messages between
+# random routers (including unknown routers). Every engine runs the case
+# and its output file must be identical to the output computed by the oracle. Cases run in parallel across
+# worker processes, and the files of the failing cases can be saved to reproduce them.
+#
+# Usage: python test/fuzz.py [--cases 1000] [--seed 0] [--workers N] [--save failures/]
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+# Engine name: (network factory, tie-break rule, ECMP, output routers)
+ENGINES = {
+    "dvr": (lambda paths, routers: DistanceVectorNetwork(paths["topology"], paths["output"]), DVR, False, False),
+    "dvr-ecmp": (lambda paths, routers: DistanceVectorNetwork(paths["topology"], paths["output"], ecmp=True), DVR, True, False),
+    "dual": (lambda paths, routers: DualNetwork(paths["topology"], paths["output"]), DVR, False, False),
+    "lsr": (lambda paths, routers: LinkStateNetwork(paths["topology"], paths["output"]), LSR, False, False),
+    "lsr-lazy": (lambda paths, routers: LinkStateNetwork(paths["topology"], paths["output"], lazy=True), LSR, False, False),
+    "lsr-routers": (lambda paths, routers: LinkStateNetwork(paths["topology"], paths["output"], routers), LSR, False, True),
+    "lsr-ecmp": (lambda paths, routers: LinkStateNetwork(paths["topology"], paths["output"], ecmp=True), LSR, True, False),
+    "dvr-shards": (lambda paths, routers: DistanceVectorNetwork(paths["topology"], paths["output"], shards=2), DVR, False, False),
+    "dvr-shards-ecmp": (lambda paths, routers: DistanceVectorNetwork(paths["topology"], paths["output"], ecmp=True, shards=3), DVR, True, False),
+    "dvr-pipeline": (lambda paths, routers: _pipelined(DistanceVectorNetwork(paths["topology"], paths["output"], routers)), DVR, False, True),
+    "lsr-pipeline": (lambda paths, routers: _pipelined(LinkStateNetwork(paths["topology"], paths["output"], ecmp=True)), LSR, True, False),
+}
+
+
+def _pipelined(network):
+    """
+    Switches a network to pipelined output, with a single pending state so that the writer often blocks the computation.
+
+    Args:
+        network (Network): The network.
+
+    Returns:
+        Network: The same network.
+    """
+    network.enable_pipeline(1)
+    return network
+
+
+def generate_case(seed):
+    """
+    Generates a random fuzz case.
+
+    Args:
+        seed (int): The seed of the case.
+
+    Returns:
+        dict: The "links", "changes" and "messages" of the case, the shared risk link "groups", and the "routers"
+              whose routing tables are written by the engines limiting their output.
+    """
+    generator = random.Random(seed)
+    router_count = generator.randint(1, 24)
+    max_cost = generator.choice((1, 2, 5))
+    links = {}
+    for router_id in range(2, router_count + 1):
+        if generator.random() < 0.9:
+            links[(generator.randint(1, router_id - 1), router_id)] = generator.randint(1, max_cost)
+    for _ in range(generator.randint(0, 2 * router_count)):
+        if router_count > 1:
+            router_id1, router_id2 = generator.sample(range(1, router_count + 1), 2)
+            links[(router_id1, router_id2)] = generator.randint(1, max_cost)
+    if not links:
+        links[(1, router_count + 1)] = 1
+    groups = {group_id: generator.sample(list(links), generator.randint(1, len(links)))
+              for group_id in range(1, generator.randint(0, 3) + 1)}
+
+    changes = []
+    for _ in range(generator.randint(0, 8)):
+        kind = generator.random()
+        if kind < 0.1:
+            changes.append(("node", generator.randint(1, router_count + 2), generator.choice(("down", "up"))))
+        elif kind < 0.2 and groups:
+            changes.append(("srlg", generator.choice(list(groups)), generator.choice(("down", "up"))))
+        elif kind < 0.4 and links:
+            router_id1, router_id2 = generator.choice(list(links))
+            changes.append((router_id1, router_id2, REMOVED))
+        elif kind < 0.5:
+            router_id1, router_id2 = generator.sample(range(1, router_count + 4), 2)
+            changes.append((router_id1, router_id2, REMOVED))
+        else:
+            router_id1, router_id2 = generator.sample(range(1, router_count + 4), 2)
+            changes.append((router_id1, router_id2, generator.randint(1, max_cost)))
+
+    messages = [(generator.randint(1, router_count + 2), generator.randint(1, router_count + 2), f"message {index}\n")
+                for index in range(generator.randint(0, 8))]
+    routers = generator.sample(range(1, router_count + 2), generator.randint(1, router_count + 1))
+    return {"links": list(links.items()), "changes": changes, "messages": messages, "groups": groups, "routers": routers}
+
+
+def write_case(case, directory):
+    """
+    Writes the input files of a fuzz case.
+
+    Args:
+        case (dict): The fuzz case.
+        directory (str): The directory to write the files to.
+
+    Returns:
+        dict: The paths of the "topology", "changes", "messages", "srlg" and "output" files.
+    """
+    paths = {name: os.path.join(directory, f"{name}.txt") for name in ("topology", "changes", "messages", "srlg", "output")}
+    with open(paths["topology"], 'w') as file:
+        file.writelines(f"{router_id1} {router_id2} {cost}\n" for (router_id1, router_id2), cost in case["links"])
+    with open(paths["changes"], 'w') as file:
+        file.writelines(f"{router_id1} {router_id2} {cost}\n" for router_id1, router_id2, cost in case["changes"])
+    with open(paths["messages"], 'w') as file:
+        file.writelines(f"{source_id} {destination_id} {message}" for source_id, destination_id, message in case["messages"])
+    with open(paths["srlg"], 'w') as file:
+        file.writelines(f"{group_id} {router_id1} {router_id2}\n" for group_id, links in case["groups"].items()
+                        for router_id1, router_id2 in links)
+    return paths
+
+
+def check_case(seed, engines=tuple(ENGINES)):
+    """
+    Runs every engine on a fuzz case and compares its output with the oracle.
+
+    Args:
+        seed (int): The seed of the case.
+        engines (tuple): The names of the engines to check.
+
+    Returns:
+        list: The names of the engines whose output differs from the oracle, or that raised an error.
+    """
+    case = generate_case(seed)
+    links = [(router_id1, router_id2, cost) for (router_id1, router_id2), cost in case["links"]]
+    failures = []
+    expected_outputs = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_case(case, directory)
+        for name in engines:
+            factory, rule, ecmp, limited = ENGINES[name]
+            output_routers = case["routers"] if limited else None
+            if (rule, ecmp, limited) not in expected_outputs:
+                expected_outputs[(rule, ecmp, limited)] = reference_output(links, case["messages"], case["changes"], rule, ecmp,
+                                                                           output_routers, case["groups"])
+            expected = expected_outputs[(rule, ecmp, limited)]
+            try:
+                with factory(paths, output_routers) as network:
+                    network.load_shared_risk_link_groups(paths["srlg"])
+                    network.apply_changes_and_output(paths["changes"], paths["messages"])
+                with open(paths["output"]) as file:
+                    if file.read() != expected:
+                        failures.append(name)
+            except Exception as error:
+                failures.append(f"{name} ({type(error).__name__}: {error})")
+
+        if "lsr" in engines:
+            network = LinkStateNetwork(paths["topology"], paths["output"], lazy=True)
+            network.load_shared_risk_link_groups(paths["srlg"])
+            network.record_history()
+            reachable = [{router_id: {other_id for other_id in network.routers if network.reachable(router_id, other_id)}
+                          for router_id in network.routers}]
+            for change in case["changes"]:
+                network.apply_topology_change(change)
+                reachable.append({router_id: {other_id for other_id in network.routers if network.reachable(router_id, other_id)}
+                                  for router_id in network.routers})
+            reference = ReferenceNetwork(links, case["groups"])
+            for number, change in enumerate([None] + case["changes"]):
+                if change is not None:
+                    reference.apply_change(*change)
+                version = network.version(number)
+                if version.routers() != sorted(reference.neighbors):
+                    failures.append(f"version {number} routers")
+                if reachable[number] != {router_id: set(reference.distances(router_id)) for router_id in reference.neighbors}:
+                    failures.append(f"version {number} reachable")
+                for rule, tie_break in ((LSR, LINK_STATE), (DVR, DISTANCE_VECTOR)):
+                    version = TopologyVersion(version.neighbors, number, tie_break)
+                    if any(version.routing_table(router_id) != reference.routing_table(router_id, rule) for router_id in reference.neighbors):
+                        failures.append(f"version {number} {rule}")
+            for source_id, destination_id, message in case["messages"]:
+                path, cost = network.query_route(source_id, destination_id)
+                if source_id in reference.neighbors and path != reference.link_state_path(source_id, destination_id):
+                    failures.append(f"query_route {source_id} {destination_id}")
+            del network
+    return failures
+
+
+def save_case(seed, directory):
+    """
+    Saves the input files of a fuzz case, to reproduce a failure.
+
+    Args:
+        seed (int): The seed of the case.
+        directory (str): The directory to save the case in, as a seed_<seed> subdirectory.
+    """
+    case_directory = os.path.join(directory, f"seed_{seed}")
+    os.makedirs(case_directory, exist_ok=True)
+    write_case(generate_case(seed), case_directory)
+
+
+def fuzz(first_seed, cases, workers=None):
+    """
+    Checks the engines on many fuzz cases in parallel.
+
+    Args:
+        first_seed (int): The seed of the first case.
+        cases (int): The number of cases, with consecutive seeds.
+        workers (int): The number of worker processes, or None for one per CPU. 1 runs the cases in this process.
+
+    Returns:
+        dict: The failing engines of every failing seed.
+    """
+    seeds = range(first_seed, first_seed + cases)
+    if workers == 1:
+        results = map(check_case, seeds)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(check_case, seeds, chunksize=16)
+    failures = {seed: failed for seed, failed in zip(seeds, results) if failed}
+    if workers != 1:
+        executor.shutdown()
+    return failures
+
+
+def main():
+    """
+    Main function of the fuzzer. Prints the failing seeds and exits with status 1 if there are any.
+
+    Args:
+        [--cases] (int): The number of cases.
+        [--seed] (int): The seed of the first case.
+        [--workers] (int): The number of worker processes.
+        [--save] (str): A directory to save the files of the failing cases to.
+    """
+    parser = argparse.ArgumentParser(description="Differential fuzzing of the routing engines against the reference oracle.")
+    parser.add_argument("--cases", type=int, default=1000, help="number of cases (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first case (default: 0)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--save", default=None, help="directory to save the files of the failing cases to")
+    args = parser.parse_args()
+
+    failures = fuzz(args.seed, args.cases, args.workers)
+    for seed, failed in failures.items():
+        print(f"seed {seed}: {', '.join(failed)}")
+        if args.save is not None:
+            save_case(seed, args.save)
+    print(f"{args.cases} cases, {len(failures)} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
+
+## @}
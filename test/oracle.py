@@ -0,0 +1,326 @@
+import heapq
+import zlib
+
+## @file
+## @brief Reference implementation of the routing rules, used as an oracle by the tests.
+# This module computes the expected routing tables, messages and output files of a simulation directly
+# from the network graph, without any routers, LSPs or distance vectors. It is written independently of
+# the simulator, as plainly as possible, so that every engine can be checked against it:
+# - Distance Vector Routing (and DUAL) uses, for every destination, the lowest-ID neighbor lying on a shortest path.
+# - Link State Routing reaches every router from the lowest-ID router lying just before it on a shortest
+#   path, so the chosen path is the one whose router IDs, read from the destination back to the source, are
+#   lexicographically smallest.
+# - In ECMP mode, every neighbor lying on a shortest path is a next hop, and messages pick one at every
+#   router with the CRC32 of "source destination router".
+# - A link is in the graph if it was added and not removed by the link changes, and neither of its routers
+#   nor any of its shared risk link groups is down.
+# Messages always follow the routing tables hop by hop, starting from the source.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+INFINITY = float("inf")
+REMOVED = -999
+DVR = "dvr"
+LSR = "lsr"
+
+
+class ReferenceNetwork:
+    """
+    A network graph with the reference routing rules.
+
+    Attributes:
+        neighbors (dict): For each router ID, a dictionary mapping its neighbor IDs to the cost of the link.
+        links (dict): The cost of every link that was added and not removed, keyed by sorted router ID pair, failed or not.
+        link_groups (dict): For each shared risk link group ID, the set of its links as sorted router ID pairs.
+        down_routers (set): The IDs of the failed routers.
+        down_link_groups (set): The IDs of the failed shared risk link groups.
+    """
+
+    def __init__(self, edges=(), link_groups=None):
+        """
+        Initializes a ReferenceNetwork object.
+
+        Args:
+            edges (iterable): The (router1, router2, cost) links of the network.
+            link_groups (dict): For each shared risk link group ID, the (router1, router2) pairs of its links.
+        """
+        self.neighbors = {}
+        self.links = {}
+        self.link_groups = {group_id: {tuple(sorted(link)) for link in links} for group_id, links in (link_groups or {}).items()}
+        self.down_routers = set()
+        self.down_link_groups = set()
+        for router_id1, router_id2, cost in edges:
+            self._set_link(router_id1, router_id2, cost)
+        self._build_graph()
+
+    def _set_link(self, router_id1, router_id2, cost):
+        """
+        Adds, updates or removes a link, without updating the graph. Both routers are added if they are new.
+
+        Args:
+            router_id1 (int): The ID of the first router.
+            router_id2 (int): The ID of the second router.
+            cost (int): The cost of the link, or -999 to remove it.
+        """
+        self.neighbors.setdefault(router_id1, {})
+        self.neighbors.setdefault(router_id2, {})
+        if cost == REMOVED:
+            self.links.pop(tuple(sorted((router_id1, router_id2))), None)
+        else:
+            self.links[tuple(sorted((router_id1, router_id2)))] = cost
+
+    def _build_graph(self):
+        """
+        Rebuilds the neighbors of every router from the links that are not failed.
+        """
+        self._distances = {}
+        self._routing_tables = {}
+        for router_neighbors in self.neighbors.values():
+            router_neighbors.clear()
+        for (router_id1, router_id2), cost in self.links.items():
+            if router_id1 in self.down_routers or router_id2 in self.down_routers:
+                continue
+            if any((router_id1, router_id2) in self.link_groups[group_id] for group_id in self.down_link_groups):
+                continue
+            self.neighbors[router_id1][router_id2] = cost
+            self.neighbors[router_id2][router_id1] = cost
+
+    def apply_change(self, router_id1, router_id2, cost):
+        """
+        Applies one line of a changes file: adds, updates or removes a link, adding both routers to the
+        network if they are new, or fails or recovers a router ("node") or a shared risk link group ("srlg").
+
+        Args:
+            router_id1 (int): The ID of the first router, or "node" or "srlg" for an event.
+            router_id2 (int): The ID of the second router, or the ID of the router or group of the event.
+            cost (int): The cost of the link, -999 to remove it, or "down" or "up" for an event.
+        """
+        if router_id1 == "node":
+            (self.down_routers.discard if cost == "up" else self.down_routers.add)(router_id2)
+        elif router_id1 == "srlg":
+            (self.down_link_groups.discard if cost == "up" else self.down_link_groups.add)(router_id2)
+        else:
+            self._set_link(router_id1, router_id2, cost)
+        self._build_graph()
+
+    def distances(self, source_id):
+        """
+        Computes the distance from a router to every router it can reach.
+
+        Args:
+            source_id (int): The ID of the source router.
+
+        Returns:
+            dict: The distance to every reachable router ID.
+        """
+        if source_id not in self._distances:
+            distances = {source_id: 0}
+            heap = [(0, source_id)]
+            while heap:
+                distance, router_id = heapq.heappop(heap)
+                if distance > distances[router_id]:
+                    continue
+                for neighbor_id, cost in self.neighbors[router_id].items():
+                    if distance + cost < distances.get(neighbor_id, INFINITY):
+                        distances[neighbor_id] = distance + cost
+                        heapq.heappush(heap, (distance + cost, neighbor_id))
+            self._distances[source_id] = distances
+        return self._distances[source_id]
+
+    def equal_cost_next_hops(self, router_id, destination_id):
+        """
+        Finds every neighbor of a router lying on a shortest path to a destination.
+
+        Args:
+            router_id (int): The ID of the router.
+            destination_id (int): The ID of the destination router.
+
+        Returns:
+            list: The sorted neighbor IDs, empty if the destination cannot be reached.
+        """
+        to_destination = self.distances(destination_id)
+        if router_id not in to_destination or router_id == destination_id:
+            return []
+        return sorted(neighbor_id for neighbor_id, cost in self.neighbors[router_id].items()
+                      if cost + to_destination.get(neighbor_id, INFINITY) == to_destination[router_id])
+
+    def link_state_path(self, source_id, destination_id):
+        """
+        Finds the path chosen by Link State Routing: every router on it is reached from the lowest-ID
+        router lying just before it on a shortest path from the source.
+
+        Args:
+            source_id (int): The ID of the source router.
+            destination_id (int): The ID of the destination router.
+
+        Returns:
+            list: The router IDs on the path, from source to destination, or None if the destination cannot be reached.
+        """
+        from_source = self.distances(source_id)
+        if destination_id not in from_source:
+            return None
+        path = [destination_id]
+        while path[-1] != source_id:
+            router_id = path[-1]
+            path.append(min(neighbor_id for neighbor_id, cost in self.neighbors[router_id].items()
+                            if from_source.get(neighbor_id, INFINITY) + cost == from_source[router_id]))
+        path.reverse()
+        return path
+
+    def routing_table(self, router_id, rule):
+        """
+        Computes the routing table of a router.
+
+        With the Link State rule, routers are visited in increasing distance order, and each one takes the
+        next hop of its lowest-ID predecessor on a shortest path, as link_state_path would find it.
+
+        Args:
+            router_id (int): The ID of the router.
+            rule (str): DVR or LSR, the tie-break rule of the next hops.
+
+        Returns:
+            dict: The (next hop ID, cost) of every reachable destination ID, including the router itself.
+        """
+        key = (router_id, rule)
+        if key not in self._routing_tables:
+            from_router = self.distances(router_id)
+            routing_table = {router_id: (router_id, 0)}
+            for destination_id in sorted(from_router, key=from_router.get):
+                cost = from_router[destination_id]
+                if destination_id == router_id:
+                    continue
+                if rule == LSR:
+                    parent_id = min(neighbor_id for neighbor_id, link_cost in self.neighbors[destination_id].items()
+                                    if from_router.get(neighbor_id, INFINITY) + link_cost == cost)
+                    next_hop_id = destination_id if parent_id == router_id else routing_table[parent_id][0]
+                else:
+                    next_hop_id = self.equal_cost_next_hops(router_id, destination_id)[0]
+                routing_table[destination_id] = (next_hop_id, cost)
+            self._routing_tables[key] = routing_table
+        return self._routing_tables[key]
+
+    def route(self, source_id, destination_id, rule, ecmp=False):
+        """
+        Follows the routing tables hop by hop from a source to a destination.
+
+        Args:
+            source_id (int): The ID of the source router.
+            destination_id (int): The ID of the destination router.
+            rule (str): DVR or LSR, the tie-break rule of the next hops.
+            ecmp (bool): If True, every router picks among its equal-cost next hops with the flow hash.
+
+        Returns:
+            tuple: The router IDs on the route, from source to destination, and its cost. (None, INFINITY) if the destination cannot be reached.
+        """
+        if source_id not in self.neighbors or destination_id not in self.distances(source_id):
+            return None, INFINITY
+        route = [source_id]
+        while route[-1] != destination_id:
+            router_id = route[-1]
+            if ecmp:
+                next_hops = self.equal_cost_next_hops(router_id, destination_id)
+                flow_hash = zlib.crc32(f"{source_id} {destination_id} {router_id}".encode())
+                route.append(next_hops[flow_hash % len(next_hops)])
+            else:
+                route.append(self.routing_table(router_id, rule)[destination_id][0])
+        return route, self.distances(source_id)[destination_id]
+
+    def output(self, messages, rule, ecmp=False, output_routers=None):
+        """
+        Writes the routing tables and messages of the current state, in the format of the simulator output files.
+
+        Args:
+            messages (list): The (source, destination, message) tuples to send.
+            rule (str): DVR or LSR, the tie-break rule of the next hops.
+            ecmp (bool): If True, messages are spread over the equal-cost next hops with the flow hash.
+            output_routers (iterable): The IDs of the routers whose routing tables are written, or None for all routers.
+
+        Returns:
+            str: The output of the state.
+        """
+        output = ""
+        for router_id in sorted(self.neighbors):
+            if output_routers is not None and router_id not in output_routers:
+                continue
+            routing_table = self.routing_table(router_id, rule)
+            for destination_id in sorted(routing_table):
+                next_hop_id, cost = routing_table[destination_id]
+                output += f"{destination_id} {next_hop_id} {cost}\n"
+            output += "\n"
+        for source_id, destination_id, message in messages:
+            route, cost = self.route(source_id, destination_id, rule, ecmp)
+            if route is None:
+                output += f"from {source_id} to {destination_id} cost infinite hops unreachable message {message}"
+            else:
+                hops = " ".join(map(str, route[:-1] if len(route) > 1 else route))
+                output += f"from {source_id} to {destination_id} cost {cost} hops {hops} message {message}"
+        return output + "\n\n"
+
+
+def read_links(path):
+    """
+    Reads a plain text topology or changes file.
+
+    Args:
+        path (str): The path to the file, where every line is "router1 router2 cost", or a "node" or "srlg" event in a changes file.
+
+    Returns:
+        list: The (router1, router2, cost) and ("node" or "srlg", ID, "down" or "up") tuples, in file order.
+    """
+    links = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if fields and fields[0] in ("node", "srlg"):
+                links.append((fields[0], int(fields[1]), fields[2]))
+            elif fields:
+                links.append(tuple(int(field) for field in fields))
+    return links
+
+
+def read_messages(path):
+    """
+    Reads a plain text message file.
+
+    Args:
+        path (str): The path to the file, where every line is "source destination message".
+
+    Returns:
+        list: The (source, destination, message) tuples, the message keeping its line break.
+    """
+    with open(path) as file:
+        messages = []
+        for line in file:
+            if line.strip():
+                source_id, destination_id, message = line.split(" ", 2)
+                messages.append((int(source_id), int(destination_id), message))
+        return messages
+
+
+def reference_output(links, messages, changes, rule, ecmp=False, output_routers=None, link_groups=None):
+    """
+    Computes the whole output file of a simulation: the initial state, then the state after every change.
+
+    Args:
+        links (list): The (router1, router2, cost) links of the topology.
+        messages (list): The (source, destination, message) tuples sent in every state.
+        changes (list): The (router1, router2, cost) changes and ("node" or "srlg", ID, "down" or "up") events, applied in order.
+        rule (str): DVR or LSR, the tie-break rule of the next hops.
+        ecmp (bool): If True, messages are spread over the equal-cost next hops with the flow hash.
+        output_routers (iterable): The IDs of the routers whose routing tables are written, or None for all routers.
+        link_groups (dict): For each shared risk link group ID, the (router1, router2) pairs of its links.
+
+    Returns:
+        str: The expected output file.
+    """
+    network = ReferenceNetwork(links, link_groups)
+    output = network.output(messages, rule, ecmp, output_routers)
+    for change in changes:
+        network.apply_change(*change)
+        output += network.output(messages, rule, ecmp, output_routers)
+    return output
+
+## @}
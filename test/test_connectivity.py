@@ -0,0 +1,105 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from ConnectivityIndex import ConnectivityIndex
+from DistanceVectorNetwork import DistanceVectorNetwork
+from LinkStateNetwork import LinkStateNetwork
+from fixtures import TWO_COMPONENTS_TOPOLOGY, TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the connectivity index of the networks.
+# Contains tests for the incremental connected components, for reachability questions answered without
+# the routing tables, and for the routers of other components keeping their routes after a change.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestConnectivity(TemporaryDirectoryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        (self.temp / "topology.txt").write_text(TWO_COMPONENTS_TOPOLOGY)
+
+    ## @brief Test case for the ConnectivityIndex.
+    #
+    # Test Steps:
+    # 1. Link the routers 1 2 3 4 in a square, then remove the links 1-2 and 3-4.
+    # 2. Link 2 to the new router 5.
+    #
+    # Expected Results:
+    # - Removing 1-2 keeps the square connected, removing 3-4 splits it into {1, 4} and {2, 3}.
+    # - Linking 5 merges it into {2, 3, 5}, and routers that were never linked are only connected to themselves.
+    # @test Verifies that components are merged and split as links are added and removed.
+    def test_connectivity_index(self):
+        neighbors = {1: {2: 1, 4: 1}, 2: {1: 1, 3: 1}, 3: {2: 1, 4: 1}, 4: {3: 1, 1: 1}}
+        index = ConnectivityIndex.from_topology(neighbors.get, neighbors)
+        self.assertEqual(index.component(1), {1, 2, 3, 4})
+
+        for router_id1, router_id2 in ((1, 2), (3, 4)):
+            del neighbors[router_id1][router_id2], neighbors[router_id2][router_id1]
+            index.remove_link(router_id1, router_id2, neighbors.get)
+            if router_id1 == 1:
+                self.assertTrue(index.connected(1, 2))
+        self.assertEqual((index.component(1), index.component(3)), ({1, 4}, {2, 3}))
+        self.assertFalse(index.connected(4, 3))
+
+        index.add_link(2, 5)
+        self.assertEqual(index.component(5), {2, 3, 5})
+        self.assertEqual(index.components_of([3, 5, 1, 8]), [{2, 3, 5}, {1, 4}, {8}])
+        self.assertTrue(index.connected(8, 8))
+        self.assertFalse(index.connected(8, 9))
+
+    ## @brief Test case for reachability in a lazy Link State network.
+    #
+    # Test Steps:
+    # 1. Create a lazy LinkStateNetwork with two components and send a message from 1 to 6.
+    # 2. Link 4 to 5 and check the reachability again.
+    #
+    # Expected Results:
+    # - 6 is unreachable from 1, and router 1 never ran Dijkstra's algorithm to find it out.
+    # - Once 4 and 5 are linked, 1 can reach 6.
+    # @test Verifies that unreachable destinations are found without computing the routing tables.
+    def test_reachable(self):
+        network = LinkStateNetwork(str(self.temp / "topology.txt"), str(self.temp / "output.txt"), lazy=True)
+        self.assertEqual(network._generate_message_string(1, 6, "across"), "from 1 to 6 cost infinite hops unreachable message across")
+        self.assertEqual(network.routers[1].spf_runs, 0)
+        self.assertEqual(network.query_route(1, 6), (None, float('inf')))
+
+        network.apply_change(4, 5, 1)
+        self.assertTrue(network.reachable(1, 6))
+        self.assertFalse(network.reachable(1, 8))
+        network.close()
+
+    ## @brief Test case for the routers of other components after a change.
+    #
+    # Test Steps:
+    # 1. Create a Distance Vector and a Link State network with two components.
+    # 2. Change the cost of the link 1-2 and remove the link 3-4.
+    #
+    # Expected Results:
+    # - The routers 5, 6 and 7 keep the same routing table objects and run no Dijkstra's algorithm.
+    # - The routers of the square use their new routes.
+    # @test Verifies that changes only update the routers of their components.
+    def test_unaffected_components(self):
+        for network_class in (DistanceVectorNetwork, LinkStateNetwork):
+            network = network_class(str(self.temp / "topology.txt"), str(self.temp / "output.txt"))
+            routing_tables = {router_id: network.routers[router_id].routing_table for router_id in (5, 6, 7)}
+            entries = {router_id: dict(routing_table) for router_id, routing_table in routing_tables.items()}
+            spf_runs = [getattr(network.routers[router_id], 'spf_runs', 0) for router_id in (5, 6, 7)]
+
+            network.apply_change(1, 2, 5)
+            network.apply_change(3, 4, -999)
+
+            self.assertEqual({router_id: network.routers[router_id].routing_table for router_id in (5, 6, 7)}, entries)
+            self.assertTrue(all(network.routers[router_id].routing_table is routing_tables[router_id] for router_id in (5, 6, 7)))
+            self.assertEqual([getattr(network.routers[router_id], 'spf_runs', 0) for router_id in (5, 6, 7)], spf_runs)
+            self.assertEqual(network.routers[1].routing_table[3], (2, 6))
+            network.close()
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
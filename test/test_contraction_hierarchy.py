@@ -0,0 +1,95 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from ContractionHierarchy import ContractionHierarchy
+from LinkStateNetwork import LinkStateNetwork
+from shortest_paths import bidirectional_route
+from utilities import INFINITY
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the contraction hierarchy route index.
+# Contains tests checking that the routes and costs found by the index are those of the network topology,
+# ties included, and that the index is only rebuilt when it is queried after a change.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+CHANGES = [(5, 11, 1), (4, 12, -999), (9, 12, 1), (2, 5, -999), (1, 13, 2), (5, 11, -999), (4, 12, 2), ("node", 9, "down"), ("node", 9, "up")]
+
+
+class TestContractionHierarchy(TemporaryDirectoryTestCase):
+
+    ## @brief Test case for the index on its own.
+    #
+    #     1 - 2 - 3
+    #     |       |
+    #     4 - 5 - 6      7
+    #
+    # Test Steps:
+    # 1. Build the index of a ring of 6 routers with unit costs, and router 7 alone.
+    # 2. Query the routes and costs between every pair of routers.
+    #
+    # Expected Results:
+    # - The routes are those of a bidirectional search of the topology, with the Link State tie-break:
+    #   from 1 to 6, both routes cost 3 and the route goes through 3, reached from 2.
+    # - Router 7 and unknown routers cannot be reached.
+    # @test Verifies that the index finds shortest routes with the Link State tie-break.
+    def test_routes(self):
+        neighbors = {1: {2: 1, 4: 1}, 2: {1: 1, 3: 1}, 3: {2: 1, 6: 1}, 4: {1: 1, 5: 1}, 5: {4: 1, 6: 1}, 6: {3: 1, 5: 1}, 7: {}}
+        index = ContractionHierarchy()
+        index.build(neighbors)
+        self.assertEqual(index.route(1, 6), ([1, 2, 3, 6], 3))
+        self.assertEqual(index.route(6, 1), ([6, 3, 2, 1], 3))
+        for router_id1 in range(1, 7):
+            for router_id2 in range(1, 7):
+                self.assertEqual(index.route(router_id1, router_id2), bidirectional_route(neighbors.get, router_id1, router_id2))
+                self.assertEqual(index.cost(router_id1, router_id2), bidirectional_route(neighbors.get, router_id1, router_id2)[1])
+            self.assertEqual(index.route(router_id1, 7), (None, INFINITY))
+            self.assertEqual(index.cost(router_id1, 7), INFINITY)
+        self.assertEqual(index.route(1, 8), (None, INFINITY))
+
+    ## @brief Test case for the route index of a network.
+    #
+    # Test Steps:
+    # 1. Create two Link State networks on topology_tie_break_2.txt, one of them answering route queries from the index.
+    # 2. Apply link changes and node events to both, querying the routes between every pair of routers after each change.
+    # 3. Apply two changes without querying the index.
+    #
+    # Expected Results:
+    # - The routes and costs of both networks are the same after every change, and so are their routing tables.
+    # - The index is built once for each change it is queried after, and not for the changes without queries.
+    # @test Verifies that the index follows the changes of the topology, and is only rebuilt when needed.
+    def test_network(self):
+        topology_file = str(self.testfiles / "topology_tie_break_2.txt")
+        network = LinkStateNetwork(topology_file, str(self.temp / "output.txt"))
+        indexed = LinkStateNetwork(topology_file, str(self.temp / "indexed.txt"))
+        indexed.enable_route_index()
+        self.assertEqual(indexed.route_index.builds, 0)
+        for change in [None] + CHANGES:
+            if change is not None:
+                network.apply_topology_change(change)
+                indexed.apply_topology_change(change)
+            for router_id1 in network.routers:
+                for router_id2 in network.routers:
+                    self.assertEqual(indexed.query_route(router_id1, router_id2), network.query_route(router_id1, router_id2))
+                    self.assertEqual(indexed.query_cost(router_id1, router_id2), network.query_cost(router_id1, router_id2))
+            self.assertEqual({router.id: dict(router.routing_table) for router in indexed.routers.values()},
+                             {router.id: dict(router.routing_table) for router in network.routers.values()})
+        self.assertEqual(indexed.route_index.builds, len(CHANGES) + 1)
+
+        indexed.apply_topology_change((4, 12, -999))
+        indexed.apply_topology_change((4, 12, 1))
+        self.assertTrue(indexed.route_index.stale)
+        self.assertEqual(indexed.query_route(4, 9), ([4, 12, 9], 2))
+        self.assertEqual(indexed.route_index.builds, len(CHANGES) + 2)
+        network.close()
+        indexed.close()
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from DualNetwork import DualNetwork
+from DistanceVectorNetwork import DistanceVectorNetwork
+from utilities import INFINITY
+## @file
+## @brief Test file for the Diffusing Update Algorithm.
+# Contains tests for the DualNetwork and DualRouter classes, checking that DUAL converges to the same
+# routing tables and output as Distance Vector Routing, and that changes are handled locally when a
+# feasible successor exists and by diffusing computations otherwise.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestDualNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.testfiles = Path(__file__).resolve().parent / "testfiles"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    ## @brief Test case for comparing the DUAL output with the Distance Vector output.
+    #
+    # Test Steps:
+    # 1. Run every test scenario with a DistanceVectorNetwork and a DualNetwork.
+    # 2. Compare the two output files.
+    #
+    # Expected Results:
+    # - Both networks write exactly the same routing tables and messages after every change.
+    # @test Verifies that DUAL converges to the same routes as Distance Vector Routing.
+    def test_same_output_as_dvr(self):
+        for scenario in ("circular", "connected_to_disconnected", "disconnected_to_connected", "single", "tie_break_2"):
+            topology_path = str(self.testfiles / f"topology_{scenario}.txt")
+            message_path = str(self.testfiles / f"message_{scenario}.txt")
+            changes_path = str(self.testfiles / f"changes_{scenario}.txt")
+            outputs = []
+            for network_class in (DistanceVectorNetwork, DualNetwork):
+                output_path = Path(self.temp_dir.name) / f"{network_class.__name__}_{scenario}.txt"
+                network = network_class(topology_path, str(output_path))
+                network.apply_changes_and_output(changes_path, message_path)
+                del network
+                outputs.append(output_path.read_text())
+            self.assertEqual(outputs[0], outputs[1], scenario)
+
+    ## @brief Test case for a change handled by a feasible successor.
+    #
+    # The testfile topology_connected_to_disconnected.txt contains the following topology:
+    #   1 - 2--4 - 5
+    #     \ | /
+    #       3
+    # Router 2 reaches 4 through 3 at cost 2, tied with its direct link to 4. Once link 2 - 3 is removed,
+    # router 4 reports distance 0, below the feasible distance of 2, so it is a feasible successor.
+    #
+    # Test Steps:
+    # 1. Create a DualNetwork object.
+    # 2. Remove link 2 - 3.
+    #
+    # Expected Results:
+    # - Router 2 switched to 4 locally, keeping the same distance.
+    # @test Verifies that changes with a feasible successor are handled locally.
+    def test_feasible_successor(self):
+        topology_path = self.testfiles / "topology_connected_to_disconnected.txt"
+        output_path = Path(self.temp_dir.name) / "output_feasible_successor.txt"
+        network = DualNetwork(str(topology_path), str(output_path))
+        self.assertEqual(network.routers[2].routing_table[4], (3, 2))
+        local_computations = network.routers[2].local_computations
+
+        network.process_change(2, 3, -999)
+        network._deliver_messages()
+
+        self.assertEqual(network.routers[2].routing_table[4], (4, 2))
+        self.assertGreater(network.routers[2].local_computations, local_computations)
+
+    ## @brief Test case for a change that needs a diffusing computation.
+    #
+    # Test Steps:
+    # 1. Create a DualNetwork object from topology_connected_to_disconnected.txt.
+    # 2. Remove link 4 - 5, the only link to router 5.
+    #
+    # Expected Results:
+    # - Diffusing computations were started and no router can reach 5 anymore.
+    # @test Verifies that unreachable destinations are found through diffusing computations.
+    def test_diffusing_computation(self):
+        topology_path = self.testfiles / "topology_connected_to_disconnected.txt"
+        output_path = Path(self.temp_dir.name) / "output_diffusing_computation.txt"
+        network = DualNetwork(str(topology_path), str(output_path))
+
+        network.process_change(4, 5, -999)
+        network._deliver_messages()
+
+        self.assertGreater(network.diffusing_computations(), 0)
+        for router_id in (1, 2, 3, 4):
+            self.assertEqual(network.routers[router_id].get_next_hop_cost(5), (None, INFINITY))
+        self.assertFalse(any(router.active for router in network.routers.values()))
+
+## @}
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
 from DistanceVectorNetwork import DistanceVectorNetwork
 from DistanceVectorRouter import DistanceVectorRouter
+from input_parser import parse_changes_file
 from utilities import INFINITY
 ## @file
 ## @brief Test file for Distance Vector Routing.
@@ -347,6 +348,111 @@ class TestDistanceVectorNetwork(unittest.TestCase):
         resultAfter = network._generate_message_string(1, 5, "Testing")
         self.assertEqual(expectedAfter, resultAfter)
         
+    ## @brief Test case for equal-cost multipath routing.
+    #
+    # The testfile topology_tie_break.txt contains the following topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2 
+    # Router 3 reaches 6 through both 2 and 4 at the same cost.
+    #
+    # Test Steps:
+    # 1. Create a DistanceVectorNetwork object in ECMP mode.
+    # 2. Check the routing table and the equal-cost next hops of the routers 3 and 5.
+    # 3. Compute the hops of the flow from 3 to 6 twice.
+    #
+    # Expected Results:
+    # - The routing table of router 3 still has 2 as next hop to 6, and its equal-cost next hops are 2 and 4.
+    # - Identical next hop sets are stored once.
+    # - The flow follows one of the two shortest paths, the same one every time.
+    # @test Verifies that equal-cost next hops are kept and messages are spread over them by flow.
+    def test_ecmp(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_tie_break.txt"
+        output_path = Path(__file__).resolve().parent / "testfiles/outputs/dvr/output_ecmp.txt"
+        network = DistanceVectorNetwork(str(topology_path), str(output_path), ecmp=True)
+
+        self.assertEqual(network.routers[3].routing_table[6], (2, 3))
+        self.assertEqual(network.routers[3].get_next_hops(6), (2, 4))
+        self.assertEqual(network.routers[3].get_next_hops(2), (2,))
+        self.assertIs(network.routers[3].get_next_hops(6), network.routers[5].get_next_hops(3))
+
+        hops, cost = network.get_hops_and_cost_from_to(network.routers[3], network.routers[6])
+        self.assertEqual(cost, 3)
+        self.assertIn(hops, [['3', '2', '5'], ['3', '4', '5']])
+        self.assertEqual(network.get_hops_and_cost_from_to(network.routers[3], network.routers[6]), (hops, cost))
+
+    ## @brief Test case for the traffic load report.
+    #
+    # The testfile traffic_tie_break.txt sends 10 from 3 to 6, 5 from 4 to 6, 2 from 6 to 3 and 7 from 2 to the unknown router 9,
+    # over the topology_tie_break.txt topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2 
+    #
+    # Test Steps:
+    # 1. Create a DistanceVectorNetwork object and load the traffic demands.
+    # 2. Compute the traffic load and the report of the 3 most loaded links.
+    #
+    # Expected Results:
+    # - The demands follow the routing tables: 3 to 6 through 2 and 5, 4 to 6 through 5, 6 to 3 through 5 and 2.
+    # - The demand toward router 9 is undelivered and loads no link.
+    # @test Verifies the accumulation of traffic demands over the next hop trees.
+    def test_traffic_load(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_tie_break.txt"
+        traffic_path = Path(__file__).resolve().parent / "testfiles/traffic_tie_break.txt"
+        output_path = Path(__file__).resolve().parent / "testfiles/outputs/dvr/output_traffic.txt"
+        network = DistanceVectorNetwork(str(topology_path), str(output_path))
+        network.load_traffic(str(traffic_path), 3)
+
+        link_loads, router_loads, delivered = network.traffic_load()
+        self.assertEqual(delivered, 17)
+        self.assertEqual(dict(link_loads), {(3, 2): 10, (2, 5): 10, (5, 6): 15, (4, 5): 5, (6, 5): 2, (5, 2): 2, (2, 3): 2})
+        self.assertEqual(router_loads[5], 17)
+        self.assertEqual(network.traffic_matrix.report(network.routers, 3),
+                         "traffic delivered 17 undelivered 7\nlink 5 6 load 15\nlink 2 5 load 10\nlink 3 2 load 10\n")
+
+    ## @brief Test case for node and shared risk link group events.
+    #
+    # The testfile topology_tie_break.txt contains the following topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2 
+    # The testfile srlg_tie_break.txt puts the links 3-2 and 4-5 in the shared risk link group 1, and
+    # changes_events.txt fails router 5, fails group 1, recovers router 5 and recovers group 1.
+    #
+    # Test Steps:
+    # 1. Create a DistanceVectorNetwork object and load the shared risk link groups.
+    # 2. Apply the events one at a time, checking the routing tables of routers 2 and 3 after each of them.
+    #
+    # Expected Results:
+    # - Failing router 5 removes its three links at once, and 6 becomes unreachable.
+    # - Failing group 1 removes the link 3-2, the link 4-5 being already down.
+    # - Recovering router 5 only restores 2-5 and 5-6, as 4-5 is still held down by group 1.
+    # - Recovering group 1 restores the original routes and no link stays suspended.
+    # @test Verifies that node and shared risk link group events change all their links at once.
+    def test_node_and_srlg_events(self):
+        testfiles = Path(__file__).resolve().parent / "testfiles"
+        output_path = testfiles / "outputs/dvr/output_events.txt"
+        network = DistanceVectorNetwork(str(testfiles / "topology_tie_break.txt"), str(output_path))
+        network.load_shared_risk_link_groups(str(testfiles / "srlg_tie_break.txt"))
+        node_down, group_down, node_up, group_up = parse_changes_file(str(testfiles / "changes_events.txt"))
+        network.apply_topology_change(node_down)
+        self.assertEqual(network.suspended_links, {(2, 5): 1, (4, 5): 1, (5, 6): 1})
+        self.assertEqual(network.routers[3].routing_table[2], (2, 1))
+        self.assertEqual(network.routers[3].routing_table[6][1], INFINITY)
+
+        network.apply_topology_change(group_down)
+        self.assertEqual(network.routers[3].routing_table[2][1], INFINITY)
+
+        network.apply_topology_change(node_up)
+        self.assertEqual(network.suspended_links, {(2, 3): 1, (4, 5): 1})
+        self.assertEqual(network.routers[2].routing_table[6], (5, 2))
+        self.assertEqual(network.routers[3].routing_table[6][1], INFINITY)
+
+        network.apply_topology_change(group_up)
+        self.assertEqual(network.suspended_links, {})
+        self.assertEqual(network.routers[3].routing_table[6], (2, 3))
+
 ## @}
 
 if __name__ == '__main__':
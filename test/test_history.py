@@ -0,0 +1,107 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from DistanceVectorNetwork import DistanceVectorNetwork
+from LinkStateNetwork import LinkStateNetwork
+from persistent_map import PersistentMap
+from utilities import INFINITY
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the persistent topology versions.
+# Contains tests for the PersistentMap holding the versions, for querying the routes of a network as of
+# a past change, and for forking a version with hypothetical changes without touching the network.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestHistory(TemporaryDirectoryTestCase):
+
+    ## @brief Test case for the PersistentMap.
+    #
+    # Test Steps:
+    # 1. Create a map of 1000 keys, then a copy with one key changed and one key added.
+    #
+    # Expected Results:
+    # - The new map has the new values and the old map is unchanged.
+    # - Only the branch holding the changed key is copied; the other top level branches are shared.
+    # @test Verifies that maps are immutable and share their unchanged branches.
+    def test_persistent_map(self):
+        old_map = PersistentMap({key: key * 2 for key in range(1000)})
+        new_map = old_map.update({5: -1, 1000: 2000})
+
+        self.assertEqual((len(old_map), old_map[5], 1000 in old_map), (1000, 10, False))
+        self.assertEqual((len(new_map), new_map[5], new_map[1000], new_map.get(2000)), (1001, -1, 2000, None))
+        self.assertEqual(dict(new_map.items()), {key: -1 if key == 5 else key * 2 for key in range(1001)})
+        shared = [old_child is new_child for old_child, new_child in zip(old_map._root, new_map._root)]
+        self.assertEqual(shared.count(False), 2)
+
+    ## @brief Test case for querying past versions of a network.
+    #
+    # The testfile topology_tie_break_2.txt contains the following topology (the number of lines is the cost of the edge):
+    #     1 - 4 - 12 -- 9
+    #         \        /
+    #           5     11
+    # And the changes_tie_break_2.txt contains the following change:
+    #     5 11 1
+    #
+    # Test Steps:
+    # 1. Create a DistanceVectorNetwork object, record its history and apply the change.
+    # 2. Query the routing table of router 4 and the route from 4 to 9 in both versions.
+    #
+    # Expected Results:
+    # - Version 0 routes from 4 to 9 through 12 with cost 3, as the network did before the change.
+    # - Version 1 has the routing tables of the network after the change.
+    # - Only the routers 5 and 11 have new neighbors in version 1; the others share their neighbors with version 0.
+    # @test Verifies that the routes as of every change can be queried.
+    def test_time_travel(self):
+        output_path = self.temp / "output.txt"
+        network = DistanceVectorNetwork(str(self.testfiles / "topology_tie_break_2.txt"), str(output_path))
+        network.record_history()
+        network.apply_changes_and_output(str(self.testfiles / "changes_tie_break_2.txt"), str(self.testfiles / "message_tie_break_2.txt"))
+
+        before, after = network.version(0), network.version(1)
+        self.assertEqual(before.routing_table(4)[9], (12, 3))
+        self.assertEqual(before.route(4, 9), ([4, 12, 9], 3))
+        for router_id, router in network.routers.items():
+            self.assertEqual(after.routing_table(router_id),
+                             {destination_id: entry for destination_id, entry in router.routing_table.items() if entry[1] != INFINITY})
+        self.assertEqual([router_id for router_id in before.routers() if before.get_neighbors(router_id) is not after.get_neighbors(router_id)], [5, 11])
+        with self.assertRaises(ValueError):
+            network.version(2)
+
+    ## @brief Test case for forking a version.
+    #
+    # The testfile topology_tie_break.txt contains the following topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2
+    #
+    # Test Steps:
+    # 1. Create a LinkStateNetwork object and fork its current version without the link 2-5.
+    # 2. Fork the current version again without router 5.
+    #
+    # Expected Results:
+    # - In the first fork, 3 reaches 6 through 4 with cost 3, while the network and its current version still route through 2.
+    # - In the second fork, 6 cannot be reached from 3.
+    # @test Verifies that hypothetical changes do not disturb the network.
+    def test_fork(self):
+        output_path = self.temp / "output.txt"
+        network = LinkStateNetwork(str(self.testfiles / "topology_tie_break.txt"), str(output_path))
+        current = network.current_version()
+        fork = current.fork([(2, 5, -999)])
+
+        self.assertEqual(fork.route(3, 6), ([3, 4, 5, 6], 3))
+        self.assertEqual(fork.routing_table(3)[6], (4, 3))
+        self.assertEqual(current.routing_table(3)[6], (2, 3))
+        self.assertEqual(network.routers[3].routing_table[6], (2, 3))
+        self.assertIs(fork.parent, current)
+        self.assertEqual(current.fork_without_router(5).route(3, 6), (None, INFINITY))
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
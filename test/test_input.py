@@ -0,0 +1,218 @@
+import unittest
+import sys
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from LinkStateNetwork import LinkStateNetwork
+from DistanceVectorNetwork import DistanceVectorNetwork
+from topology_format import convert_topology, is_binary_topology, open_topology_edges
+from input_parser import InputFormatError, parse_changes_file, parse_message_file, parse_topology_file
+## @file
+## @brief Test file for the input file formats.
+# Contains tests for reading topologies from the text, gzip-compressed and binary formats, making
+# sure every format builds exactly the same network as the plain text topology file, and for the
+# shared parsers of the topology, message and changes files.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestTopologyFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.testfiles = Path(__file__).resolve().parent / "testfiles"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    ## @brief Test case for converting a text topology to the binary format.
+    #
+    # Test Steps:
+    # 1. Convert topology_connected.txt to the binary format.
+    # 2. Read the links back from the binary file.
+    #
+    # Expected Results:
+    # - The binary file is detected as binary and holds the same links, in the same order, as the text file.
+    # @test Verifies the round trip between the text and binary topology formats.
+    def test_convert_topology(self):
+        topology_path = self.testfiles / "topology_connected.txt"
+        binary_path = Path(self.temp_dir.name) / "topology_connected.bin"
+
+        link_count = convert_topology(str(topology_path), str(binary_path))
+
+        self.assertEqual(link_count, 5)
+        self.assertTrue(is_binary_topology(str(binary_path)))
+        self.assertFalse(is_binary_topology(str(topology_path)))
+        with open_topology_edges(str(binary_path)) as edges:
+            self.assertEqual(list(edges), [1, 2, 8, 2, 3, 3, 2, 5, 4, 4, 1, 1, 4, 5, 1])
+
+    ## @brief Test case for an error raised while reading a binary topology.
+    #
+    # Test Steps:
+    # 1. Convert topology_connected.txt to the binary format.
+    # 2. Raise an error while a slice of the mapped edges is still held.
+    #
+    # Expected Results:
+    # - The error is raised as is, instead of the BufferError of closing a mapping that is still exported.
+    # @test Verifies that mapped binary topologies do not hide the errors of their readers.
+    def test_binary_read_error(self):
+        binary_path = Path(self.temp_dir.name) / "topology_connected.bin"
+        convert_topology(str(self.testfiles / "topology_connected.txt"), str(binary_path))
+
+        with self.assertRaises(KeyError):
+            with open_topology_edges(str(binary_path)) as edges:
+                first_ids = edges[0::3]
+                raise KeyError(first_ids[0])
+
+    ## @brief Test case for loading networks from binary and gzip-compressed topologies.
+    #
+    # Test Steps:
+    # 1. Build networks from the text, binary and gzip-compressed versions of topology_tie_break_2.txt.
+    # 2. Compare the neighbors and routing tables of every router.
+    #
+    # Expected Results:
+    # - All three networks are identical, for both routing protocols.
+    # @test Verifies that every topology format builds the same network.
+    def test_load_all_formats(self):
+        topology_path = self.testfiles / "topology_tie_break_2.txt"
+        binary_path = Path(self.temp_dir.name) / "topology.bin"
+        gzip_path = Path(self.temp_dir.name) / "topology.txt.gz"
+        convert_topology(str(topology_path), str(binary_path))
+        with open(topology_path, 'rb') as source, gzip.open(gzip_path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+
+        for network_class, folder in ((LinkStateNetwork, "lsr"), (DistanceVectorNetwork, "dvr")):
+            output_path = self.testfiles / f"outputs/{folder}/output_formats.txt"
+            networks = [network_class(str(path), str(output_path)) for path in (topology_path, binary_path, gzip_path)]
+            expected = networks[0]
+            for network in networks[1:]:
+                self.assertEqual(list(network.routers), list(expected.routers))
+                for router_id, router in network.routers.items():
+                    self.assertEqual(router.neighbors, expected.routers[router_id].neighbors)
+                    self.assertEqual(router.routing_table, expected.routers[router_id].routing_table)
+
+class TestInputParser(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, content):
+        path = Path(self.temp_dir.name) / name
+        path.write_text(content)
+        return str(path)
+
+    ## @brief Test case for parsing integer files with blank lines.
+    #
+    # Test Steps:
+    # 1. Parse a changes file with a blank line and no line break at the end.
+    #
+    # Expected Results:
+    # - Blank lines are skipped and the last line is still parsed.
+    # @test Verifies the bulk parsing of changes files.
+    def test_parse_changes(self):
+        changes_path = self.write_file("changes.txt", "1 2 -999\n\n3 4 5")
+        self.assertEqual(parse_changes_file(changes_path), [(1, 2, -999), (3, 4, 5)])
+
+    ## @brief Test case for parsing node and shared risk link group events.
+    #
+    # Test Steps:
+    # 1. Parse a changes file mixing link changes with node and srlg events.
+    # 2. Parse a changes file with an event missing its state.
+    #
+    # Expected Results:
+    # - Events are returned as (kind, ID, state) tuples, in file order with the link changes.
+    # - An InputFormatError is raised with the number of the malformed line.
+    # @test Verifies the parsing of events in changes files.
+    def test_parse_change_events(self):
+        changes_path = self.write_file("events.txt", "node 5 down\n1 2 3\n\nsrlg 7 up\n")
+        self.assertEqual(parse_changes_file(changes_path), [("node", 5, "down"), (1, 2, 3), ("srlg", 7, "up")])
+
+        changes_path = self.write_file("events_malformed.txt", "1 2 3\nnode 5\n")
+        with self.assertRaises(InputFormatError) as context:
+            parse_changes_file(changes_path)
+        self.assertEqual(context.exception.line_number, 2)
+
+    ## @brief Test case for reporting malformed lines.
+    #
+    # Test Steps:
+    # 1. Parse a topology file whose third line has a non integer cost.
+    # 2. Parse a topology file whose first line has too few fields.
+    #
+    # Expected Results:
+    # - An InputFormatError is raised with the number of the malformed line.
+    # @test Verifies that malformed lines are reported with their line numbers.
+    def test_malformed_lines(self):
+        topology_path = self.write_file("topology.txt", "1 2 3\n2 3 4\n3 4 x\n")
+        with self.assertRaises(InputFormatError) as context:
+            parse_topology_file(topology_path)
+        self.assertEqual(context.exception.line_number, 3)
+
+        topology_path = self.write_file("topology_short.txt", "1 2\n3 4 5 6\n")
+        with self.assertRaises(InputFormatError) as context:
+            parse_topology_file(topology_path)
+        self.assertEqual(context.exception.line_number, 1)
+
+    ## @brief Test case for values that do not fit in 32 bits.
+    #
+    # Test Steps:
+    # 1. Parse a topology file whose second link costs 2^31, and build a Link State network from it.
+    # 2. Parse a topology file whose second line has a cost of 2^63, and a message file whose second
+    #    line has a source of 2^63.
+    # 3. Convert the first topology to the binary format.
+    #
+    # Expected Results:
+    # - Costs up to 2^63 - 1 are parsed and routed with, the link costing 2^31 is avoided.
+    # - Larger values raise an InputFormatError with the number of their line.
+    # - The conversion raises a ValueError, binary topologies holding 32 bit integers.
+    # @test Verifies that large values are parsed or reported with their line numbers.
+    def test_large_values(self):
+        topology_path = self.write_file("topology_large.txt", f"1 2 1\n2 3 {1 << 31}\n1 3 5\n")
+        self.assertEqual(list(parse_topology_file(topology_path)), [1, 2, 1, 2, 3, 1 << 31, 1, 3, 5])
+        network = LinkStateNetwork(topology_path, str(Path(self.temp_dir.name) / "output.txt"))
+        self.assertEqual(network.routers[2].routing_table[3], (1, 6))
+        network.close()
+
+        for path, parse in ((self.write_file("topology_overflow.txt", f"1 2 1\n2 3 {1 << 63}\n"), parse_topology_file),
+                            (self.write_file("message_overflow.txt", f"1 2 hello\n{1 << 63} 2 hi\n"), parse_message_file)):
+            with self.assertRaises(InputFormatError) as context:
+                parse(path)
+            self.assertEqual(context.exception.line_number, 2)
+
+        with self.assertRaises(ValueError):
+            convert_topology(topology_path, str(Path(self.temp_dir.name) / "topology_large.bin"))
+
+    ## @brief Test case for parsing message files.
+    #
+    # Test Steps:
+    # 1. Parse a message file with repeated spaces in the message and no line break at the end.
+    # 2. Parse a message file with blank lines between the messages.
+    # 3. Parse a message file with a line missing its destination, after a blank line.
+    #
+    # Expected Results:
+    # - The message text is kept exactly as written, including its line break.
+    # - Blank lines are skipped.
+    # - The malformed line is reported with its line number.
+    # @test Verifies the parsing of message files.
+    def test_parse_messages(self):
+        message_path = self.write_file("message.txt", "1 2 hello  world\n3 4 bye")
+        self.assertEqual(parse_message_file(message_path), [(1, 2, "hello  world\n"), (3, 4, "bye")])
+
+        message_path = self.write_file("message_blank.txt", "\n1 2 hello\n  \n3 4 bye\n")
+        self.assertEqual(parse_message_file(message_path), [(1, 2, "hello\n"), (3, 4, "bye\n")])
+
+        message_path = self.write_file("message_bad.txt", "1 2 hello\n\n3 hi\n")
+        with self.assertRaises(InputFormatError) as context:
+            parse_message_file(message_path)
+        self.assertEqual(context.exception.line_number, 3)
+
+## @}
+
+if __name__ == '__main__':
+    unittest.main()
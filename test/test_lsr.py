@@ -4,6 +4,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
 from LinkStateNetwork import LinkStateNetwork
 from LinkStateRouter import LinkStateRouter
+from AreaLinkStateNetwork import AreaLinkStateNetwork
+from input_parser import parse_changes_file
 from utilities import INFINITY
 ## @file
 ## @brief Test file for LinkStateRouting.
@@ -325,7 +327,333 @@ class TestLinkState(unittest.TestCase):
         resultAfter = network._generate_message_string(1, 5, "Testing")
         self.assertEqual(expectedAfter, resultAfter)
 
-        
+    ## @brief Test case for lazy routing tables limited to a subset of routers.
+    #
+    # This test case runs the tie_break_2 scenario twice, once computing every routing table after each change
+    # and once with the output limited to router 4, where routing tables are only computed when they are read.
+    #
+    # Test Steps:
+    # 1. Create an eager LinkStateNetwork and a LinkStateNetwork limited to router 4.
+    # 2. Apply the same changes to both networks.
+    # 3. Compare the routing tables and the number of Dijkstra runs.
+    #
+    # Expected Results:
+    # - The routing tables read from the lazy network are equal to the eager ones.
+    # - The lazy network runs Dijkstra's algorithm fewer times.
+    # - Only the routing table of router 4 is written to the output file.
+    # @test Verifies lazy routing tables and the router subset output.
+    def test_lazy_router_subset(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_tie_break_2.txt"
+        changes_path = Path(__file__).resolve().parent / "testfiles/changes_tie_break_2.txt"
+        message_path = Path(__file__).resolve().parent / "testfiles/message_tie_break_2.txt"
+        eager_output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_eager.txt"
+        lazy_output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_lazy.txt"
+
+        eager_network = LinkStateNetwork(str(topology_path), str(eager_output_path))
+        eager_network.apply_changes_and_output(str(changes_path), str(message_path))
+        lazy_network = LinkStateNetwork(str(topology_path), str(lazy_output_path), output_routers=[4])
+        lazy_network.apply_changes_and_output(str(changes_path), str(message_path))
+        lazy_network.output_file_iterator.close()
+
+        self.assertLess(lazy_network.spf_runs(), eager_network.spf_runs())
+        for router_id, router in eager_network.routers.items():
+            self.assertEqual(lazy_network.routers[router_id].routing_table, router.routing_table)
+
+        with open(lazy_output_path) as output:
+            output_text = output.read()
+        self.assertIn(eager_network.routers[4].get_routing_table_string() + "\n", output_text)
+        self.assertNotIn("9 9 0", output_text)
+
+    ## @brief Test case for point-to-point route queries.
+    #
+    # This test case compares the routes answered by query_route, which searches the topology directly,
+    # with the routes obtained by walking the routing tables of the routers, before and after changes.
+    #
+    # Test Steps:
+    # 1. Create a LinkStateNetwork object with the tie_break_2 topology.
+    # 2. Query the route between every pair of routers and compare it with the routing tables.
+    # 3. Apply the changes and repeat the comparison.
+    #
+    # Expected Results:
+    # - Every query returns the same path and cost as the routing tables, including tie-breaks.
+    # - A query to an unknown router is unreachable.
+    # @test Verifies that route queries follow the Link State tie-break rules.
+    def test_query_route(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_tie_break_2.txt"
+        output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_query_route.txt"
+        changes_path = Path(__file__).resolve().parent / "testfiles/changes_tie_break_2.txt"
+        message_path = Path(__file__).resolve().parent / "testfiles/message_tie_break_2.txt"
+        network = LinkStateNetwork(str(topology_path), str(output_path))
+
+        self.assertEqual(network.query_route(4, 9), ([4, 12, 9], 3))
+        network.apply_changes_and_output(str(changes_path), str(message_path))
+        self.assertEqual(network.query_route(4, 9), ([4, 5, 11, 9], 3))
+
+        for router_from in network.routers.values():
+            for router_to in network.routers.values():
+                path, cost = network.query_route(router_from.id, router_to.id)
+                if network.check_impossible_to_reach(router_from, router_to):
+                    self.assertEqual((path, cost), (None, INFINITY))
+                else:
+                    hops, total_cost = network.get_hops_and_cost_from_to(router_from, router_to)
+                    self.assertEqual(cost, total_cost)
+                    self.assertEqual(path[:-1] if len(path) > 1 else path, [int(hop) for hop in hops])
+        self.assertEqual(network.query_route(4, 99), (None, INFINITY))
+
+    ## @brief Test case for routing with areas.
+    #
+    # The testfile topology_connected_to_disconnected.txt contains the following topology:
+    #   1 - 2--4 - 5
+    #     \ | /
+    #       3
+    # areas_connected_to_disconnected.txt puts routers 1, 2 and 3 in area 1, and routers 4 and 5 in area 0.
+    #
+    # Test Steps:
+    # 1. Create an AreaLinkStateNetwork object and a LinkStateNetwork object with the same topology.
+    # 2. Compare their routes and the link state database of router 1.
+    # 3. Apply the changes and compare the routes again.
+    #
+    # Expected Results:
+    # - Router 1 only knows the links of area 1, and learns the distance to 5 from the summaries of routers 2 and 3.
+    # - All routes have the same cost as with flat routing, before and after the changes.
+    # @test Verifies that area border routers summarize the distances to other areas.
+    def test_areas(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_connected_to_disconnected.txt"
+        areas_path = Path(__file__).resolve().parent / "testfiles/areas_connected_to_disconnected.txt"
+        changes_path = Path(__file__).resolve().parent / "testfiles/changes_connected_to_disconnected.txt"
+        message_path = Path(__file__).resolve().parent / "testfiles/message_connected_to_disconnected.txt"
+        area_output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_areas.txt"
+        flat_output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_areas_flat.txt"
+        area_network = AreaLinkStateNetwork(str(topology_path), str(area_output_path), str(areas_path))
+        flat_network = LinkStateNetwork(str(topology_path), str(flat_output_path))
+
+        router = area_network.routers[1]
+        self.assertEqual(set(router.network_topology), {1, 2, 3})
+        self.assertEqual(set(router.summary_topology), {2, 3})
+        self.assertEqual(router.routing_table[5], (3, 3))
+
+        for step in range(2):
+            if step:
+                area_network.apply_changes_and_output(str(changes_path), str(message_path))
+                flat_network.apply_changes_and_output(str(changes_path), str(message_path))
+            for router_id, flat_router in flat_network.routers.items():
+                for destination_id, (next_hop, cost) in flat_router.routing_table.items():
+                    self.assertEqual(area_network.routers[router_id].get_next_hop_cost(destination_id)[1], cost)
+
+    ## @brief Test case for the comparison of areas with flat routing.
+    #
+    # The testfile topology_areas.txt contains the following topology:
+    #   1 -1- 2 -1- 3
+    #    \____5____/
+    # areas_areas.txt puts routers 1 and 3 in area 1 and router 2 in area 0.
+    #
+    # Test Steps:
+    # 1. Create an AreaLinkStateNetwork object.
+    # 2. Check the route between 1 and 3 and the report.
+    #
+    # Expected Results:
+    # - Routers 1 and 3 prefer their intra-area link of cost 5 over the path of cost 2 through area 0.
+    # - The report counts these two routes as longer than with flat routing.
+    # @test Verifies the preference for intra-area routes and the area report.
+    def test_area_report(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_areas.txt"
+        areas_path = Path(__file__).resolve().parent / "testfiles/areas_areas.txt"
+        output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_area_report.txt"
+        network = AreaLinkStateNetwork(str(topology_path), str(output_path), str(areas_path))
+
+        self.assertEqual(network.routers[1].routing_table[3], (3, 5))
+        self.assertEqual(network.routers[1].routing_table[2], (2, 1))
+        report = network.area_report()
+        self.assertIn("area border routers: 3\n", report)
+        self.assertIn("longer routes: 2 (max stretch 2.50)\n", report)
+        self.assertIn("unreachable routes: 0\n", report)
+
+    ## @brief Test case for the shared link state databases.
+    #
+    # Test Steps:
+    # 1. Create a LinkStateNetwork object with the disconnected_to_connected topology, made of two components.
+    # 2. Count the distinct link state databases, then apply the change connecting the components and count again.
+    # 3. Try to modify an LSP stored in the database.
+    #
+    # Expected Results:
+    # - Each component shares one database, and a single database remains once the network is connected.
+    # - The routing tables are the same as before the databases were shared.
+    # - LSPs are read-only snapshots, unaffected by later changes of the neighbors of their router.
+    # @test Verifies that routers share their link state databases copy-on-write.
+    def test_shared_link_state_database(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_disconnected_to_connected.txt"
+        output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_shared_lsdb.txt"
+        changes_path = Path(__file__).resolve().parent / "testfiles/changes_disconnected_to_connected.txt"
+        message_path = Path(__file__).resolve().parent / "testfiles/message_disconnected_to_connected.txt"
+        network = LinkStateNetwork(str(topology_path), str(output_path))
+
+        self.assertEqual(network.link_state_databases(), 2)
+        self.assertIs(network.routers[1].network_topology, network.routers[4].network_topology)
+        network.apply_changes_and_output(str(changes_path), str(message_path))
+        self.assertEqual(network.link_state_databases(), 1)
+        self.assertEqual(network.routers[1].routing_table[6], (3, 4))
+
+        neighbors = network.routers[1].network_topology[4]
+        with self.assertRaises(TypeError):
+            neighbors[1] = 1
+        network.routers[4].neighbors[1] = 1
+        self.assertNotIn(1, network.routers[1].network_topology[4])
+
+    ## @brief Test case for equal-cost multipath routing.
+    #
+    # The testfile topology_tie_break.txt contains the following topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2 
+    # Router 3 reaches 6 through both 2 and 4 at the same cost.
+    #
+    # Test Steps:
+    # 1. Create a LinkStateNetwork object in ECMP mode.
+    # 2. Check the routing table and the equal-cost next hops of the routers 3 and 5.
+    # 3. Compute the hops of the flow from 3 to 6 twice.
+    #
+    # Expected Results:
+    # - The routing table of router 3 still has 2 as next hop to 6, and its equal-cost next hops are 2 and 4.
+    # - Identical next hop sets are stored once.
+    # - The flow follows one of the two shortest paths, the same one every time.
+    # @test Verifies that equal-cost next hops are kept and messages are spread over them by flow.
+    def test_ecmp(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_tie_break.txt"
+        output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_ecmp.txt"
+        network = LinkStateNetwork(str(topology_path), str(output_path), ecmp=True)
+
+        self.assertEqual(network.routers[3].routing_table[6], (2, 3))
+        self.assertEqual(network.routers[3].get_next_hops(6), (2, 4))
+        self.assertEqual(network.routers[3].get_next_hops(2), (2,))
+        self.assertIs(network.routers[3].get_next_hops(6), network.routers[5].get_next_hops(3))
+
+        hops, cost = network.get_hops_and_cost_from_to(network.routers[3], network.routers[6])
+        self.assertEqual(cost, 3)
+        self.assertIn(hops, [['3', '2', '5'], ['3', '4', '5']])
+        self.assertEqual(network.get_hops_and_cost_from_to(network.routers[3], network.routers[6]), (hops, cost))
+
+    ## @brief Test case for the traffic load report.
+    #
+    # The testfile traffic_tie_break.txt sends 10 from 3 to 6, 5 from 4 to 6, 2 from 6 to 3 and 7 from 2 to the unknown router 9,
+    # over the topology_tie_break.txt topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2 
+    #
+    # Test Steps:
+    # 1. Create a LinkStateNetwork object and load the traffic demands.
+    # 2. Compute the traffic load and the report of the 3 most loaded links.
+    # 3. Compute the traffic load again in ECMP mode.
+    #
+    # Expected Results:
+    # - The demands follow the routing tables: 3 to 6 through 2 and 5, 4 to 6 through 5, 6 to 3 through 5 and 2.
+    # - The demand toward router 9 is undelivered and loads no link.
+    # - In ECMP mode, the demand from 3 to 6 is split evenly between 2 and 4.
+    # @test Verifies the accumulation of traffic demands over the next hop trees.
+    def test_traffic_load(self):
+        topology_path = Path(__file__).resolve().parent / "testfiles/topology_tie_break.txt"
+        traffic_path = Path(__file__).resolve().parent / "testfiles/traffic_tie_break.txt"
+        output_path = Path(__file__).resolve().parent / "testfiles/outputs/lsr/output_traffic.txt"
+        network = LinkStateNetwork(str(topology_path), str(output_path))
+        network.load_traffic(str(traffic_path), 3)
+
+        link_loads, router_loads, delivered = network.traffic_load()
+        self.assertEqual(delivered, 17)
+        self.assertEqual(dict(link_loads), {(3, 2): 10, (2, 5): 10, (5, 6): 15, (4, 5): 5, (6, 5): 2, (5, 2): 2, (2, 3): 2})
+        self.assertEqual(router_loads[5], 17)
+        self.assertEqual(network.traffic_matrix.report(network.routers, 3),
+                         "traffic delivered 17 undelivered 7\nlink 5 6 load 15\nlink 2 5 load 10\nlink 3 2 load 10\n")
+
+        network = LinkStateNetwork(str(topology_path), str(output_path), ecmp=True)
+        network.load_traffic(str(traffic_path))
+        link_loads, router_loads, delivered = network.traffic_load()
+        self.assertEqual(delivered, 17)
+        self.assertEqual(link_loads[(3, 2)], 5)
+        self.assertEqual(link_loads[(3, 4)], 5)
+        self.assertEqual(link_loads[(4, 5)], 10)
+
+    ## @brief Test case for node and shared risk link group events.
+    #
+    # The testfile topology_tie_break.txt contains the following topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2 
+    # The testfile srlg_tie_break.txt puts the links 3-2 and 4-5 in the shared risk link group 1, and
+    # changes_events.txt fails router 5, fails group 1, recovers router 5 and recovers group 1.
+    #
+    # Test Steps:
+    # 1. Create a LinkStateNetwork object and load the shared risk link groups.
+    # 2. Apply the events one at a time, checking the routing tables of routers 2 and 3 after each of them.
+    # 3. Count the SPF runs of the first event.
+    #
+    # Expected Results:
+    # - Failing router 5 removes its three links at once, and 6 becomes unreachable.
+    # - Failing group 1 removes the link 3-2, the link 4-5 being already down.
+    # - Recovering router 5 only restores 2-5 and 5-6, as 4-5 is still held down by group 1.
+    # - Recovering group 1 restores the original routes and no link stays suspended.
+    # - Each event runs Dijkstra's algorithm once per router.
+    # @test Verifies that node and shared risk link group events change all their links at once.
+    def test_node_and_srlg_events(self):
+        testfiles = Path(__file__).resolve().parent / "testfiles"
+        output_path = testfiles / "outputs/lsr/output_events.txt"
+        network = LinkStateNetwork(str(testfiles / "topology_tie_break.txt"), str(output_path))
+        network.load_shared_risk_link_groups(str(testfiles / "srlg_tie_break.txt"))
+        node_down, group_down, node_up, group_up = parse_changes_file(str(testfiles / "changes_events.txt"))
+        spf_runs = network.spf_runs()
+        network.apply_topology_change(node_down)
+        self.assertEqual(network.spf_runs() - spf_runs, len(network.routers))
+        self.assertEqual(network.suspended_links, {(2, 5): 1, (4, 5): 1, (5, 6): 1})
+        self.assertEqual(network.routers[3].routing_table[2], (2, 1))
+        self.assertEqual(network.routers[3].routing_table[6][1], INFINITY)
+
+        network.apply_topology_change(group_down)
+        self.assertEqual(network.routers[3].routing_table[2][1], INFINITY)
+
+        network.apply_topology_change(node_up)
+        self.assertEqual(network.suspended_links, {(2, 3): 1, (4, 5): 1})
+        self.assertEqual(network.routers[2].routing_table[6], (5, 2))
+        self.assertEqual(network.routers[3].routing_table[6][1], INFINITY)
+
+        network.apply_topology_change(group_up)
+        self.assertEqual(network.suspended_links, {})
+        self.assertEqual(network.routers[3].routing_table[6], (2, 3))
+
+    ## @brief Test case for the routers skipped after a change.
+    #
+    # The testfile topology_tie_break.txt contains the following topology with all edges equal to 1:
+    #     3 - 4 - 5 - 6
+    #       \    /
+    #         2 
+    #
+    # Test Steps:
+    # 1. Create a LinkStateNetwork object and raise the cost of the link 3-4 to 2.
+    # 2. Recompute every routing table and compare them with the routing tables after the change.
+    #
+    # Expected Results:
+    # - Only the routers 2, 3 and 4, whose shortest path trees use the link 3-4, run Dijkstra's algorithm again.
+    #   Router 5 reaches 3 through 2 and router 6 reaches 3 through 5 and 2, as 2 is lower than 4.
+    # - Two recomputations are reported as skipped, and recomputing every routing table changes nothing.
+    # - Each router received the 5 initial LSPs and the new LSPs of 3 and 4, 35 arrivals changing the topology,
+    #   while the LSPs flooded again by the other routers do not count: 27 of them did not run Dijkstra's algorithm.
+    # @test Verifies that routers whose shortest path tree does not use a changed link keep their routing table.
+    def test_skip_unaffected_routers(self):
+        testfiles = Path(__file__).resolve().parent / "testfiles"
+        output_path = testfiles / "outputs/lsr/output_tie_break.txt"
+        network = LinkStateNetwork(str(testfiles / "topology_tie_break.txt"), str(output_path))
+        spf_runs = {router_id: router.spf_runs for router_id, router in network.routers.items()}
+
+        network.apply_change(3, 4, 2)
+        routing_tables = {router_id: dict(router.routing_table) for router_id, router in network.routers.items()}
+        self.assertEqual(sorted(router_id for router_id, router in network.routers.items() if router.spf_runs > spf_runs[router_id]), [2, 3, 4])
+        self.assertEqual(network.skipped_recomputations, 2)
+        self.assertEqual(network.spf_report(), "SPF runs: 8\nrouting table recomputations skipped: 2\n"
+                                               "LSP arrivals changing the link state topology: 35\n"
+                                               "SPF runs saved by coalescing LSP arrivals: 27\n")
+
+        network.update_routing_tables()
+        self.assertEqual({router_id: router.routing_table for router_id, router in network.routers.items()}, routing_tables)
+        self.assertEqual(network.routers[6].routing_table[3], (5, 3))
+
 ## @}
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from Network import Network
+from fixtures import TWO_COMPONENTS_TOPOLOGY, TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the base Network.
+# Contains tests checking that a Network without a routing protocol applies the link changes and the
+# failure events of a changes file line one at a time.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestNetwork(TemporaryDirectoryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        (self.temp / "topology.txt").write_text(TWO_COMPONENTS_TOPOLOGY)
+
+    ## @brief Test case for changes applied by the base Network.
+    #
+    # Test Steps:
+    # 1. Create a Network, which has no routing protocol, with two components.
+    # 2. Link 4 to 5, fail router 4, recover it, then remove the link 6-7.
+    #
+    # Expected Results:
+    # - The changes are applied one at a time: linking 4 and 5 adds the link to both routers, failing 4
+    #   removes all its links and recovering it restores them.
+    # - Removing 6-7 leaves router 7 without neighbors.
+    # @test Verifies that the base Network applies the changes of a line without a routing protocol.
+    def test_apply_changes(self):
+        network = Network(str(self.temp / "topology.txt"), str(self.temp / "output.txt"))
+        network.apply_change(4, 5, 1)
+        self.assertEqual(network.routers[4].neighbors, {3: 1, 1: 1, 5: 1})
+        self.assertEqual(network.routers[5].neighbors, {6: 1, 4: 1})
+
+        network.apply_topology_change(("node", 4, "down"))
+        self.assertEqual(network.routers[4].neighbors, {})
+        self.assertEqual(network.routers[5].neighbors, {6: 1})
+        network.apply_topology_change(("node", 4, "up"))
+        self.assertEqual(network.routers[4].neighbors, {3: 1, 1: 1, 5: 1})
+
+        network.apply_change(6, 7, -999)
+        self.assertEqual(network.routers[7].neighbors, {})
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
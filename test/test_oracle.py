@@ -0,0 +1,67 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from oracle import DVR, LSR, ReferenceNetwork, read_links
+from fuzz import fuzz
+## @file
+## @brief Test file for the reference oracle and the differential fuzzing harness.
+# Contains tests checking the oracle against the hand-checked tie-break scenarios, and a short fuzzing
+# run comparing every routing engine with the oracle on random topologies and change traces. Longer
+# runs are started with python test/fuzz.py.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestOracle(unittest.TestCase):
+
+    def setUp(self):
+        self.testfiles = Path(__file__).resolve().parent / "testfiles"
+
+    ## @brief Test case for the tie-break rules of the oracle.
+    #
+    # The testfile topology_tie_break_2.txt contains the following topology (the number of lines is the cost of the edge):
+    #     1 - 4 - 12 -- 9
+    #         \        /
+    #           5     11
+    # And the changes_tie_break_2.txt contains the following change:
+    #     5 11 1
+    #
+    # Test Steps:
+    # 1. Build a ReferenceNetwork from topology_tie_break.txt and check the route from 3 to 6.
+    # 2. Build a ReferenceNetwork from topology_tie_break_2.txt, apply the change and check the route from 4 to 9.
+    #
+    # Expected Results:
+    # - Both rules choose 2 as the next hop from 3 to 6, with cost 3.
+    # - After the change, Link State Routing goes from 4 to 9 through 5, as 11 < 12 when reading the paths backward.
+    # @test Verifies that the oracle follows the tie-break rules of the simulator.
+    def test_tie_break_rules(self):
+        network = ReferenceNetwork(read_links(str(self.testfiles / "topology_tie_break.txt")))
+        self.assertEqual(network.routing_table(3, LSR)[6], (2, 3))
+        self.assertEqual(network.routing_table(3, DVR)[6], (2, 3))
+        self.assertEqual(network.equal_cost_next_hops(3, 6), [2, 4])
+
+        network = ReferenceNetwork(read_links(str(self.testfiles / "topology_tie_break_2.txt")))
+        for change in read_links(str(self.testfiles / "changes_tie_break_2.txt")):
+            network.apply_change(*change)
+        self.assertEqual(network.link_state_path(4, 9), [4, 5, 11, 9])
+        self.assertEqual(network.routing_table(4, LSR)[9][0], 5)
+
+    ## @brief Test case for a short differential fuzzing run.
+    #
+    # Test Steps:
+    # 1. Run the fuzzer on 20 random cases in this process.
+    #
+    # Expected Results:
+    # - Every engine writes exactly the output computed by the oracle, and query_route finds the oracle's paths.
+    # @test Verifies the routing engines against the oracle on random topologies and changes.
+    def test_fuzz(self):
+        self.assertEqual(fuzz(0, 20, workers=1), {})
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
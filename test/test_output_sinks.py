@@ -0,0 +1,99 @@
+import unittest
+import io
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from DistanceVectorNetwork import DistanceVectorNetwork
+from LinkStateNetwork import LinkStateNetwork
+from output_pipeline import NullOutput
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the output sinks of networks and their lifecycle.
+# Contains tests checking that networks write the same output to an open object as to a file, that a
+# discarded output is not formatted but routes the same way, and that networks close what they opened
+# when used as context managers.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestOutputSinks(TemporaryDirectoryTestCase):
+
+    def run_circular(self, network):
+        network.apply_changes_and_output(str(self.testfiles / "changes_circular.txt"), str(self.testfiles / "message_circular.txt"))
+
+    ## @brief Test case for writing to an open object.
+    #
+    # Test Steps:
+    # 1. Run the circular simulation with Link State and Distance Vector networks writing to a file, and
+    #    to a StringIO, in plain and pipelined mode.
+    #
+    # Expected Results:
+    # - The StringIO holds the content of the file, and is still open once the network is closed.
+    # @test Verifies that networks write to any writable object without closing it.
+    def test_string_output(self):
+        for network_class in (LinkStateNetwork, DistanceVectorNetwork):
+            with network_class(str(self.testfiles / "topology_circular.txt"), self.temp / "output.txt") as network:
+                self.run_circular(network)
+            expected = (self.temp / "output.txt").read_text()
+            for pipeline in (False, True):
+                output = io.StringIO()
+                with network_class(str(self.testfiles / "topology_circular.txt"), output) as network:
+                    if pipeline:
+                        network.enable_pipeline()
+                    self.run_circular(network)
+                self.assertFalse(output.closed)
+                self.assertEqual(output.getvalue(), expected)
+
+    ## @brief Test case for discarding the output.
+    #
+    # Test Steps:
+    # 1. Run the circular simulation with lazy Link State networks writing to a file and discarding their output.
+    # 2. Send a message between two routers of the network discarding its output.
+    #
+    # Expected Results:
+    # - Both networks make the same SPF runs, so the routing tables that would have been written are computed.
+    # - The network discarding its output never formats a routing table or a message, and does not pipeline.
+    # @test Verifies that discarded output is not formatted, without changing the routing.
+    def test_null_output(self):
+        with LinkStateNetwork(str(self.testfiles / "topology_circular.txt"), str(self.temp / "output.txt"), lazy=True) as written:
+            self.run_circular(written)
+        with LinkStateNetwork(str(self.testfiles / "topology_circular.txt"), None, lazy=True) as discarded:
+            formatted = []
+            for router in discarded.routers.values():
+                router.get_routing_table_string = lambda: formatted.append("table")
+            discarded._generate_message_string = lambda *args: formatted.append("message")
+            discarded.enable_pipeline()
+            self.assertIsInstance(discarded.output_file_iterator, NullOutput)
+            self.assertTrue(discarded.output_discarded())
+            self.run_circular(discarded)
+            discarded.send_message(1, 3, "hello")
+            self.assertEqual(formatted, [])
+            self.assertEqual(discarded.spf_runs(), written.spf_runs())
+
+    ## @brief Test case for the lifecycle of a network.
+    #
+    # Test Steps:
+    # 1. Use a network writing to a file as a context manager, raising an exception inside the context.
+    # 2. Close the network again.
+    #
+    # Expected Results:
+    # - The exception goes through the context, and the output file is closed and written when it exits.
+    # - Closing twice does nothing.
+    # @test Verifies that networks close their output file when used as context managers.
+    def test_context_manager(self):
+        with self.assertRaises(KeyError):
+            with LinkStateNetwork(str(self.testfiles / "topology_circular.txt"), str(self.temp / "output.txt")) as network:
+                output_file = network.output_file_iterator
+                network.topology_output()
+                raise KeyError("stop")
+        self.assertTrue(output_file.closed)
+        self.assertTrue((self.temp / "output.txt").read_text().startswith("1 1 0\n"))
+        network.close()
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import io
+import sys
+import tempfile
+import threading
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from DistanceVectorNetwork import DistanceVectorNetwork
+from LinkStateNetwork import LinkStateNetwork
+from output_pipeline import PipelinedOutput
+## @file
+## @brief Test file for the pipelined output mode.
+# Contains tests checking that networks writing their output on a background thread produce the same
+# output files, that a slow writer blocks the computation instead of letting pending output grow, and
+# that write errors are reported.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class BlockingFile(io.StringIO):
+    """
+    A file whose writes wait until they are released, or fail once it is broken.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+        self.broken = False
+
+    def write(self, text):
+        self.released.wait()
+        if self.broken:
+            raise OSError("no space left on device")
+        return super().write(text)
+
+    def close(self):
+        pass
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.testfiles = Path(__file__).resolve().parent / "testfiles"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    ## @brief Test case for the output files written in pipelined mode.
+    #
+    # Test Steps:
+    # 1. Run the Distance Vector and Link State simulations of the circular topology, with and without pipelined output.
+    #
+    # Expected Results:
+    # - The output files are identical.
+    # @test Verifies that the background writer writes the same output as the network itself.
+    def test_pipelined_output(self):
+        temp = Path(self.temp_dir.name)
+        files = [str(self.testfiles / f"{kind}_circular.txt") for kind in ("topology", "message", "changes")]
+        for network_class in (DistanceVectorNetwork, LinkStateNetwork):
+            for name, max_pending in (("direct", None), ("pipelined", 1)):
+                network = network_class(files[0], str(temp / f"{name}.txt"))
+                if max_pending is not None:
+                    network.enable_pipeline(max_pending)
+                network.apply_changes_and_output(files[2], files[1])
+                network.close()
+            self.assertEqual((temp / "pipelined.txt").read_text(), (temp / "direct.txt").read_text())
+
+    ## @brief Test case for the backpressure of the background writer.
+    #
+    # Test Steps:
+    # 1. Create a PipelinedOutput with one pending item, on a file whose writes wait.
+    # 2. Hand it three routing table snapshots from another thread.
+    # 3. Release the writes, then close the output.
+    #
+    # Expected Results:
+    # - While the writes wait, the producer is blocked on the third snapshot, with a full queue.
+    # - Once released, every snapshot is written in order.
+    # @test Verifies that pending output stays bounded when the writer is slow.
+    def test_backpressure(self):
+        file = BlockingFile()
+        output = PipelinedOutput(file, max_pending=1)
+        producer = threading.Thread(target=lambda: [output.write_routing_tables([{1: (1, 0), 2: (2, index)}]) for index in range(1, 4)])
+        producer.start()
+        producer.join(0.2)
+        self.assertTrue(producer.is_alive())
+        self.assertTrue(output.pending.full())
+
+        file.released.set()
+        producer.join()
+        output.close()
+        self.assertEqual(file.getvalue(), "1 1 0\n2 2 1\n\n1 1 0\n2 2 2\n\n1 1 0\n2 2 3\n\n")
+
+    ## @brief Test case for a write error of the background writer.
+    #
+    # Test Steps:
+    # 1. Create a PipelinedOutput on a file whose writes fail, and write text to it.
+    # 2. Close the output.
+    #
+    # Expected Results:
+    # - Closing raises the error of the background thread.
+    # @test Verifies that write errors are not lost in pipelined mode.
+    def test_write_error(self):
+        file = BlockingFile()
+        file.broken = True
+        file.released.set()
+        output = PipelinedOutput(file)
+        output.write("from 1 to 2 cost 1 hops 1 message hello\n")
+        with self.assertRaises(OSError):
+            output.close()
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import os
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+import dual
+import dvr
+import lsr
+from result_cache import ResultCache
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the result cache of the simulation scripts.
+# Contains tests checking that identical runs reuse the stored output, that runs extending the changes of
+# a stored run resume from its checkpoint with the same output, and that the least recently used entries
+# are removed once the cache is full.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestResultCache(TemporaryDirectoryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        (self.temp / "changes_short.txt").write_text("3 4 -999\n2 5 3\n")
+        (self.temp / "changes_long.txt").write_text("3 4 -999\n2 5 3\n1 5 -999\n3 4 2\n6 1 1\n2 5 -999\n")
+
+    def arguments(self, script, changes, output, *options):
+        """
+        Parses the arguments of a script running the circular topology.
+        """
+        return script.createParser().parse_args([str(self.testfiles / "topology_circular.txt"), str(self.testfiles / "message_circular.txt"),
+                                                 str(self.temp / changes), str(self.temp / output)] + list(options))
+
+    ## @brief Test case for a run answered from the cache.
+    #
+    # Test Steps:
+    # 1. Run the Link State simulation twice through the cache, then once with another topology file.
+    #
+    # Expected Results:
+    # - The second run is a hit, and writes the same output file and report as the first.
+    # - The run with another topology is not a hit.
+    # @test Verifies that identical runs reuse the stored result.
+    def test_hit(self):
+        cache = ResultCache(self.temp / "cache")
+        args = self.arguments(lsr, "changes_long.txt", "first.txt", "--spf-report")
+        first = cache.run(args, "lsr", lsr.createNetwork, lambda network: lsr.report(args, network))
+        args.output_file = str(self.temp / "second.txt")
+        second = cache.run(args, "lsr", lsr.createNetwork, lambda network: lsr.report(args, network))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(second, first)
+        self.assertEqual((self.temp / "second.txt").read_text(), (self.temp / "first.txt").read_text())
+
+        (self.temp / "topology.txt").write_text((self.testfiles / "topology_circular.txt").read_text() + "\n5 6 1\n")
+        args.topology_file = str(self.temp / "topology.txt")
+        cache.run(args, "lsr", lsr.createNetwork, lambda network: lsr.report(args, network))
+        self.assertEqual(cache.hits, 1)
+
+    ## @brief Test case for a run resumed from a checkpoint.
+    #
+    # Test Steps:
+    # 1. For every script, run the first two changes through the cache, then all six of them.
+    # 2. Run the six changes without the cache.
+    #
+    # Expected Results:
+    # - The second run resumes after the first two changes.
+    # - Its output file and report are the same as those of the run without the cache.
+    # @test Verifies that runs extending the changes of a stored run resume from its state.
+    def test_resume(self):
+        for script, protocol in ((dvr, "dvr"), (lsr, "lsr"), (dual, "dual")):
+            cache = ResultCache(self.temp / f"cache_{protocol}")
+            cache.run(self.arguments(script, "changes_short.txt", "short.txt"), protocol, script.createNetwork, lambda network: "")
+            args = self.arguments(script, "changes_long.txt", "resumed.txt", "--cache", str(cache.directory))
+            resumed = script.run(args)
+            cache.run(args, protocol, script.createNetwork, lambda network: "")
+            direct = script.run(self.arguments(script, "changes_long.txt", "direct.txt"))
+
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual(resumed, direct)
+            self.assertEqual((self.temp / "resumed.txt").read_text(), (self.temp / "direct.txt").read_text())
+
+        cache = ResultCache(self.temp / "cache_lsr")
+        args = self.arguments(lsr, "changes_long.txt", "resumed.txt")
+        (self.temp / "changes_longer.txt").write_text((self.temp / "changes_long.txt").read_text() + "6 2 1\n")
+        args.changes_file = str(self.temp / "changes_longer.txt")
+        cache.run(args, "lsr", lsr.createNetwork, lambda network: "")
+        self.assertEqual(cache.resumed_changes, 6)
+
+    ## @brief Test case for the size cap of the cache.
+    #
+    # Test Steps:
+    # 1. Store three entries of 1000 bytes, the first one being the oldest, then read the first one.
+    # 2. Cap the cache to 2500 bytes and evict.
+    #
+    # Expected Results:
+    # - The second entry, the least recently used, is removed, and the other two are kept.
+    # @test Verifies that the least recently used entries are evicted first.
+    def test_eviction(self):
+        cache = ResultCache(self.temp / "cache")
+        for index, key in enumerate(("first", "second", "third")):
+            cache._store(key, "result", ("", "x" * 1000))
+            os.utime(cache.directory / f"{key}.result", (time.time() - 100 + index, time.time() - 100 + index))
+        self.assertIsNotNone(cache._load("first", "result"))
+
+        cache.max_bytes = 2500
+        cache.evict()
+        self.assertEqual(sorted(path.name for path in cache.directory.iterdir()), ["first.result", "third.result"])
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
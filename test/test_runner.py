@@ -0,0 +1,96 @@
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from DistanceVectorNetwork import DistanceVectorNetwork
+from LinkStateNetwork import LinkStateNetwork
+from runner import run_manifest
+from topology_format import cache_text_topologies, open_topology_edges
+## @file
+## @brief Test file for the parallel scenario runner.
+# Contains tests for running the scenarios of a manifest across worker processes, checking that every
+# scenario writes the same output as when it is run on its own, that failing scenarios do not affect the
+# others, and that parsed text topologies are reused.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.testfiles = Path(__file__).resolve().parent / "testfiles"
+
+    def tearDown(self):
+        cache_text_topologies(0)
+        self.temp_dir.cleanup()
+
+    ## @brief Test case for running a manifest.
+    #
+    # Test Steps:
+    # 1. Write a manifest with a Distance Vector and a Link State scenario on the circular topology,
+    #    a scenario with a missing topology file and a scenario with an unknown protocol.
+    # 2. Run it with two workers.
+    # 3. Run the two valid scenarios directly with DistanceVectorNetwork and LinkStateNetwork.
+    #
+    # Expected Results:
+    # - Two scenarios succeed and two fail, and the summary lists them in manifest order with their errors.
+    # - The outputs of the valid scenarios are the same as when they are run directly.
+    # @test Verifies that scenarios run in parallel and that failures are isolated.
+    def test_run_manifest(self):
+        temp = Path(self.temp_dir.name)
+        files = " ".join(str(self.testfiles / f"{kind}_circular.txt") for kind in ("topology", "message", "changes"))
+        manifest_path = temp / "manifest.txt"
+        summary_path = temp / "summary.txt"
+        manifest_path.write_text(f"# circular topology\n"
+                                 f"dvr {files} {temp / 'dvr.txt'}\n"
+                                 f"lsr {files} {temp / 'lsr.txt'} --lazy\n"
+                                 f"lsr {temp / 'missing.txt'} {files.split()[1]} {files.split()[2]} {temp / 'missing_out.txt'}\n"
+                                 f"\n"
+                                 f"ospf {files}\n")
+
+        self.assertEqual(run_manifest(str(manifest_path), str(summary_path), 2), (2, 2))
+
+        summary = summary_path.read_text().splitlines()
+        self.assertTrue(summary[0].startswith("scenario 2 dvr ok "))
+        self.assertTrue(summary[1].startswith("scenario 3 lsr ok "))
+        self.assertTrue(summary[2].startswith("scenario 4 lsr failed "))
+        self.assertTrue(summary[3].startswith("    FileNotFoundError: "))
+        self.assertTrue(summary[4].startswith("scenario 6 ospf failed "))
+        self.assertEqual(summary[5], "    ValueError: unknown protocol 'ospf'")
+        self.assertTrue(summary[6].startswith("scenarios 4 ok 2 failed 2 "))
+
+        for network_class, name in ((DistanceVectorNetwork, "dvr"), (LinkStateNetwork, "lsr")):
+            expected_path = temp / f"expected_{name}.txt"
+            network = network_class(files.split()[0], str(expected_path))
+            network.apply_changes_and_output(files.split()[2], files.split()[1])
+            del network
+            self.assertEqual((temp / f"{name}.txt").read_text(), expected_path.read_text())
+
+    ## @brief Test case for the cache of parsed text topologies.
+    #
+    # Test Steps:
+    # 1. Turn on the topology cache and open topology_circular.txt twice.
+    # 2. Turn off the cache and open it again.
+    #
+    # Expected Results:
+    # - With the cache, both reads return the same parsed edges.
+    # - Without the cache, the file is parsed again.
+    # @test Verifies that parsed text topologies are reused between networks.
+    def test_topology_cache(self):
+        topology_path = str(self.testfiles / "topology_circular.txt")
+        cache_text_topologies(2)
+        with open_topology_edges(topology_path) as first, open_topology_edges(topology_path) as second:
+            self.assertIs(first, second)
+        cache_text_topologies(0)
+        with open_topology_edges(topology_path) as third:
+            self.assertIsNot(third, first)
+            self.assertEqual(list(third), list(first))
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import sys
+import tempfile
+import threading
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from client import SimulatorClient
+from LinkStateNetwork import LinkStateNetwork
+from server import SimulatorServer
+from topology_format import cache_text_topologies
+## @file
+## @brief Test file for the simulator server and its client.
+# Contains tests for running whole simulations on the server, checking that they write the same output as
+# the scripts, and for sessions that apply changes, send messages and query routes one request at a time.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.testfiles = Path(__file__).resolve().parent / "testfiles"
+        self.socket_path = str(Path(self.temp_dir.name) / "simulator.sock")
+        self.server = SimulatorServer(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        cache_text_topologies(0)
+        self.temp_dir.cleanup()
+
+    ## @brief Test case for running whole simulations on the server.
+    #
+    # Test Steps:
+    # 1. Run the Link State simulation of the circular topology twice on the server, then run it directly with LinkStateNetwork.
+    # 2. Run a simulation with a missing topology file and one with missing arguments.
+    #
+    # Expected Results:
+    # - The outputs written by the server are the same as the direct output, and the second run reuses the parsed topology.
+    # - The failing runs return their error, and the server keeps answering.
+    # @test Verifies that the server runs simulations like the scripts.
+    def test_run(self):
+        temp = Path(self.temp_dir.name)
+        files = [str(self.testfiles / f"{kind}_circular.txt") for kind in ("topology", "message", "changes")]
+        with SimulatorClient(self.socket_path) as client:
+            first = client.request("run", protocol="lsr", arguments=files + [str(temp / "first.txt")])
+            second = client.request("run", protocol="lsr", arguments=files + [str(temp / "second.txt"), "--lazy"])
+            missing = client.request("run", protocol="lsr", arguments=[str(temp / "missing.txt")] + files[1:] + [str(temp / "missing_out.txt")])
+            invalid = client.request("run", protocol="dvr", arguments=files[:1])
+
+        self.assertTrue(first["ok"])
+        self.assertEqual(first["report"], "")
+        self.assertTrue(second["topology_reused"])
+        self.assertFalse(missing["ok"])
+        self.assertTrue(missing["error"].startswith("FileNotFoundError: "))
+        self.assertFalse(invalid["ok"])
+        self.assertEqual(invalid["error"], "dvr: error: the following arguments are required: message_file, changes_file")
+
+        network = LinkStateNetwork(files[0], str(temp / "expected.txt"))
+        network.apply_changes_and_output(files[2], files[1])
+        del network
+        self.assertEqual((temp / "first.txt").read_text(), (temp / "expected.txt").read_text())
+        self.assertEqual((temp / "second.txt").read_text(), (temp / "expected.txt").read_text())
+
+    ## @brief Test case for a session on the server.
+    #
+    # The testfile topology_tie_break_2.txt contains the following topology (the number of lines is the cost of the edge):
+    #     1 - 4 - 12 -- 9
+    #         \        /
+    #           5     11
+    #
+    # Test Steps:
+    # 1. Open a Link State session on topology_tie_break_2.txt, recording its history.
+    # 2. Add the link 5-11 with cost 1, send a message from 4 to 9 and query the route from 4 to 9.
+    # 3. Query the route from 4 to 9 before the change, and if the link 5-11 were removed again.
+    # 4. Close the session and query it again.
+    #
+    # Expected Results:
+    # - The output of the session is the same as the output file of the simulation with the same change and message.
+    # - The query finds the path 4 5 11 9 with cost 3.
+    # - Before the change and in the hypothetical topology, the route is 4 12 9 with cost 3.
+    # - The closed session is unknown.
+    # @test Verifies that sessions apply changes and stream back the routing output.
+    def test_session(self):
+        temp = Path(self.temp_dir.name)
+        topology_file = str(self.testfiles / "topology_tie_break_2.txt")
+        with SimulatorClient(self.socket_path) as client:
+            opened = client.request("open", protocol="lsr", topology=topology_file, history=True)
+            session_id = opened["session"]
+            changed = client.request("change", session=session_id, changes=[[5, 11, 1]])
+            sent = client.request("messages", session=session_id, messages=[[4, 9, "here is a message from 4 to 9"]])
+            query = client.request("query", session=session_id, source=4, destination=9)
+            past_query = client.request("query", session=session_id, source=4, destination=9, version=0)
+            fork_query = client.request("query", session=session_id, source=4, destination=9, changes=[[5, 11, -999]])
+            closed = client.request("close", session=session_id)
+            unknown = client.request("query", session=session_id, source=4, destination=9)
+
+        (temp / "message.txt").write_text("4 9 here is a message from 4 to 9\n")
+        (temp / "changes.txt").write_text("5 11 1\n")
+        network = LinkStateNetwork(topology_file, str(temp / "expected.txt"))
+        network.apply_changes_and_output(str(temp / "changes.txt"), str(temp / "message.txt"))
+        del network
+        expected_states = (temp / "expected.txt").read_text().split("\n\n\n")
+
+        self.assertTrue(closed["ok"])
+        self.assertTrue(expected_states[0].startswith(opened["output"] + "from 4 to 9"))
+        self.assertEqual(changed["output"] + sent["output"], expected_states[1] + "\n")
+        self.assertEqual(query["path"], [4, 5, 11, 9])
+        self.assertEqual(query["cost"], 3)
+        self.assertEqual((past_query["path"], past_query["cost"]), ([4, 12, 9], 3))
+        self.assertEqual((fork_query["path"], fork_query["cost"]), ([4, 12, 9], 3))
+        self.assertFalse(unknown["ok"])
+        self.assertEqual(unknown["error"], f"ValueError: unknown session {session_id}")
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+import dvr
+from ControlPlaneCounter import ControlPlaneCounter
+from DistanceVectorNetwork import DistanceVectorNetwork
+from DistanceVectorShards import partition_routers
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the Distance Vector algorithm run across worker processes.
+# Contains tests checking that routers are partitioned into balanced shards cutting few links, and that
+# sharded networks converge to the same routing tables and write the same output as a single process.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+CHANGES = [(3, 4, -999), (2, 5, 3), (1, 5, -999), (3, 4, 2), (6, 1, 1), (4, 5, -999), ("node", 2, "down"), ("node", 2, "up"), (4, 5, 1)]
+
+
+class TestShards(TemporaryDirectoryTestCase):
+
+    ## @brief Test case for partitioning routers.
+    #
+    # Test Steps:
+    # 1. Partition two rings of 6 routers, joined by the link 6-7, into 2 shards, then into 3 shards.
+    #
+    # Expected Results:
+    # - With 2 shards, each ring is a shard and only the link 6-7 is cut.
+    # - With 3 shards, every shard holds 4 routers.
+    # @test Verifies that shards are balanced and cut few links.
+    def test_partition(self):
+        neighbors = {router_id: {} for router_id in range(1, 13)}
+        links = [(router_id, router_id % 6 + 1) for router_id in range(1, 7)]
+        links += [(router_id, router_id % 6 + 7) for router_id in range(7, 13)] + [(6, 7)]
+        for router_id1, router_id2 in links:
+            neighbors[router_id1][router_id2] = neighbors[router_id2][router_id1] = 1
+
+        assignment = partition_routers(neighbors, 2)
+        self.assertEqual([router_id1 for router_id1, router_id2 in links if assignment[router_id1] != assignment[router_id2]], [6])
+        self.assertEqual(len({assignment[router_id] for router_id in range(1, 7)}), 1)
+
+        assignment = partition_routers(neighbors, 3)
+        self.assertEqual(sorted(list(assignment.values()).count(shard) for shard in range(3)), [4, 4, 4])
+
+    ## @brief Test case for sharded networks.
+    #
+    # Test Steps:
+    # 1. Create Distance Vector networks on the circular, tie break and connected to disconnected topologies,
+    #    in a single process and across 2 and 3 shards, and apply link changes and node events to them.
+    # 2. Count the control plane of a sharded network.
+    #
+    # Expected Results:
+    # - The routing tables of the sharded networks are those of the single process after every change,
+    #   including the unreachable destinations.
+    # - Counting the control plane of a sharded network raises a ValueError.
+    # @test Verifies that sharding does not change the routing tables.
+    def test_same_routing_tables(self):
+        output_file = str(self.temp / "output.txt")
+        for topology in ("topology_circular.txt", "topology_tie_break.txt", "topology_connected_to_disconnected.txt"):
+            networks = [DistanceVectorNetwork(str(self.testfiles / topology), output_file, shards=shards) for shards in (None, 2, 3)]
+            for change in [None] + CHANGES:
+                routing_tables = []
+                for network in networks:
+                    if change is not None:
+                        network.apply_topology_change(change)
+                    routing_tables.append({router.id: dict(router.routing_table) for router in network.routers.values()})
+                self.assertEqual(routing_tables[1], routing_tables[0])
+                self.assertEqual(routing_tables[2], routing_tables[0])
+            for network in networks:
+                network.close()
+
+        with self.assertRaises(ValueError):
+            DistanceVectorNetwork(str(self.testfiles / "topology_circular.txt"), output_file, control_plane=ControlPlaneCounter(), shards=2)
+
+    ## @brief Test case for the Distance Vector script with --shards.
+    #
+    # Test Steps:
+    # 1. Run the Distance Vector script on the circular topology with and without --shards 2.
+    #
+    # Expected Results:
+    # - The output files are the same.
+    # - The report gives the shards, the links between them and the parallel efficiency.
+    # @test Verifies that sharded runs write the same output.
+    def test_script(self):
+        reports = []
+        for options in ([], ["--shards", "2"]):
+            args = dvr.createParser().parse_args([str(self.testfiles / "topology_circular.txt"), str(self.testfiles / "message_circular.txt"),
+                                                  str(self.testfiles / "changes_circular.txt"), str(self.temp / f"output{len(reports)}.txt")] + options)
+            reports.append(dvr.run(args))
+        self.assertEqual((self.temp / "output0.txt").read_text(), (self.temp / "output1.txt").read_text())
+        self.assertEqual(reports[0], "")
+        self.assertTrue(reports[1].startswith("shards: 2\nlinks between shards: "))
+        self.assertIn("\nparallel efficiency: ", reports[1])
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from LinkStateNetwork import LinkStateNetwork
+from shortest_paths import breadth_first_tree, bucket_tree, choose_tree_kernel, shortest_path_tree
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the shortest path kernels specialized for integer link costs.
+# Contains tests checking that the breadth first and bucket kernels find the same distances and next hops
+# as Dijkstra's algorithm, ties included, that the kernel is chosen from the link costs, and that the link
+# state database keeps the costs its routers choose the kernel from up to date.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestSpfKernels(TemporaryDirectoryTestCase):
+
+    ## @brief Test case for the kernels.
+    #
+    # Test Steps:
+    # 1. Generate random topologies, possibly disconnected, with costs all equal or drawn up to 1, 3 or 10,
+    #    so that many paths have equal costs.
+    # 2. Compute the shortest path trees of a router with every kernel that applies, and with shortest_path_tree.
+    #
+    # Expected Results:
+    # - Every kernel finds the same distances and next hops as shortest_path_tree.
+    # @test Verifies that the kernels follow the tie-break rule of LinkStateRouter.
+    def test_same_trees(self):
+        generator = random.Random(49)
+        for _ in range(300):
+            router_count = generator.randint(1, 30)
+            max_cost = generator.choice((1, 3, 10))
+            equal_costs = generator.random() < 0.3
+            neighbors = {router_id: {} for router_id in range(1, router_count + 1)}
+            for _ in range(generator.randint(0, 3 * router_count) if router_count > 1 else 0):
+                router_id1, router_id2 = generator.sample(range(1, router_count + 1), 2)
+                cost = max_cost if equal_costs else generator.randint(1, max_cost)
+                neighbors[router_id1][router_id2] = neighbors[router_id2][router_id1] = cost
+            source_id = generator.randint(1, router_count)
+
+            expected = shortest_path_tree(neighbors.get, source_id)
+            self.assertEqual(bucket_tree(neighbors.get, source_id, max_cost), expected)
+            if equal_costs:
+                self.assertEqual(breadth_first_tree(neighbors.get, source_id, max_cost), expected)
+
+    ## @brief Test case for choosing the kernel.
+    #
+    # Test Steps:
+    # 1. Choose the kernel for links all costing 2, for costs up to 5 and up to 100, for a zero cost and for no link.
+    #
+    # Expected Results:
+    # - Equal costs use a breadth first search, costs up to 5 use buckets for 6 distances, and the other
+    #   cases use shortest_path_tree.
+    # @test Verifies that the kernel is chosen from the link costs.
+    def test_choose_kernel(self):
+        kernel = choose_tree_kernel({2: 8})
+        self.assertEqual((kernel.func, kernel.keywords), (breadth_first_tree, {"weight": 2}))
+        kernel = choose_tree_kernel({1: 4, 5: 2})
+        self.assertEqual((kernel.func, kernel.keywords), (bucket_tree, {"max_weight": 5}))
+        self.assertIs(choose_tree_kernel({1: 4, 100: 2}), shortest_path_tree)
+        self.assertIs(choose_tree_kernel({0: 2, 1: 2}), shortest_path_tree)
+        self.assertIs(choose_tree_kernel({}), shortest_path_tree)
+
+    ## @brief Test case for the link costs of the link state database.
+    #
+    # Test Steps:
+    # 1. Create a Link State network on the tie break topology, where every link costs 1, raise the costs
+    #    of two links so the routers move from a breadth first search to buckets, lower them back, then
+    #    remove a link.
+    #
+    # Expected Results:
+    # - After every change, the costs counted by the link state database are those of its LSPs.
+    # - The routing tables are the shortest path trees of the topology.
+    # @test Verifies that the link state database follows the link costs.
+    def test_database_weights(self):
+        network = LinkStateNetwork(str(self.testfiles / "topology_tie_break.txt"), str(self.temp / "output.txt"))
+        for change in (None, (3, 4, 3), (2, 5, 2), (3, 4, 1), (2, 5, 1), (3, 4, -999)):
+            if change is not None:
+                network.apply_topology_change(change)
+            for router in network.routers.values():
+                weights = {}
+                for router_neighbors in router.network_topology.values():
+                    for cost in router_neighbors.values():
+                        weights[cost] = weights.get(cost, 0) + 1
+                self.assertEqual(router.lsdb.weights, weights)
+
+                distances, next_hops = shortest_path_tree(lambda router_id: network.routers[router_id].neighbors, router.id)
+                self.assertEqual({destination_id: cost for destination_id, (_, cost) in router.routing_table.items() if destination_id in distances}, distances)
+                self.assertEqual({destination_id: next_hop_id for destination_id, (next_hop_id, _) in router.routing_table.items() if destination_id in next_hops}, next_hops)
+        self.assertEqual(set(network.routers[3].lsdb.weights), {1})
+        network.close()
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+import io
+import sys
+from contextlib import redirect_stderr
+from unittest import mock
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+import lsr
+from LinkStateNetwork import LinkStateNetwork
+from SpfThrottle import SpfThrottle
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the SPF throttle of Link State routers.
+# Contains tests checking the exponential backoff of the SPF runs, that throttling does not change the output
+# of a simulation where every change waits for the previous one, and that changes arriving faster than the
+# SPF runs are coalesced into fewer runs, and that the Link State script rejects the options the throttle
+# cannot be used with before writing anything.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestSpfThrottle(TemporaryDirectoryTestCase):
+
+    ## @brief Test case for the backoff of an SPF throttle.
+    #
+    # Test Steps:
+    # 1. Create a throttle with an initial delay of 10, a hold time of 100 and a maximum hold time of 400.
+    # 2. Request SPF runs shortly after each other, one of them while a run is pending, then after a quiet period.
+    #
+    # Expected Results:
+    # - The first run waits for the initial delay, and the request made while it is pending is coalesced.
+    # - The next runs are 100, 200 and 400 after the previous one, then the hold time stops doubling.
+    # - After a quiet period as long as the maximum hold time, a run only waits for the initial delay again.
+    # - Negative times and a maximum hold time shorter than the hold time raise a ValueError, while times of 0
+    #   run every SPF as soon as it is requested.
+    # @test Verifies that consecutive SPF runs back off exponentially.
+    def test_backoff(self):
+        throttle = SpfThrottle(10, 100, 400)
+        self.assertEqual(throttle.request(0), 10)
+        self.assertIsNone(throttle.request(5))
+        self.assertEqual(throttle.run(), 10)
+        self.assertEqual(throttle.request(20), 110)
+        throttle.run()
+        self.assertEqual(throttle.request(120), 310)
+        throttle.run()
+        self.assertEqual(throttle.request(320), 710)
+        throttle.run()
+        self.assertEqual(throttle.request(720), 1110)
+        throttle.run()
+        self.assertEqual(throttle.request(1600), 1610)
+        self.assertEqual((throttle.requests, throttle.coalesced, throttle.current_hold), (7, 1, 100))
+
+        with self.assertRaises(ValueError):
+            SpfThrottle(-1, 100, 400)
+        with self.assertRaises(ValueError):
+            SpfThrottle(10, 100, 50)
+        throttle = SpfThrottle(0, 0, 0)
+        self.assertEqual(throttle.request(30), 30)
+
+    ## @brief Test case for throttled SPF runs where every change waits for the previous one.
+    #
+    # Test Steps:
+    # 1. Run the Link State script on the circular topology with and without --spf-throttle.
+    # 2. Throttle a lazy network.
+    #
+    # Expected Results:
+    # - The output files are the same, and so are the SPF runs.
+    # - The SPF report adds the throttle counts and the simulated time.
+    # - Throttling the lazy network raises a ValueError.
+    # @test Verifies that throttling alone only changes when the SPF runs are made.
+    def test_synchronous(self):
+        reports = []
+        for options in ([], ["--spf-throttle", "10,100,400"]):
+            args = lsr.createParser().parse_args([str(self.testfiles / "topology_circular.txt"), str(self.testfiles / "message_circular.txt"),
+                                                  str(self.testfiles / "changes_circular.txt"), str(self.temp / f"output{len(reports)}.txt"),
+                                                  "--spf-report"] + options)
+            reports.append(lsr.run(args))
+        self.assertEqual((self.temp / "output0.txt").read_text(), (self.temp / "output1.txt").read_text())
+        self.assertTrue(reports[1].startswith(reports[0]))
+        self.assertIn("SPF requests coalesced into a pending run: 0\nSPF runs pending: 0\nsimulated time: 110 ms\n", reports[1])
+
+        network = LinkStateNetwork(str(self.testfiles / "topology_circular.txt"), str(self.temp / "output.txt"), lazy=True)
+        with self.assertRaises(ValueError):
+            network.enable_spf_throttle(10, 100, 400)
+
+    ## @brief Test case for the SPF runs saved when no request is coalesced.
+    #
+    # Test Steps:
+    # 1. Run the Link State script on the connected to disconnected files with --spf-report, with and without
+    #    an SPF throttle of 50,200,5000 and a change every 100.
+    #
+    # Expected Results:
+    # - The throttle coalesces no request, so the runs saved are those saved without it, the pending runs not
+    #   being counted as saved.
+    # @test Verifies that the runs saved only count LSP arrivals changing the topology.
+    def test_saved_runs(self):
+        reports = []
+        for options in ([], ["--spf-throttle", "50,200,5000", "--change-interval", "100"]):
+            args = lsr.createParser().parse_args([str(self.testfiles / "topology_connected_to_disconnected.txt"),
+                                                  str(self.testfiles / "message_connected_to_disconnected.txt"),
+                                                  str(self.testfiles / "changes_connected_to_disconnected.txt"),
+                                                  str(self.temp / f"output{len(reports)}.txt"), "--spf-report"] + options)
+            reports.append(lsr.run(args))
+        self.assertIn("LSP arrivals changing the link state topology: 40\nSPF runs saved by coalescing LSP arrivals: 26\n", reports[0])
+        self.assertIn("LSP arrivals changing the link state topology: 40\nSPF runs saved by coalescing LSP arrivals: 26\n", reports[1])
+        self.assertIn("SPF requests coalesced into a pending run: 0\nSPF runs pending: 4\n", reports[1])
+
+    ## @brief Test case for changes arriving faster than the SPF runs.
+    #
+    #     3 - 4 - 5 - 6
+    #      \    /
+    #         2
+    #
+    # Test Steps:
+    # 1. Throttle the tie break network with an initial delay of 10, a hold time of 30 and a maximum hold time
+    #    of 400, with a change every 5, and change the link 2-3 twice, then the link 2-5.
+    # 2. Send a message from 3 to 2, then run the pending SPF runs.
+    #
+    # Expected Results:
+    # - Routers 3 and 4 route to 2 through each other, as one of them has not run its SPF yet, so the message is dropped.
+    # - Once the pending runs are made, the routing tables are those of an unthrottled network, which ran
+    #   Dijkstra's algorithm 17 times instead of 12.
+    # @test Verifies that LSP arrivals are coalesced into fewer SPF runs.
+    def test_timed(self):
+        topology = str(self.testfiles / "topology_tie_break.txt")
+        network = LinkStateNetwork(topology, str(self.temp / "output.txt"))
+        unthrottled = LinkStateNetwork(topology, str(self.temp / "unthrottled.txt"))
+        network.enable_spf_throttle(10, 30, 400, 5)
+        for change in ((2, 3, 1), (2, 3, 9), (2, 5, 9)):
+            network.apply_topology_change(change)
+            unthrottled.apply_topology_change(change)
+        self.assertEqual(network._generate_message_string(3, 2, "stale"), "from 3 to 2 cost infinite hops 3 4 3 dropped message stale")
+
+        network.run_scheduled_spfs()
+        self.assertEqual({router.id: dict(router.routing_table) for router in network.routers.values()},
+                         {router.id: dict(router.routing_table) for router in unthrottled.routers.values()})
+        self.assertEqual((network.spf_runs(), unthrottled.spf_runs()), (12, 17))
+        self.assertGreater(sum(router.spf_throttle.coalesced for router in network.routers.values()), 0)
+
+    ## @brief Test case for the options the SPF throttle cannot be used with.
+    #
+    # Test Steps:
+    # 1. Run the Link State script with --spf-throttle and --lazy, --routers or --areas, with --change-interval
+    #    alone or not positive, and with throttle times that are negative or a maximum below the hold time,
+    #    writing to an output file that already exists.
+    #
+    # Expected Results:
+    # - The script exits with a usage error naming the option, and the output file is left as it was.
+    # @test Verifies that conflicting options are rejected before any output is written.
+    def test_conflicting_options(self):
+        output_path = self.temp / "output.txt"
+        output_path.write_text("previous run\n")
+        files = [str(self.testfiles / "topology_circular.txt"), str(self.testfiles / "message_circular.txt"),
+                 str(self.testfiles / "changes_circular.txt"), str(output_path)]
+        for options, message in ((["--spf-throttle", "1,2,3", "--lazy"], "--lazy"),
+                                 (["--spf-throttle", "1,2,3", "--routers", "1,2"], "--routers"),
+                                 (["--spf-throttle", "1,2,3", "--areas", str(self.testfiles / "areas_connected_to_disconnected.txt")], "--areas"),
+                                 (["--change-interval", "100"], "--change-interval"),
+                                 (["--spf-throttle", "1,2,3", "--change-interval", "0"], "--change-interval"),
+                                 (["--spf-throttle", "1,-2,3"], "non-negative"),
+                                 (["--spf-throttle", "1,20,3"], "MAX at least HOLD")):
+            errors = io.StringIO()
+            with mock.patch.object(sys, "argv", ["lsr.py"] + files + options), redirect_stderr(errors):
+                with self.assertRaises(SystemExit) as context:
+                    lsr.main()
+            self.assertEqual(context.exception.code, 2)
+            self.assertIn(message, errors.getvalue())
+            self.assertEqual(output_path.read_text(), "previous run\n")
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+import dvr
+import inspect_trace
+from AreaLinkStateNetwork import AreaLinkStateNetwork
+from DistanceVectorNetwork import DistanceVectorNetwork
+from DualNetwork import DualNetwork
+from LinkStateNetwork import LinkStateNetwork
+from TraceRecorder import CLEAR, TraceRecorder, read_trace, replay
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the binary trace of routing table updates.
+# Contains tests checking that replaying a trace rebuilds the routing tables of every protocol after each
+# change, that a ring keeps the most recent records, and that the inspection script reads the traces of
+# the simulation scripts.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+CHANGES = [(3, 4, -999), (2, 5, 3), (1, 5, -999), (3, 4, 2), (6, 1, 1), ("node", 2, "down"), ("node", 2, "up")]
+
+
+class TestTrace(TemporaryDirectoryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.topology = str(self.testfiles / "topology_circular.txt")
+        (self.temp / "areas.txt").write_text("1 1\n2 1\n3 2\n")
+
+    ## @brief Test case for replaying the traces of every protocol.
+    #
+    # Test Steps:
+    # 1. For every protocol, trace a network while applying link changes and node events.
+    # 2. Replay the trace up to each change.
+    #
+    # Expected Results:
+    # - The replayed routing tables are the routing tables of the network after each change.
+    # - Link State routers record that they emptied their routing table before recomputing it.
+    # @test Verifies that traces hold every routing table update.
+    def test_replay(self):
+        self.check_replay(CHANGES)
+
+    ## @brief Test case for replaying the traces of routers created by changes.
+    #
+    # Test Steps:
+    # 1. For every protocol, trace a network while removing a link to router 7, which is not in the
+    #    topology, then linking router 7 to router 5.
+    # 2. Replay the trace up to each change.
+    #
+    # Expected Results:
+    # - The replayed routing tables are the routing tables of the network after each change, router 7 included.
+    # @test Verifies that routers created by a change record their routing table updates.
+    def test_replay_created_router(self):
+        self.check_replay([(7, 4, -999), (7, 5, 2)])
+
+    def check_replay(self, changes):
+        trace_file = str(self.temp / "trace.bin")
+        output_file = str(self.temp / "output.txt")
+        for create_network in (lambda trace: DistanceVectorNetwork(self.topology, output_file, trace=trace),
+                               lambda trace: LinkStateNetwork(self.topology, output_file, trace=trace),
+                               lambda trace: LinkStateNetwork(self.topology, output_file, lazy=True, trace=trace),
+                               lambda trace: AreaLinkStateNetwork(self.topology, output_file, str(self.temp / "areas.txt"), trace=trace),
+                               lambda trace: DualNetwork(self.topology, output_file, trace=trace)):
+            network = create_network(TraceRecorder(trace_file))
+            routing_tables = [{router.id: dict(router.routing_table) for router in network.routers.values()}]
+            for change in changes:
+                network.apply_topology_change(change)
+                routing_tables.append({router.id: dict(router.routing_table) for router in network.routers.values()})
+            network.close()
+
+            dropped, records = read_trace(trace_file)
+            self.assertEqual(dropped, 0)
+            self.assertEqual([replay(records, change_index) for change_index in range(len(changes) + 1)], routing_tables)
+            self.assertEqual(any(record[1] == CLEAR for record in records), isinstance(network, LinkStateNetwork))
+
+    ## @brief Test case for a trace kept in a ring.
+    #
+    # Test Steps:
+    # 1. Trace the same Distance Vector network twice, once completely and once in a ring of 10 records.
+    #
+    # Expected Results:
+    # - The ring holds the last 10 records of the complete trace, and counts the other ones as dropped.
+    # - Replaying the ring is refused.
+    # @test Verifies that a ring keeps the most recent records in order.
+    def test_ring(self):
+        traces = []
+        for trace_file, ring_size in (("trace.bin", None), ("ring.bin", 10)):
+            network = DistanceVectorNetwork(self.topology, str(self.temp / "output.txt"), trace=TraceRecorder(str(self.temp / trace_file), ring_size))
+            for change in CHANGES:
+                network.apply_topology_change(change)
+            network.close()
+            traces.append(read_trace(str(self.temp / trace_file)))
+
+        (_, records), (dropped, ring_records) = traces
+        self.assertEqual(ring_records, records[-10:])
+        self.assertEqual(dropped, len(records) - 10)
+        with self.assertRaises(ValueError):
+            inspect_trace.replay_output(dropped, ring_records)
+        with self.assertRaises(ValueError):
+            TraceRecorder(str(self.temp / "ring.bin"), 0)
+
+    ## @brief Test case for inspecting the trace of a simulation script.
+    #
+    # Test Steps:
+    # 1. Run the Distance Vector script with --trace on the circular topology.
+    # 2. Summarize, dump and replay the trace, and read a file that is not a trace.
+    #
+    # Expected Results:
+    # - The replayed routing tables are the ones last written to the output file.
+    # - The summary counts every record, and the dump of a router only lists its records.
+    # - Reading the other file raises a ValueError.
+    # @test Verifies that the inspection script reads the traces written with --trace.
+    def test_inspect(self):
+        args = dvr.createParser().parse_args([self.topology, str(self.testfiles / "message_circular.txt"),
+                                              str(self.testfiles / "changes_circular.txt"), str(self.temp / "output.txt"),
+                                              "--trace", str(self.temp / "trace.bin")])
+        dvr.run(args)
+        dropped, records = read_trace(str(self.temp / "trace.bin"))
+
+        network = DistanceVectorNetwork(self.topology, str(self.temp / "direct.txt"))
+        network.apply_changes_and_output(str(self.testfiles / "changes_circular.txt"), str(self.testfiles / "message_circular.txt"))
+        network.close()
+        self.assertEqual(inspect_trace.replay_output(dropped, records),
+                         "".join(network.routers[router_id].get_routing_table_string() + "\n" for router_id in sorted(network.routers)))
+
+        self.assertTrue(inspect_trace.summarize(dropped, records).startswith(f"records: {len(records)}\ndropped records: 0\nchange 0: "))
+        lines = inspect_trace.dump(records, router_id=3).splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.split()[1] == "3" for line in lines))
+        with self.assertRaises(ValueError):
+            read_trace(self.topology)
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.append(str(Path(__file__).resolve().parent))
+from ControlPlaneCounter import DELTA, FULL, ControlPlaneCounter
+from DistanceVectorNetwork import DistanceVectorNetwork
+from DualNetwork import DualNetwork
+from LinkStateDatabase import make_lsp
+from LinkStateNetwork import LinkStateNetwork
+from utilities import INFINITY
+from wire_format import decode_packet, encode_delta_lsp, encode_distance_vector, encode_dual_message, encode_lsp
+from fixtures import TemporaryDirectoryTestCase
+## @file
+## @brief Test file for the wire encodings of the routing protocol messages and the control plane counts.
+# Contains tests checking that every packet decodes to the message it encodes, and that networks count
+# their messages and bytes for each change in the full and delta encodings without changing their output.
+## @author Maddy Paulson (maddypaulson)
+## @author Leonardo Kamino Barros (LeonardoKamino)
+## @bug No known bugs.
+## @addtogroup Tests
+## @{
+
+class TestWireFormat(TemporaryDirectoryTestCase):
+
+    ## @brief Test case for encoding and decoding packets.
+    #
+    # Test Steps:
+    # 1. Encode an LSP, a delta LSP changing, adding and removing adjacencies, a distance vector with a
+    #    withdrawn route and a DUAL query, then decode them.
+    # 2. Decode the delta LSP with the wrong base LSP, and a packet of unknown type.
+    #
+    # Expected Results:
+    # - Every packet decodes to the message it encodes, and the delta LSP only holds the 3 changed adjacencies.
+    # - The wrong base LSP and the unknown type raise a ValueError.
+    # @test Verifies that the wire encodings are lossless.
+    def test_round_trip(self):
+        base_lsp = make_lsp(7, 4, {1: 3, 2: 5, 9: 1})
+        lsp = make_lsp(7, 5, {1: 3, 2: 6, 4: 2})
+        self.assertEqual(dict(decode_packet(encode_lsp(lsp))['neighbors']), {1: 3, 2: 6, 4: 2})
+
+        delta = encode_delta_lsp(lsp, base_lsp)
+        self.assertEqual(len(delta), len(encode_lsp(lsp)) + 4)
+        decoded = decode_packet(delta, base_lsp)
+        self.assertEqual((decoded['id'], decoded['sequence'], dict(decoded['neighbors'])), (7, 5, {1: 3, 2: 6, 4: 2}))
+
+        self.assertEqual(decode_packet(encode_distance_vector(3, [(1, 4), (5, INFINITY)])), (3, {1: 4, 5: INFINITY}))
+        self.assertEqual(decode_packet(encode_dual_message("query", 2, 6, INFINITY)), ("query", 2, 6, INFINITY))
+
+        with self.assertRaises(ValueError):
+            decode_packet(delta, lsp)
+        with self.assertRaises(ValueError):
+            decode_packet(b"\x09")
+
+    ## @brief Test case for the control plane counts of the networks.
+    #
+    # Test Steps:
+    # 1. Create Distance Vector, Link State and DUAL networks on the circular topology, with a counter in
+    #    the full encoding and one in the delta encoding, and change the cost of the link 1-2.
+    # 2. Create the same networks without counters.
+    #
+    # Expected Results:
+    # - The 5 initial LSPs are each sent over the 5 links in both directions, in 29 byte packets.
+    # - The delta encoding never sends more messages or bytes, and sends the same number of LSPs and DUAL messages.
+    # - The routing tables are the same as without counters.
+    # @test Verifies that messages and bytes are counted for each change.
+    def test_counts(self):
+        topology = str(self.testfiles / "topology_circular.txt")
+        output_file = str(self.temp / "output.txt")
+        for network_class in (DistanceVectorNetwork, LinkStateNetwork, DualNetwork):
+            counters = {encoding: ControlPlaneCounter(encoding) for encoding in (FULL, DELTA)}
+            routing_tables = []
+            for counter in (counters[FULL], counters[DELTA], None):
+                network = network_class(topology, output_file, control_plane=counter)
+                network.apply_change(1, 2, 1)
+                routing_tables.append({router.id: dict(router.routing_table) for router in network.routers.values()})
+                network.close()
+            self.assertEqual(routing_tables[0], routing_tables[2])
+            self.assertEqual(routing_tables[1], routing_tables[2])
+
+            full, delta = counters[FULL].counts, counters[DELTA].counts
+            self.assertEqual(sorted(full), [0, 1])
+            for change_index in full:
+                for kind, (messages, size) in full[change_index].items():
+                    self.assertLessEqual(delta[change_index][kind][0], messages)
+                    self.assertLessEqual(delta[change_index][kind][1], size)
+                    if kind != "distance vector":
+                        self.assertEqual(delta[change_index][kind][0], messages)
+        self.assertEqual(full[0]["dual"][1], full[0]["dual"][0] * 14)
+
+        network = LinkStateNetwork(topology, output_file, control_plane=ControlPlaneCounter())
+        self.assertEqual(network.control_plane.counts, {0: {"lsp": [50, 1450]}})
+        self.assertEqual(network.control_plane_report(), "control plane (full encoding):\nchange 0: 50 messages 1450 bytes\nlsp: 50 messages 1450 bytes\n")
+        network.close()
+        with self.assertRaises(ValueError):
+            ControlPlaneCounter("compressed")
+
+    ## @brief Test case for counting the messages of routers created by changes.
+    #
+    # Test Steps:
+    # 1. Create Distance Vector, Link State and DUAL networks on the circular topology with counters.
+    # 2. In one network, remove a link to router 7, which is not in the topology, then link router 7 to
+    #    router 5 and change the cost of that link. In the other, only add the link and change its cost.
+    #
+    # Expected Results:
+    # - Router 7 counts its messages with the counter of the network.
+    # - Changing the cost of the link sends the same messages and bytes in both networks.
+    # @test Verifies that routers created by a removal count their messages.
+    def test_created_router_counts(self):
+        topology = str(self.testfiles / "topology_circular.txt")
+        for network_class in (DistanceVectorNetwork, LinkStateNetwork, DualNetwork):
+            removed = network_class(topology, str(self.temp / "removed.txt"), control_plane=ControlPlaneCounter())
+            for change in ((7, 4, -999), (7, 5, 2), (7, 5, 3)):
+                removed.apply_topology_change(change)
+            added = network_class(topology, str(self.temp / "added.txt"), control_plane=ControlPlaneCounter())
+            for change in ((7, 5, 2), (7, 5, 3)):
+                added.apply_topology_change(change)
+
+            self.assertIs(removed.routers[7].control_plane, removed.control_plane)
+            self.assertEqual(removed.control_plane.counts[3], added.control_plane.counts[2])
+            removed.close()
+            added.close()
+
+## @}
+
+if __name__ == "__main__":
+    unittest.main()